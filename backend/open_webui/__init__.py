@@ -99,5 +99,81 @@ def dev(
     )
 
 
+@app.command()
+def startup_profile(
+    module: str = "open_webui.main",
+    top: int = 30,
+):
+    """
+    Imports the app in a fresh interpreter with -X importtime and reports the
+    modules and packages that take the longest to import.
+    """
+    import subprocess
+    import sys
+    import time
+
+    env = {**os.environ, "FROM_INIT_PY": "true"}
+    if env.get("WEBUI_SECRET_KEY") is None:
+        env["WEBUI_SECRET_KEY"] = (
+            KEY_FILE.read_text() if KEY_FILE.exists() else "startup-profile"
+        )
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        modules.append(
+            (fields[2].strip(), int(fields[0]) / 1000, int(fields[1]) / 1000)
+        )
+
+    if result.returncode != 0:
+        typer.echo(result.stderr[-2000:], err=True)
+        typer.echo(f"Importing {module} failed", err=True)
+        raise typer.Exit(result.returncode)
+
+    packages = {}
+    for name, self_ms, _ in modules:
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_ms
+
+    typer.echo(f"Imported {module} in {elapsed:.2f}s ({len(modules)} modules)\n")
+
+    typer.echo(f"{'cumulative ms':>14} {'self ms':>10}  module")
+    for name, self_ms, cumulative_ms in sorted(
+        modules, key=lambda item: item[2], reverse=True
+    )[:top]:
+        typer.echo(f"{cumulative_ms:>14.1f} {self_ms:>10.1f}  {name}")
+
+    typer.echo(f"\n{'self ms':>14}  package")
+    for package, self_ms in sorted(
+        packages.items(), key=lambda item: item[1], reverse=True
+    )[:top]:
+        typer.echo(f"{self_ms:>14.1f}  {package}")
+
+
+@app.command()
+def recompute_leaderboard():
+    """
+    Rebuilds the evaluation leaderboard from all stored feedback.
+    """
+    import open_webui.config  # runs the database migrations
+    from open_webui.models.leaderboard import Leaderboards
+
+    count = Leaderboards.recompute()
+    typer.echo(f"Rebuilt the leaderboard from {count} rated feedbacks")
+
+
 if __name__ == "__main__":
     app()
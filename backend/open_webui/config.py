@@ -933,6 +933,15 @@ AZURE_STORAGE_ENDPOINT = os.environ.get("AZURE_STORAGE_ENDPOINT", None)
 AZURE_STORAGE_CONTAINER_NAME = os.environ.get("AZURE_STORAGE_CONTAINER_NAME", None)
 AZURE_STORAGE_KEY = os.environ.get("AZURE_STORAGE_KEY", None)
 
+# Maximum size in MB of local copies kept for S3/GCS/Azure objects, least
+# recently used copies are removed first. Set to 0 to disable the limit.
+try:
+    STORAGE_LOCAL_CACHE_MAX_SIZE = int(
+        os.environ.get("STORAGE_LOCAL_CACHE_MAX_SIZE", "10240")
+    )
+except ValueError:
+    STORAGE_LOCAL_CACHE_MAX_SIZE = 10240
+
 ####################################
 # File Upload DIR
 ####################################
@@ -2177,10 +2186,9 @@ VECTOR_DB = os.environ.get("VECTOR_DB", "chroma")
 CHROMA_DATA_PATH = f"{DATA_DIR}/vector_db"
 
 if VECTOR_DB == "chroma":
-    import chromadb
-
-    CHROMA_TENANT = os.environ.get("CHROMA_TENANT", chromadb.DEFAULT_TENANT)
-    CHROMA_DATABASE = os.environ.get("CHROMA_DATABASE", chromadb.DEFAULT_DATABASE)
+    # chromadb.DEFAULT_TENANT / DEFAULT_DATABASE, without importing chromadb here
+    CHROMA_TENANT = os.environ.get("CHROMA_TENANT", "default_tenant")
+    CHROMA_DATABASE = os.environ.get("CHROMA_DATABASE", "default_database")
     CHROMA_HTTP_HOST = os.environ.get("CHROMA_HTTP_HOST", "")
     CHROMA_HTTP_PORT = int(os.environ.get("CHROMA_HTTP_PORT", "8000"))
     CHROMA_CLIENT_AUTH_PROVIDER = os.environ.get("CHROMA_CLIENT_AUTH_PROVIDER", "")
@@ -2358,6 +2366,20 @@ else:
     except Exception:
         PGVECTOR_IVFFLAT_LISTS = 100
 
+# Keeps a full-text (tsvector) column next to each chunk so hybrid search can
+# run as a single query instead of building BM25 over the whole collection.
+# Opt-in: the first startup with this enabled adds the generated text_tsv
+# column and its GIN index to document_chunk. Adding the column rewrites the
+# table under an exclusive lock, so on large databases run the statement
+# logged at startup (or an equivalent migration) during a maintenance window
+# first; later startups only check that the column exists.
+PGVECTOR_ENABLE_HYBRID_SEARCH = (
+    os.getenv("PGVECTOR_ENABLE_HYBRID_SEARCH", "false").lower() == "true"
+)
+PGVECTOR_TEXT_SEARCH_CONFIG = (
+    os.getenv("PGVECTOR_TEXT_SEARCH_CONFIG", "simple").strip() or "simple"
+)
+
 # Pinecone
 PINECONE_API_KEY = os.environ.get("PINECONE_API_KEY", None)
 PINECONE_ENVIRONMENT = os.environ.get("PINECONE_ENVIRONMENT", None)
@@ -3618,6 +3640,13 @@ WHISPER_VAD_FILTER = PersistentConfig(
 
 WHISPER_LANGUAGE = os.getenv("WHISPER_LANGUAGE", "").lower() or None
 
+# Batch size for faster-whisper batched inference, which needs WHISPER_VAD_FILTER,
+# 1 disables batching
+try:
+    WHISPER_BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", "8"))
+except ValueError:
+    WHISPER_BATCH_SIZE = 8
+
 # Add Deepgram configuration
 DEEPGRAM_API_KEY = PersistentConfig(
     "DEEPGRAM_API_KEY",
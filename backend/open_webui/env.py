@@ -372,8 +372,93 @@ ENABLE_REALTIME_CHAT_SAVE = (
     os.environ.get("ENABLE_REALTIME_CHAT_SAVE", "False").lower() == "true"
 )
 
+# Record the tokens and cost of every completion in the usage ledger
+ENABLE_USAGE_LEDGER = os.environ.get("ENABLE_USAGE_LEDGER", "True").lower() == "true"
+
+# The ledger is written in batches, whichever of these is reached first
+USAGE_LEDGER_FLUSH_INTERVAL_MS = os.environ.get(
+    "USAGE_LEDGER_FLUSH_INTERVAL_MS", "1000"
+)
+try:
+    USAGE_LEDGER_FLUSH_INTERVAL_MS = int(USAGE_LEDGER_FLUSH_INTERVAL_MS)
+except ValueError:
+    USAGE_LEDGER_FLUSH_INTERVAL_MS = 1000
+
+USAGE_LEDGER_FLUSH_BATCH_SIZE = os.environ.get("USAGE_LEDGER_FLUSH_BATCH_SIZE", "500")
+try:
+    USAGE_LEDGER_FLUSH_BATCH_SIZE = int(USAGE_LEDGER_FLUSH_BATCH_SIZE)
+except ValueError:
+    USAGE_LEDGER_FLUSH_BATCH_SIZE = 500
+
+# Chats written per transaction by the streaming chat import
+CHAT_IMPORT_BATCH_SIZE = os.environ.get("CHAT_IMPORT_BATCH_SIZE", "200")
+try:
+    CHAT_IMPORT_BATCH_SIZE = int(CHAT_IMPORT_BATCH_SIZE)
+except ValueError:
+    CHAT_IMPORT_BATCH_SIZE = 200
+
 ENABLE_QUERIES_CACHE = os.environ.get("ENABLE_QUERIES_CACHE", "False").lower() == "true"
 
+# Number of retrieval results (RAG queries against knowledge collections) kept
+# in memory per node, 0 disables the cache. Results are shared through Redis
+# when REDIS_URL is set and dropped as soon as a collection they used changes.
+# Without Redis, collection versions live in the process that changed the
+# collection, so other processes could keep serving results built from the
+# old contents; the cache is therefore turned off when UVICORN_WORKERS > 1 and
+# REDIS_URL is unset. Do not enable it on several nodes without Redis either.
+RAG_RESULT_CACHE_SIZE = os.environ.get("RAG_RESULT_CACHE_SIZE", "512")
+try:
+    RAG_RESULT_CACHE_SIZE = int(RAG_RESULT_CACHE_SIZE)
+except ValueError:
+    RAG_RESULT_CACHE_SIZE = 512
+
+# Seconds a cached retrieval result is kept
+RAG_RESULT_CACHE_TTL = os.environ.get("RAG_RESULT_CACHE_TTL", "600")
+try:
+    RAG_RESULT_CACHE_TTL = int(RAG_RESULT_CACHE_TTL)
+except ValueError:
+    RAG_RESULT_CACHE_TTL = 600
+
+# Milliseconds the local reranking worker waits for more requests before it runs
+# the model, so concurrent queries are scored in one batch
+RAG_RERANKING_BATCH_WAIT_MS = os.environ.get("RAG_RERANKING_BATCH_WAIT_MS", "5")
+try:
+    RAG_RERANKING_BATCH_WAIT_MS = float(RAG_RERANKING_BATCH_WAIT_MS)
+except ValueError:
+    RAG_RERANKING_BATCH_WAIT_MS = 5.0
+
+# Maximum number of (query, document) pairs passed to the local reranking model
+# at once, defaults to a size that suits the device the model runs on
+RAG_RERANKING_MAX_BATCH_PAIRS = os.environ.get(
+    "RAG_RERANKING_MAX_BATCH_PAIRS",
+    {"cuda": "256", "mps": "128"}.get(DEVICE_TYPE, "32"),
+)
+try:
+    RAG_RERANKING_MAX_BATCH_PAIRS = int(RAG_RERANKING_MAX_BATCH_PAIRS)
+except ValueError:
+    RAG_RERANKING_MAX_BATCH_PAIRS = 32
+
+# Milliseconds the local embedding worker waits for more requests before it runs
+# the model, so concurrent queries and uploads are embedded in one batch
+RAG_EMBEDDING_BATCH_WAIT_MS = os.environ.get("RAG_EMBEDDING_BATCH_WAIT_MS", "5")
+try:
+    RAG_EMBEDDING_BATCH_WAIT_MS = float(RAG_EMBEDDING_BATCH_WAIT_MS)
+except ValueError:
+    RAG_EMBEDDING_BATCH_WAIT_MS = 5.0
+
+# Batches the local embedding model runs at the same time. Every batch already
+# uses all cores, so a few workers are enough to keep them busy on large hosts.
+RAG_EMBEDDING_WORKERS = os.environ.get(
+    "RAG_EMBEDDING_WORKERS",
+    str(
+        1 if DEVICE_TYPE in ("cuda", "mps") else min(4, (os.cpu_count() or 1) // 8 + 1)
+    ),
+)
+try:
+    RAG_EMBEDDING_WORKERS = int(RAG_EMBEDDING_WORKERS)
+except ValueError:
+    RAG_EMBEDDING_WORKERS = 1
+
 ####################################
 # REDIS
 ####################################
@@ -662,6 +747,24 @@ try:
 except ValueError:
     WEBSOCKET_SERVER_PING_INTERVAL = 25
 
+# Number of Yjs updates kept per document before they are compacted into a
+# single snapshot. Set to 0 to disable compaction.
+WEBSOCKET_YDOC_COMPACTION_THRESHOLD = os.environ.get(
+    "WEBSOCKET_YDOC_COMPACTION_THRESHOLD", "200"
+)
+try:
+    WEBSOCKET_YDOC_COMPACTION_THRESHOLD = int(WEBSOCKET_YDOC_COMPACTION_THRESHOLD)
+except ValueError:
+    WEBSOCKET_YDOC_COMPACTION_THRESHOLD = 200
+
+# Seconds a node may serve session pool reads from its local cache before
+# going back to Redis. Set to 0 to always read from Redis.
+WEBSOCKET_REDIS_POOL_CACHE_TTL = os.environ.get("WEBSOCKET_REDIS_POOL_CACHE_TTL", "1")
+try:
+    WEBSOCKET_REDIS_POOL_CACHE_TTL = float(WEBSOCKET_REDIS_POOL_CACHE_TTL)
+except ValueError:
+    WEBSOCKET_REDIS_POOL_CACHE_TTL = 1.0
+
 
 AIOHTTP_CLIENT_TIMEOUT = os.environ.get("AIOHTTP_CLIENT_TIMEOUT", "")
 
@@ -756,6 +859,154 @@ else:
     except Exception:
         SENTENCE_TRANSFORMERS_CROSS_ENCODER_MODEL_KWARGS = None
 
+
+####################################
+# AUDIO
+####################################
+
+# Maximum size of the on-disk speech cache in MB, least recently used entries
+# are evicted first. Set to 0 to disable the limit.
+AUDIO_SPEECH_CACHE_MAX_SIZE = os.environ.get("AUDIO_SPEECH_CACHE_MAX_SIZE", "1024")
+
+try:
+    AUDIO_SPEECH_CACHE_MAX_SIZE = int(AUDIO_SPEECH_CACHE_MAX_SIZE)
+except ValueError:
+    AUDIO_SPEECH_CACHE_MAX_SIZE = 1024
+
+# Number of sentences synthesized ahead of the one currently being streamed
+AUDIO_TTS_STREAM_CONCURRENCY = os.environ.get("AUDIO_TTS_STREAM_CONCURRENCY", "4")
+
+try:
+    AUDIO_TTS_STREAM_CONCURRENCY = max(int(AUDIO_TTS_STREAM_CONCURRENCY), 1)
+except ValueError:
+    AUDIO_TTS_STREAM_CONCURRENCY = 4
+
+# Maximum number of audio chunks transcribed at once across all requests
+AUDIO_STT_MAX_CONCURRENCY = os.environ.get(
+    "AUDIO_STT_MAX_CONCURRENCY", str(min(os.cpu_count() or 1, 8))
+)
+
+try:
+    AUDIO_STT_MAX_CONCURRENCY = max(int(AUDIO_STT_MAX_CONCURRENCY), 1)
+except ValueError:
+    AUDIO_STT_MAX_CONCURRENCY = min(os.cpu_count() or 1, 8)
+
+####################################
+# FILE INGESTION
+####################################
+
+# Number of threads per instance taking jobs from the file ingestion queue
+INGESTION_WORKERS = os.environ.get(
+    "INGESTION_WORKERS", str(min(os.cpu_count() or 1, 4))
+)
+
+try:
+    INGESTION_WORKERS = max(int(INGESTION_WORKERS), 1)
+except ValueError:
+    INGESTION_WORKERS = min(os.cpu_count() or 1, 4)
+
+# Number of processes used for document extraction (PDF parsing, OCR, etc.).
+# Set to 0 to run extraction in the ingestion worker threads instead.
+INGESTION_PROCESS_POOL_SIZE = os.environ.get(
+    "INGESTION_PROCESS_POOL_SIZE", str(os.cpu_count() or 1)
+)
+
+try:
+    INGESTION_PROCESS_POOL_SIZE = max(int(INGESTION_PROCESS_POOL_SIZE), 0)
+except ValueError:
+    INGESTION_PROCESS_POOL_SIZE = os.cpu_count() or 1
+
+# Seconds after which a job taken from the Redis queue by an instance that
+# stopped renewing it (crash, restart) is put back in the queue
+INGESTION_JOB_TIMEOUT = os.environ.get("INGESTION_JOB_TIMEOUT", "300")
+
+try:
+    INGESTION_JOB_TIMEOUT = max(int(INGESTION_JOB_TIMEOUT), 30)
+except ValueError:
+    INGESTION_JOB_TIMEOUT = 300
+
+# Times a job is taken before it is given up and its file marked as failed
+INGESTION_JOB_MAX_ATTEMPTS = os.environ.get("INGESTION_JOB_MAX_ATTEMPTS", "3")
+
+try:
+    INGESTION_JOB_MAX_ATTEMPTS = max(int(INGESTION_JOB_MAX_ATTEMPTS), 1)
+except ValueError:
+    INGESTION_JOB_MAX_ATTEMPTS = 3
+
+####################################
+# WEB LOADER
+####################################
+
+# Connections kept open by the web loader in total and to any single host
+WEB_LOADER_MAX_CONNECTIONS = os.environ.get("WEB_LOADER_MAX_CONNECTIONS", "100")
+
+try:
+    WEB_LOADER_MAX_CONNECTIONS = max(int(WEB_LOADER_MAX_CONNECTIONS), 1)
+except ValueError:
+    WEB_LOADER_MAX_CONNECTIONS = 100
+
+WEB_LOADER_MAX_CONNECTIONS_PER_HOST = os.environ.get(
+    "WEB_LOADER_MAX_CONNECTIONS_PER_HOST", "4"
+)
+
+try:
+    WEB_LOADER_MAX_CONNECTIONS_PER_HOST = max(
+        int(WEB_LOADER_MAX_CONNECTIONS_PER_HOST), 1
+    )
+except ValueError:
+    WEB_LOADER_MAX_CONNECTIONS_PER_HOST = 4
+
+# Bytes read from a single page, the rest of the page is ignored
+WEB_LOADER_MAX_RESPONSE_SIZE = os.environ.get(
+    "WEB_LOADER_MAX_RESPONSE_SIZE", str(5 * 1024 * 1024)
+)
+
+try:
+    WEB_LOADER_MAX_RESPONSE_SIZE = max(int(WEB_LOADER_MAX_RESPONSE_SIZE), 1)
+except ValueError:
+    WEB_LOADER_MAX_RESPONSE_SIZE = 5 * 1024 * 1024
+
+# Number of processes used to parse fetched pages, kept apart from the document
+# extraction pool so that web search does not wait behind large uploads.
+# Set to 0 to parse pages in a thread of the serving process instead.
+WEB_PARSE_PROCESS_POOL_SIZE = os.environ.get(
+    "WEB_PARSE_PROCESS_POOL_SIZE", str(min(os.cpu_count() or 1, 2))
+)
+
+try:
+    WEB_PARSE_PROCESS_POOL_SIZE = max(int(WEB_PARSE_PROCESS_POOL_SIZE), 0)
+except ValueError:
+    WEB_PARSE_PROCESS_POOL_SIZE = min(os.cpu_count() or 1, 2)
+
+# Seconds web search responses and fetched pages are reused, 0 disables caching.
+# Pages with an ETag or Last-Modified header are revalidated after that instead
+# of being fetched again.
+WEB_SEARCH_CACHE_TTL = os.environ.get("WEB_SEARCH_CACHE_TTL", "900")
+
+try:
+    WEB_SEARCH_CACHE_TTL = max(int(WEB_SEARCH_CACHE_TTL), 0)
+except ValueError:
+    WEB_SEARCH_CACHE_TTL = 900
+
+# Search responses and pages kept in memory per node, each
+WEB_SEARCH_CACHE_SIZE = os.environ.get("WEB_SEARCH_CACHE_SIZE", "256")
+
+try:
+    WEB_SEARCH_CACHE_SIZE = max(int(WEB_SEARCH_CACHE_SIZE), 0)
+except ValueError:
+    WEB_SEARCH_CACHE_SIZE = 256
+
+# Chunk embeddings of web pages kept per node, so unchanged pages are not
+# embedded again when they show up in another search
+WEB_SEARCH_EMBEDDING_CACHE_SIZE = os.environ.get(
+    "WEB_SEARCH_EMBEDDING_CACHE_SIZE", "4096"
+)
+
+try:
+    WEB_SEARCH_EMBEDDING_CACHE_SIZE = max(int(WEB_SEARCH_EMBEDDING_CACHE_SIZE), 0)
+except ValueError:
+    WEB_SEARCH_EMBEDDING_CACHE_SIZE = 4096
+
 ####################################
 # OFFLINE_MODE
 ####################################
@@ -876,6 +1127,18 @@ OTEL_LOGS_OTLP_SPAN_EXPORTER = os.environ.get(
 PIP_OPTIONS = os.getenv("PIP_OPTIONS", "").split()
 PIP_PACKAGE_INDEX_OPTIONS = os.getenv("PIP_PACKAGE_INDEX_OPTIONS", "").split()
 
+# Optional directory of prebuilt wheels, passed to pip as --find-links
+PIP_WHEEL_CACHE_DIR = os.getenv("PIP_WHEEL_CACHE_DIR", "")
+
+# Seconds a tool or function that fails to import waits for the dependency
+# install running in the background on startup before giving up
+PLUGIN_DEPENDENCIES_WAIT_TIMEOUT = os.getenv("PLUGIN_DEPENDENCIES_WAIT_TIMEOUT", "300")
+
+try:
+    PLUGIN_DEPENDENCIES_WAIT_TIMEOUT = max(int(PLUGIN_DEPENDENCIES_WAIT_TIMEOUT), 0)
+except ValueError:
+    PLUGIN_DEPENDENCIES_WAIT_TIMEOUT = 300
+
 
 ####################################
 # PROGRESSIVE WEB APP OPTIONS
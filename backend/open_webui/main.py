@@ -12,6 +12,7 @@ import re
 from uuid import uuid4
 
 
+from functools import partial
 from contextlib import asynccontextmanager
 from urllib.parse import urlencode, parse_qs, urlparse
 from pydantic import BaseModel
@@ -64,8 +65,8 @@ from open_webui.socket.main import (
     app as socket_app,
     periodic_usage_pool_cleanup,
     get_event_emitter,
-    get_models_in_use,
-    get_active_user_ids,
+    aget_models_in_use,
+    aget_active_user_ids,
 )
 from open_webui.routers import (
     audio,
@@ -91,6 +92,7 @@ from open_webui.routers import (
     prompts,
     evaluations,
     tools,
+    usage,
     users,
     utils,
     scim,
@@ -102,6 +104,10 @@ from open_webui.routers.retrieval import (
     get_ef,
     get_rf,
 )
+from open_webui.routers.files import fail_ingestion_job, process_ingestion_job
+from open_webui.retrieval.ingestion import IngestionQueue
+from open_webui.retrieval.web.utils import close_web_sessions, shutdown_web_parse_pool
+from open_webui.utils.usage import USAGE_LEDGER
 
 from open_webui.internal.db import Session, engine
 
@@ -443,6 +449,7 @@ from open_webui.env import (
     AUDIT_EXCLUDED_PATHS,
     AUDIT_LOG_LEVEL,
     CHANGELOG,
+    ENABLE_USAGE_LEDGER,
     REDIS_URL,
     REDIS_CLUSTER,
     REDIS_KEY_PREFIX,
@@ -500,7 +507,10 @@ from open_webui.utils.auth import (
     get_admin_user,
     get_verified_user,
 )
-from open_webui.utils.plugin import install_tool_and_function_dependencies
+from open_webui.utils.plugin import (
+    PLUGIN_DEPENDENCIES_INSTALLED,
+    install_tool_and_function_dependencies,
+)
 from open_webui.utils.oauth import (
     get_oauth_client_info_with_dynamic_client_registration,
     encrypt_data,
@@ -578,10 +588,13 @@ async def lifespan(app: FastAPI):
     if LICENSE_KEY:
         get_license_data(app, LICENSE_KEY)
 
-    # This should be blocking (sync) so functions are not deactivated on first /get_models calls
-    # when the first user lands on the / route.
+    # Runs alongside serving; plugins that fail to import while it is still
+    # running wait for it to finish (see exec_plugin_module).
     log.info("Installing external dependencies of functions and tools...")
-    install_tool_and_function_dependencies()
+    PLUGIN_DEPENDENCIES_INSTALLED.clear()
+    app.state.plugin_dependencies_task = asyncio.create_task(
+        asyncio.to_thread(install_tool_and_function_dependencies)
+    )
 
     app.state.redis = get_redis_connection(
         redis_url=REDIS_URL,
@@ -603,6 +616,22 @@ async def lifespan(app: FastAPI):
 
     asyncio.create_task(periodic_usage_pool_cleanup())
 
+    app.state.INGESTION_QUEUE = IngestionQueue(
+        handler=partial(process_ingestion_job, app),
+        on_abandoned=fail_ingestion_job,
+        redis=get_redis_connection(
+            redis_url=REDIS_URL,
+            redis_sentinels=get_sentinels_from_env(
+                REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT
+            ),
+            redis_cluster=REDIS_CLUSTER,
+        ),
+    )
+    app.state.INGESTION_QUEUE.start()
+
+    if ENABLE_USAGE_LEDGER:
+        USAGE_LEDGER.start()
+
     if app.state.config.ENABLE_BASE_MODELS_CACHE:
         await get_all_models(
             Request(
@@ -629,6 +658,18 @@ async def lifespan(app: FastAPI):
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
 
+    if getattr(app.state, "INGESTION_QUEUE", None) is not None:
+        app.state.INGESTION_QUEUE.stop()
+
+    if ENABLE_USAGE_LEDGER:
+        USAGE_LEDGER.stop()
+
+    if hasattr(app.state.ef, "close"):
+        app.state.ef.close()
+
+    await close_web_sessions()
+    shutdown_web_parse_pool()
+
 
 app = FastAPI(
     title="Open WebUI",
@@ -1002,6 +1043,7 @@ try:
         app.state.config.RAG_EMBEDDING_ENGINE,
         app.state.config.RAG_EMBEDDING_MODEL,
         RAG_EMBEDDING_MODEL_AUTO_UPDATE,
+        batch_size=app.state.config.RAG_EMBEDDING_BATCH_SIZE,
     )
     if (
         app.state.config.ENABLE_RAG_HYBRID_SEARCH
@@ -1411,6 +1453,7 @@ app.include_router(functions.router, prefix="/api/v1/functions", tags=["function
 app.include_router(
     evaluations.router, prefix="/api/v1/evaluations", tags=["evaluations"]
 )
+app.include_router(usage.router, prefix="/api/v1/usage", tags=["usage"])
 app.include_router(utils.router, prefix="/api/v1/utils", tags=["utils"])
 
 # SCIM 2.0 API for identity management
@@ -2029,7 +2072,10 @@ async def get_current_usage(user=Depends(get_verified_user)):
     This is an experimental endpoint and subject to change.
     """
     try:
-        return {"model_ids": get_models_in_use(), "user_ids": get_active_user_ids()}
+        return {
+            "model_ids": await aget_models_in_use(),
+            "user_ids": await aget_active_user_ids(),
+        }
     except Exception as e:
         log.error(f"Error getting usage statistics: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -0,0 +1,124 @@
+"""Add leaderboard tables
+
+Revision ID: b2c4e6f8a0d1
+Revises: f1a2b3c4d5e6
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b2c4e6f8a0d1"
+down_revision: Union[str, None] = "f1a2b3c4d5e6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copies of the counting rules in open_webui.models.leaderboard at the
+# time of this revision, so later changes to the app don't change the backfill
+ALL_TAGS = ""
+
+
+def get_contribution(data):
+    data = data or {}
+    model_id = data.get("model_id")
+    rating = str(data.get("rating"))
+    if not model_id or rating not in ("1", "-1"):
+        return None
+
+    opponent_ids = [
+        opponent_id
+        for opponent_id in dict.fromkeys(data.get("sibling_model_ids") or [])
+        if opponent_id and opponent_id != model_id
+    ]
+    if not opponent_ids:
+        return None
+
+    tags = [
+        tag
+        for tag in dict.fromkeys(data.get("tags") or [])
+        if isinstance(tag, str) and tag
+    ]
+
+    return {
+        "model_id": model_id,
+        "opponent_ids": opponent_ids,
+        "outcome": 1 if rating == "1" else 0,
+        "tags": tags,
+    }
+
+
+def add_contribution(deltas, contribution):
+    model_id = contribution["model_id"]
+    outcome = contribution["outcome"]
+
+    for tag in [ALL_TAGS, *contribution["tags"]]:
+        for opponent_id in contribution["opponent_ids"]:
+            for key, won in (
+                ((tag, model_id, opponent_id), outcome),
+                ((tag, opponent_id, model_id), 1 - outcome),
+            ):
+                current_won, current_lost = deltas.get(key, (0, 0))
+                deltas[key] = (current_won + won, current_lost + 1 - won)
+
+
+def upgrade() -> None:
+    leaderboard_pair = op.create_table(
+        "leaderboard_pair",
+        sa.Column("tag", sa.Text(), primary_key=True),
+        sa.Column("model_id", sa.Text(), primary_key=True),
+        sa.Column("opponent_id", sa.Text(), primary_key=True),
+        sa.Column("won", sa.BigInteger(), nullable=True),
+        sa.Column("lost", sa.BigInteger(), nullable=True),
+    )
+    leaderboard_feedback = op.create_table(
+        "leaderboard_feedback",
+        sa.Column("feedback_id", sa.Text(), primary_key=True),
+        sa.Column("model_id", sa.Text(), nullable=True),
+        sa.Column("opponent_ids", sa.JSON(), nullable=True),
+        sa.Column("outcome", sa.BigInteger(), nullable=True),
+        sa.Column("tags", sa.JSON(), nullable=True),
+    )
+
+    # Backfill from the existing feedback, same as `open-webui recompute-leaderboard`
+    feedback_table = sa.Table(
+        "feedback",
+        sa.MetaData(),
+        sa.Column("id", sa.Text()),
+        sa.Column("data", sa.JSON()),
+    )
+
+    connection = op.get_bind()
+    deltas = {}
+    contributions = []
+    for feedback_id, data in connection.execute(
+        sa.select(feedback_table.c.id, feedback_table.c.data)
+    ):
+        contribution = get_contribution(data)
+        if contribution:
+            add_contribution(deltas, contribution)
+            contributions.append({"feedback_id": feedback_id, **contribution})
+
+    if contributions:
+        op.bulk_insert(leaderboard_feedback, contributions)
+        op.bulk_insert(
+            leaderboard_pair,
+            [
+                {
+                    "tag": tag,
+                    "model_id": model_id,
+                    "opponent_id": opponent_id,
+                    "won": won,
+                    "lost": lost,
+                }
+                for (tag, model_id, opponent_id), (won, lost) in deltas.items()
+            ],
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("leaderboard_feedback")
+    op.drop_table("leaderboard_pair")
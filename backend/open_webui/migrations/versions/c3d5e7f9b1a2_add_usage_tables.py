@@ -0,0 +1,75 @@
+"""Add usage tables
+
+Revision ID: c3d5e7f9b1a2
+Revises: b2c4e6f8a0d1
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c3d5e7f9b1a2"
+down_revision: Union[str, None] = "b2c4e6f8a0d1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "usage_event",
+        sa.Column("id", sa.Text(), primary_key=True),
+        sa.Column("user_id", sa.Text(), nullable=False),
+        sa.Column("model_id", sa.Text(), nullable=False),
+        sa.Column("chat_id", sa.Text(), nullable=True),
+        sa.Column("message_id", sa.Text(), nullable=True),
+        sa.Column("billing_type", sa.Text(), nullable=True),
+        sa.Column("currency", sa.Text(), nullable=True),
+        sa.Column("prompt_tokens", sa.BigInteger(), nullable=True),
+        sa.Column("completion_tokens", sa.BigInteger(), nullable=True),
+        sa.Column("reasoning_tokens", sa.BigInteger(), nullable=True),
+        sa.Column("total_tokens", sa.BigInteger(), nullable=True),
+        sa.Column("cost", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=False),
+    )
+    op.create_index(
+        "usage_event_user_id_created_at_idx",
+        "usage_event",
+        ["user_id", "created_at"],
+    )
+
+    op.create_table(
+        "usage_rollup",
+        sa.Column("period", sa.Text(), primary_key=True),
+        sa.Column("bucket", sa.BigInteger(), primary_key=True),
+        sa.Column("scope", sa.Text(), primary_key=True),
+        sa.Column("scope_id", sa.Text(), primary_key=True),
+        sa.Column("model_id", sa.Text(), primary_key=True),
+        sa.Column("requests", sa.BigInteger(), nullable=True),
+        sa.Column("prompt_tokens", sa.BigInteger(), nullable=True),
+        sa.Column("completion_tokens", sa.BigInteger(), nullable=True),
+        sa.Column("reasoning_tokens", sa.BigInteger(), nullable=True),
+        sa.Column("total_tokens", sa.BigInteger(), nullable=True),
+        sa.Column("cost", sa.Float(), nullable=True),
+    )
+    op.create_index(
+        "usage_rollup_scope_period_bucket_idx",
+        "usage_rollup",
+        ["scope", "scope_id", "period", "bucket"],
+    )
+    op.create_index(
+        "usage_rollup_period_scope_bucket_idx",
+        "usage_rollup",
+        ["period", "scope", "bucket"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("usage_rollup_period_scope_bucket_idx", table_name="usage_rollup")
+    op.drop_index("usage_rollup_scope_period_bucket_idx", table_name="usage_rollup")
+    op.drop_table("usage_rollup")
+    op.drop_index("usage_event_user_id_created_at_idx", table_name="usage_event")
+    op.drop_table("usage_event")
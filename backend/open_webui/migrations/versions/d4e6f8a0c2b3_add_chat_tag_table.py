@@ -0,0 +1,68 @@
+"""Add chat_tag table
+
+Revision ID: d4e6f8a0c2b3
+Revises: c3d5e7f9b1a2
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e6f8a0c2b3"
+down_revision: Union[str, None] = "c3d5e7f9b1a2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    chat_tag_table = op.create_table(
+        "chat_tag",
+        sa.Column("chat_id", sa.String(), primary_key=True),
+        sa.Column("tag_id", sa.String(), primary_key=True),
+        sa.Column("user_id", sa.String(), nullable=False),
+    )
+    op.create_index("chat_tag_user_id_tag_id_idx", "chat_tag", ["user_id", "tag_id"])
+
+    # Backfill from Chat.meta["tags"], shared chat copies are skipped
+    chat_table = sa.Table(
+        "chat",
+        sa.MetaData(),
+        sa.Column("id", sa.String()),
+        sa.Column("user_id", sa.String()),
+        sa.Column("meta", sa.JSON()),
+    )
+
+    connection = op.get_bind()
+    result = connection.execute(
+        sa.select(chat_table.c.id, chat_table.c.user_id, chat_table.c.meta).where(
+            sa.not_(chat_table.c.user_id.startswith("shared-"))
+        )
+    )
+
+    while True:
+        chats = result.fetchmany(BATCH_SIZE)
+        if not chats:
+            break
+
+        rows = []
+        for chat_id, user_id, meta in chats:
+            tags = (meta or {}).get("tags") if isinstance(meta, dict) else None
+            for tag_id in dict.fromkeys(tags or []):
+                if isinstance(tag_id, str):
+                    rows.append(
+                        {"chat_id": chat_id, "tag_id": tag_id, "user_id": user_id}
+                    )
+
+        if rows:
+            op.bulk_insert(chat_tag_table, rows)
+
+
+def downgrade() -> None:
+    op.drop_index("chat_tag_user_id_tag_id_idx", table_name="chat_tag")
+    op.drop_table("chat_tag")
@@ -2,7 +2,7 @@ import logging
 import json
 import time
 import uuid
-from typing import Optional
+from typing import Iterator, Optional
 
 from open_webui.internal.db import Base, get_db
 from open_webui.models.tags import TagModel, Tag, Tags
@@ -11,7 +11,7 @@ from open_webui.env import SRC_LOG_LEVELS
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON, Index
-from sqlalchemy import or_, func, select, and_, text
+from sqlalchemy import or_, func, select, and_, text, insert
 from sqlalchemy.sql import exists
 from sqlalchemy.sql.expression import bindparam
 
@@ -56,6 +56,21 @@ class Chat(Base):
     )
 
 
+class ChatTag(Base):
+    """Tags of a chat, mirrored from Chat.meta["tags"] so they can be indexed."""
+
+    __tablename__ = "chat_tag"
+
+    chat_id = Column(String, primary_key=True)
+    tag_id = Column(String, primary_key=True)
+    user_id = Column(String, nullable=False)
+
+    __table_args__ = (
+        # WHERE user_id = ... AND tag_id = ...
+        Index("chat_tag_user_id_tag_id_idx", "user_id", "tag_id"),
+    )
+
+
 class ChatModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -164,6 +179,22 @@ class ChatTable:
 
         return changed
 
+    def _get_chat_tag_rows(self, chat_id: str, user_id: str, tag_ids: list):
+        return [
+            {"chat_id": chat_id, "user_id": user_id, "tag_id": tag_id}
+            for tag_id in dict.fromkeys(tag_ids)
+            if isinstance(tag_id, str)
+        ]
+
+    def _set_chat_tags(self, db, chat_id: str, user_id: str, tag_ids: list):
+        db.query(ChatTag).filter_by(chat_id=chat_id).delete()
+        db.add_all(
+            [
+                ChatTag(**row)
+                for row in self._get_chat_tag_rows(chat_id, user_id, tag_ids)
+            ]
+        )
+
     def insert_new_chat(self, user_id: str, form_data: ChatForm) -> Optional[ChatModel]:
         with get_db() as db:
             id = str(uuid.uuid4())
@@ -225,9 +256,42 @@ class ChatTable:
                 chats.append(Chat(**chat.model_dump()))
 
             db.add_all(chats)
+            for chat in chats:
+                tag_ids = (chat.meta or {}).get("tags") or []
+                if tag_ids:
+                    self._set_chat_tags(db, chat.id, user_id, tag_ids)
             db.commit()
             return [ChatModel.model_validate(chat) for chat in chats]
 
+    def insert_chats_batch(
+        self, user_id: str, chat_import_forms: list[ChatImportForm]
+    ) -> int:
+        """
+        Inserts chats with one executemany per table and a single commit, used by
+        the streaming import. New chats have no tags yet, so chat_tag rows are
+        inserted directly instead of going through _set_chat_tags.
+        """
+        if not chat_import_forms:
+            return 0
+
+        chat_rows = []
+        tag_rows = []
+        for form_data in chat_import_forms:
+            chat = self._chat_import_form_to_chat_model(user_id, form_data)
+            chat_rows.append(chat.model_dump())
+            tag_rows.extend(
+                self._get_chat_tag_rows(
+                    chat.id, user_id, (chat.meta or {}).get("tags") or []
+                )
+            )
+
+        with get_db() as db:
+            db.execute(insert(Chat), chat_rows)
+            if tag_rows:
+                db.execute(insert(ChatTag), tag_rows)
+            db.commit()
+        return len(chat_rows)
+
     def update_chat_by_id(self, id: str, chat: dict) -> Optional[ChatModel]:
         try:
             with get_db() as db:
@@ -684,6 +748,27 @@ class ChatTable:
             )
             return [ChatModel.model_validate(chat) for chat in all_chats]
 
+    def iter_chats(
+        self,
+        user_id: Optional[str] = None,
+        archived: Optional[bool] = None,
+        batch_size: int = 500,
+    ) -> Iterator[ChatModel]:
+        """
+        Yields chats in the same order as get_chats, fetching batch_size rows at
+        a time with a server-side cursor. Meant for exports, where loading every
+        chat into memory is not an option.
+        """
+        with get_db() as db:
+            query = db.query(Chat)
+            if user_id is not None:
+                query = query.filter_by(user_id=user_id)
+            if archived is not None:
+                query = query.filter_by(archived=archived)
+
+            for chat in query.order_by(Chat.updated_at.desc()).yield_per(batch_size):
+                yield ChatModel.model_validate(chat)
+
     def get_pinned_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
             all_chats = (
@@ -812,36 +897,6 @@ class ChatTable:
                     ).params(title_key=f"%{search_text}%", content_key=search_text)
                 )
 
-                # Check if there are any tags to filter, it should have all the tags
-                if "none" in tag_ids:
-                    query = query.filter(
-                        text(
-                            """
-                            NOT EXISTS (
-                                SELECT 1
-                                FROM json_each(Chat.meta, '$.tags') AS tag
-                            )
-                            """
-                        )
-                    )
-                elif tag_ids:
-                    query = query.filter(
-                        and_(
-                            *[
-                                text(
-                                    f"""
-                                    EXISTS (
-                                        SELECT 1
-                                        FROM json_each(Chat.meta, '$.tags') AS tag
-                                        WHERE tag.value = :tag_id_{tag_idx}
-                                    )
-                                    """
-                                ).params(**{f"tag_id_{tag_idx}": tag_id})
-                                for tag_idx, tag_id in enumerate(tag_ids)
-                            ]
-                        )
-                    )
-
             elif dialect_name == "postgresql":
                 # PostgreSQL doesn't allow null bytes in text. We filter those out by checking
                 # the JSON representation for \u0000 before attempting text extraction
@@ -869,41 +924,26 @@ class ChatTable:
                         postgres_content_clause,
                     )
                 ).params(title_key=f"%{search_text}%", content_key=search_text.lower())
-
-                # Check if there are any tags to filter, it should have all the tags
-                if "none" in tag_ids:
-                    query = query.filter(
-                        text(
-                            """
-                            NOT EXISTS (
-                                SELECT 1
-                                FROM json_array_elements_text(Chat.meta->'tags') AS tag
-                            )
-                            """
-                        )
-                    )
-                elif tag_ids:
-                    query = query.filter(
-                        and_(
-                            *[
-                                text(
-                                    f"""
-                                    EXISTS (
-                                        SELECT 1
-                                        FROM json_array_elements_text(Chat.meta->'tags') AS tag
-                                        WHERE tag = :tag_id_{tag_idx}
-                                    )
-                                    """
-                                ).params(**{f"tag_id_{tag_idx}": tag_id})
-                                for tag_idx, tag_id in enumerate(tag_ids)
-                            ]
-                        )
-                    )
             else:
                 raise NotImplementedError(
                     f"Unsupported dialect: {db.bind.dialect.name}"
                 )
 
+            # Check if there are any tags to filter, it should have all the tags
+            if "none" in tag_ids:
+                query = query.filter(~exists().where(ChatTag.chat_id == Chat.id))
+            elif tag_ids:
+                query = query.filter(
+                    and_(
+                        *[
+                            exists().where(
+                                ChatTag.chat_id == Chat.id, ChatTag.tag_id == tag_id
+                            )
+                            for tag_id in tag_ids
+                        ]
+                    )
+                )
+
             # Perform pagination at the SQL level
             all_chats = query.offset(skip).limit(limit).all()
 
@@ -970,28 +1010,12 @@ class ChatTable:
         self, user_id: str, tag_name: str, skip: int = 0, limit: int = 50
     ) -> list[ChatModel]:
         with get_db() as db:
-            query = db.query(Chat).filter_by(user_id=user_id)
             tag_id = tag_name.replace(" ", "_").lower()
-
-            log.info(f"DB dialect name: {db.bind.dialect.name}")
-            if db.bind.dialect.name == "sqlite":
-                # SQLite JSON1 querying for tags within the meta JSON field
-                query = query.filter(
-                    text(
-                        f"EXISTS (SELECT 1 FROM json_each(Chat.meta, '$.tags') WHERE json_each.value = :tag_id)"
-                    )
-                ).params(tag_id=tag_id)
-            elif db.bind.dialect.name == "postgresql":
-                # PostgreSQL JSON query for tags within the meta JSON field (for `json` type)
-                query = query.filter(
-                    text(
-                        "EXISTS (SELECT 1 FROM json_array_elements_text(Chat.meta->'tags') elem WHERE elem = :tag_id)"
-                    )
-                ).params(tag_id=tag_id)
-            else:
-                raise NotImplementedError(
-                    f"Unsupported dialect: {db.bind.dialect.name}"
-                )
+            query = (
+                db.query(Chat)
+                .join(ChatTag, ChatTag.chat_id == Chat.id)
+                .filter(ChatTag.user_id == user_id, ChatTag.tag_id == tag_id)
+            )
 
             all_chats = query.all()
             log.debug(f"all_chats: {all_chats}")
@@ -1013,6 +1037,7 @@ class ChatTable:
                         **chat.meta,
                         "tags": list(set(chat.meta.get("tags", []) + [tag_id])),
                     }
+                    self._set_chat_tags(db, id, chat.user_id, chat.meta["tags"])
 
                 db.commit()
                 db.refresh(chat)
@@ -1022,31 +1047,18 @@ class ChatTable:
 
     def count_chats_by_tag_name_and_user_id(self, tag_name: str, user_id: str) -> int:
         with get_db() as db:  # Assuming `get_db()` returns a session object
-            query = db.query(Chat).filter_by(user_id=user_id, archived=False)
-
             # Normalize the tag_name for consistency
             tag_id = tag_name.replace(" ", "_").lower()
 
-            if db.bind.dialect.name == "sqlite":
-                # SQLite JSON1 support for querying the tags inside the `meta` JSON field
-                query = query.filter(
-                    text(
-                        f"EXISTS (SELECT 1 FROM json_each(Chat.meta, '$.tags') WHERE json_each.value = :tag_id)"
-                    )
-                ).params(tag_id=tag_id)
-
-            elif db.bind.dialect.name == "postgresql":
-                # PostgreSQL JSONB support for querying the tags inside the `meta` JSON field
-                query = query.filter(
-                    text(
-                        "EXISTS (SELECT 1 FROM json_array_elements_text(Chat.meta->'tags') elem WHERE elem = :tag_id)"
-                    )
-                ).params(tag_id=tag_id)
-
-            else:
-                raise NotImplementedError(
-                    f"Unsupported dialect: {db.bind.dialect.name}"
+            query = (
+                db.query(ChatTag)
+                .join(Chat, Chat.id == ChatTag.chat_id)
+                .filter(
+                    ChatTag.user_id == user_id,
+                    ChatTag.tag_id == tag_id,
+                    Chat.archived == False,
                 )
+            )
 
             # Get the count of matching records
             count = query.count()
@@ -1080,6 +1092,7 @@ class ChatTable:
                     **chat.meta,
                     "tags": list(set(tags)),
                 }
+                db.query(ChatTag).filter_by(chat_id=id, tag_id=tag_id).delete()
                 db.commit()
                 return True
         except Exception:
@@ -1093,6 +1106,7 @@ class ChatTable:
                     **chat.meta,
                     "tags": [],
                 }
+                db.query(ChatTag).filter_by(chat_id=id).delete()
                 db.commit()
 
                 return True
@@ -1102,6 +1116,7 @@ class ChatTable:
     def delete_chat_by_id(self, id: str) -> bool:
         try:
             with get_db() as db:
+                db.query(ChatTag).filter_by(chat_id=id).delete()
                 db.query(Chat).filter_by(id=id).delete()
                 db.commit()
 
@@ -1112,6 +1127,7 @@ class ChatTable:
     def delete_chat_by_id_and_user_id(self, id: str, user_id: str) -> bool:
         try:
             with get_db() as db:
+                db.query(ChatTag).filter_by(chat_id=id, user_id=user_id).delete()
                 db.query(Chat).filter_by(id=id, user_id=user_id).delete()
                 db.commit()
 
@@ -1124,6 +1140,7 @@ class ChatTable:
             with get_db() as db:
                 self.delete_shared_chats_by_user_id(user_id)
 
+                db.query(ChatTag).filter_by(user_id=user_id).delete()
                 db.query(Chat).filter_by(user_id=user_id).delete()
                 db.commit()
 
@@ -1136,6 +1153,13 @@ class ChatTable:
     ) -> bool:
         try:
             with get_db() as db:
+                db.query(ChatTag).filter(
+                    ChatTag.chat_id.in_(
+                        select(Chat.id).where(
+                            Chat.user_id == user_id, Chat.folder_id == folder_id
+                        )
+                    )
+                ).delete(synchronize_session=False)
                 db.query(Chat).filter_by(user_id=user_id, folder_id=folder_id).delete()
                 db.commit()
 
@@ -1,9 +1,10 @@
 import logging
 import time
 import uuid
-from typing import Optional
+from typing import Iterator, Optional
 
 from open_webui.internal.db import Base, get_db
+from open_webui.models.leaderboard import Leaderboards
 from open_webui.models.users import User
 
 from open_webui.env import SRC_LOG_LEVELS
@@ -133,6 +134,7 @@ class FeedbackTable:
             try:
                 result = Feedback(**feedback.model_dump())
                 db.add(result)
+                Leaderboards.sync_feedback(db, id, result.data)
                 db.commit()
                 db.refresh(result)
                 if result:
@@ -238,6 +240,16 @@ class FeedbackTable:
                 .all()
             ]
 
+    def iter_feedbacks(self, batch_size: int = 500) -> Iterator[FeedbackModel]:
+        """Yields all feedbacks like get_all_feedbacks, batch_size rows at a time."""
+        with get_db() as db:
+            for feedback in (
+                db.query(Feedback)
+                .order_by(Feedback.updated_at.desc())
+                .yield_per(batch_size)
+            ):
+                yield FeedbackModel.model_validate(feedback)
+
     def get_feedbacks_by_type(self, type: str) -> list[FeedbackModel]:
         with get_db() as db:
             return [
@@ -274,6 +286,7 @@ class FeedbackTable:
                 feedback.snapshot = form_data.snapshot.model_dump()
 
             feedback.updated_at = int(time.time())
+            Leaderboards.sync_feedback(db, feedback.id, feedback.data)
 
             db.commit()
             return FeedbackModel.model_validate(feedback)
@@ -294,6 +307,7 @@ class FeedbackTable:
                 feedback.snapshot = form_data.snapshot.model_dump()
 
             feedback.updated_at = int(time.time())
+            Leaderboards.sync_feedback(db, feedback.id, feedback.data)
 
             db.commit()
             return FeedbackModel.model_validate(feedback)
@@ -303,6 +317,7 @@ class FeedbackTable:
             feedback = db.query(Feedback).filter_by(id=id).first()
             if not feedback:
                 return False
+            Leaderboards.remove_feedback(db, feedback.id)
             db.delete(feedback)
             db.commit()
             return True
@@ -312,6 +327,7 @@ class FeedbackTable:
             feedback = db.query(Feedback).filter_by(id=id, user_id=user_id).first()
             if not feedback:
                 return False
+            Leaderboards.remove_feedback(db, feedback.id)
             db.delete(feedback)
             db.commit()
             return True
@@ -322,6 +338,7 @@ class FeedbackTable:
             if not feedbacks:
                 return False
             for feedback in feedbacks:
+                Leaderboards.remove_feedback(db, feedback.id)
                 db.delete(feedback)
             db.commit()
             return True
@@ -333,6 +350,7 @@ class FeedbackTable:
                 return False
             for feedback in feedbacks:
                 db.delete(feedback)
+            Leaderboards.reset(db)
             db.commit()
             return True
 
@@ -0,0 +1,407 @@
+import logging
+import math
+from collections import Counter
+from typing import Optional
+
+from open_webui.internal.db import Base, get_db
+
+from open_webui.env import SRC_LOG_LEVELS
+from pydantic import BaseModel
+from sqlalchemy import BigInteger, Column, Text, JSON
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+# Tag under which every feedback is counted, regardless of its own tags
+ALL_TAGS = ""
+
+INITIAL_RATING = 1000
+
+
+####################
+# Leaderboard DB Schema
+####################
+
+
+class LeaderboardPair(Base):
+    """Head to head results of model_id against opponent_id for a tag."""
+
+    __tablename__ = "leaderboard_pair"
+
+    tag = Column(Text, primary_key=True)
+    model_id = Column(Text, primary_key=True)
+    opponent_id = Column(Text, primary_key=True)
+    won = Column(BigInteger, default=0)
+    lost = Column(BigInteger, default=0)
+
+
+class LeaderboardFeedback(Base):
+    """What a feedback currently contributes, so it can be taken back."""
+
+    __tablename__ = "leaderboard_feedback"
+
+    feedback_id = Column(Text, primary_key=True)
+    model_id = Column(Text)
+    opponent_ids = Column(JSON)
+    outcome = Column(BigInteger)
+    tags = Column(JSON)
+
+
+####################
+# Forms
+####################
+
+
+class LeaderboardModel(BaseModel):
+    model_id: str
+    rating: float
+    won: int
+    lost: int
+    count: int
+
+
+class LeaderboardResponse(BaseModel):
+    items: list[LeaderboardModel]
+    total: int
+
+
+class LeaderboardTagCount(BaseModel):
+    tag: str
+    count: int
+
+
+def get_contribution(data: Optional[dict]) -> Optional[dict]:
+    """
+    The games a feedback stands for, counted the same way as the leaderboard
+    page does: a rating of 1 is a win against every sibling model, -1 a loss.
+    """
+    data = data or {}
+    model_id = data.get("model_id")
+    rating = str(data.get("rating"))
+    if not model_id or rating not in ("1", "-1"):
+        return None
+
+    opponent_ids = [
+        opponent_id
+        for opponent_id in dict.fromkeys(data.get("sibling_model_ids") or [])
+        if opponent_id and opponent_id != model_id
+    ]
+    if not opponent_ids:
+        return None
+
+    tags = [
+        tag
+        for tag in dict.fromkeys(data.get("tags") or [])
+        if isinstance(tag, str) and tag
+    ]
+
+    return {
+        "model_id": model_id,
+        "opponent_ids": opponent_ids,
+        "outcome": 1 if rating == "1" else 0,
+        "tags": tags,
+    }
+
+
+def add_contribution(deltas: dict, contribution: dict, sign: int = 1):
+    """Adds the won/lost changes of a contribution to deltas, keyed by pair."""
+    model_id = contribution["model_id"]
+    outcome = contribution["outcome"]
+
+    for tag in [ALL_TAGS, *contribution["tags"]]:
+        for opponent_id in contribution["opponent_ids"]:
+            for key, won in (
+                ((tag, model_id, opponent_id), outcome),
+                ((tag, opponent_id, model_id), 1 - outcome),
+            ):
+                current_won, current_lost = deltas.get(key, (0, 0))
+                deltas[key] = (
+                    current_won + sign * won,
+                    current_lost + sign * (1 - won),
+                )
+
+
+def calculate_ratings(
+    pairs: list[tuple[str, str, int]], iterations: int = 200, tolerance: float = 1e-6
+) -> dict[str, float]:
+    """
+    Bradley-Terry ratings on the Elo scale from (model_id, opponent_id, won)
+    results. Unlike sequential Elo updates the result does not depend on the
+    order of the feedback, so it can be kept up to date from the pair counts
+    alone. Every model gets one virtual win and loss against an average model,
+    which keeps the ratings of unbeaten or winless models finite.
+    """
+    wins = {}
+    games = {}
+    for model_id, opponent_id, won in pairs:
+        wins[model_id] = wins.get(model_id, 0) + won
+        wins.setdefault(opponent_id, 0)
+        if won:
+            games.setdefault(model_id, {})
+            games.setdefault(opponent_id, {})
+            games[model_id][opponent_id] = games[model_id].get(opponent_id, 0) + won
+            games[opponent_id][model_id] = games[opponent_id].get(model_id, 0) + won
+
+    strengths = {model_id: 1.0 for model_id in wins}
+    for _ in range(iterations):
+        updated = {}
+        for model_id, strength in strengths.items():
+            denominator = 2 / (strength + 1)
+            for opponent_id, count in games.get(model_id, {}).items():
+                denominator += count / (strength + strengths[opponent_id])
+            updated[model_id] = (wins[model_id] + 1) / denominator
+
+        # Keep the geometric mean at 1 so the average model stays at INITIAL_RATING
+        if updated:
+            scale = math.exp(
+                sum(math.log(strength) for strength in updated.values()) / len(updated)
+            )
+            updated = {
+                model_id: strength / scale for model_id, strength in updated.items()
+            }
+
+        change = max(
+            (
+                abs(math.log(updated[model_id] / strengths[model_id]))
+                for model_id in updated
+            ),
+            default=0,
+        )
+        strengths = updated
+        if change < tolerance:
+            break
+
+    return {
+        model_id: INITIAL_RATING + 400 * math.log10(strength)
+        for model_id, strength in strengths.items()
+    }
+
+
+class LeaderboardTable:
+    def _write_deltas(self, db, deltas: dict):
+        rows = [
+            {
+                "tag": tag,
+                "model_id": model_id,
+                "opponent_id": opponent_id,
+                "won": won,
+                "lost": lost,
+            }
+            for (tag, model_id, opponent_id), (won, lost) in sorted(deltas.items())
+            if won or lost
+        ]
+        if not rows:
+            return
+
+        dialect = db.bind.dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+
+            # One atomic statement, so concurrent feedback on the same pair
+            # can't both miss the row and insert it twice
+            statement = insert(LeaderboardPair)
+            statement = statement.on_conflict_do_update(
+                index_elements=["tag", "model_id", "opponent_id"],
+                set_={
+                    "won": LeaderboardPair.won + statement.excluded.won,
+                    "lost": LeaderboardPair.lost + statement.excluded.lost,
+                },
+            )
+            db.execute(statement, rows)
+        else:
+            for row in rows:
+                updated = (
+                    db.query(LeaderboardPair)
+                    .filter_by(
+                        tag=row["tag"],
+                        model_id=row["model_id"],
+                        opponent_id=row["opponent_id"],
+                    )
+                    .update(
+                        {
+                            LeaderboardPair.won: LeaderboardPair.won + row["won"],
+                            LeaderboardPair.lost: LeaderboardPair.lost + row["lost"],
+                        },
+                        synchronize_session=False,
+                    )
+                )
+                if not updated:
+                    db.add(LeaderboardPair(**row))
+
+        db.query(LeaderboardPair).filter(
+            LeaderboardPair.won <= 0, LeaderboardPair.lost <= 0
+        ).delete(synchronize_session=False)
+
+    def sync_feedback(self, db, feedback_id: str, data: Optional[dict]):
+        """
+        Replaces what feedback_id contributes to the leaderboard with what data
+        stands for now. Runs in the caller's transaction, a failure is logged
+        and leaves the feedback itself untouched.
+        """
+        try:
+            with db.begin_nested():
+                deltas = {}
+
+                previous = db.get(LeaderboardFeedback, feedback_id)
+                if previous:
+                    add_contribution(
+                        deltas,
+                        {
+                            "model_id": previous.model_id,
+                            "opponent_ids": previous.opponent_ids or [],
+                            "outcome": previous.outcome,
+                            "tags": previous.tags or [],
+                        },
+                        sign=-1,
+                    )
+
+                contribution = get_contribution(data)
+                if contribution:
+                    add_contribution(deltas, contribution)
+                    if previous:
+                        previous.model_id = contribution["model_id"]
+                        previous.opponent_ids = contribution["opponent_ids"]
+                        previous.outcome = contribution["outcome"]
+                        previous.tags = contribution["tags"]
+                    else:
+                        db.add(
+                            LeaderboardFeedback(feedback_id=feedback_id, **contribution)
+                        )
+                elif previous:
+                    db.delete(previous)
+
+                self._write_deltas(db, deltas)
+        except Exception as e:
+            log.exception(
+                f"Error updating the leaderboard for feedback {feedback_id}, "
+                f"run `open-webui recompute-leaderboard` to rebuild it: {e}"
+            )
+
+    def remove_feedback(self, db, feedback_id: str):
+        self.sync_feedback(db, feedback_id, None)
+
+    def reset(self, db):
+        db.query(LeaderboardPair).delete()
+        db.query(LeaderboardFeedback).delete()
+
+    def recompute(self) -> int:
+        """Rebuilds the leaderboard from all stored feedback."""
+        from open_webui.models.feedbacks import Feedback
+
+        with get_db() as db:
+            deltas = {}
+            contributions = []
+            for feedback_id, data in db.query(Feedback.id, Feedback.data).yield_per(
+                1000
+            ):
+                contribution = get_contribution(data)
+                if contribution:
+                    add_contribution(deltas, contribution)
+                    contributions.append({"feedback_id": feedback_id, **contribution})
+
+            self.reset(db)
+            db.bulk_insert_mappings(LeaderboardFeedback, contributions)
+            db.bulk_insert_mappings(
+                LeaderboardPair,
+                [
+                    {
+                        "tag": tag,
+                        "model_id": model_id,
+                        "opponent_id": opponent_id,
+                        "won": won,
+                        "lost": lost,
+                    }
+                    for (tag, model_id, opponent_id), (won, lost) in deltas.items()
+                ],
+            )
+            db.commit()
+            return len(contributions)
+
+    def get_tags(self) -> list[str]:
+        with get_db() as db:
+            return [
+                tag
+                for (tag,) in db.query(LeaderboardPair.tag)
+                .filter(LeaderboardPair.tag != ALL_TAGS)
+                .distinct()
+                .order_by(LeaderboardPair.tag)
+                .all()
+            ]
+
+    def get_model_tags(
+        self, model_id: str, limit: int = 5
+    ) -> list[LeaderboardTagCount]:
+        """The tags most often given to feedback on model_id."""
+        with get_db() as db:
+            counts = Counter(
+                tag
+                for (tags,) in db.query(LeaderboardFeedback.tags)
+                .filter_by(model_id=model_id)
+                .yield_per(1000)
+                for tag in tags or []
+            )
+        return [
+            LeaderboardTagCount(tag=tag, count=count)
+            for tag, count in counts.most_common(limit)
+        ]
+
+    def get_leaderboard(
+        self,
+        tag: str = ALL_TAGS,
+        order_by: str = "rating",
+        direction: str = "desc",
+        skip: int = 0,
+        limit: int = 30,
+    ) -> LeaderboardResponse:
+        with get_db() as db:
+            pairs = (
+                db.query(
+                    LeaderboardPair.model_id,
+                    LeaderboardPair.opponent_id,
+                    LeaderboardPair.won,
+                    LeaderboardPair.lost,
+                )
+                .filter_by(tag=tag)
+                .all()
+            )
+
+        stats = {}
+        for model_id, _, won, lost in pairs:
+            current_won, current_lost = stats.get(model_id, (0, 0))
+            stats[model_id] = (current_won + won, current_lost + lost)
+
+        ratings = calculate_ratings(
+            [(model_id, opponent_id, won) for model_id, opponent_id, won, _ in pairs]
+        )
+
+        items = [
+            LeaderboardModel(
+                model_id=model_id,
+                rating=round(ratings.get(model_id, INITIAL_RATING), 1),
+                won=won,
+                lost=lost,
+                count=won + lost,
+            )
+            for model_id, (won, lost) in stats.items()
+        ]
+
+        if order_by not in ("rating", "won", "lost", "count", "model_id"):
+            order_by = "rating"
+        items.sort(
+            key=lambda item: (getattr(item, order_by), item.model_id),
+            reverse=direction != "asc",
+        )
+
+        total = len(items)
+        if skip:
+            items = items[skip:]
+        if limit:
+            items = items[:limit]
+
+        return LeaderboardResponse(items=items, total=total)
+
+
+Leaderboards = LeaderboardTable()
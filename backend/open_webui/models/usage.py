@@ -0,0 +1,373 @@
+import logging
+import uuid
+from typing import Optional
+
+from open_webui.internal.db import Base, get_db
+from open_webui.models.groups import GroupMember
+
+from open_webui.env import SRC_LOG_LEVELS
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import BigInteger, Column, Float, Index, Text, func
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+# Rollup periods and their length in seconds, buckets start at UTC boundaries
+PERIODS = {"hour": 3600, "day": 86400}
+
+USAGE_FIELDS = [
+    "prompt_tokens",
+    "completion_tokens",
+    "reasoning_tokens",
+    "total_tokens",
+    "cost",
+]
+
+
+####################
+# Usage DB Schema
+####################
+
+
+class UsageEvent(Base):
+    """Append-only ledger, one row per completion."""
+
+    __tablename__ = "usage_event"
+
+    id = Column(Text, primary_key=True)
+    user_id = Column(Text, nullable=False)
+    model_id = Column(Text, nullable=False)
+    chat_id = Column(Text, nullable=True)
+    message_id = Column(Text, nullable=True)
+
+    billing_type = Column(Text, nullable=True)
+    currency = Column(Text, nullable=True)
+    prompt_tokens = Column(BigInteger, default=0)
+    completion_tokens = Column(BigInteger, default=0)
+    reasoning_tokens = Column(BigInteger, default=0)
+    total_tokens = Column(BigInteger, default=0)
+    cost = Column(Float, default=0)
+
+    created_at = Column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        Index("usage_event_user_id_created_at_idx", "user_id", "created_at"),
+    )
+
+
+class UsageRollup(Base):
+    """
+    Usage totals per hour or day for a user or a group, per model. Every event
+    is counted once for its user and once for each group the user is in.
+    """
+
+    __tablename__ = "usage_rollup"
+
+    period = Column(Text, primary_key=True)
+    bucket = Column(BigInteger, primary_key=True)
+    scope = Column(Text, primary_key=True)  # "user" or "group"
+    scope_id = Column(Text, primary_key=True)
+    model_id = Column(Text, primary_key=True)
+
+    requests = Column(BigInteger, default=0)
+    prompt_tokens = Column(BigInteger, default=0)
+    completion_tokens = Column(BigInteger, default=0)
+    reasoning_tokens = Column(BigInteger, default=0)
+    total_tokens = Column(BigInteger, default=0)
+    cost = Column(Float, default=0)
+
+    __table_args__ = (
+        Index(
+            "usage_rollup_scope_period_bucket_idx",
+            "scope",
+            "scope_id",
+            "period",
+            "bucket",
+        ),
+        Index("usage_rollup_period_scope_bucket_idx", "period", "scope", "bucket"),
+    )
+
+
+class UsageEventModel(BaseModel):
+    id: str
+    user_id: str
+    model_id: str
+    chat_id: Optional[str] = None
+    message_id: Optional[str] = None
+
+    billing_type: Optional[str] = None
+    currency: Optional[str] = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    reasoning_tokens: int = 0
+    total_tokens: int = 0
+    cost: float = 0
+
+    created_at: int  # timestamp in epoch
+
+    model_config = ConfigDict(from_attributes=True, protected_namespaces=())
+
+
+####################
+# Forms
+####################
+
+
+class UsageTotalsResponse(BaseModel):
+    key: Optional[str] = None
+    bucket: Optional[int] = None
+    requests: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    reasoning_tokens: int = 0
+    total_tokens: int = 0
+    cost: float = 0
+
+
+def get_bucket(timestamp: int, period: str) -> int:
+    return timestamp - timestamp % PERIODS[period]
+
+
+def get_rollup_deltas(
+    events: list[UsageEventModel], group_ids_by_user: dict[str, list[str]]
+) -> dict[tuple, dict]:
+    """Sums events into rollup rows, keyed by the rollup primary key."""
+    deltas = {}
+    for event in events:
+        scopes = [("user", event.user_id)] + [
+            ("group", group_id) for group_id in group_ids_by_user.get(event.user_id, [])
+        ]
+        for period in PERIODS:
+            bucket = get_bucket(event.created_at, period)
+            for scope, scope_id in scopes:
+                key = (period, bucket, scope, scope_id, event.model_id)
+                delta = deltas.setdefault(
+                    key, {"requests": 0, **{field: 0 for field in USAGE_FIELDS}}
+                )
+                delta["requests"] += 1
+                for field in USAGE_FIELDS:
+                    delta[field] += getattr(event, field) or 0
+    return deltas
+
+
+class UsageTable:
+    def _get_group_ids_by_user(self, db, user_ids: list[str]) -> dict[str, list]:
+        group_ids_by_user = {}
+        for user_id, group_id in db.query(
+            GroupMember.user_id, GroupMember.group_id
+        ).filter(GroupMember.user_id.in_(user_ids)):
+            group_ids_by_user.setdefault(user_id, []).append(group_id)
+        return group_ids_by_user
+
+    def _upsert_rollups(self, db, deltas: dict[tuple, dict]):
+        columns = ["requests", *USAGE_FIELDS]
+        dialect = db.bind.dialect.name
+
+        if dialect in ("postgresql", "sqlite"):
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+
+            rows = [
+                {
+                    "period": period,
+                    "bucket": bucket,
+                    "scope": scope,
+                    "scope_id": scope_id,
+                    "model_id": model_id,
+                    **delta,
+                }
+                for (period, bucket, scope, scope_id, model_id), delta in sorted(
+                    deltas.items()
+                )
+            ]
+            statement = insert(UsageRollup)
+            statement = statement.on_conflict_do_update(
+                index_elements=["period", "bucket", "scope", "scope_id", "model_id"],
+                set_={
+                    column: getattr(UsageRollup, column)
+                    + getattr(statement.excluded, column)
+                    for column in columns
+                },
+            )
+            db.execute(statement, rows)
+            return
+
+        for (period, bucket, scope, scope_id, model_id), delta in deltas.items():
+            updated = (
+                db.query(UsageRollup)
+                .filter_by(
+                    period=period,
+                    bucket=bucket,
+                    scope=scope,
+                    scope_id=scope_id,
+                    model_id=model_id,
+                )
+                .update(
+                    {
+                        getattr(UsageRollup, column): getattr(UsageRollup, column)
+                        + delta[column]
+                        for column in columns
+                    },
+                    synchronize_session=False,
+                )
+            )
+            if not updated:
+                db.add(
+                    UsageRollup(
+                        period=period,
+                        bucket=bucket,
+                        scope=scope,
+                        scope_id=scope_id,
+                        model_id=model_id,
+                        **delta,
+                    )
+                )
+
+    def insert_usage_events(self, events: list[UsageEventModel]) -> int:
+        """Appends events to the ledger and adds them to the rollups."""
+        if not events:
+            return 0
+
+        with get_db() as db:
+            group_ids_by_user = self._get_group_ids_by_user(
+                db, list({event.user_id for event in events})
+            )
+
+            db.bulk_insert_mappings(
+                UsageEvent, [event.model_dump() for event in events]
+            )
+            self._upsert_rollups(db, get_rollup_deltas(events, group_ids_by_user))
+            db.commit()
+            return len(events)
+
+    def _sum_columns(self):
+        return [
+            func.sum(UsageRollup.requests),
+            *[func.sum(getattr(UsageRollup, field)) for field in USAGE_FIELDS],
+        ]
+
+    def _to_totals(self, key, bucket, sums) -> UsageTotalsResponse:
+        requests, *values = sums
+        return UsageTotalsResponse(
+            key=key,
+            bucket=bucket,
+            requests=requests or 0,
+            **{field: value or 0 for field, value in zip(USAGE_FIELDS, values)},
+        )
+
+    def get_usage_summary(
+        self,
+        group_by: str = "model",
+        period: str = "day",
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        user_id: Optional[str] = None,
+    ) -> list[UsageTotalsResponse]:
+        """Totals between start and end, per user, group or model."""
+        scope = "group" if group_by == "group" else "user"
+        key_column = (
+            UsageRollup.model_id if group_by == "model" else UsageRollup.scope_id
+        )
+
+        with get_db() as db:
+            query = db.query(key_column, *self._sum_columns()).filter(
+                UsageRollup.period == period, UsageRollup.scope == scope
+            )
+            if user_id:
+                query = query.filter(UsageRollup.scope_id == user_id)
+            if start is not None:
+                query = query.filter(UsageRollup.bucket >= get_bucket(start, period))
+            if end is not None:
+                query = query.filter(UsageRollup.bucket < end)
+
+            results = [
+                self._to_totals(key, None, sums)
+                for key, *sums in query.group_by(key_column).all()
+            ]
+        return sorted(results, key=lambda result: result.cost, reverse=True)
+
+    def get_usage_timeseries(
+        self,
+        period: str = "day",
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        user_id: Optional[str] = None,
+        group_id: Optional[str] = None,
+        model_id: Optional[str] = None,
+    ) -> list[UsageTotalsResponse]:
+        """Totals per hour or day, optionally for one user, group or model."""
+        with get_db() as db:
+            query = db.query(UsageRollup.bucket, *self._sum_columns()).filter(
+                UsageRollup.period == period
+            )
+            if group_id:
+                query = query.filter(
+                    UsageRollup.scope == "group", UsageRollup.scope_id == group_id
+                )
+            else:
+                query = query.filter(UsageRollup.scope == "user")
+                if user_id:
+                    query = query.filter(UsageRollup.scope_id == user_id)
+            if model_id:
+                query = query.filter(UsageRollup.model_id == model_id)
+            if start is not None:
+                query = query.filter(UsageRollup.bucket >= get_bucket(start, period))
+            if end is not None:
+                query = query.filter(UsageRollup.bucket < end)
+
+            return [
+                self._to_totals(model_id, bucket, sums)
+                for bucket, *sums in query.group_by(UsageRollup.bucket)
+                .order_by(UsageRollup.bucket)
+                .all()
+            ]
+
+    def get_usage_events_by_user_id(
+        self, user_id: str, skip: int = 0, limit: int = 50
+    ) -> list[UsageEventModel]:
+        with get_db() as db:
+            return [
+                UsageEventModel.model_validate(event)
+                for event in db.query(UsageEvent)
+                .filter_by(user_id=user_id)
+                .order_by(UsageEvent.created_at.desc())
+                .offset(skip)
+                .limit(limit)
+                .all()
+            ]
+
+
+Usages = UsageTable()
+
+
+def new_usage_event(
+    user_id: str,
+    model_id: str,
+    usage: dict,
+    created_at: int,
+    chat_id: Optional[str] = None,
+    message_id: Optional[str] = None,
+) -> UsageEventModel:
+    """Ledger entry for a usage dict as returned by enrich_usage_with_cost."""
+    cost = usage.get("cost") if isinstance(usage.get("cost"), dict) else {}
+    completion_details = usage.get("completion_tokens_details")
+    if not isinstance(completion_details, dict):
+        completion_details = {}
+
+    return UsageEventModel(
+        id=str(uuid.uuid4()),
+        user_id=user_id,
+        model_id=model_id,
+        chat_id=chat_id,
+        message_id=message_id,
+        billing_type=cost.get("billing_type"),
+        currency=cost.get("currency"),
+        prompt_tokens=int(usage.get("prompt_tokens") or 0),
+        completion_tokens=int(usage.get("completion_tokens") or 0),
+        reasoning_tokens=int(completion_details.get("reasoning_tokens") or 0),
+        total_tokens=int(usage.get("total_tokens") or 0),
+        cost=float(cost.get("total") or 0),
+        created_at=created_at,
+    )
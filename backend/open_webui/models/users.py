@@ -1,5 +1,5 @@
 import time
-from typing import Optional
+from typing import Iterator, Optional
 
 from open_webui.internal.db import Base, JSONField, get_db
 
@@ -354,6 +354,12 @@ class UsersTable:
                 "total": total,
             }
 
+    def iter_users(self, batch_size: int = 500) -> Iterator[UserModel]:
+        """Yields all users by creation date, batch_size rows at a time."""
+        with get_db() as db:
+            for user in db.query(User).order_by(User.created_at).yield_per(batch_size):
+                yield UserModel.model_validate(user)
+
     def get_users_by_user_ids(self, user_ids: list[str]) -> list[UserModel]:
         with get_db() as db:
             users = db.query(User).filter(User.id.in_(user_ids)).all()
@@ -0,0 +1,275 @@
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from open_webui.env import (
+    RAG_RESULT_CACHE_SIZE,
+    RAG_RESULT_CACHE_TTL,
+    REDIS_CLUSTER,
+    REDIS_KEY_PREFIX,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+    REDIS_URL,
+    SRC_LOG_LEVELS,
+    UVICORN_WORKERS,
+    WEB_SEARCH_CACHE_SIZE,
+    WEB_SEARCH_CACHE_TTL,
+    WEB_SEARCH_EMBEDDING_CACHE_SIZE,
+)
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+# Pseudo collection whose version is part of every key, see invalidate_all
+ALL_COLLECTIONS = "*"
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class TTLCache:
+    """
+    LRU of values that expire after ttl seconds. With Redis, entries are shared
+    between nodes and each node keeps the LRU in front of it, values then have to
+    be JSON-serializable.
+
+    Code running on the event loop should use aget/aset, which only leave the
+    loop (through a worker thread) when Redis has to be asked.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        ttl: int,
+        redis=None,
+        redis_key_prefix: str = f"{REDIS_KEY_PREFIX}:cache",
+    ):
+        self.size = size
+        self.ttl = ttl
+        self._redis = redis
+        self._redis_key_prefix = redis_key_prefix
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0 and self.ttl > 0
+
+    def _get_local(self, key: str) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    return copy.deepcopy(value)
+                del self._entries[key]
+        return None
+
+    def _get_remote(self, key: str) -> Optional[Any]:
+        try:
+            value = self._redis.get(f"{self._redis_key_prefix}:entry:{key}")
+        except Exception as e:
+            log.warning(f"{self.__class__.__name__} unavailable: {e}")
+            return None
+
+        if value is not None:
+            value = json.loads(value)
+            self._set_local(key, value)
+        return value
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self._get_local(key)
+        if value is None and self._redis:
+            value = self._get_remote(key)
+        return value
+
+    async def aget(self, key: str) -> Optional[Any]:
+        value = self._get_local(key)
+        if value is None and self._redis:
+            value = await asyncio.to_thread(self._get_remote, key)
+        return value
+
+    def _set_local(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def _set_remote(self, key: str, value: Any):
+        try:
+            self._redis.set(
+                f"{self._redis_key_prefix}:entry:{key}",
+                json.dumps(value, default=str),
+                ex=self.ttl,
+            )
+        except Exception as e:
+            log.warning(f"{self.__class__.__name__} unavailable: {e}")
+
+    def set(self, key: str, value: Any):
+        self._set_local(key, value)
+        if self._redis:
+            self._set_remote(key, value)
+
+    async def aset(self, key: str, value: Any):
+        self._set_local(key, value)
+        if self._redis:
+            await asyncio.to_thread(self._set_remote, key, value)
+
+
+class RetrievalResultCache(TTLCache):
+    """
+    Caches retrieval results for a set of collections and queries.
+
+    Every collection has a version that is bumped when its contents change
+    (see invalidate). Versions are part of the cache key, so a write makes all
+    entries built from the old contents unreachable without having to find
+    them. With Redis, versions and entries are shared between nodes and each
+    node keeps a small LRU in front of it. Without Redis, versions only exist
+    in this process, see get_retrieval_result_cache.
+    """
+
+    def __init__(
+        self,
+        size: int = RAG_RESULT_CACHE_SIZE,
+        ttl: int = RAG_RESULT_CACHE_TTL,
+        redis=None,
+        redis_key_prefix: str = f"{REDIS_KEY_PREFIX}:rag:result_cache",
+    ):
+        super().__init__(size, ttl, redis=redis, redis_key_prefix=redis_key_prefix)
+        self._versions = {}
+
+    def _get_versions(self, collection_names: list[str]) -> list[int]:
+        if self._redis:
+            # One hash for all versions, so this is a single key even on a cluster
+            versions = self._redis.hmget(
+                f"{self._redis_key_prefix}:versions", collection_names
+            )
+            return [int(version or 0) for version in versions]
+
+        with self._lock:
+            return [self._versions.get(name, 0) for name in collection_names]
+
+    def get_key(self, collection_names: list[str], queries: list[str], **params):
+        """
+        Key for a retrieval over collection_names. params holds everything else
+        that changes the result: k, reranker and embedding model, weights, etc.
+        """
+        collection_names = sorted(set(collection_names)) + [ALL_COLLECTIONS]
+        try:
+            versions = self._get_versions(collection_names)
+        except Exception as e:
+            log.warning(f"Retrieval result cache unavailable: {e}")
+            return None
+        return self._build_key(collection_names, versions, queries, params)
+
+    async def aget_key(self, collection_names: list[str], queries: list[str], **params):
+        """Like get_key, reading the versions from Redis off the event loop."""
+        collection_names = sorted(set(collection_names)) + [ALL_COLLECTIONS]
+        try:
+            if self._redis:
+                versions = await asyncio.to_thread(self._get_versions, collection_names)
+            else:
+                versions = self._get_versions(collection_names)
+        except Exception as e:
+            log.warning(f"Retrieval result cache unavailable: {e}")
+            return None
+        return self._build_key(collection_names, versions, queries, params)
+
+    @staticmethod
+    def _build_key(
+        collection_names: list[str],
+        versions: list[int],
+        queries: list[str],
+        params: dict,
+    ) -> str:
+        payload = json.dumps(
+            {
+                "collections": list(zip(collection_names, versions)),
+                "queries": [normalize_query(query) for query in queries],
+                "params": params,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def invalidate(self, collection_name: str):
+        """Called after a collection's contents change."""
+        if not self.enabled:
+            return
+
+        try:
+            if self._redis:
+                self._redis.hincrby(
+                    f"{self._redis_key_prefix}:versions", collection_name, 1
+                )
+            else:
+                with self._lock:
+                    self._versions[collection_name] = (
+                        self._versions.get(collection_name, 0) + 1
+                    )
+        except Exception as e:
+            # A missed bump leaves stale entries around until they expire
+            log.warning(
+                f"Failed to invalidate cached results of {collection_name}: {e}"
+            )
+
+    def invalidate_all(self):
+        """Called after the whole vector database is reset."""
+        self.invalidate(ALL_COLLECTIONS)
+
+
+def get_cache_redis(enabled: bool = True):
+    if not REDIS_URL or not enabled:
+        return None
+    return get_redis_connection(
+        redis_url=REDIS_URL,
+        redis_sentinels=get_sentinels_from_env(
+            REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT
+        ),
+        redis_cluster=REDIS_CLUSTER,
+    )
+
+
+def get_retrieval_result_cache() -> RetrievalResultCache:
+    redis = get_cache_redis(RAG_RESULT_CACHE_SIZE > 0)
+    if redis is None and RAG_RESULT_CACHE_SIZE > 0 and UVICORN_WORKERS > 1:
+        # A collection change would only bump the version in the worker that
+        # handled it, the other workers would keep serving stale results
+        log.info(
+            "Retrieval result cache disabled: UVICORN_WORKERS > 1 requires REDIS_URL"
+        )
+        return RetrievalResultCache(size=0)
+    return RetrievalResultCache(redis=redis)
+
+
+RETRIEVAL_RESULT_CACHE = get_retrieval_result_cache()
+
+# Search engine responses, shared between nodes to save on paid API calls
+WEB_SEARCH_RESULT_CACHE = TTLCache(
+    WEB_SEARCH_CACHE_SIZE,
+    WEB_SEARCH_CACHE_TTL,
+    redis=get_cache_redis(WEB_SEARCH_CACHE_SIZE > 0 and WEB_SEARCH_CACHE_TTL > 0),
+    redis_key_prefix=f"{REDIS_KEY_PREFIX}:web_search:results",
+)
+
+# Text of fetched pages, local only since pages can be large. Entries are kept
+# for a day so that stale pages can be revalidated, see SafeWebBaseLoader.
+WEB_PAGE_CACHE = TTLCache(WEB_SEARCH_CACHE_SIZE, 86400 if WEB_SEARCH_CACHE_TTL else 0)
+
+# Chunk embeddings of fetched pages, local only
+WEB_EMBEDDING_CACHE = TTLCache(
+    WEB_SEARCH_EMBEDDING_CACHE_SIZE, 86400 if WEB_SEARCH_CACHE_TTL else 0
+)
@@ -0,0 +1,334 @@
+import itertools
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from open_webui.env import (
+    INGESTION_JOB_MAX_ATTEMPTS,
+    INGESTION_JOB_TIMEOUT,
+    INGESTION_PROCESS_POOL_SIZE,
+    INGESTION_WORKERS,
+    REDIS_KEY_PREFIX,
+    SRC_LOG_LEVELS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+# Lower values are processed first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 9
+
+# Both keys share a hash tag, so the scripts below also work on Redis Cluster
+REDIS_INGESTION_QUEUE_KEY = f"{{{REDIS_KEY_PREFIX}:ingestion}}:queue"
+# Jobs taken by a worker, scored by the time they count as abandoned
+REDIS_INGESTION_PROCESSING_KEY = f"{{{REDIS_KEY_PREFIX}:ingestion}}:processing"
+
+# Moves the next job to the processing set, with its deadline as score
+CLAIM_JOB_SCRIPT = """
+local jobs = redis.call('ZRANGE', KEYS[1], 0, 0)
+if #jobs == 0 then
+    return false
+end
+redis.call('ZREM', KEYS[1], jobs[1])
+redis.call('ZADD', KEYS[2], ARGV[1], jobs[1])
+return jobs[1]
+"""
+
+# Puts an abandoned job back in the queue, unless another instance already did
+REQUEUE_JOB_SCRIPT = """
+if redis.call('ZREM', KEYS[2], ARGV[1]) == 1 then
+    redis.call('ZADD', KEYS[1], ARGV[3], ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# Seconds between polls of an empty Redis queue
+REDIS_POLL_INTERVAL = 0.5
+
+
+class IngestionJob(BaseModel):
+    file_id: str
+    user_id: str
+    priority: int = PRIORITY_NORMAL
+    metadata: dict = {}
+    created_at: float = Field(default_factory=time.time)
+    # Times the job was taken by a worker that did not finish it
+    attempts: int = 0
+
+
+def clamp_priority(priority: int) -> int:
+    return min(max(int(priority), PRIORITY_HIGH), PRIORITY_LOW)
+
+
+####################################
+# Extraction process pool
+####################################
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> Optional[ProcessPoolExecutor]:
+    global _process_pool
+
+    if INGESTION_PROCESS_POOL_SIZE <= 0:
+        return None
+
+    with _process_pool_lock:
+        if _process_pool is None:
+            # Spawn instead of fork, the parent process runs threads and event loops
+            _process_pool = ProcessPoolExecutor(
+                max_workers=INGESTION_PROCESS_POOL_SIZE,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _process_pool
+
+
+def shutdown_process_pool():
+    global _process_pool
+
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+
+
+def _load_documents(loader, filename: str, content_type: str, file_path: str):
+    return loader.load(filename, content_type, file_path)
+
+
+def load_documents(loader, filename: str, content_type: str, file_path: str):
+    """
+    Runs loader.load in the extraction process pool so that CPU-bound parsing
+    does not hold the GIL of the serving process. Falls back to loading in the
+    calling thread when the pool is disabled or has died.
+    """
+    global _process_pool
+
+    pool = get_process_pool()
+    if pool is None:
+        return loader.load(filename, content_type, file_path)
+
+    try:
+        return pool.submit(
+            _load_documents, loader, filename, content_type, file_path
+        ).result()
+    except BrokenProcessPool:
+        log.warning("Extraction process pool died, recreating it")
+        with _process_pool_lock:
+            if _process_pool is pool:
+                _process_pool = None
+        return loader.load(filename, content_type, file_path)
+
+
+####################################
+# Job queue
+####################################
+
+
+class IngestionQueue:
+    """
+    Priority queue of file ingestion jobs consumed by a pool of worker threads.
+
+    Without Redis jobs are kept in memory and processed by this instance only,
+    they do not survive a restart. With Redis jobs are stored in a sorted set
+    shared by all instances, scored by priority then submission time, so every
+    node pulls from the same queue. A job taken by a worker is moved to a
+    processing set and only removed once it is done. Instances renew the
+    deadlines of their running jobs, jobs whose deadline passed (the instance
+    crashed or restarted) are put back in the queue, up to max_attempts times,
+    after which on_abandoned is called with the job.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[IngestionJob], None],
+        workers: int = INGESTION_WORKERS,
+        redis=None,
+        job_timeout: float = INGESTION_JOB_TIMEOUT,
+        max_attempts: int = INGESTION_JOB_MAX_ATTEMPTS,
+        on_abandoned: Optional[Callable[[IngestionJob], None]] = None,
+    ):
+        self.handler = handler
+        self.workers = workers
+        self.redis = redis
+        self.job_timeout = job_timeout
+        self.max_attempts = max_attempts
+        self.on_abandoned = on_abandoned
+
+        self._queue = queue.PriorityQueue()
+        self._counter = itertools.count()
+        self._threads: list[threading.Thread] = []
+        self._stop_event = threading.Event()
+        # Redis members of the jobs this instance is running
+        self._running: set[str] = set()
+        self._running_lock = threading.Lock()
+
+    @staticmethod
+    def _get_score(job: IngestionJob) -> int:
+        # Priority first, then FIFO by submission time in milliseconds
+        return job.priority * 10**13 + int(job.created_at * 1000)
+
+    def submit(self, job: IngestionJob):
+        job.priority = clamp_priority(job.priority)
+
+        if self.redis is not None:
+            self.redis.zadd(
+                REDIS_INGESTION_QUEUE_KEY,
+                {job.model_dump_json(): self._get_score(job)},
+            )
+        else:
+            self._queue.put((job.priority, next(self._counter), job))
+
+    def size(self) -> int:
+        if self.redis is not None:
+            return self.redis.zcard(REDIS_INGESTION_QUEUE_KEY)
+        return self._queue.qsize()
+
+    def start(self):
+        self._stop_event.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._worker, name=f"ingestion-worker-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+        if self.redis is not None:
+            thread = threading.Thread(
+                target=self._heartbeat, name="ingestion-heartbeat", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+        log.info(
+            f"Started {self.workers} ingestion workers "
+            f"({'redis' if self.redis is not None else 'local'} queue)"
+        )
+
+    def stop(self, timeout: float = 5.0):
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+        shutdown_process_pool()
+
+    def _next_job(self) -> Optional[Tuple[IngestionJob, Optional[str]]]:
+        if self.redis is not None:
+            member = self.redis.eval(
+                CLAIM_JOB_SCRIPT,
+                2,
+                REDIS_INGESTION_QUEUE_KEY,
+                REDIS_INGESTION_PROCESSING_KEY,
+                time.time() + self.job_timeout,
+            )
+            if not member:
+                self._stop_event.wait(REDIS_POLL_INTERVAL)
+                return None
+
+            if isinstance(member, bytes):
+                member = member.decode()
+            with self._running_lock:
+                self._running.add(member)
+            return IngestionJob.model_validate_json(member), member
+
+        try:
+            _, _, job = self._queue.get(timeout=1)
+            return job, None
+        except queue.Empty:
+            return None
+
+    def _complete(self, member: str):
+        with self._running_lock:
+            self._running.discard(member)
+        try:
+            self.redis.zrem(REDIS_INGESTION_PROCESSING_KEY, member)
+        except Exception as e:
+            # The job runs again once its deadline passes
+            log.error(f"Error completing ingestion job: {e}")
+
+    def requeue_abandoned_jobs(self) -> int:
+        """Puts jobs whose deadline passed back in the queue, returns their count."""
+        requeued = 0
+        for member in self.redis.zrangebyscore(
+            REDIS_INGESTION_PROCESSING_KEY, "-inf", time.time()
+        ):
+            if isinstance(member, bytes):
+                member = member.decode()
+            with self._running_lock:
+                if member in self._running:
+                    continue
+
+            job = IngestionJob.model_validate_json(member)
+            job.attempts += 1
+            if job.attempts >= self.max_attempts:
+                if self.redis.zrem(REDIS_INGESTION_PROCESSING_KEY, member):
+                    log.error(
+                        f"Giving up ingestion job {job.file_id} after {job.attempts} attempts"
+                    )
+                    if self.on_abandoned is not None:
+                        self.on_abandoned(job)
+            elif self.redis.eval(
+                REQUEUE_JOB_SCRIPT,
+                2,
+                REDIS_INGESTION_QUEUE_KEY,
+                REDIS_INGESTION_PROCESSING_KEY,
+                member,
+                job.model_dump_json(),
+                self._get_score(job),
+            ):
+                log.warning(f"Requeued abandoned ingestion job {job.file_id}")
+                requeued += 1
+        return requeued
+
+    def _heartbeat(self):
+        # Runs once on start, which picks up the jobs of a previous run
+        while True:
+            try:
+                with self._running_lock:
+                    members = list(self._running)
+                if members:
+                    deadline = time.time() + self.job_timeout
+                    self.redis.zadd(
+                        REDIS_INGESTION_PROCESSING_KEY,
+                        {member: deadline for member in members},
+                        xx=True,
+                    )
+                self.requeue_abandoned_jobs()
+            except Exception as e:
+                log.error(f"Error renewing ingestion jobs: {e}")
+
+            if self._stop_event.wait(self.job_timeout / 3):
+                break
+
+    def _worker(self):
+        while not self._stop_event.is_set():
+            try:
+                claimed = self._next_job()
+            except Exception as e:
+                log.error(f"Error fetching ingestion job: {e}")
+                self._stop_event.wait(1)
+                continue
+
+            if claimed is None:
+                continue
+
+            job, member = claimed
+            try:
+                self.handler(job)
+            except Exception as e:
+                log.exception(f"Error processing ingestion job {job.file_id}: {e}")
+            finally:
+                if member is not None:
+                    self._complete(member)
@@ -4,25 +4,9 @@ import ftfy
 import sys
 import json
 
-from azure.identity import DefaultAzureCredential
-from langchain_community.document_loaders import (
-    AzureAIDocumentIntelligenceLoader,
-    BSHTMLLoader,
-    CSVLoader,
-    Docx2txtLoader,
-    OutlookMessageLoader,
-    PyPDFLoader,
-    TextLoader,
-    UnstructuredEPubLoader,
-    UnstructuredExcelLoader,
-    UnstructuredODTLoader,
-    UnstructuredPowerPointLoader,
-    UnstructuredRSTLoader,
-    UnstructuredXMLLoader,
-    YoutubeLoader,
-)
 from langchain_core.documents import Document
 
+from open_webui.retrieval.registry import LazyRegistry
 from open_webui.retrieval.loaders.external_document import ExternalDocumentLoader
 
 from open_webui.retrieval.loaders.mistral import MistralLoader
@@ -36,6 +20,26 @@ logging.basicConfig(stream=sys.stdout, level=GLOBAL_LOG_LEVEL)
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
+# Third party loaders by name, imported on first use
+DOCUMENT_LOADERS = LazyRegistry(
+    "document loader",
+    {
+        "AzureAIDocumentIntelligenceLoader": "langchain_community.document_loaders:AzureAIDocumentIntelligenceLoader",
+        "BSHTMLLoader": "langchain_community.document_loaders:BSHTMLLoader",
+        "CSVLoader": "langchain_community.document_loaders:CSVLoader",
+        "Docx2txtLoader": "langchain_community.document_loaders:Docx2txtLoader",
+        "OutlookMessageLoader": "langchain_community.document_loaders:OutlookMessageLoader",
+        "PyPDFLoader": "langchain_community.document_loaders:PyPDFLoader",
+        "TextLoader": "langchain_community.document_loaders:TextLoader",
+        "UnstructuredEPubLoader": "langchain_community.document_loaders:UnstructuredEPubLoader",
+        "UnstructuredExcelLoader": "langchain_community.document_loaders:UnstructuredExcelLoader",
+        "UnstructuredODTLoader": "langchain_community.document_loaders:UnstructuredODTLoader",
+        "UnstructuredPowerPointLoader": "langchain_community.document_loaders:UnstructuredPowerPointLoader",
+        "UnstructuredRSTLoader": "langchain_community.document_loaders:UnstructuredRSTLoader",
+        "UnstructuredXMLLoader": "langchain_community.document_loaders:UnstructuredXMLLoader",
+    },
+)
+
 known_source_ext = [
     "go",
     "py",
@@ -228,7 +232,9 @@ class Loader:
             )
         elif self.engine == "tika" and self.kwargs.get("TIKA_SERVER_URL"):
             if self._is_text_file(file_ext, file_content_type):
-                loader = TextLoader(file_path, autodetect_encoding=True)
+                loader = DOCUMENT_LOADERS["TextLoader"](
+                    file_path, autodetect_encoding=True
+                )
             else:
                 loader = TikaLoader(
                     url=self.kwargs.get("TIKA_SERVER_URL"),
@@ -286,7 +292,9 @@ class Loader:
             )
         elif self.engine == "docling" and self.kwargs.get("DOCLING_SERVER_URL"):
             if self._is_text_file(file_ext, file_content_type):
-                loader = TextLoader(file_path, autodetect_encoding=True)
+                loader = DOCUMENT_LOADERS["TextLoader"](
+                    file_path, autodetect_encoding=True
+                )
             else:
                 # Build params for DoclingLoader
                 params = self.kwargs.get("DOCLING_PARAMS", {})
@@ -318,13 +326,15 @@ class Loader:
             )
         ):
             if self.kwargs.get("DOCUMENT_INTELLIGENCE_KEY") != "":
-                loader = AzureAIDocumentIntelligenceLoader(
+                loader = DOCUMENT_LOADERS["AzureAIDocumentIntelligenceLoader"](
                     file_path=file_path,
                     api_endpoint=self.kwargs.get("DOCUMENT_INTELLIGENCE_ENDPOINT"),
                     api_key=self.kwargs.get("DOCUMENT_INTELLIGENCE_KEY"),
                 )
             else:
-                loader = AzureAIDocumentIntelligenceLoader(
+                from azure.identity import DefaultAzureCredential
+
+                loader = DOCUMENT_LOADERS["AzureAIDocumentIntelligenceLoader"](
                     file_path=file_path,
                     api_endpoint=self.kwargs.get("DOCUMENT_INTELLIGENCE_ENDPOINT"),
                     azure_credential=DefaultAzureCredential(),
@@ -352,44 +362,56 @@ class Loader:
             )
         else:
             if file_ext == "pdf":
-                loader = PyPDFLoader(
+                loader = DOCUMENT_LOADERS["PyPDFLoader"](
                     file_path, extract_images=self.kwargs.get("PDF_EXTRACT_IMAGES")
                 )
             elif file_ext == "csv":
-                loader = CSVLoader(file_path, autodetect_encoding=True)
+                loader = DOCUMENT_LOADERS["CSVLoader"](
+                    file_path, autodetect_encoding=True
+                )
             elif file_ext == "rst":
-                loader = UnstructuredRSTLoader(file_path, mode="elements")
+                loader = DOCUMENT_LOADERS["UnstructuredRSTLoader"](
+                    file_path, mode="elements"
+                )
             elif file_ext == "xml":
-                loader = UnstructuredXMLLoader(file_path)
+                loader = DOCUMENT_LOADERS["UnstructuredXMLLoader"](file_path)
             elif file_ext in ["htm", "html"]:
-                loader = BSHTMLLoader(file_path, open_encoding="unicode_escape")
+                loader = DOCUMENT_LOADERS["BSHTMLLoader"](
+                    file_path, open_encoding="unicode_escape"
+                )
             elif file_ext == "md":
-                loader = TextLoader(file_path, autodetect_encoding=True)
+                loader = DOCUMENT_LOADERS["TextLoader"](
+                    file_path, autodetect_encoding=True
+                )
             elif file_content_type == "application/epub+zip":
-                loader = UnstructuredEPubLoader(file_path)
+                loader = DOCUMENT_LOADERS["UnstructuredEPubLoader"](file_path)
             elif (
                 file_content_type
                 == "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
                 or file_ext == "docx"
             ):
-                loader = Docx2txtLoader(file_path)
+                loader = DOCUMENT_LOADERS["Docx2txtLoader"](file_path)
             elif file_content_type in [
                 "application/vnd.ms-excel",
                 "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             ] or file_ext in ["xls", "xlsx"]:
-                loader = UnstructuredExcelLoader(file_path)
+                loader = DOCUMENT_LOADERS["UnstructuredExcelLoader"](file_path)
             elif file_content_type in [
                 "application/vnd.ms-powerpoint",
                 "application/vnd.openxmlformats-officedocument.presentationml.presentation",
             ] or file_ext in ["ppt", "pptx"]:
-                loader = UnstructuredPowerPointLoader(file_path)
+                loader = DOCUMENT_LOADERS["UnstructuredPowerPointLoader"](file_path)
             elif file_ext == "msg":
-                loader = OutlookMessageLoader(file_path)
+                loader = DOCUMENT_LOADERS["OutlookMessageLoader"](file_path)
             elif file_ext == "odt":
-                loader = UnstructuredODTLoader(file_path)
+                loader = DOCUMENT_LOADERS["UnstructuredODTLoader"](file_path)
             elif self._is_text_file(file_ext, file_content_type):
-                loader = TextLoader(file_path, autodetect_encoding=True)
+                loader = DOCUMENT_LOADERS["TextLoader"](
+                    file_path, autodetect_encoding=True
+                )
             else:
-                loader = TextLoader(file_path, autodetect_encoding=True)
+                loader = DOCUMENT_LOADERS["TextLoader"](
+                    file_path, autodetect_encoding=True
+                )
 
         return loader
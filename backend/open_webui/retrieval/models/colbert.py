@@ -1,5 +1,9 @@
 import os
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
+
 import torch
 import numpy as np
 from colbert.infra import ColBERTConfig
@@ -14,6 +18,10 @@ log.setLevel(SRC_LOG_LEVELS["RAG"])
 
 
 class ColBERT(BaseReranker):
+    # Number of document token embeddings kept between calls, so chunks that come
+    # back for many queries are only encoded once
+    DOCUMENT_CACHE_SIZE = 4096
+
     def __init__(self, name, **kwargs) -> None:
         log.info("ColBERT: Loading model", name)
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
@@ -35,7 +43,50 @@ class ColBERT(BaseReranker):
             name,
             colbert_config=ColBERTConfig(model_name=name),
         ).to(self.device)
-        pass
+
+        self.document_cache_size = kwargs.get(
+            "document_cache_size", self.DOCUMENT_CACHE_SIZE
+        )
+        self._document_cache = OrderedDict()
+        self._document_cache_lock = threading.Lock()
+
+    def embed_documents(self, docs):
+        """
+        Token embeddings of docs, padded to the longest document. Cached
+        documents are not encoded again.
+        """
+        keys = [hashlib.sha256(doc.encode()).hexdigest() for doc in docs]
+
+        embeddings = {}
+        with self._document_cache_lock:
+            for key in keys:
+                if key in self._document_cache:
+                    self._document_cache.move_to_end(key)
+                    embeddings[key] = self._document_cache[key]
+
+        missing = {}
+        for key, doc in zip(keys, docs):
+            if key not in embeddings:
+                missing[key] = doc
+
+        if missing:
+            encoded = self.ckpt.docFromText(list(missing.values()), bsize=32)[0]
+            for key, embedding in zip(missing.keys(), encoded):
+                # Drop the padding docFromText added for this batch
+                lengths = embedding.abs().sum(dim=1).nonzero()
+                length = int(lengths.max()) + 1 if len(lengths) else 1
+                embeddings[key] = embedding[:length].detach()
+
+            with self._document_cache_lock:
+                for key in missing:
+                    self._document_cache[key] = embeddings[key]
+                while len(self._document_cache) > self.document_cache_size:
+                    self._document_cache.popitem(last=False)
+
+        # Padded tokens are zero, as in the masked output of docFromText
+        return torch.nn.utils.rnn.pad_sequence(
+            [embeddings[key] for key in keys], batch_first=True
+        )
 
     def calculate_similarity_scores(self, query_embeddings, document_embeddings):
 
@@ -76,7 +127,7 @@ class ColBERT(BaseReranker):
         docs = [i[1] for i in sentences]
 
         # Embedding the documents
-        embedded_docs = self.ckpt.docFromText(docs, bsize=32)[0]
+        embedded_docs = self.embed_documents(docs)
         # Embedding the queries
         embedded_queries = self.ckpt.queryFromText([query], bsize=32)
         embedded_query = embedded_queries[0]
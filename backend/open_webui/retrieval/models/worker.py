@@ -0,0 +1,367 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from open_webui.env import (
+    RAG_EMBEDDING_BATCH_WAIT_MS,
+    RAG_EMBEDDING_WORKERS,
+    RAG_RERANKING_BATCH_WAIT_MS,
+    RAG_RERANKING_MAX_BATCH_PAIRS,
+    SRC_LOG_LEVELS,
+)
+from open_webui.retrieval.models.base_reranker import BaseReranker
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+class BatchRequest(NamedTuple):
+    items: list
+    future: Future
+    queued_at: float
+    # Passed through to _run_batch, e.g. the prompt of an embedding request
+    options: Any = None
+
+
+class BatchingWorker:
+    """
+    Runs a local model for all requests of the process.
+
+    A batcher thread takes requests off the queue and collects those that
+    arrive within batch_wait_ms of the first one, until max_batch_items items
+    (or a single request when merge_requests is false). Each batch runs through
+    _run_batch on an executor with max_workers threads, the batcher only collects
+    the next batch once one of them is free. Futures _run_batch leaves unresolved
+    fail with its exception, requests still queued after close with RuntimeError.
+    """
+
+    # Used in thread names and messages
+    name = "batching"
+
+    def __init__(
+        self,
+        model,
+        max_batch_items: int,
+        batch_wait_ms: float,
+        max_workers: int = 1,
+        merge_requests: bool = True,
+    ):
+        self.model = model
+        self.max_batch_items = max(1, max_batch_items)
+        self.batch_wait = max(0.0, batch_wait_ms) / 1000
+        self.max_workers = max(1, max_workers)
+        self.merge_requests = merge_requests
+
+        self._queue = queue.Queue()
+        self._slots = threading.Semaphore(self.max_workers)
+        self._executor = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"{self.name.capitalize()} worker is closed")
+            if self._thread is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=f"{self.name}-worker",
+                )
+                self._thread = threading.Thread(
+                    target=self._run, name=f"{self.name}-batcher", daemon=True
+                )
+                self._thread.start()
+
+    def _submit(self, items: list, options: Any = None) -> Future:
+        self._ensure_thread()
+        future = Future()
+        self._queue.put(BatchRequest(items, future, time.monotonic(), options))
+        return future
+
+    def close(self):
+        """Stops the worker threads so the model can be released."""
+        with self._lock:
+            self._closed = True
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread = None
+
+    def _collect(self, first: BatchRequest) -> Tuple[List[BatchRequest], bool]:
+        batch = [first]
+        items = len(first.items)
+        deadline = time.monotonic() + self.batch_wait
+
+        while self.merge_requests and items < self.max_batch_items:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if request is None:
+                return batch, True
+
+            batch.append(request)
+            items += len(request.items)
+        return batch, False
+
+    def _run(self):
+        executor = self._executor
+        stop = False
+        while not stop:
+            # Only collect the next batch once a worker is free to run it
+            self._slots.acquire()
+            request = self._queue.get()
+            if request is None:
+                self._slots.release()
+                break
+
+            batch, stop = self._collect(request)
+            executor.submit(self._run_batch_safely, batch)
+
+        executor.shutdown(wait=True)
+        # Fail whatever was queued after close instead of leaving callers waiting
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is not None and request.future.set_running_or_notify_cancel():
+                request.future.set_exception(
+                    RuntimeError(f"{self.name.capitalize()} worker is closed")
+                )
+
+    def _run_batch_safely(self, batch: List[BatchRequest]):
+        try:
+            batch = [
+                request
+                for request in batch
+                if request.future.set_running_or_notify_cancel()
+            ]
+            if batch:
+                self._run_batch(batch)
+        except Exception as e:
+            log.exception(f"{self.name.capitalize()} failed: {e}")
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+        finally:
+            self._slots.release()
+
+    def _run_batch(self, batch: List[BatchRequest]):
+        """Runs the model on a batch and resolves the future of every request."""
+        raise NotImplementedError
+
+
+class RerankingWorker(BatchingWorker, BaseReranker):
+    """
+    Runs a local reranking model on its own thread.
+
+    Requests that arrive within batch_wait_ms of each other are scored together
+    and the model never sees more than max_batch_pairs pairs per call. Models
+    that normalize scores over a whole request (ColBERT) are created with
+    merge_requests=False, their requests are still run on the worker thread but
+    one at a time.
+    """
+
+    name = "reranking"
+
+    def __init__(
+        self,
+        model,
+        max_batch_pairs: int = RAG_RERANKING_MAX_BATCH_PAIRS,
+        batch_wait_ms: float = RAG_RERANKING_BATCH_WAIT_MS,
+        merge_requests: bool = True,
+        predict_kwargs: Optional[dict] = None,
+    ):
+        super().__init__(
+            model, max_batch_pairs, batch_wait_ms, merge_requests=merge_requests
+        )
+        self.max_batch_pairs = self.max_batch_items
+        self.predict_kwargs = predict_kwargs or {}
+
+    def submit(self, sentences: List[Tuple[str, str]]) -> Future:
+        if not sentences:
+            future = Future()
+            future.set_result(np.array([], dtype=np.float32))
+            return future
+        return self._submit(list(sentences))
+
+    def predict(self, sentences: List[Tuple[str, str]]) -> Optional[List[float]]:
+        return self.submit(sentences).result()
+
+    async def apredict(self, sentences: List[Tuple[str, str]]):
+        return await asyncio.wrap_future(self.submit(sentences))
+
+    def _run_batch(self, batch: List[BatchRequest]):
+        if not self.merge_requests:
+            for request in batch:
+                request.future.set_result(
+                    self.model.predict(request.items, **self.predict_kwargs)
+                )
+            return
+
+        sentences = [pair for request in batch for pair in request.items]
+
+        scores = []
+        for start in range(0, len(sentences), self.max_batch_pairs):
+            scores.append(
+                np.asarray(
+                    self.model.predict(
+                        sentences[start : start + self.max_batch_pairs],
+                        **self.predict_kwargs,
+                    )
+                ).reshape(-1)
+            )
+        scores = np.concatenate(scores)
+
+        log.debug(f"Reranked {len(sentences)} pairs from {len(batch)} requests")
+
+        offset = 0
+        for request in batch:
+            request.future.set_result(scores[offset : offset + len(request.items)])
+            offset += len(request.items)
+
+
+# Used when RAG_EMBEDDING_BATCH_SIZE is left at 1, which is meant for remote
+# engines, same as the sentence-transformers default
+DEFAULT_EMBEDDING_BATCH_SIZE = 32
+
+
+class EmbeddingWorker(BatchingWorker):
+    """
+    Runs a local sentence-transformers model for all requests of the process.
+
+    Requests that arrive within batch_wait_ms of each other are embedded in one
+    call of up to batch_size texts, requests with more texts are split. Batches
+    run on their own executor with max_workers threads, while all of them are
+    busy new requests wait in the queue and end up in larger batches.
+    """
+
+    name = "embedding"
+
+    def __init__(
+        self,
+        model,
+        batch_size: Optional[int] = None,
+        batch_wait_ms: float = RAG_EMBEDDING_BATCH_WAIT_MS,
+        max_workers: int = RAG_EMBEDDING_WORKERS,
+    ):
+        super().__init__(
+            model,
+            (
+                batch_size
+                if batch_size and batch_size > 1
+                else DEFAULT_EMBEDDING_BATCH_SIZE
+            ),
+            batch_wait_ms,
+            max_workers=max_workers,
+        )
+        self.batch_size = self.max_batch_items
+
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "requests": 0,
+            "texts": 0,
+            "batches": 0,
+            "encode_seconds": 0.0,
+            "queue_seconds": 0.0,
+            "max_queue_seconds": 0.0,
+        }
+
+    def submit(self, texts: List[str], prefix: Optional[str] = None) -> List[Future]:
+        """Queues texts in requests of at most batch_size, one future each."""
+        self._ensure_thread()
+        return [
+            self._submit(texts[start : start + self.batch_size], prefix)
+            for start in range(0, len(texts), self.batch_size)
+        ]
+
+    def encode(self, query: Union[str, List[str]], prefix: Optional[str] = None):
+        texts = [query] if isinstance(query, str) else list(query)
+        embeddings = [
+            embedding
+            for future in self.submit(texts, prefix)
+            for embedding in future.result()
+        ]
+        return embeddings[0] if isinstance(query, str) else embeddings
+
+    async def aencode(self, query: Union[str, List[str]], prefix: Optional[str] = None):
+        texts = [query] if isinstance(query, str) else list(query)
+        results = await asyncio.gather(
+            *[asyncio.wrap_future(future) for future in self.submit(texts, prefix)]
+        )
+        embeddings = [embedding for result in results for embedding in result]
+        return embeddings[0] if isinstance(query, str) else embeddings
+
+    def get_metrics(self) -> dict:
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+
+        encode_seconds = metrics.pop("encode_seconds")
+        queue_seconds = metrics.pop("queue_seconds")
+        max_queue_seconds = metrics.pop("max_queue_seconds")
+        return {
+            **metrics,
+            "pending": self._queue.qsize(),
+            "batch_size": self.batch_size,
+            "workers": self.max_workers,
+            "avg_batch_size": (
+                metrics["texts"] / metrics["batches"] if metrics["batches"] else 0
+            ),
+            "texts_per_second": (
+                metrics["texts"] / encode_seconds if encode_seconds else 0
+            ),
+            "avg_queue_ms": (
+                queue_seconds * 1000 / metrics["requests"] if metrics["requests"] else 0
+            ),
+            "max_queue_ms": max_queue_seconds * 1000,
+        }
+
+    def _run_batch(self, batch: List[BatchRequest]):
+        started = time.monotonic()
+
+        # Texts are only merged with texts that use the same prompt
+        by_prefix = {}
+        for request in batch:
+            by_prefix.setdefault(request.options, []).append(request)
+
+        for prefix, requests in by_prefix.items():
+            self._encode_requests(prefix, requests, started)
+
+    def _encode_requests(self, prefix, requests: List[BatchRequest], started: float):
+        texts = [text for request in requests for text in request.items]
+
+        encode_started = time.monotonic()
+        embeddings = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            **({"prompt": prefix} if prefix else {}),
+        ).tolist()
+        encode_seconds = time.monotonic() - encode_started
+
+        queue_seconds = [started - request.queued_at for request in requests]
+        with self._metrics_lock:
+            self._metrics["requests"] += len(requests)
+            self._metrics["texts"] += len(texts)
+            self._metrics["batches"] += 1
+            self._metrics["encode_seconds"] += encode_seconds
+            self._metrics["queue_seconds"] += sum(queue_seconds)
+            self._metrics["max_queue_seconds"] = max(
+                self._metrics["max_queue_seconds"], *queue_seconds
+            )
+
+        log.debug(f"Embedded {len(texts)} texts from {len(requests)} requests")
+
+        offset = 0
+        for request in requests:
+            request.future.set_result(embeddings[offset : offset + len(request.items)])
+            offset += len(request.items)
@@ -0,0 +1,78 @@
+import importlib
+import threading
+from typing import Any, Iterator
+
+
+class LazyRegistry:
+    """
+    Maps names to "module:attribute" import paths and imports each target on
+    first lookup. Keeps optional integrations (search engines, document loaders,
+    vector database clients) and their dependencies out of the startup path.
+    """
+
+    def __init__(self, kind: str, entries: dict[str, str]):
+        self.kind = kind
+        self._entries = dict(entries)
+        self._resolved: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, target: str):
+        with self._lock:
+            self._entries[name] = target
+            self._resolved.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        resolved = self._resolved.get(name)
+        if resolved is not None:
+            return resolved
+
+        target = self._entries.get(name)
+        if target is None:
+            raise KeyError(f"Unknown {self.kind}: {name}")
+
+        module_name, _, attribute = target.partition(":")
+        resolved = getattr(importlib.import_module(module_name), attribute)
+
+        with self._lock:
+            self._resolved[name] = resolved
+        return resolved
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._resolved
+
+    def __getitem__(self, name: str) -> Any:
+        return self.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+
+class LazyObject:
+    """
+    Stand-in for a module level singleton that is only created, by calling
+    factory, the first time one of its attributes is accessed.
+    """
+
+    def __init__(self, factory):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _get_instance(self):
+        instance = object.__getattribute__(self, "_instance")
+        if instance is None:
+            with object.__getattribute__(self, "_lock"):
+                instance = object.__getattribute__(self, "_instance")
+                if instance is None:
+                    instance = object.__getattribute__(self, "_factory")()
+                    object.__setattr__(self, "_instance", instance)
+        return instance
+
+    def __getattr__(self, name: str):
+        return getattr(self._get_instance(), name)
+
+    def __setattr__(self, name: str, value):
+        setattr(self._get_instance(), name, value)
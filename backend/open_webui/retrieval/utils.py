@@ -6,6 +6,7 @@ import requests
 import aiohttp
 import asyncio
 import hashlib
+import inspect
 from concurrent.futures import ThreadPoolExecutor
 import time
 import re
@@ -18,6 +19,7 @@ from langchain_core.documents import Document
 
 from open_webui.config import VECTOR_DB
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.cache import RETRIEVAL_RESULT_CACHE
 
 
 from open_webui.models.users import UserModel
@@ -27,7 +29,7 @@ from open_webui.models.knowledge import Knowledges
 from open_webui.models.chats import Chats
 from open_webui.models.notes import Notes
 
-from open_webui.retrieval.vector.main import GetResult
+from open_webui.retrieval.vector.main import GET_RESULT_FIELDS, GetResult
 from open_webui.utils.access_control import has_access
 from open_webui.utils.headers import include_user_info_headers
 from open_webui.utils.misc import get_message_list
@@ -132,6 +134,43 @@ class VectorSearchRetriever(BaseRetriever):
         return results
 
 
+class HybridSearchRetriever(BaseRetriever):
+    """Runs the vector database's native hybrid search (see VectorDBBase.hybrid_search)."""
+
+    collection_name: Any
+    embedding_function: Any
+    top_k: int
+    bm25_weight: float
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        return []
+
+    async def _aget_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun,
+    ) -> list[Document]:
+        embedding = await self.embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)
+        result = await asyncio.to_thread(
+            VECTOR_DB_CLIENT.hybrid_search,
+            collection_name=self.collection_name,
+            query=query,
+            vector=embedding,
+            limit=self.top_k,
+            bm25_weight=self.bm25_weight,
+        )
+        if result is None:
+            raise Exception(f"Hybrid search failed for {self.collection_name}")
+
+        return [
+            Document(metadata=metadata, page_content=document)
+            for document, metadata in zip(result.documents[0], result.metadatas[0])
+        ]
+
+
 def query_doc(
     collection_name: str, query_embedding: list[float], k: int, user: UserModel = None
 ):
@@ -152,13 +191,42 @@ def query_doc(
         raise e
 
 
+def get_all_items(
+    collection_name: str,
+    filter: Optional[dict] = None,
+    include: Optional[list[str]] = None,
+) -> Optional[GetResult]:
+    """
+    Reads a whole collection (or the part matching filter) with iter_items, so
+    backends that page natively never run one query for the entire collection.
+    Returns None when nothing matches, like get_items.
+    """
+    fields = {}
+    for batch in VECTOR_DB_CLIENT.iter_items(
+        collection_name=collection_name, filter=filter, include=include
+    ):
+        for field in GET_RESULT_FIELDS:
+            value = getattr(batch, field, None)
+            if value is not None:
+                fields.setdefault(field, []).extend(value[0] if value else [])
+
+    if not fields:
+        return None
+    return GetResult(
+        **{
+            field: [fields[field]] if field in fields else None
+            for field in GET_RESULT_FIELDS
+        }
+    )
+
+
 def get_doc(collection_name: str, user: UserModel = None):
     try:
         log.debug(f"get_doc:doc {collection_name}")
-        result = VECTOR_DB_CLIENT.get(collection_name=collection_name)
+        result = get_all_items(collection_name)
 
         if result:
-            log.info(f"query_doc:result {result.ids} {result.metadatas}")
+            log.info(f"get_doc:result {len(result.ids[0])} items")
 
         return result
     except Exception as e:
@@ -269,43 +337,56 @@ async def query_doc_with_hybrid_search(
                 weights=[hybrid_bm25_weight, 1.0 - hybrid_bm25_weight],
             )
 
-        compressor = RerankCompressor(
+        result = await rerank_retriever_results(
+            retriever=ensemble_retriever,
+            query=query,
             embedding_function=embedding_function,
-            top_n=k_reranker,
+            k=k,
             reranking_function=reranking_function,
-            r_score=r,
+            k_reranker=k_reranker,
+            r=r,
         )
 
-        compression_retriever = ContextualCompressionRetriever(
-            base_compressor=compressor, base_retriever=ensemble_retriever
+        log.info(
+            "query_doc_with_hybrid_search:result "
+            + f'{result["metadatas"]} {result["distances"]}'
         )
+        return result
+    except Exception as e:
+        log.exception(f"Error querying doc {collection_name} with hybrid search: {e}")
+        raise e
 
-        result = await compression_retriever.ainvoke(query)
-
-        distances = [d.metadata.get("score") for d in result]
-        documents = [d.page_content for d in result]
-        metadatas = [d.metadata for d in result]
-
-        # retrieve only min(k, k_reranker) items, sort and cut by distance if k < k_reranker
-        if k < k_reranker:
-            sorted_items = sorted(
-                zip(distances, metadatas, documents), key=lambda x: x[0], reverse=True
-            )
-            sorted_items = sorted_items[:k]
 
-            if sorted_items:
-                distances, documents, metadatas = map(list, zip(*sorted_items))
-            else:
-                distances, documents, metadatas = [], [], []
+async def query_doc_with_native_hybrid_search(
+    collection_name: str,
+    query: str,
+    embedding_function,
+    k: int,
+    reranking_function,
+    k_reranker: int,
+    r: float,
+    hybrid_bm25_weight: float,
+) -> dict:
+    try:
+        log.debug(f"query_doc_with_native_hybrid_search:doc {collection_name}")
 
-        result = {
-            "distances": [distances],
-            "documents": [documents],
-            "metadatas": [metadatas],
-        }
+        result = await rerank_retriever_results(
+            retriever=HybridSearchRetriever(
+                collection_name=collection_name,
+                embedding_function=embedding_function,
+                top_k=k,
+                bm25_weight=hybrid_bm25_weight,
+            ),
+            query=query,
+            embedding_function=embedding_function,
+            k=k,
+            reranking_function=reranking_function,
+            k_reranker=k_reranker,
+            r=r,
+        )
 
         log.info(
-            "query_doc_with_hybrid_search:result "
+            "query_doc_with_native_hybrid_search:result "
             + f'{result["metadatas"]} {result["distances"]}'
         )
         return result
@@ -314,6 +395,51 @@ async def query_doc_with_hybrid_search(
         raise e
 
 
+async def rerank_retriever_results(
+    retriever,
+    query: str,
+    embedding_function,
+    k: int,
+    reranking_function,
+    k_reranker: int,
+    r: float,
+) -> dict:
+    compressor = RerankCompressor(
+        embedding_function=embedding_function,
+        top_n=k_reranker,
+        reranking_function=reranking_function,
+        r_score=r,
+    )
+
+    compression_retriever = ContextualCompressionRetriever(
+        base_compressor=compressor, base_retriever=retriever
+    )
+
+    result = await compression_retriever.ainvoke(query)
+
+    distances = [d.metadata.get("score") for d in result]
+    documents = [d.page_content for d in result]
+    metadatas = [d.metadata for d in result]
+
+    # retrieve only min(k, k_reranker) items, sort and cut by distance if k < k_reranker
+    if k < k_reranker:
+        sorted_items = sorted(
+            zip(distances, metadatas, documents), key=lambda x: x[0], reverse=True
+        )
+        sorted_items = sorted_items[:k]
+
+        if sorted_items:
+            distances, documents, metadatas = map(list, zip(*sorted_items))
+        else:
+            distances, documents, metadatas = [], [], []
+
+    return {
+        "distances": [distances],
+        "documents": [documents],
+        "metadatas": [metadatas],
+    }
+
+
 def merge_get_results(get_results: list[dict]) -> dict:
     # Initialize lists to store combined data
     combined_documents = []
@@ -466,16 +592,25 @@ async def query_collection_with_hybrid_search(
 ) -> dict:
     results = []
     error = False
+
+    # Backends with native hybrid search rank in the database, so the
+    # collections don't have to be loaded to build BM25 in Python. Enriched
+    # texts need chunk metadata, which is only indexed by the BM25 path.
+    native_hybrid_search = (
+        not enable_enriched_texts and VECTOR_DB_CLIENT.supports_hybrid_search()
+    )
+
     # Fetch collection data once per collection sequentially
     # Avoid fetching the same data multiple times later
     collection_results = {}
-    for collection_name in collection_names:
+    for collection_name in [] if native_hybrid_search else collection_names:
         try:
             log.debug(
-                f"query_collection_with_hybrid_search:VECTOR_DB_CLIENT.get:collection {collection_name}"
+                f"query_collection_with_hybrid_search:VECTOR_DB_CLIENT.get_items:collection {collection_name}"
             )
-            collection_results[collection_name] = VECTOR_DB_CLIENT.get(
-                collection_name=collection_name
+            # Only text and metadata are needed to build BM25
+            collection_results[collection_name] = get_all_items(
+                collection_name, include=["documents", "metadatas"]
             )
         except Exception as e:
             log.exception(f"Failed to fetch collection {collection_name}: {e}")
@@ -487,6 +622,19 @@ async def query_collection_with_hybrid_search(
 
     async def process_query(collection_name, query):
         try:
+            if native_hybrid_search:
+                result = await query_doc_with_native_hybrid_search(
+                    collection_name=collection_name,
+                    query=query,
+                    embedding_function=embedding_function,
+                    k=k,
+                    reranking_function=reranking_function,
+                    k_reranker=k_reranker,
+                    r=r,
+                    hybrid_bm25_weight=hybrid_bm25_weight,
+                )
+                return result, None
+
             result = await query_doc_with_hybrid_search(
                 collection_name=collection_name,
                 collection_result=collection_results[collection_name],
@@ -509,7 +657,7 @@ async def query_collection_with_hybrid_search(
     tasks = [
         (collection_name, query)
         for collection_name in collection_names
-        if collection_results[collection_name] is not None
+        if native_hybrid_search or collection_results[collection_name] is not None
         for query in queries
     ]
 
@@ -785,6 +933,13 @@ def get_embedding_function(
     enable_async=True,
 ) -> Awaitable:
     if embedding_engine == "":
+        if hasattr(embedding_function, "aencode"):
+            # Batched with the other requests by the EmbeddingWorker
+            async def async_embedding_function(query, prefix=None, user=None):
+                return await embedding_function.aencode(query, prefix)
+
+            return async_embedding_function
+
         # Sentence transformers: CPU-bound sync operation
         async def async_embedding_function(query, prefix=None, user=None):
             return await asyncio.to_thread(
@@ -907,14 +1062,22 @@ async def generate_embeddings(
 def get_reranking_function(reranking_engine, reranking_model, reranking_function):
     if reranking_function is None:
         return None
+    # Both return awaitables so the model never runs on the event loop
     if reranking_engine == "external":
-        return lambda query, documents, user=None: reranking_function.predict(
-            [(query, doc.page_content) for doc in documents], user=user
+        return lambda query, documents, user=None: asyncio.to_thread(
+            reranking_function.predict,
+            [(query, doc.page_content) for doc in documents],
+            user=user,
         )
-    else:
-        return lambda query, documents, user=None: reranking_function.predict(
+    elif hasattr(reranking_function, "apredict"):
+        return lambda query, documents, user=None: reranking_function.apredict(
             [(query, doc.page_content) for doc in documents]
         )
+    else:
+        return lambda query, documents, user=None: asyncio.to_thread(
+            reranking_function.predict,
+            [(query, doc.page_content) for doc in documents],
+        )
 
 
 async def get_sources_from_items(
@@ -1142,8 +1305,35 @@ async def get_sources_from_items(
                 if full_context:
                     query_result = get_all_items_from_collections(collection_names)
                 else:
+                    cache_key = None
                     query_result = None  # Initialize to None
-                    if hybrid_search:
+                    if RETRIEVAL_RESULT_CACHE.enabled:
+                        cache_key = await RETRIEVAL_RESULT_CACHE.aget_key(
+                            collection_names,
+                            queries,
+                            k=k,
+                            hybrid_search=hybrid_search,
+                            k_reranker=k_reranker,
+                            r=r,
+                            hybrid_bm25_weight=hybrid_bm25_weight,
+                            enriched_texts=request.app.state.config.ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS,
+                            embedding=(
+                                request.app.state.config.RAG_EMBEDDING_ENGINE,
+                                request.app.state.config.RAG_EMBEDDING_MODEL,
+                            ),
+                            reranking=(
+                                (
+                                    request.app.state.config.RAG_RERANKING_ENGINE,
+                                    request.app.state.config.RAG_RERANKING_MODEL,
+                                )
+                                if reranking_function
+                                else None
+                            ),
+                        )
+                        if cache_key:
+                            query_result = await RETRIEVAL_RESULT_CACHE.aget(cache_key)
+
+                    if hybrid_search and query_result is None:
                         try:
                             query_result = await query_collection_with_hybrid_search(
                                 collection_names=collection_names,
@@ -1169,6 +1359,9 @@ async def get_sources_from_items(
                             embedding_function=embedding_function,
                             k=k,
                         )
+
+                    if cache_key and query_result is not None:
+                        await RETRIEVAL_RESULT_CACHE.aset(cache_key, query_result)
             except Exception as e:
                 log.exception(e)
 
@@ -1286,6 +1479,8 @@ class RerankCompressor(BaseDocumentCompressor):
         scores = None
         if reranking:
             scores = self.reranking_function(query, documents)
+            if inspect.isawaitable(scores):
+                scores = await scores
         else:
             from sentence_transformers import util
 
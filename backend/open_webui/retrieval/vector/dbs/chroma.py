@@ -3,9 +3,10 @@ import logging
 from chromadb import Settings
 from chromadb.utils.batch_utils import create_batches
 
-from typing import Optional
+from typing import Iterator, Optional, Sequence
 
 from open_webui.retrieval.vector.main import (
+    DEFAULT_GET_INCLUDE,
     VectorDBBase,
     VectorItem,
     SearchResult,
@@ -137,6 +138,92 @@ class ChromaClient(VectorDBBase):
             )
         return None
 
+    def _get_projected(
+        self,
+        collection,
+        filter: Optional[dict],
+        include: Optional[Sequence[str]],
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> GetResult:
+        include = DEFAULT_GET_INCLUDE if include is None else include
+        chroma_include = [
+            chroma_field
+            for field, chroma_field in (
+                ("documents", "documents"),
+                ("metadatas", "metadatas"),
+                ("vectors", "embeddings"),
+            )
+            if field in include
+        ]
+
+        result = collection.get(
+            where=filter or None,
+            limit=limit,
+            offset=offset,
+            include=chroma_include,
+        )
+
+        vectors = result.get("embeddings") if "vectors" in include else None
+        return GetResult(
+            ids=[result["ids"]] if "ids" in include else None,
+            documents=[result["documents"]] if "documents" in include else None,
+            metadatas=[result["metadatas"]] if "metadatas" in include else None,
+            vectors=(
+                [[list(map(float, vector)) for vector in vectors]]
+                if vectors is not None
+                else None
+            ),
+        )
+
+    def get_items(
+        self,
+        collection_name: str,
+        filter: Optional[dict] = None,
+        include: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+    ) -> Optional[GetResult]:
+        try:
+            collection = self.client.get_collection(name=collection_name)
+            if collection:
+                return self._get_projected(collection, filter, include, limit)
+            return None
+        except Exception as e:
+            return None
+
+    def iter_items(
+        self,
+        collection_name: str,
+        filter: Optional[dict] = None,
+        include: Optional[Sequence[str]] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[GetResult]:
+        try:
+            collection = self.client.get_collection(name=collection_name)
+        except Exception:
+            return
+
+        offset = 0
+        while True:
+            result = self._get_projected(
+                collection,
+                filter,
+                ["ids", *(include or DEFAULT_GET_INCLUDE)],
+                batch_size,
+                offset,
+            )
+            count = len(result.ids[0])
+            if count == 0:
+                return
+
+            if include is not None and "ids" not in include:
+                result.ids = None
+            yield result
+
+            if count < batch_size:
+                return
+            offset += count
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
         collection = self.client.get_or_create_collection(
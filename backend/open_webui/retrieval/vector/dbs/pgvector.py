@@ -1,7 +1,10 @@
-from typing import Optional, List, Dict, Any, Tuple
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any, Iterator, Sequence, Tuple
 import logging
 import json
+import re
 from sqlalchemy import (
+    bindparam,
     func,
     literal,
     cast,
@@ -20,8 +23,8 @@ from sqlalchemy import (
 from sqlalchemy.sql import true
 from sqlalchemy.pool import NullPool, QueuePool
 
-from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
-from sqlalchemy.dialects.postgresql import JSONB, array
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.dialects.postgresql import JSONB, array, insert as pg_insert
 from pgvector.sqlalchemy import Vector, HALFVEC
 from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.exc import NoSuchTableError
@@ -29,6 +32,7 @@ from sqlalchemy.exc import NoSuchTableError
 
 from open_webui.retrieval.vector.utils import process_metadata
 from open_webui.retrieval.vector.main import (
+    DEFAULT_GET_INCLUDE,
     VectorDBBase,
     VectorItem,
     SearchResult,
@@ -49,6 +53,8 @@ from open_webui.config import (
     PGVECTOR_HNSW_EF_CONSTRUCTION,
     PGVECTOR_IVFFLAT_LISTS,
     PGVECTOR_USE_HALFVEC,
+    PGVECTOR_ENABLE_HYBRID_SEARCH,
+    PGVECTOR_TEXT_SEARCH_CONFIG,
 )
 
 from open_webui.env import SRC_LOG_LEVELS
@@ -58,11 +64,69 @@ USE_HALFVEC = PGVECTOR_USE_HALFVEC
 
 VECTOR_TYPE_FACTORY = HALFVEC if USE_HALFVEC else Vector
 VECTOR_OPCLASS = "halfvec_cosine_ops" if USE_HALFVEC else "vector_cosine_ops"
+VECTOR_TYPE_NAME = "halfvec" if USE_HALFVEC else "vector"
 Base = declarative_base()
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
+# The text search configuration is interpolated into DDL, so only accept names
+if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_.]*", PGVECTOR_TEXT_SEARCH_CONFIG):
+    raise ValueError(
+        f"Invalid PGVECTOR_TEXT_SEARCH_CONFIG: {PGVECTOR_TEXT_SEARCH_CONFIG}"
+    )
+
+# Constant of reciprocal rank fusion, same as langchain's EnsembleRetriever
+HYBRID_SEARCH_RRF_K = 60
+
+# Fuses the nearest chunks by cosine distance with the best full-text matches
+# using weighted reciprocal rank fusion. The query terms are OR-ed, like BM25,
+# rather than requiring every term to match.
+HYBRID_SEARCH_SQL = f"""
+WITH vector_hits AS (
+    SELECT id, row_number() OVER (ORDER BY distance) AS rank
+    FROM (
+        SELECT id,
+               vector <=> CAST(:query_vector AS {VECTOR_TYPE_NAME}({VECTOR_LENGTH})) AS distance
+        FROM document_chunk
+        WHERE collection_name = :collection_name
+        ORDER BY distance
+        LIMIT :vector_limit
+    ) AS nearest
+),
+ts AS (
+    SELECT CAST(
+        replace(
+            CAST(plainto_tsquery(CAST(:ts_config AS regconfig), :query) AS text),
+            '&',
+            '|'
+        ) AS tsquery
+    ) AS query
+),
+text_hits AS (
+    SELECT id, row_number() OVER (ORDER BY score DESC) AS rank
+    FROM (
+        SELECT document_chunk.id, ts_rank_cd(document_chunk.text_tsv, ts.query) AS score
+        FROM document_chunk, ts
+        WHERE document_chunk.collection_name = :collection_name
+          AND document_chunk.text_tsv @@ ts.query
+        ORDER BY score DESC
+        LIMIT :text_limit
+    ) AS matches
+),
+fused AS (
+    SELECT COALESCE(v.id, t.id) AS id,
+           COALESCE(CAST(:vector_weight AS float8) / (:rrf_k + v.rank), 0)
+           + COALESCE(CAST(:bm25_weight AS float8) / (:rrf_k + t.rank), 0) AS score
+    FROM vector_hits AS v
+    FULL OUTER JOIN text_hits AS t ON v.id = t.id
+)
+SELECT document_chunk.id, document_chunk.text, document_chunk.vmetadata, fused.score
+FROM fused
+JOIN document_chunk ON document_chunk.id = fused.id
+ORDER BY fused.score DESC
+"""
+
 
 def pgcrypto_encrypt(val, key):
     return func.pgp_sym_encrypt(val, literal(key))
@@ -89,12 +153,17 @@ class DocumentChunk(Base):
 
 class PgvectorClient(VectorDBBase):
     def __init__(self) -> None:
+        # Encrypted chunk text cannot be indexed for full-text search
+        self.hybrid_search_enabled = (
+            PGVECTOR_ENABLE_HYBRID_SEARCH and not PGVECTOR_PGCRYPTO
+        )
 
         # if no pgvector uri, use the existing database connection
         if not PGVECTOR_DB_URL:
-            from open_webui.internal.db import Session
+            from open_webui.internal.db import SessionLocal, engine
 
-            self.session = Session
+            self.engine = engine
+            self.SessionLocal = SessionLocal
         else:
             if isinstance(PGVECTOR_POOL_SIZE, int):
                 if PGVECTOR_POOL_SIZE > 0:
@@ -114,16 +183,17 @@ class PgvectorClient(VectorDBBase):
             else:
                 engine = create_engine(PGVECTOR_DB_URL, pool_pre_ping=True)
 
-            SessionLocal = sessionmaker(
+            self.engine = engine
+            self.SessionLocal = sessionmaker(
                 autocommit=False, autoflush=False, bind=engine, expire_on_commit=False
             )
-            self.session = scoped_session(SessionLocal)
 
+        session = self.SessionLocal()
         try:
             # Ensure the pgvector extension is available
             # Use a conditional check to avoid permission issues on Azure PostgreSQL
             if PGVECTOR_CREATE_EXTENSION:
-                self.session.execute(
+                session.execute(
                     text(
                         """
                     DO $$
@@ -139,7 +209,7 @@ class PgvectorClient(VectorDBBase):
             if PGVECTOR_PGCRYPTO:
                 # Ensure the pgcrypto extension is available for encryption
                 # Use a conditional check to avoid permission issues on Azure PostgreSQL
-                self.session.execute(
+                session.execute(
                     text(
                         """
                     DO $$
@@ -163,24 +233,50 @@ class PgvectorClient(VectorDBBase):
             # Create the tables if they do not exist
             # Base.metadata.create_all requires a bind (engine or connection)
             # Get the connection from the session
-            connection = self.session.connection()
+            connection = session.connection()
             Base.metadata.create_all(bind=connection)
 
             index_method, index_options = self._vector_index_configuration()
-            self._ensure_vector_index(index_method, index_options)
+            self._ensure_vector_index(session, index_method, index_options)
 
-            self.session.execute(
+            session.execute(
                 text(
                     "CREATE INDEX IF NOT EXISTS idx_document_chunk_collection_name "
                     "ON document_chunk (collection_name);"
                 )
             )
-            self.session.commit()
+
+            if self.hybrid_search_enabled:
+                try:
+                    with session.begin_nested():
+                        self._ensure_text_search_index(session)
+                except Exception as e:
+                    log.warning(
+                        f"Full-text index unavailable, hybrid search will use BM25: {e}"
+                    )
+                    self.hybrid_search_enabled = False
+
+            session.commit()
             log.info("Initialization complete.")
         except Exception as e:
-            self.session.rollback()
+            session.rollback()
             log.exception(f"Error during initialization: {e}")
             raise
+        finally:
+            session.close()
+
+    @contextmanager
+    def get_session(self):
+        """
+        A session for a single operation. Each caller gets its own connection
+        from the pool, so concurrent requests don't share (and serialize on) one
+        session; the connection is returned when the block exits.
+        """
+        session = self.SessionLocal()
+        try:
+            yield session
+        finally:
+            session.close()
 
     @staticmethod
     def _extract_index_method(index_def: Optional[str]) -> Optional[str]:
@@ -215,9 +311,11 @@ class PgvectorClient(VectorDBBase):
 
         return index_method, index_options
 
-    def _ensure_vector_index(self, index_method: str, index_options: str) -> None:
+    def _ensure_vector_index(
+        self, session, index_method: str, index_options: str
+    ) -> None:
         index_name = "idx_document_chunk_vector"
-        existing_index_def = self.session.execute(
+        existing_index_def = session.execute(
             text(
                 """
                 SELECT indexdef
@@ -246,7 +344,7 @@ class PgvectorClient(VectorDBBase):
             )
             if index_options:
                 index_sql = f"{index_sql} {index_options}"
-            self.session.execute(text(index_sql))
+            session.execute(text(index_sql))
             log.info(
                 "Ensured vector index '%s' using %s%s.",
                 index_name,
@@ -254,6 +352,48 @@ class PgvectorClient(VectorDBBase):
                 f" {index_options}" if index_options else "",
             )
 
+    def _ensure_text_search_index(self, session) -> None:
+        has_column = session.execute(
+            text(
+                """
+                SELECT 1
+                FROM information_schema.columns
+                WHERE table_schema = current_schema()
+                  AND table_name = 'document_chunk'
+                  AND column_name = 'text_tsv'
+                """
+            )
+        ).scalar()
+
+        if not has_column:
+            # A stored generated column is backfilled once for existing rows and
+            # kept in sync by Postgres on every insert and update. The backfill
+            # rewrites the table, which is why PGVECTOR_ENABLE_HYBRID_SEARCH is
+            # opt-in.
+            column_sql = (
+                "ALTER TABLE document_chunk ADD COLUMN IF NOT EXISTS text_tsv tsvector "
+                "GENERATED ALWAYS AS (to_tsvector("
+                f"'{PGVECTOR_TEXT_SEARCH_CONFIG}'::regconfig, coalesce(text, '')"
+                ")) STORED"
+            )
+            log.warning(
+                "Adding the full-text column to document_chunk, this rewrites the "
+                "table once: %s",
+                column_sql,
+            )
+            session.execute(text(column_sql))
+
+        session.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS idx_document_chunk_text_tsv "
+                "ON document_chunk USING gin (text_tsv);"
+            )
+        )
+        log.info(
+            "Ensured full-text index on document_chunk using '%s'.",
+            PGVECTOR_TEXT_SEARCH_CONFIG,
+        )
+
     def check_vector_length(self) -> None:
         """
         Check if the VECTOR_LENGTH matches the existing vector column dimension in the database.
@@ -263,7 +403,7 @@ class PgvectorClient(VectorDBBase):
         try:
             # Attempt to reflect the 'document_chunk' table
             document_chunk_table = Table(
-                "document_chunk", metadata, autoload_with=self.session.bind
+                "document_chunk", metadata, autoload_with=self.engine
             )
         except NoSuchTableError:
             # Table does not exist; no action needed
@@ -303,127 +443,98 @@ class PgvectorClient(VectorDBBase):
             vector = vector[:VECTOR_LENGTH]
         return vector
 
-    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
-        try:
-            if PGVECTOR_PGCRYPTO:
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    # Use raw SQL for BYTEA/pgcrypto
-                    # Ensure metadata is converted to its JSON text representation
-                    json_metadata = json.dumps(item["metadata"])
-                    self.session.execute(
-                        text(
-                            """
-                            INSERT INTO document_chunk
-                            (id, vector, collection_name, text, vmetadata)
-                            VALUES (
-                                :id, :vector, :collection_name,
-                                pgp_sym_encrypt(:text, :key),
-                                pgp_sym_encrypt(:metadata_text, :key)
-                            )
-                            ON CONFLICT (id) DO NOTHING
-                        """
-                        ),
-                        {
-                            "id": item["id"],
-                            "vector": vector,
-                            "collection_name": collection_name,
-                            "text": item["text"],
-                            "metadata_text": json_metadata,
-                            "key": PGVECTOR_PGCRYPTO_KEY,
-                        },
-                    )
-                self.session.commit()
-                log.info(f"Encrypted & inserted {len(items)} into '{collection_name}'")
+    def _get_write_statement(self, upsert: bool):
+        table = DocumentChunk.__table__
+        if PGVECTOR_PGCRYPTO:
+            # Encrypt in the database, once per row of the multi-row insert
+            stmt = pg_insert(table).values(
+                id=bindparam("chunk_id"),
+                vector=bindparam("chunk_vector"),
+                collection_name=bindparam("chunk_collection_name"),
+                text=func.pgp_sym_encrypt(
+                    bindparam("chunk_text", type_=Text), bindparam("chunk_key")
+                ),
+                vmetadata=func.pgp_sym_encrypt(
+                    bindparam("chunk_metadata", type_=Text), bindparam("chunk_key")
+                ),
+            )
+        else:
+            stmt = pg_insert(table).values(
+                id=bindparam("chunk_id"),
+                vector=bindparam("chunk_vector"),
+                collection_name=bindparam("chunk_collection_name"),
+                text=bindparam("chunk_text"),
+                vmetadata=bindparam("chunk_metadata"),
+            )
 
+        if upsert:
+            return stmt.on_conflict_do_update(
+                index_elements=[table.c.id],
+                set_={
+                    "vector": stmt.excluded.vector,
+                    "collection_name": stmt.excluded.collection_name,
+                    "text": stmt.excluded.text,
+                    "vmetadata": stmt.excluded.vmetadata,
+                },
+            )
+        # A plain insert fails on an existing id, like adding the rows one by one
+        return stmt
+
+    def _get_write_rows(
+        self, collection_name: str, items: List[VectorItem], upsert: bool
+    ) -> List[Dict[str, Any]]:
+        rows = []
+        for item in items:
+            row = {
+                "chunk_id": item["id"],
+                "chunk_vector": self.adjust_vector_length(item["vector"]),
+                "chunk_collection_name": collection_name,
+                "chunk_text": item["text"],
+            }
+            if PGVECTOR_PGCRYPTO:
+                # Ensure metadata is converted to its JSON text representation
+                row["chunk_metadata"] = json.dumps(item["metadata"])
+                row["chunk_key"] = PGVECTOR_PGCRYPTO_KEY
             else:
-                new_items = []
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    new_chunk = DocumentChunk(
-                        id=item["id"],
-                        vector=vector,
-                        collection_name=collection_name,
-                        text=item["text"],
-                        vmetadata=process_metadata(item["metadata"]),
-                    )
-                    new_items.append(new_chunk)
-                self.session.bulk_save_objects(new_items)
-                self.session.commit()
+                row["chunk_metadata"] = process_metadata(item["metadata"])
+
+            rows.append(row)
+
+        if upsert:
+            # One statement can't touch a row twice, the last item for an id wins
+            rows = list({row["chunk_id"]: row for row in rows}.values())
+        return rows
+
+    def _write(
+        self, collection_name: str, items: List[VectorItem], upsert: bool
+    ) -> None:
+        if not items:
+            return
+
+        # Executed as batched multi-row INSERT ... VALUES statements rather
+        # than one round trip per chunk
+        with self.get_session() as session:
+            try:
+                session.execute(
+                    self._get_write_statement(upsert),
+                    self._get_write_rows(collection_name, items, upsert),
+                )
+                session.commit()
                 log.info(
-                    f"Inserted {len(new_items)} items into collection '{collection_name}'."
+                    f"{'Upserted' if upsert else 'Inserted'} {len(items)} items "
+                    f"into collection '{collection_name}'"
+                    f"{' (encrypted)' if PGVECTOR_PGCRYPTO else ''}."
                 )
-        except Exception as e:
-            self.session.rollback()
-            log.exception(f"Error during insert: {e}")
-            raise
+            except Exception as e:
+                session.rollback()
+                log.exception(f"Error during {'upsert' if upsert else 'insert'}: {e}")
+                raise
+
+    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+        self._write(collection_name, items, upsert=False)
 
     def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
-        try:
-            if PGVECTOR_PGCRYPTO:
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    json_metadata = json.dumps(item["metadata"])
-                    self.session.execute(
-                        text(
-                            """
-                            INSERT INTO document_chunk
-                            (id, vector, collection_name, text, vmetadata)
-                            VALUES (
-                                :id, :vector, :collection_name,
-                                pgp_sym_encrypt(:text, :key),
-                                pgp_sym_encrypt(:metadata_text, :key)
-                            )
-                            ON CONFLICT (id) DO UPDATE SET
-                              vector = EXCLUDED.vector,
-                              collection_name = EXCLUDED.collection_name,
-                              text = EXCLUDED.text,
-                              vmetadata = EXCLUDED.vmetadata
-                        """
-                        ),
-                        {
-                            "id": item["id"],
-                            "vector": vector,
-                            "collection_name": collection_name,
-                            "text": item["text"],
-                            "metadata_text": json_metadata,
-                            "key": PGVECTOR_PGCRYPTO_KEY,
-                        },
-                    )
-                self.session.commit()
-                log.info(f"Encrypted & upserted {len(items)} into '{collection_name}'")
-            else:
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    existing = (
-                        self.session.query(DocumentChunk)
-                        .filter(DocumentChunk.id == item["id"])
-                        .first()
-                    )
-                    if existing:
-                        existing.vector = vector
-                        existing.text = item["text"]
-                        existing.vmetadata = process_metadata(item["metadata"])
-                        existing.collection_name = (
-                            collection_name  # Update collection_name if necessary
-                        )
-                    else:
-                        new_chunk = DocumentChunk(
-                            id=item["id"],
-                            vector=vector,
-                            collection_name=collection_name,
-                            text=item["text"],
-                            vmetadata=process_metadata(item["metadata"]),
-                        )
-                        self.session.add(new_chunk)
-                self.session.commit()
-                log.info(
-                    f"Upserted {len(items)} items into collection '{collection_name}'."
-                )
-        except Exception as e:
-            self.session.rollback()
-            log.exception(f"Error during upsert: {e}")
-            raise
+        self._write(collection_name, items, upsert=True)
 
     def search(
         self,
@@ -431,214 +542,296 @@ class PgvectorClient(VectorDBBase):
         vectors: List[List[float]],
         limit: Optional[int] = None,
     ) -> Optional[SearchResult]:
-        try:
-            if not vectors:
-                return None
-
-            # Adjust query vectors to VECTOR_LENGTH
-            vectors = [self.adjust_vector_length(vector) for vector in vectors]
-            num_queries = len(vectors)
-
-            def vector_expr(vector):
-                return cast(array(vector), VECTOR_TYPE_FACTORY(VECTOR_LENGTH))
+        with self.get_session() as session:
+            try:
+                if not vectors:
+                    return None
 
-            # Create the values for query vectors
-            qid_col = column("qid", Integer)
-            q_vector_col = column("q_vector", VECTOR_TYPE_FACTORY(VECTOR_LENGTH))
-            query_vectors = (
-                values(qid_col, q_vector_col)
-                .data(
-                    [(idx, vector_expr(vector)) for idx, vector in enumerate(vectors)]
+                # Adjust query vectors to VECTOR_LENGTH
+                vectors = [self.adjust_vector_length(vector) for vector in vectors]
+                num_queries = len(vectors)
+
+                def vector_expr(vector):
+                    return cast(array(vector), VECTOR_TYPE_FACTORY(VECTOR_LENGTH))
+
+                # Create the values for query vectors
+                qid_col = column("qid", Integer)
+                q_vector_col = column("q_vector", VECTOR_TYPE_FACTORY(VECTOR_LENGTH))
+                query_vectors = (
+                    values(qid_col, q_vector_col)
+                    .data(
+                        [
+                            (idx, vector_expr(vector))
+                            for idx, vector in enumerate(vectors)
+                        ]
+                    )
+                    .alias("query_vectors")
                 )
-                .alias("query_vectors")
-            )
 
-            result_fields = [
-                DocumentChunk.id,
-            ]
-            if PGVECTOR_PGCRYPTO:
-                result_fields.append(
-                    pgcrypto_decrypt(
-                        DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text
-                    ).label("text")
-                )
+                result_fields = [
+                    DocumentChunk.id,
+                ]
+                if PGVECTOR_PGCRYPTO:
+                    result_fields.append(
+                        pgcrypto_decrypt(
+                            DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text
+                        ).label("text")
+                    )
+                    result_fields.append(
+                        pgcrypto_decrypt(
+                            DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
+                        ).label("vmetadata")
+                    )
+                else:
+                    result_fields.append(DocumentChunk.text)
+                    result_fields.append(DocumentChunk.vmetadata)
                 result_fields.append(
-                    pgcrypto_decrypt(
-                        DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
-                    ).label("vmetadata")
-                )
-            else:
-                result_fields.append(DocumentChunk.text)
-                result_fields.append(DocumentChunk.vmetadata)
-            result_fields.append(
-                (DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector)).label(
-                    "distance"
+                    (
+                        DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector)
+                    ).label("distance")
                 )
-            )
 
-            # Build the lateral subquery for each query vector
-            subq = (
-                select(*result_fields)
-                .where(DocumentChunk.collection_name == collection_name)
-                .order_by(
-                    (DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector))
+                # Build the lateral subquery for each query vector
+                subq = (
+                    select(*result_fields)
+                    .where(DocumentChunk.collection_name == collection_name)
+                    .order_by(
+                        (DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector))
+                    )
                 )
-            )
-            if limit is not None:
-                subq = subq.limit(limit)
-            subq = subq.lateral("result")
-
-            # Build the main query by joining query_vectors and the lateral subquery
-            stmt = (
-                select(
-                    query_vectors.c.qid,
-                    subq.c.id,
-                    subq.c.text,
-                    subq.c.vmetadata,
-                    subq.c.distance,
+                if limit is not None:
+                    subq = subq.limit(limit)
+                subq = subq.lateral("result")
+
+                # Build the main query by joining query_vectors and the lateral subquery
+                stmt = (
+                    select(
+                        query_vectors.c.qid,
+                        subq.c.id,
+                        subq.c.text,
+                        subq.c.vmetadata,
+                        subq.c.distance,
+                    )
+                    .select_from(query_vectors)
+                    .join(subq, true())
+                    .order_by(query_vectors.c.qid, subq.c.distance)
                 )
-                .select_from(query_vectors)
-                .join(subq, true())
-                .order_by(query_vectors.c.qid, subq.c.distance)
-            )
 
-            result_proxy = self.session.execute(stmt)
-            results = result_proxy.all()
+                result_proxy = session.execute(stmt)
+                results = result_proxy.all()
 
-            ids = [[] for _ in range(num_queries)]
-            distances = [[] for _ in range(num_queries)]
-            documents = [[] for _ in range(num_queries)]
-            metadatas = [[] for _ in range(num_queries)]
+                ids = [[] for _ in range(num_queries)]
+                distances = [[] for _ in range(num_queries)]
+                documents = [[] for _ in range(num_queries)]
+                metadatas = [[] for _ in range(num_queries)]
+
+                if not results:
+                    return SearchResult(
+                        ids=ids,
+                        distances=distances,
+                        documents=documents,
+                        metadatas=metadatas,
+                    )
+
+                for row in results:
+                    qid = int(row.qid)
+                    ids[qid].append(row.id)
+                    # normalize and re-orders pgvec distance from [2, 0] to [0, 1] score range
+                    # https://github.com/pgvector/pgvector?tab=readme-ov-file#querying
+                    distances[qid].append((2.0 - row.distance) / 2.0)
+                    documents[qid].append(row.text)
+                    metadatas[qid].append(row.vmetadata)
 
-            if not results:
                 return SearchResult(
                     ids=ids,
                     distances=distances,
                     documents=documents,
                     metadatas=metadatas,
                 )
+            except Exception as e:
+                session.rollback()
+                log.exception(f"Error during search: {e}")
+                return None
 
-            for row in results:
-                qid = int(row.qid)
-                ids[qid].append(row.id)
-                # normalize and re-orders pgvec distance from [2, 0] to [0, 1] score range
-                # https://github.com/pgvector/pgvector?tab=readme-ov-file#querying
-                distances[qid].append((2.0 - row.distance) / 2.0)
-                documents[qid].append(row.text)
-                metadatas[qid].append(row.vmetadata)
-
-            self.session.rollback()  # read-only transaction
-            return SearchResult(
-                ids=ids, distances=distances, documents=documents, metadatas=metadatas
-            )
-        except Exception as e:
-            self.session.rollback()
-            log.exception(f"Error during search: {e}")
-            return None
-
-    def query(
-        self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None
-    ) -> Optional[GetResult]:
-        try:
-            if PGVECTOR_PGCRYPTO:
-                # Build where clause for vmetadata filter
-                where_clauses = [DocumentChunk.collection_name == collection_name]
-                for key, value in filter.items():
-                    # decrypt then check key: JSON filter after decryption
-                    where_clauses.append(
-                        pgcrypto_decrypt(
-                            DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
-                        )[key].astext
-                        == str(value)
-                    )
-                stmt = select(
-                    DocumentChunk.id,
-                    pgcrypto_decrypt(
-                        DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text
-                    ).label("text"),
-                    pgcrypto_decrypt(
-                        DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
-                    ).label("vmetadata"),
-                ).where(*where_clauses)
-                if limit is not None:
-                    stmt = stmt.limit(limit)
-                results = self.session.execute(stmt).all()
-            else:
-                query = self.session.query(DocumentChunk).filter(
-                    DocumentChunk.collection_name == collection_name
-                )
-
-                for key, value in filter.items():
-                    query = query.filter(
-                        DocumentChunk.vmetadata[key].astext == str(value)
-                    )
+    def supports_hybrid_search(self) -> bool:
+        return self.hybrid_search_enabled
 
-                if limit is not None:
-                    query = query.limit(limit)
+    def hybrid_search(
+        self,
+        collection_name: str,
+        query: str,
+        vector: List[float],
+        limit: int,
+        bm25_weight: float = 0.5,
+    ) -> Optional[SearchResult]:
+        with self.get_session() as session:
+            try:
+                bm25_weight = min(max(bm25_weight, 0.0), 1.0)
 
-                results = query.all()
+                stmt = text(HYBRID_SEARCH_SQL).bindparams(
+                    bindparam("query_vector", type_=VECTOR_TYPE_FACTORY(VECTOR_LENGTH))
+                )
+                results = session.execute(
+                    stmt,
+                    {
+                        "query_vector": self.adjust_vector_length(list(vector)),
+                        "query": query,
+                        "collection_name": collection_name,
+                        "ts_config": PGVECTOR_TEXT_SEARCH_CONFIG,
+                        # A signal with no weight is not searched at all
+                        "vector_limit": limit if bm25_weight < 1 else 0,
+                        "text_limit": limit if bm25_weight > 0 else 0,
+                        "vector_weight": 1.0 - bm25_weight,
+                        "bm25_weight": bm25_weight,
+                        "rrf_k": HYBRID_SEARCH_RRF_K,
+                    },
+                ).all()
 
-            if not results:
+                return SearchResult(
+                    ids=[[row.id for row in results]],
+                    distances=[[row.score for row in results]],
+                    documents=[[row.text for row in results]],
+                    metadatas=[[row.vmetadata for row in results]],
+                )
+            except Exception as e:
+                session.rollback()
+                log.exception(f"Error during hybrid search: {e}")
                 return None
 
-            ids = [[result.id for result in results]]
-            documents = [[result.text for result in results]]
-            metadatas = [[result.vmetadata for result in results]]
+    def _metadata_field(self, key: str):
+        if PGVECTOR_PGCRYPTO:
+            # decrypt then check key: JSON filter after decryption
+            return pgcrypto_decrypt(
+                DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
+            )[key].astext
+        return DocumentChunk.vmetadata[key].astext
 
-            self.session.rollback()  # read-only transaction
-            return GetResult(
-                ids=ids,
-                documents=documents,
-                metadatas=metadatas,
+    def _select_items(
+        self,
+        collection_name: str,
+        filter: Optional[Dict[str, Any]] = None,
+        include: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+        after_id: Optional[str] = None,
+    ):
+        # Only the requested columns are read, the vector column in particular
+        # is many times larger than the text it belongs to
+        include = DEFAULT_GET_INCLUDE if include is None else include
+
+        columns = [DocumentChunk.id]
+        if "documents" in include:
+            columns.append(
+                pgcrypto_decrypt(DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text).label(
+                    "text"
+                )
+                if PGVECTOR_PGCRYPTO
+                else DocumentChunk.text
             )
-        except Exception as e:
-            self.session.rollback()
-            log.exception(f"Error during query: {e}")
-            return None
+        if "metadatas" in include:
+            columns.append(
+                pgcrypto_decrypt(
+                    DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
+                ).label("vmetadata")
+                if PGVECTOR_PGCRYPTO
+                else DocumentChunk.vmetadata
+            )
+        if "vectors" in include:
+            columns.append(DocumentChunk.vector)
 
-    def get(
-        self, collection_name: str, limit: Optional[int] = None
-    ) -> Optional[GetResult]:
-        try:
-            if PGVECTOR_PGCRYPTO:
-                stmt = select(
-                    DocumentChunk.id,
-                    pgcrypto_decrypt(
-                        DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text
-                    ).label("text"),
-                    pgcrypto_decrypt(
-                        DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
-                    ).label("vmetadata"),
-                ).where(DocumentChunk.collection_name == collection_name)
-                if limit is not None:
-                    stmt = stmt.limit(limit)
-                results = self.session.execute(stmt).all()
-                ids = [[row.id for row in results]]
-                documents = [[row.text for row in results]]
-                metadatas = [[row.vmetadata for row in results]]
-            else:
+        stmt = select(*columns).where(DocumentChunk.collection_name == collection_name)
+        for key, value in (filter or {}).items():
+            stmt = stmt.where(self._metadata_field(key) == str(value))
 
-                query = self.session.query(DocumentChunk).filter(
-                    DocumentChunk.collection_name == collection_name
-                )
-                if limit is not None:
-                    query = query.limit(limit)
+        if after_id is not None:
+            stmt = stmt.where(DocumentChunk.id > after_id)
+        if after_id is not None or limit is not None:
+            stmt = stmt.order_by(DocumentChunk.id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return stmt
 
-                results = query.all()
+    @staticmethod
+    def _rows_to_get_result(rows, include: Optional[Sequence[str]]) -> GetResult:
+        include = DEFAULT_GET_INCLUDE if include is None else include
+
+        def vector_to_list(vector):
+            # numpy arrays for vector, HalfVector for halfvec
+            return vector.tolist() if hasattr(vector, "tolist") else vector.to_list()
+
+        return GetResult(
+            ids=[[row.id for row in rows]] if "ids" in include else None,
+            documents=[[row.text for row in rows]] if "documents" in include else None,
+            metadatas=(
+                [[row.vmetadata for row in rows]] if "metadatas" in include else None
+            ),
+            vectors=(
+                [[vector_to_list(row.vector) for row in rows]]
+                if "vectors" in include
+                else None
+            ),
+        )
 
-                if not results:
+    def get_items(
+        self,
+        collection_name: str,
+        filter: Optional[Dict[str, Any]] = None,
+        include: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+    ) -> Optional[GetResult]:
+        with self.get_session() as session:
+            try:
+                rows = session.execute(
+                    self._select_items(collection_name, filter, include, limit)
+                ).all()
+                if not rows:
                     return None
+                return self._rows_to_get_result(rows, include)
+            except Exception as e:
+                session.rollback()
+                log.exception(f"Error during get: {e}")
+                return None
 
-                ids = [[result.id for result in results]]
-                documents = [[result.text for result in results]]
-                metadatas = [[result.vmetadata for result in results]]
+    def iter_items(
+        self,
+        collection_name: str,
+        filter: Optional[Dict[str, Any]] = None,
+        include: Optional[Sequence[str]] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[GetResult]:
+        # Keyset pagination on the primary key, each page is a short query on
+        # its own session so a slow consumer doesn't hold a connection
+        after_id = None
+        while True:
+            with self.get_session() as session:
+                rows = session.execute(
+                    self._select_items(
+                        collection_name, filter, include, batch_size, after_id
+                    )
+                ).all()
+            if not rows:
+                return
 
-            self.session.rollback()  # read-only transaction
-            return GetResult(ids=ids, documents=documents, metadatas=metadatas)
-        except Exception as e:
-            self.session.rollback()
-            log.exception(f"Error during get: {e}")
-            return None
+            yield self._rows_to_get_result(rows, include)
+            if len(rows) < batch_size:
+                return
+            after_id = rows[-1].id
+
+    def query(
+        self,
+        collection_name: str,
+        filter: Dict[str, Any],
+        limit: Optional[int] = None,
+        include: Optional[Sequence[str]] = None,
+    ) -> Optional[GetResult]:
+        return self.get_items(collection_name, filter, include, limit)
+
+    def get(
+        self,
+        collection_name: str,
+        limit: Optional[int] = None,
+        include: Optional[Sequence[str]] = None,
+    ) -> Optional[GetResult]:
+        return self.get_items(collection_name, None, include, limit)
 
     def delete(
         self,
@@ -646,70 +839,76 @@ class PgvectorClient(VectorDBBase):
         ids: Optional[List[str]] = None,
         filter: Optional[Dict[str, Any]] = None,
     ) -> None:
-        try:
-            if PGVECTOR_PGCRYPTO:
-                wheres = [DocumentChunk.collection_name == collection_name]
-                if ids:
-                    wheres.append(DocumentChunk.id.in_(ids))
-                if filter:
-                    for key, value in filter.items():
-                        wheres.append(
-                            pgcrypto_decrypt(
-                                DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
-                            )[key].astext
-                            == str(value)
-                        )
-                stmt = DocumentChunk.__table__.delete().where(*wheres)
-                result = self.session.execute(stmt)
-                deleted = result.rowcount
-            else:
-                query = self.session.query(DocumentChunk).filter(
-                    DocumentChunk.collection_name == collection_name
+        with self.get_session() as session:
+            try:
+                if PGVECTOR_PGCRYPTO:
+                    wheres = [DocumentChunk.collection_name == collection_name]
+                    if ids:
+                        wheres.append(DocumentChunk.id.in_(ids))
+                    if filter:
+                        for key, value in filter.items():
+                            wheres.append(
+                                pgcrypto_decrypt(
+                                    DocumentChunk.vmetadata,
+                                    PGVECTOR_PGCRYPTO_KEY,
+                                    JSONB,
+                                )[key].astext
+                                == str(value)
+                            )
+                    stmt = DocumentChunk.__table__.delete().where(*wheres)
+                    result = session.execute(stmt)
+                    deleted = result.rowcount
+                else:
+                    query = session.query(DocumentChunk).filter(
+                        DocumentChunk.collection_name == collection_name
+                    )
+                    if ids:
+                        query = query.filter(DocumentChunk.id.in_(ids))
+                    if filter:
+                        for key, value in filter.items():
+                            query = query.filter(
+                                DocumentChunk.vmetadata[key].astext == str(value)
+                            )
+                    deleted = query.delete(synchronize_session=False)
+                session.commit()
+                log.info(
+                    f"Deleted {deleted} items from collection '{collection_name}'."
                 )
-                if ids:
-                    query = query.filter(DocumentChunk.id.in_(ids))
-                if filter:
-                    for key, value in filter.items():
-                        query = query.filter(
-                            DocumentChunk.vmetadata[key].astext == str(value)
-                        )
-                deleted = query.delete(synchronize_session=False)
-            self.session.commit()
-            log.info(f"Deleted {deleted} items from collection '{collection_name}'.")
-        except Exception as e:
-            self.session.rollback()
-            log.exception(f"Error during delete: {e}")
-            raise
+            except Exception as e:
+                session.rollback()
+                log.exception(f"Error during delete: {e}")
+                raise
 
     def reset(self) -> None:
-        try:
-            deleted = self.session.query(DocumentChunk).delete()
-            self.session.commit()
-            log.info(
-                f"Reset complete. Deleted {deleted} items from 'document_chunk' table."
-            )
-        except Exception as e:
-            self.session.rollback()
-            log.exception(f"Error during reset: {e}")
-            raise
+        with self.get_session() as session:
+            try:
+                deleted = session.query(DocumentChunk).delete()
+                session.commit()
+                log.info(
+                    f"Reset complete. Deleted {deleted} items from 'document_chunk' table."
+                )
+            except Exception as e:
+                session.rollback()
+                log.exception(f"Error during reset: {e}")
+                raise
 
     def close(self) -> None:
         pass
 
     def has_collection(self, collection_name: str) -> bool:
-        try:
-            exists = (
-                self.session.query(DocumentChunk)
-                .filter(DocumentChunk.collection_name == collection_name)
-                .first()
-                is not None
-            )
-            self.session.rollback()  # read-only transaction
-            return exists
-        except Exception as e:
-            self.session.rollback()
-            log.exception(f"Error checking collection existence: {e}")
-            return False
+        with self.get_session() as session:
+            try:
+                exists = (
+                    session.query(DocumentChunk)
+                    .filter(DocumentChunk.collection_name == collection_name)
+                    .first()
+                    is not None
+                )
+                return exists
+            except Exception as e:
+                session.rollback()
+                log.exception(f"Error checking collection existence: {e}")
+                return False
 
     def delete_collection(self, collection_name: str) -> None:
         self.delete(collection_name)
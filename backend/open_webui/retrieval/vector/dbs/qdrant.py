@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Iterator, Optional, Sequence
 import logging
 from urllib.parse import urlparse
 
@@ -7,6 +7,7 @@ from qdrant_client.http.models import PointStruct
 from qdrant_client.models import models
 
 from open_webui.retrieval.vector.main import (
+    DEFAULT_GET_INCLUDE,
     VectorDBBase,
     VectorItem,
     SearchResult,
@@ -201,6 +202,99 @@ class QdrantClient(VectorDBBase):
         )
         return self._result_to_get_result(points[0])
 
+    def _scroll_projected(
+        self,
+        collection_name: str,
+        filter: Optional[dict],
+        include: Optional[Sequence[str]],
+        limit: int,
+        offset=None,
+    ):
+        include = DEFAULT_GET_INCLUDE if include is None else include
+        payload_keys = [
+            key
+            for field, key in (("documents", "text"), ("metadatas", "metadata"))
+            if field in include
+        ]
+
+        scroll_filter = None
+        if filter:
+            scroll_filter = models.Filter(
+                should=[
+                    models.FieldCondition(
+                        key=f"metadata.{key}", match=models.MatchValue(value=value)
+                    )
+                    for key, value in filter.items()
+                ]
+            )
+
+        points, next_offset = self.client.scroll(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            scroll_filter=scroll_filter,
+            limit=limit,
+            offset=offset,
+            with_payload=payload_keys or False,
+            with_vectors="vectors" in include,
+        )
+
+        result = GetResult(
+            ids=[[point.id for point in points]] if "ids" in include else None,
+            documents=(
+                [[point.payload["text"] for point in points]]
+                if "documents" in include
+                else None
+            ),
+            metadatas=(
+                [[point.payload["metadata"] for point in points]]
+                if "metadatas" in include
+                else None
+            ),
+            vectors=(
+                [[list(point.vector) for point in points]]
+                if "vectors" in include
+                else None
+            ),
+        )
+        return result, len(points), next_offset
+
+    def get_items(
+        self,
+        collection_name: str,
+        filter: Optional[dict] = None,
+        include: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+    ) -> Optional[GetResult]:
+        if not self.has_collection(collection_name):
+            return None
+        try:
+            result, _, _ = self._scroll_projected(
+                collection_name, filter, include, limit or NO_LIMIT
+            )
+            return result
+        except Exception as e:
+            log.exception(f"Error getting items from '{collection_name}': {e}")
+            return None
+
+    def iter_items(
+        self,
+        collection_name: str,
+        filter: Optional[dict] = None,
+        include: Optional[Sequence[str]] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[GetResult]:
+        if not self.has_collection(collection_name):
+            return
+
+        offset = None
+        while True:
+            result, count, offset = self._scroll_projected(
+                collection_name, filter, include, batch_size, offset
+            )
+            if count:
+                yield result
+            if offset is None:
+                return
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
         self._create_collection_if_not_exists(collection_name, len(items[0]["vector"]))
@@ -1,3 +1,4 @@
+from open_webui.retrieval.registry import LazyObject, LazyRegistry
 from open_webui.retrieval.vector.main import VectorDBBase
 from open_webui.retrieval.vector.type import VectorType
 from open_webui.config import (
@@ -7,6 +8,25 @@ from open_webui.config import (
 )
 
 
+VECTOR_DB_CLIENTS = LazyRegistry(
+    "vector database",
+    {
+        VectorType.MILVUS: "open_webui.retrieval.vector.dbs.milvus:MilvusClient",
+        f"{VectorType.MILVUS}_multitenancy": "open_webui.retrieval.vector.dbs.milvus_multitenancy:MilvusClient",
+        VectorType.QDRANT: "open_webui.retrieval.vector.dbs.qdrant:QdrantClient",
+        f"{VectorType.QDRANT}_multitenancy": "open_webui.retrieval.vector.dbs.qdrant_multitenancy:QdrantClient",
+        VectorType.PINECONE: "open_webui.retrieval.vector.dbs.pinecone:PineconeClient",
+        VectorType.S3VECTOR: "open_webui.retrieval.vector.dbs.s3vector:S3VectorClient",
+        VectorType.OPENSEARCH: "open_webui.retrieval.vector.dbs.opensearch:OpenSearchClient",
+        VectorType.PGVECTOR: "open_webui.retrieval.vector.dbs.pgvector:PgvectorClient",
+        VectorType.ELASTICSEARCH: "open_webui.retrieval.vector.dbs.elasticsearch:ElasticsearchClient",
+        VectorType.CHROMA: "open_webui.retrieval.vector.dbs.chroma:ChromaClient",
+        VectorType.ORACLE23AI: "open_webui.retrieval.vector.dbs.oracle23ai:Oracle23aiClient",
+        VectorType.WEAVIATE: "open_webui.retrieval.vector.dbs.weaviate:WeaviateClient",
+    },
+)
+
+
 class Vector:
 
     @staticmethod
@@ -14,65 +34,20 @@ class Vector:
         """
         get vector db instance by vector type
         """
-        match vector_type:
-            case VectorType.MILVUS:
-                if ENABLE_MILVUS_MULTITENANCY_MODE:
-                    from open_webui.retrieval.vector.dbs.milvus_multitenancy import (
-                        MilvusClient,
-                    )
-
-                    return MilvusClient()
-                else:
-                    from open_webui.retrieval.vector.dbs.milvus import MilvusClient
-
-                    return MilvusClient()
-            case VectorType.QDRANT:
-                if ENABLE_QDRANT_MULTITENANCY_MODE:
-                    from open_webui.retrieval.vector.dbs.qdrant_multitenancy import (
-                        QdrantClient,
-                    )
-
-                    return QdrantClient()
-                else:
-                    from open_webui.retrieval.vector.dbs.qdrant import QdrantClient
-
-                    return QdrantClient()
-            case VectorType.PINECONE:
-                from open_webui.retrieval.vector.dbs.pinecone import PineconeClient
-
-                return PineconeClient()
-            case VectorType.S3VECTOR:
-                from open_webui.retrieval.vector.dbs.s3vector import S3VectorClient
-
-                return S3VectorClient()
-            case VectorType.OPENSEARCH:
-                from open_webui.retrieval.vector.dbs.opensearch import OpenSearchClient
-
-                return OpenSearchClient()
-            case VectorType.PGVECTOR:
-                from open_webui.retrieval.vector.dbs.pgvector import PgvectorClient
-
-                return PgvectorClient()
-            case VectorType.ELASTICSEARCH:
-                from open_webui.retrieval.vector.dbs.elasticsearch import (
-                    ElasticsearchClient,
-                )
-
-                return ElasticsearchClient()
-            case VectorType.CHROMA:
-                from open_webui.retrieval.vector.dbs.chroma import ChromaClient
+        name = vector_type
+        if (vector_type == VectorType.MILVUS and ENABLE_MILVUS_MULTITENANCY_MODE) or (
+            vector_type == VectorType.QDRANT and ENABLE_QDRANT_MULTITENANCY_MODE
+        ):
+            name = f"{vector_type}_multitenancy"
 
-                return ChromaClient()
-            case VectorType.ORACLE23AI:
-                from open_webui.retrieval.vector.dbs.oracle23ai import Oracle23aiClient
+        if name not in VECTOR_DB_CLIENTS:
+            raise ValueError(f"Unsupported vector type: {vector_type}")
 
-                return Oracle23aiClient()
-            case VectorType.WEAVIATE:
-                from open_webui.retrieval.vector.dbs.weaviate import WeaviateClient
+        return VECTOR_DB_CLIENTS.get(name)()
 
-                return WeaviateClient()
-            case _:
-                raise ValueError(f"Unsupported vector type: {vector_type}")
 
+if VECTOR_DB not in VECTOR_DB_CLIENTS:
+    raise ValueError(f"Unsupported vector type: {VECTOR_DB}")
 
-VECTOR_DB_CLIENT = Vector.get_vector(VECTOR_DB)
+# The client (and its driver) is created on first use rather than at import
+VECTOR_DB_CLIENT = LazyObject(lambda: Vector.get_vector(VECTOR_DB))
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
 
 
 class VectorItem(BaseModel):
@@ -10,16 +10,46 @@ class VectorItem(BaseModel):
     metadata: Any
 
 
+# Fields that can be requested from get_items/iter_items
+GET_RESULT_FIELDS = ("ids", "documents", "metadatas", "vectors")
+# Vectors are large and rarely needed, so they are only returned when asked for
+DEFAULT_GET_INCLUDE = ("ids", "documents", "metadatas")
+
+
 class GetResult(BaseModel):
     ids: Optional[List[List[str]]]
     documents: Optional[List[List[str]]]
     metadatas: Optional[List[List[Any]]]
+    vectors: Optional[List[List[List[float | int]]]] = None
 
 
 class SearchResult(GetResult):
     distances: Optional[List[List[float | int]]]
 
 
+def project_get_result(
+    result: Optional[GetResult],
+    include: Optional[Sequence[str]] = None,
+    offset: int = 0,
+    limit: Optional[int] = None,
+) -> Optional[GetResult]:
+    """Keeps only the included fields (and optionally a slice) of a GetResult."""
+    if result is None:
+        return None
+
+    include = DEFAULT_GET_INCLUDE if include is None else include
+    end = None if limit is None else offset + limit
+
+    fields = {}
+    for field in GET_RESULT_FIELDS:
+        value = getattr(result, field, None)
+        if field in include and value is not None:
+            fields[field] = [value[0][offset:end]] if value else value
+        else:
+            fields[field] = None
+    return GetResult(**fields)
+
+
 class VectorDBBase(ABC):
     """
     Abstract base class for all vector database backends.
@@ -84,3 +114,72 @@ class VectorDBBase(ABC):
     def reset(self) -> None:
         """Reset the vector database by removing all collections or those matching a condition."""
         pass
+
+    def supports_hybrid_search(self) -> bool:
+        """Whether hybrid_search is available for this backend."""
+        return False
+
+    def hybrid_search(
+        self,
+        collection_name: str,
+        query: str,
+        vector: List[Union[float, int]],
+        limit: int,
+        bm25_weight: float = 0.5,
+    ) -> Optional[SearchResult]:
+        """
+        Rank a collection by both full-text relevance and vector similarity inside
+        the database. Each signal contributes up to limit candidates; results are
+        ordered by their fused score, returned as distances.
+        """
+        raise NotImplementedError
+
+    def get_items(
+        self,
+        collection_name: str,
+        filter: Optional[Dict] = None,
+        include: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+    ) -> Optional[GetResult]:
+        """
+        Like get/query, but only the fields in include (see GET_RESULT_FIELDS)
+        are returned. Backends that can skip the other fields at the source
+        override this; the default drops them after loading.
+        """
+        if filter:
+            result = self.query(collection_name, filter=filter, limit=limit)
+        else:
+            result = self.get(collection_name)
+        return project_get_result(result, include, limit=limit)
+
+    def iter_items(
+        self,
+        collection_name: str,
+        filter: Optional[Dict] = None,
+        include: Optional[Sequence[str]] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[GetResult]:
+        """
+        Yields the items of a collection in batches of at most batch_size.
+        Backends that can page natively override this to scan in constant
+        memory; the default loads the collection once and slices it.
+        """
+        result = self.get_items(collection_name, filter=filter, include=include)
+        if result is None:
+            return
+
+        total = max(
+            (
+                len(value[0])
+                for value in (
+                    result.ids,
+                    result.documents,
+                    result.metadatas,
+                    result.vectors,
+                )
+                if value
+            ),
+            default=0,
+        )
+        for offset in range(0, total, batch_size):
+            yield project_get_result(result, include, offset, batch_size)
@@ -5,6 +5,7 @@ from urllib.parse import urlparse
 
 from pydantic import BaseModel
 
+from open_webui.retrieval.registry import LazyRegistry
 from open_webui.retrieval.web.utils import resolve_hostname
 from open_webui.utils.misc import is_string_allowed
 
@@ -44,3 +45,35 @@ class SearchResult(BaseModel):
     link: str
     title: Optional[str]
     snippet: Optional[str]
+
+
+# Search engines by name, imported on first use
+WEB_SEARCH_ENGINES = LazyRegistry(
+    "web search engine",
+    {
+        "ollama_cloud": "open_webui.retrieval.web.ollama:search_ollama_cloud",
+        "perplexity_search": "open_webui.retrieval.web.perplexity_search:search_perplexity_search",
+        "searxng": "open_webui.retrieval.web.searxng:search_searxng",
+        "yacy": "open_webui.retrieval.web.yacy:search_yacy",
+        "google_pse": "open_webui.retrieval.web.google_pse:search_google_pse",
+        "brave": "open_webui.retrieval.web.brave:search_brave",
+        "kagi": "open_webui.retrieval.web.kagi:search_kagi",
+        "mojeek": "open_webui.retrieval.web.mojeek:search_mojeek",
+        "bocha": "open_webui.retrieval.web.bocha:search_bocha",
+        "serpstack": "open_webui.retrieval.web.serpstack:search_serpstack",
+        "serper": "open_webui.retrieval.web.serper:search_serper",
+        "serply": "open_webui.retrieval.web.serply:search_serply",
+        "duckduckgo": "open_webui.retrieval.web.duckduckgo:search_duckduckgo",
+        "tavily": "open_webui.retrieval.web.tavily:search_tavily",
+        "exa": "open_webui.retrieval.web.exa:search_exa",
+        "searchapi": "open_webui.retrieval.web.searchapi:search_searchapi",
+        "serpapi": "open_webui.retrieval.web.serpapi:search_serpapi",
+        "jina": "open_webui.retrieval.web.jina_search:search_jina",
+        "bing": "open_webui.retrieval.web.bing:search_bing",
+        "azure": "open_webui.retrieval.web.azure:search_azure",
+        "perplexity": "open_webui.retrieval.web.perplexity:search_perplexity",
+        "sougou": "open_webui.retrieval.web.sougou:search_sougou",
+        "firecrawl": "open_webui.retrieval.web.firecrawl:search_firecrawl",
+        "external": "open_webui.retrieval.web.external:search_external",
+    },
+)
@@ -0,0 +1,46 @@
+import time
+from typing import Optional, Union
+
+# Kept free of open_webui imports, it is imported by every process of the
+# extraction pool that parses a page
+
+
+def extract_metadata(soup, url):
+    metadata = {"source": url}
+    if title := soup.find("title"):
+        metadata["title"] = title.get_text()
+    if description := soup.find("meta", attrs={"name": "description"}):
+        metadata["description"] = description.get("content", "No description found.")
+    if html := soup.find("html"):
+        metadata["language"] = html.get("lang", "No language found.")
+    return metadata
+
+
+def parse_page(
+    content: Union[bytes, str],
+    url: str,
+    parser: str = "html.parser",
+    encoding: Optional[str] = None,
+    bs_kwargs: Optional[dict] = None,
+    bs_get_text_kwargs: Optional[dict] = None,
+) -> tuple[str, dict, float]:
+    """
+    Returns the text and metadata of a fetched page, and the seconds spent
+    parsing it. Pages are decoded with the charset of the response or UTF-8,
+    BeautifulSoup detects the encoding of pages that are neither.
+    """
+    from bs4 import BeautifulSoup
+
+    if not content:
+        return "", {"source": url}, 0.0
+
+    started = time.perf_counter()
+    if isinstance(content, bytes):
+        try:
+            content = content.decode(encoding or "utf-8")
+        except (UnicodeDecodeError, LookupError):
+            pass
+
+    soup = BeautifulSoup(content, parser, **(bs_kwargs or {}))
+    text = soup.get_text(**(bs_get_text_kwargs or {}))
+    return text, extract_metadata(soup, url), time.perf_counter() - started
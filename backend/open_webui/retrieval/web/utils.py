@@ -1,10 +1,15 @@
 import asyncio
 import logging
+import multiprocessing
 import socket
 import ssl
+import threading
+import time
 import urllib.parse
 import urllib.request
-from datetime import datetime, time, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
 from typing import (
     Any,
     AsyncIterator,
@@ -41,7 +46,16 @@ from open_webui.config import (
     EXTERNAL_WEB_LOADER_API_KEY,
     WEB_FETCH_FILTER_LIST,
 )
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    WEB_SEARCH_CACHE_TTL,
+    WEB_LOADER_MAX_CONNECTIONS,
+    WEB_LOADER_MAX_CONNECTIONS_PER_HOST,
+    WEB_LOADER_MAX_RESPONSE_SIZE,
+    WEB_PARSE_PROCESS_POOL_SIZE,
+)
+from open_webui.retrieval.cache import WEB_PAGE_CACHE
+from open_webui.retrieval.web.parser import extract_metadata, parse_page
 from open_webui.utils.misc import is_string_allowed
 
 log = logging.getLogger(__name__)
@@ -111,15 +125,87 @@ def safe_validate_urls(url: Sequence[str]) -> Sequence[str]:
     return valid_urls
 
 
-def extract_metadata(soup, url):
-    metadata = {"source": url}
-    if title := soup.find("title"):
-        metadata["title"] = title.get_text()
-    if description := soup.find("meta", attrs={"name": "description"}):
-        metadata["description"] = description.get("content", "No description found.")
-    if html := soup.find("html"):
-        metadata["language"] = html.get("lang", "No language found.")
-    return metadata
+####################################
+# Shared HTTP session
+####################################
+
+# One pooled session per event loop and trust_env, reused by every web loader
+_web_sessions: dict[tuple, aiohttp.ClientSession] = {}
+
+
+def get_web_session(trust_env: bool = False) -> aiohttp.ClientSession:
+    loop = asyncio.get_running_loop()
+
+    # Sessions of loops that were closed (asyncio.run in a thread) are unusable
+    for key in [key for key in _web_sessions if key[0].is_closed()]:
+        del _web_sessions[key]
+
+    session = _web_sessions.get((loop, trust_env))
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=WEB_LOADER_MAX_CONNECTIONS,
+                limit_per_host=WEB_LOADER_MAX_CONNECTIONS_PER_HOST,
+                ttl_dns_cache=300,
+            ),
+            # Cookies set by one page must not be sent on behalf of other users
+            cookie_jar=aiohttp.DummyCookieJar(),
+            trust_env=trust_env,
+        )
+        _web_sessions[(loop, trust_env)] = session
+    return session
+
+
+async def close_web_sessions():
+    loop = asyncio.get_running_loop()
+    for key in [key for key in _web_sessions if key[0] is loop]:
+        await _web_sessions.pop(key).close()
+
+
+####################################
+# Parse process pool
+####################################
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+
+def get_web_parse_pool() -> Optional[ProcessPoolExecutor]:
+    global _parse_pool
+
+    if WEB_PARSE_PROCESS_POOL_SIZE <= 0:
+        return None
+
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            # Spawn instead of fork, the parent process runs threads and event loops
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=WEB_PARSE_PROCESS_POOL_SIZE,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _parse_pool
+
+
+def shutdown_web_parse_pool():
+    global _parse_pool
+
+    with _parse_pool_lock:
+        if _parse_pool is not None:
+            _parse_pool.shutdown(wait=False, cancel_futures=True)
+            _parse_pool = None
+
+
+async def read_response(
+    response: aiohttp.ClientResponse, max_size: int = WEB_LOADER_MAX_RESPONSE_SIZE
+) -> bytes:
+    """Reads at most max_size bytes of the body, the rest is never downloaded."""
+    content = bytearray()
+    async for chunk in response.content.iter_chunked(64 * 1024):
+        content += chunk[: max_size - len(content)]
+        if len(content) >= max_size:
+            log.info(f"Truncated {response.url} to {max_size} bytes")
+            break
+    return bytes(content)
 
 
 def verify_ssl_cert(url: str) -> bool:
@@ -557,39 +643,90 @@ class SafeWebBaseLoader(WebBaseLoader):
         """
         super().__init__(*args, **kwargs)
         self.trust_env = trust_env
+        # Status, size, fetch and parse time of every URL loaded asynchronously
+        self.timings: dict[str, dict] = {}
+        # Charset and cache validators of every response
+        self._responses: dict[str, dict] = {}
+        # Conditional request headers for pages in WEB_PAGE_CACHE
+        self._validators: dict[str, dict] = {}
 
     async def _fetch(
         self, url: str, retries: int = 3, cooldown: int = 2, backoff: float = 1.5
-    ) -> str:
-        async with aiohttp.ClientSession(trust_env=self.trust_env) as session:
-            for i in range(retries):
-                try:
-                    kwargs: Dict = dict(
-                        headers=self.session.headers,
-                        cookies=self.session.cookies.get_dict(),
+    ) -> bytes:
+        session = get_web_session(self.trust_env)
+        for i in range(retries):
+            try:
+                kwargs: Dict = dict(
+                    headers={**self.session.headers, **self._validators.get(url, {})},
+                    cookies=self.session.cookies.get_dict(),
+                )
+                if not self.session.verify:
+                    kwargs["ssl"] = False
+
+                started = time.perf_counter()
+                async with session.get(
+                    url,
+                    **(self.requests_kwargs | kwargs),
+                    allow_redirects=False,
+                ) as response:
+                    if self.raise_for_status:
+                        response.raise_for_status()
+                    content = await read_response(response)
+
+                    self.timings[url] = {
+                        "status": response.status,
+                        "bytes": len(content),
+                        "fetch_ms": round((time.perf_counter() - started) * 1000, 1),
+                    }
+                    self._responses[url] = {
+                        "status": response.status,
+                        "encoding": response.charset,
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                    }
+                    return content
+            except aiohttp.ClientConnectionError as e:
+                if i == retries - 1:
+                    raise
+                else:
+                    log.warning(
+                        f"Error fetching {url} with attempt "
+                        f"{i + 1}/{retries}: {e}. Retrying..."
                     )
-                    if not self.session.verify:
-                        kwargs["ssl"] = False
-
-                    async with session.get(
-                        url,
-                        **(self.requests_kwargs | kwargs),
-                        allow_redirects=False,
-                    ) as response:
-                        if self.raise_for_status:
-                            response.raise_for_status()
-                        return await response.text()
-                except aiohttp.ClientConnectionError as e:
-                    if i == retries - 1:
-                        raise
-                    else:
-                        log.warning(
-                            f"Error fetching {url} with attempt "
-                            f"{i + 1}/{retries}: {e}. Retrying..."
-                        )
-                        await asyncio.sleep(cooldown * backoff**i)
+                    await asyncio.sleep(cooldown * backoff**i)
         raise ValueError("retry count exceeded")
 
+    async def _aparse(self, url: str, content: Union[bytes, str]) -> tuple[str, dict]:
+        """Parses a page in the web parse process pool, off the event loop."""
+        args = (
+            content or b"",
+            url,
+            "xml" if url.endswith(".xml") else self.default_parser,
+            self._responses.get(url, {}).get("encoding"),
+            self.bs_kwargs,
+            self.bs_get_text_kwargs,
+        )
+
+        global _parse_pool
+
+        pool = get_web_parse_pool()
+        if pool is None:
+            text, metadata, seconds = await asyncio.to_thread(parse_page, *args)
+        else:
+            try:
+                text, metadata, seconds = await asyncio.wrap_future(
+                    pool.submit(parse_page, *args)
+                )
+            except BrokenProcessPool:
+                log.warning("Web parse process pool died, recreating it")
+                with _parse_pool_lock:
+                    if _parse_pool is pool:
+                        _parse_pool = None
+                text, metadata, seconds = await asyncio.to_thread(parse_page, *args)
+
+        self.timings.setdefault(url, {})["parse_ms"] = round(seconds * 1000, 1)
+        return text, metadata
+
     def _unpack_fetch_results(
         self, results: Any, urls: List[str], parser: Union[str, None] = None
     ) -> List[Any]:
@@ -630,21 +767,80 @@ class SafeWebBaseLoader(WebBaseLoader):
                 # Log the error and continue with the next URL
                 log.exception(f"Error loading {path}: {e}")
 
+    async def _aget_cached_pages(self) -> dict[str, dict]:
+        """
+        Pages in WEB_PAGE_CACHE younger than WEB_SEARCH_CACHE_TTL are used as is,
+        older ones are requested again with their ETag or Last-Modified date.
+        """
+        if not WEB_PAGE_CACHE.enabled:
+            return {}
+
+        now = time.time()
+        pages = {}
+        for url in self.web_paths:
+            page = await WEB_PAGE_CACHE.aget(url)
+            if page is None:
+                continue
+
+            if now - page["fetched_at"] < WEB_SEARCH_CACHE_TTL:
+                pages[url] = page
+            elif page.get("etag") or page.get("last_modified"):
+                pages[url] = page
+                self._validators[url] = {
+                    header: value
+                    for header, value in (
+                        ("If-None-Match", page.get("etag")),
+                        ("If-Modified-Since", page.get("last_modified")),
+                    )
+                    if value
+                }
+        return pages
+
+    async def _aload_page(self, url: str, content, page: Optional[dict]) -> dict:
+        response = self._responses.get(url, {})
+        if page is not None and response.get("status") != 200:
+            self.timings.setdefault(url, {})["cached"] = True
+            if response.get("status") != 304:
+                # Revalidation failed, the stale page beats no page. It is not
+                # stored again, so the next load revalidates it.
+                log.info(f"Could not revalidate {url}, using the cached page")
+                return page
+        else:
+            text, metadata = await self._aparse(url, content)
+            page = {"text": text, "metadata": metadata}
+            if response.get("status") != 200 or not text:
+                return page
+            page["etag"] = response.get("etag")
+            page["last_modified"] = response.get("last_modified")
+
+        if WEB_PAGE_CACHE.enabled:
+            await WEB_PAGE_CACHE.aset(url, {**page, "fetched_at": time.time()})
+        return page
+
     async def alazy_load(self) -> AsyncIterator[Document]:
         """Async lazy load text from the url(s) in web_path."""
-        results = await self.ascrape_all(self.web_paths)
-        for path, soup in zip(self.web_paths, results):
-            text = soup.get_text(**self.bs_get_text_kwargs)
-            metadata = {"source": path}
-            if title := soup.find("title"):
-                metadata["title"] = title.get_text()
-            if description := soup.find("meta", attrs={"name": "description"}):
-                metadata["description"] = description.get(
-                    "content", "No description found."
-                )
-            if html := soup.find("html"):
-                metadata["language"] = html.get("lang", "No language found.")
-            yield Document(page_content=text, metadata=metadata)
+        pages = await self._aget_cached_pages()
+        urls = [
+            url for url in self.web_paths if url not in pages or url in self._validators
+        ]
+        for url in self.web_paths:
+            if url not in urls:
+                self.timings[url] = {"cached": True}
+
+        results = await self.fetch_all(urls)
+        loaded = await asyncio.gather(
+            *[
+                self._aload_page(url, result, pages.get(url))
+                for url, result in zip(urls, results)
+            ]
+        )
+        pages.update(zip(urls, loaded))
+        log.debug(f"Web loader timings: {self.timings}")
+
+        for url in self.web_paths:
+            yield Document(
+                page_content=pages[url]["text"], metadata=pages[url]["metadata"]
+            )
 
     async def aload(self) -> list[Document]:
         """Load data into Document objects."""
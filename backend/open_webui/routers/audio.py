@@ -1,19 +1,24 @@
+import asyncio
+import collections
 import hashlib
+import io
 import json
 import logging
 import os
+import queue
+import shutil
 import uuid
 import html
 import base64
+import threading
 from functools import lru_cache
 from pydub import AudioSegment
-from pydub.silence import split_on_silence
-from concurrent.futures import ThreadPoolExecutor
+from pydub.silence import detect_nonsilent
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Optional
 
 from fnmatch import fnmatch
 import aiohttp
-import aiofiles
 import requests
 import mimetypes
 
@@ -29,10 +34,17 @@ from fastapi import (
     APIRouter,
 )
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 
 
+from open_webui.utils.audio import (
+    SPEECH_CACHE,
+    get_audio_media_type,
+    get_wav_stream_header,
+    read_wav,
+    split_text_into_sentences,
+)
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.headers import include_user_info_headers
 from open_webui.config import (
@@ -40,6 +52,7 @@ from open_webui.config import (
     WHISPER_MODEL_DIR,
     CACHE_DIR,
     WHISPER_LANGUAGE,
+    WHISPER_BATCH_SIZE,
     ELEVENLABS_API_BASE_URL,
 )
 
@@ -51,6 +64,8 @@ from open_webui.env import (
     SRC_LOG_LEVELS,
     DEVICE_TYPE,
     ENABLE_FORWARD_USER_INFO_HEADERS,
+    AUDIO_TTS_STREAM_CONCURRENCY,
+    AUDIO_STT_MAX_CONCURRENCY,
 )
 
 
@@ -65,8 +80,13 @@ AZURE_MAX_FILE_SIZE = AZURE_MAX_FILE_SIZE_MB * 1024 * 1024  # Convert MB to byte
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["AUDIO"])
 
-SPEECH_CACHE_DIR = CACHE_DIR / "audio" / "speech"
-SPEECH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+# Shared by all transcription requests to bound concurrent STT work globally
+TRANSCRIPTION_EXECUTOR = ThreadPoolExecutor(
+    max_workers=AUDIO_STT_MAX_CONCURRENCY, thread_name_prefix="transcription"
+)
+
+# The speecht5 pipeline is shared across requests and not safe to call concurrently
+SPEECH_SYNTHESIS_LOCK = threading.Lock()
 
 
 ##########################################
@@ -327,241 +347,382 @@ def load_speech_pipeline(request):
         )
 
 
-@router.post("/speech")
-async def speech(request: Request, user=Depends(get_verified_user)):
-    body = await request.body()
-    name = hashlib.sha256(
-        body
-        + str(request.app.state.config.TTS_ENGINE).encode("utf-8")
-        + str(request.app.state.config.TTS_MODEL).encode("utf-8")
-    ).hexdigest()
+async def synthesize_openai_speech(request: Request, payload: dict, user) -> bytes:
+    payload = {
+        **payload,
+        "model": request.app.state.config.TTS_MODEL,
+        **(request.app.state.config.TTS_OPENAI_PARAMS or {}),
+    }
 
-    file_path = SPEECH_CACHE_DIR.joinpath(f"{name}.mp3")
-    file_body_path = SPEECH_CACHE_DIR.joinpath(f"{name}.json")
+    r = None
+    try:
+        timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
+        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
+            headers = {
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {request.app.state.config.TTS_OPENAI_API_KEY}",
+            }
+            if ENABLE_FORWARD_USER_INFO_HEADERS:
+                headers = include_user_info_headers(headers, user)
+
+            r = await session.post(
+                url=f"{request.app.state.config.TTS_OPENAI_API_BASE_URL}/audio/speech",
+                json=payload,
+                headers=headers,
+                ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            )
 
-    # Check if the file already exists in the cache
-    if file_path.is_file():
-        return FileResponse(file_path)
+            r.raise_for_status()
+            return await r.read()
 
-    payload = None
-    try:
-        payload = json.loads(body.decode("utf-8"))
     except Exception as e:
         log.exception(e)
-        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+        detail = None
+
+        status_code = 500
+        detail = f"Open WebUI: Server Connection Error"
+
+        if r is not None:
+            status_code = r.status
+
+            try:
+                res = await r.json()
+                if "error" in res:
+                    detail = f"External: {res['error']}"
+            except Exception:
+                detail = f"External: {e}"
+
+        raise HTTPException(
+            status_code=status_code,
+            detail=detail,
+        )
+
+
+async def synthesize_elevenlabs_speech(request: Request, payload: dict) -> bytes:
+    voice_id = payload.get("voice", "")
+
+    if voice_id not in get_available_voices(request):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid voice id",
+        )
 
     r = None
-    if request.app.state.config.TTS_ENGINE == "openai":
-        payload["model"] = request.app.state.config.TTS_MODEL
+    try:
+        timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
+        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
+            async with session.post(
+                f"{ELEVENLABS_API_BASE_URL}/v1/text-to-speech/{voice_id}",
+                json={
+                    "text": payload["input"],
+                    "model_id": request.app.state.config.TTS_MODEL,
+                    "voice_settings": {"stability": 0.5, "similarity_boost": 0.5},
+                },
+                headers={
+                    "Accept": "audio/mpeg",
+                    "Content-Type": "application/json",
+                    "xi-api-key": request.app.state.config.TTS_API_KEY,
+                },
+                ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            ) as r:
+                r.raise_for_status()
+                return await r.read()
+
+    except Exception as e:
+        log.exception(e)
+        detail = None
 
         try:
-            timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-            async with aiohttp.ClientSession(
-                timeout=timeout, trust_env=True
-            ) as session:
-                payload = {
-                    **payload,
-                    **(request.app.state.config.TTS_OPENAI_PARAMS or {}),
-                }
+            if r.status != 200:
+                res = await r.json()
+                if "error" in res:
+                    detail = f"External: {res['error'].get('message', '')}"
+        except Exception:
+            detail = f"External: {e}"
 
-                headers = {
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {request.app.state.config.TTS_OPENAI_API_KEY}",
-                }
-                if ENABLE_FORWARD_USER_INFO_HEADERS:
-                    headers = include_user_info_headers(headers, user)
+        raise HTTPException(
+            status_code=getattr(r, "status", 500) if r else 500,
+            detail=detail if detail else "Open WebUI: Server Connection Error",
+        )
 
-                r = await session.post(
-                    url=f"{request.app.state.config.TTS_OPENAI_API_BASE_URL}/audio/speech",
-                    json=payload,
-                    headers=headers,
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                )
 
+async def synthesize_azure_speech(request: Request, payload: dict) -> bytes:
+    region = request.app.state.config.TTS_AZURE_SPEECH_REGION or "eastus"
+    base_url = request.app.state.config.TTS_AZURE_SPEECH_BASE_URL
+    language = request.app.state.config.TTS_VOICE
+    locale = "-".join(request.app.state.config.TTS_VOICE.split("-")[:1])
+    output_format = request.app.state.config.TTS_AZURE_SPEECH_OUTPUT_FORMAT
+
+    r = None
+    try:
+        data = f"""<speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="{locale}">
+            <voice name="{language}">{html.escape(payload["input"])}</voice>
+        </speak>"""
+        timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
+        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
+            async with session.post(
+                (base_url or f"https://{region}.tts.speech.microsoft.com")
+                + "/cognitiveservices/v1",
+                headers={
+                    "Ocp-Apim-Subscription-Key": request.app.state.config.TTS_API_KEY,
+                    "Content-Type": "application/ssml+xml",
+                    "X-Microsoft-OutputFormat": output_format,
+                },
+                data=data,
+                ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            ) as r:
                 r.raise_for_status()
+                return await r.read()
 
-                async with aiofiles.open(file_path, "wb") as f:
-                    await f.write(await r.read())
+    except Exception as e:
+        log.exception(e)
+        detail = None
 
-                async with aiofiles.open(file_body_path, "w") as f:
-                    await f.write(json.dumps(payload))
+        try:
+            if r.status != 200:
+                res = await r.json()
+                if "error" in res:
+                    detail = f"External: {res['error'].get('message', '')}"
+        except Exception:
+            detail = f"External: {e}"
 
-            return FileResponse(file_path)
+        raise HTTPException(
+            status_code=getattr(r, "status", 500) if r else 500,
+            detail=detail if detail else "Open WebUI: Server Connection Error",
+        )
 
-        except Exception as e:
-            log.exception(e)
-            detail = None
 
-            status_code = 500
-            detail = f"Open WebUI: Server Connection Error"
+def synthesize_transformers_speech(request: Request, payload: dict) -> bytes:
+    import torch
+    import soundfile as sf
 
-            if r is not None:
-                status_code = r.status
+    load_speech_pipeline(request)
 
-                try:
-                    res = await r.json()
-                    if "error" in res:
-                        detail = f"External: {res['error']}"
-                except Exception:
-                    detail = f"External: {e}"
+    embeddings_dataset = request.app.state.speech_speaker_embeddings_dataset
 
-            raise HTTPException(
-                status_code=status_code,
-                detail=detail,
-            )
+    speaker_index = 6799
+    try:
+        speaker_index = embeddings_dataset["filename"].index(
+            request.app.state.config.TTS_MODEL
+        )
+    except Exception:
+        pass
 
-    elif request.app.state.config.TTS_ENGINE == "elevenlabs":
-        voice_id = payload.get("voice", "")
+    speaker_embedding = torch.tensor(
+        embeddings_dataset[speaker_index]["xvector"]
+    ).unsqueeze(0)
 
-        if voice_id not in get_available_voices(request):
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid voice id",
-            )
+    with SPEECH_SYNTHESIS_LOCK:
+        speech = request.app.state.speech_synthesiser(
+            payload["input"],
+            forward_params={"speaker_embeddings": speaker_embedding},
+        )
 
-        try:
-            timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-            async with aiohttp.ClientSession(
-                timeout=timeout, trust_env=True
-            ) as session:
-                async with session.post(
-                    f"{ELEVENLABS_API_BASE_URL}/v1/text-to-speech/{voice_id}",
-                    json={
-                        "text": payload["input"],
-                        "model_id": request.app.state.config.TTS_MODEL,
-                        "voice_settings": {"stability": 0.5, "similarity_boost": 0.5},
-                    },
-                    headers={
-                        "Accept": "audio/mpeg",
-                        "Content-Type": "application/json",
-                        "xi-api-key": request.app.state.config.TTS_API_KEY,
-                    },
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                ) as r:
-                    r.raise_for_status()
+    # 16-bit PCM WAV so sentences can be concatenated into a single stream
+    buffer = io.BytesIO()
+    sf.write(
+        buffer,
+        speech["audio"],
+        samplerate=speech["sampling_rate"],
+        format="WAV",
+        subtype="PCM_16",
+    )
+    return buffer.getvalue()
 
-                    async with aiofiles.open(file_path, "wb") as f:
-                        await f.write(await r.read())
 
-                    async with aiofiles.open(file_body_path, "w") as f:
-                        await f.write(json.dumps(payload))
+async def synthesize_speech(request: Request, payload: dict, user) -> bytes:
+    engine = request.app.state.config.TTS_ENGINE
 
-            return FileResponse(file_path)
+    if engine == "openai":
+        return await synthesize_openai_speech(request, payload, user)
+    elif engine == "elevenlabs":
+        return await synthesize_elevenlabs_speech(request, payload)
+    elif engine == "azure":
+        return await synthesize_azure_speech(request, payload)
+    elif engine == "transformers":
+        return await asyncio.to_thread(synthesize_transformers_speech, request, payload)
 
-        except Exception as e:
-            log.exception(e)
-            detail = None
+    raise HTTPException(
+        status_code=400,
+        detail=f"Unsupported TTS engine: {engine}",
+    )
 
-            try:
-                if r.status != 200:
-                    res = await r.json()
-                    if "error" in res:
-                        detail = f"External: {res['error'].get('message', '')}"
-            except Exception:
-                detail = f"External: {e}"
 
-            raise HTTPException(
-                status_code=getattr(r, "status", 500) if r else 500,
-                detail=detail if detail else "Open WebUI: Server Connection Error",
-            )
+def get_speech_cache_key(request: Request, payload: dict) -> str:
+    """
+    Cache key for a single synthesized input. Everything except the text is
+    part of the voice configuration, so repeated phrases are reused across
+    requests that share it.
+    """
+    config = request.app.state.config
+    return SPEECH_CACHE.get_key(
+        config.TTS_ENGINE,
+        config.TTS_MODEL,
+        config.TTS_VOICE,
+        config.TTS_AZURE_SPEECH_OUTPUT_FORMAT,
+        json.dumps(config.TTS_OPENAI_PARAMS or {}, sort_keys=True),
+        json.dumps({k: v for k, v in payload.items() if k != "input"}, sort_keys=True),
+        payload.get("input", ""),
+    )
 
-    elif request.app.state.config.TTS_ENGINE == "azure":
-        try:
-            payload = json.loads(body.decode("utf-8"))
-        except Exception as e:
-            log.exception(e)
-            raise HTTPException(status_code=400, detail="Invalid JSON payload")
 
-        region = request.app.state.config.TTS_AZURE_SPEECH_REGION or "eastus"
-        base_url = request.app.state.config.TTS_AZURE_SPEECH_BASE_URL
-        language = request.app.state.config.TTS_VOICE
-        locale = "-".join(request.app.state.config.TTS_VOICE.split("-")[:1])
-        output_format = request.app.state.config.TTS_AZURE_SPEECH_OUTPUT_FORMAT
+async def get_sentence_speech(request: Request, payload: dict, user) -> bytes:
+    key = get_speech_cache_key(request, payload)
 
-        try:
-            data = f"""<speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="{locale}">
-                <voice name="{language}">{html.escape(payload["input"])}</voice>
-            </speak>"""
-            timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-            async with aiohttp.ClientSession(
-                timeout=timeout, trust_env=True
-            ) as session:
-                async with session.post(
-                    (base_url or f"https://{region}.tts.speech.microsoft.com")
-                    + "/cognitiveservices/v1",
-                    headers={
-                        "Ocp-Apim-Subscription-Key": request.app.state.config.TTS_API_KEY,
-                        "Content-Type": "application/ssml+xml",
-                        "X-Microsoft-OutputFormat": output_format,
-                    },
-                    data=data,
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                ) as r:
-                    r.raise_for_status()
+    data = await asyncio.to_thread(SPEECH_CACHE.read, key)
+    if data is not None:
+        return data
 
-                    async with aiofiles.open(file_path, "wb") as f:
-                        await f.write(await r.read())
+    data = await synthesize_speech(request, payload, user)
+    await asyncio.to_thread(SPEECH_CACHE.put, key, data)
+    return data
 
-                    async with aiofiles.open(file_body_path, "w") as f:
-                        await f.write(json.dumps(payload))
 
-                    return FileResponse(file_path)
+@router.post("/speech")
+async def speech(request: Request, user=Depends(get_verified_user)):
+    body = await request.body()
+    name = hashlib.sha256(
+        body
+        + str(request.app.state.config.TTS_ENGINE).encode("utf-8")
+        + str(request.app.state.config.TTS_MODEL).encode("utf-8")
+    ).hexdigest()
 
-        except Exception as e:
-            log.exception(e)
-            detail = None
+    # Check if the file already exists in the cache
+    file_path = SPEECH_CACHE.get(name)
+    if file_path:
+        return FileResponse(file_path)
 
-            try:
-                if r.status != 200:
-                    res = await r.json()
-                    if "error" in res:
-                        detail = f"External: {res['error'].get('message', '')}"
-            except Exception:
-                detail = f"External: {e}"
+    payload = None
+    try:
+        payload = json.loads(body.decode("utf-8"))
+    except Exception as e:
+        log.exception(e)
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
 
-            raise HTTPException(
-                status_code=getattr(r, "status", 500) if r else 500,
-                detail=detail if detail else "Open WebUI: Server Connection Error",
+    data = await synthesize_speech(request, payload, user)
+    file_path = await asyncio.to_thread(SPEECH_CACHE.put, name, data)
+
+    return FileResponse(file_path)
+
+
+@router.post("/speech/stream")
+async def speech_stream(request: Request, user=Depends(get_verified_user)):
+    """
+    Splits the input into sentences (per TTS_SPLIT_ON), synthesizes up to
+    AUDIO_TTS_STREAM_CONCURRENCY of them concurrently and streams the audio
+    back in order as soon as each sentence is ready. Sentences are cached
+    individually, so repeated phrases are not synthesized again.
+    """
+    try:
+        payload = await request.json()
+    except Exception as e:
+        log.exception(e)
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+
+    sentences = split_text_into_sentences(
+        payload.get("input", ""), request.app.state.config.TTS_SPLIT_ON
+    )
+    if not sentences:
+        raise HTTPException(status_code=400, detail="No input text provided")
+
+    pending = iter(sentences)
+    tasks = collections.deque()
+
+    def schedule():
+        # Keep a bounded window of sentences in flight ahead of the stream
+        while len(tasks) < AUDIO_TTS_STREAM_CONCURRENCY:
+            sentence = next(pending, None)
+            if sentence is None:
+                break
+            tasks.append(
+                asyncio.create_task(
+                    get_sentence_speech(request, {**payload, "input": sentence}, user)
+                )
             )
 
-    elif request.app.state.config.TTS_ENGINE == "transformers":
-        payload = None
+    async def next_chunk() -> Optional[bytes]:
+        schedule()
+        if not tasks:
+            return None
+        return await tasks.popleft()
+
+    try:
+        # Wait for the first sentence so synthesis errors surface as HTTP errors
+        first_chunk = await next_chunk()
+    except Exception:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    media_type = get_audio_media_type(first_chunk)
+    wav_params = read_wav(first_chunk)[0] if media_type == "audio/wav" else None
+
+    async def stream():
+        chunk = first_chunk
         try:
-            payload = json.loads(body.decode("utf-8"))
+            if wav_params:
+                yield get_wav_stream_header(wav_params)
+
+            while chunk is not None:
+                # WAV segments carry their own header, only forward the frames
+                yield read_wav(chunk)[1] if wav_params else chunk
+                chunk = await next_chunk()
         except Exception as e:
-            log.exception(e)
-            raise HTTPException(status_code=400, detail="Invalid JSON payload")
+            log.exception(f"Error while streaming speech: {e}")
+        finally:
+            for task in tasks:
+                task.cancel()
 
-        import torch
-        import soundfile as sf
+    return StreamingResponse(stream(), media_type=media_type)
 
-        load_speech_pipeline(request)
 
-        embeddings_dataset = request.app.state.speech_speaker_embeddings_dataset
+def get_faster_whisper_transcriber(request):
+    """
+    Returns the local faster-whisper model, wrapped in a batched inference
+    pipeline when WHISPER_BATCH_SIZE > 1 and WHISPER_VAD_FILTER is enabled,
+    along with the extra transcribe kwargs it needs.
+    """
+    if request.app.state.faster_whisper_model is None:
+        request.app.state.faster_whisper_model = set_faster_whisper_model(
+            request.app.state.config.WHISPER_MODEL
+        )
 
-        speaker_index = 6799
+    model = request.app.state.faster_whisper_model
+    vad_filter = request.app.state.config.WHISPER_VAD_FILTER
+    # Batched inference transcribes the speech regions found by VAD in parallel,
+    # without VAD the audio is transcribed sequentially
+    if WHISPER_BATCH_SIZE <= 1 or not vad_filter:
+        return model, {"vad_filter": vad_filter}
+
+    pipeline = getattr(request.app.state, "faster_whisper_batched_pipeline", None)
+    if pipeline is None or pipeline.model is not model:
         try:
-            speaker_index = embeddings_dataset["filename"].index(
-                request.app.state.config.TTS_MODEL
+            from faster_whisper import BatchedInferencePipeline
+        except ImportError:
+            log.warning(
+                "Installed faster-whisper does not support batched inference, falling back to sequential transcription"
             )
-        except Exception:
-            pass
+            return model, {"vad_filter": vad_filter}
 
-        speaker_embedding = torch.tensor(
-            embeddings_dataset[speaker_index]["xvector"]
-        ).unsqueeze(0)
+        pipeline = BatchedInferencePipeline(model=model)
+        request.app.state.faster_whisper_batched_pipeline = pipeline
 
-        speech = request.app.state.speech_synthesiser(
-            payload["input"],
-            forward_params={"speaker_embeddings": speaker_embedding},
-        )
-
-        sf.write(file_path, speech["audio"], samplerate=speech["sampling_rate"])
+    return pipeline, {"vad_filter": vad_filter, "batch_size": WHISPER_BATCH_SIZE}
 
-        async with aiofiles.open(file_body_path, "w") as f:
-            await f.write(json.dumps(payload))
 
-        return FileResponse(file_path)
+def iter_faster_whisper_segments(request, file_path, language=None):
+    transcriber, kwargs = get_faster_whisper_transcriber(request)
+    segments, info = transcriber.transcribe(
+        file_path,
+        beam_size=5,
+        language=language,
+        **kwargs,
+    )
+    log.info(
+        "Detected language '%s' with probability %f"
+        % (info.language, info.language_probability)
+    )
+    return segments
 
 
 def transcription_handler(request, file_path, metadata, user=None):
@@ -577,22 +738,7 @@ def transcription_handler(request, file_path, metadata, user=None):
     ]
 
     if request.app.state.config.STT_ENGINE == "":
-        if request.app.state.faster_whisper_model is None:
-            request.app.state.faster_whisper_model = set_faster_whisper_model(
-                request.app.state.config.WHISPER_MODEL
-            )
-
-        model = request.app.state.faster_whisper_model
-        segments, info = model.transcribe(
-            file_path,
-            beam_size=5,
-            vad_filter=request.app.state.config.WHISPER_VAD_FILTER,
-            language=languages[0],
-        )
-        log.info(
-            "Detected language '%s' with probability %f"
-            % (info.language, info.language_probability)
-        )
+        segments = iter_faster_whisper_segments(request, file_path, languages[0])
 
         transcript = "".join([segment.text for segment in list(segments)])
         data = {"text": transcript.strip()}
@@ -1025,23 +1171,140 @@ def transcription_handler(request, file_path, metadata, user=None):
             )
 
 
-def transcribe(
+def get_chunk_boundaries(
+    duration_ms: int, cut_points: list[int], max_chunk_ms: int
+) -> list[tuple[int, int]]:
+    """
+    Groups audio into (start, end) ranges no longer than max_chunk_ms, cutting
+    at the latest candidate cut point (e.g. the middle of a silence) that
+    keeps the chunk under the limit. Falls back to a hard cut when a stretch
+    of audio has no usable cut point.
+    """
+    boundaries = []
+    start = 0
+    candidates = sorted(point for point in cut_points if 0 < point < duration_ms)
+
+    while duration_ms - start > max_chunk_ms:
+        limit = start + max_chunk_ms
+        end = max(
+            (point for point in candidates if start < point <= limit),
+            default=limit,
+        )
+        boundaries.append((start, end))
+        start = end
+
+    boundaries.append((start, duration_ms))
+    return boundaries
+
+
+def split_audio(file_path, max_bytes, format="mp3", bitrate="32k", min_silence_len=500):
+    """
+    Splits audio into chunks not exceeding max_bytes, preferring to cut in
+    silences so words are not split across chunks.
+
+    The source is decoded once, downmixed to 16 kHz mono and every chunk is
+    encoded exactly once at a constant bitrate, so chunk sizes are known up
+    front. Returns a list of chunk file paths. If the audio already fits in a
+    supported format, returns a list with the original path.
+    """
+    if os.path.getsize(file_path) <= max_bytes and not is_audio_conversion_required(
+        file_path
+    ):
+        return [file_path]  # Nothing to split
+
+    audio = AudioSegment.from_file(file_path).set_frame_rate(16000).set_channels(1)
+    duration_ms = len(audio)
+
+    # Constant bitrate output, keep 10% headroom for container overhead
+    bytes_per_ms = int(bitrate.rstrip("k")) * 1000 / 8 / 1000
+    max_chunk_ms = max(int(max_bytes / bytes_per_ms * 0.9), 1000)
+
+    cut_points = []
+    if duration_ms > max_chunk_ms:
+        nonsilent_ranges = detect_nonsilent(
+            audio,
+            min_silence_len=min_silence_len,
+            silence_thresh=audio.dBFS - 16,
+            seek_step=10,
+        )
+        cut_points = [
+            (previous_end + next_start) // 2
+            for (_, previous_end), (next_start, _) in zip(
+                nonsilent_ranges, nonsilent_ranges[1:]
+            )
+        ]
+
+    base, _ = os.path.splitext(file_path)
+    chunks = []
+    for i, (start, end) in enumerate(
+        get_chunk_boundaries(duration_ms, cut_points, max_chunk_ms)
+    ):
+        chunk_path = f"{base}_chunk_{i}.{format}"
+        audio[start:end].export(chunk_path, format=format, bitrate=bitrate)
+
+        if os.path.getsize(chunk_path) > max_bytes:
+            os.remove(chunk_path)
+            for path in chunks:
+                os.remove(path)
+            raise Exception("Audio chunk cannot be reduced below max file size.")
+
+        chunks.append(chunk_path)
+
+    return chunks
+
+
+def iter_transcription(
     request: Request, file_path: str, metadata: Optional[dict] = None, user=None
 ):
+    """
+    Transcribes an audio file, yielding the transcript text in order as parts
+    of it complete: segments for the local faster-whisper engine, chunks for
+    the remote engines. Work runs on TRANSCRIPTION_EXECUTOR, which bounds
+    concurrency across all requests.
+    """
     log.info(f"transcribe: {file_path} {metadata}")
 
-    if is_audio_conversion_required(file_path):
-        file_path = convert_audio_to_mp3(file_path)
+    if request.app.state.config.STT_ENGINE == "":
+        # faster-whisper decodes any format itself, no conversion or splitting needed
+        metadata = metadata or {}
+        language = (
+            metadata.get("language", None) if not WHISPER_LANGUAGE else WHISPER_LANGUAGE
+        )
+        results = queue.Queue()
+        # Set once the generator is closed, e.g. when the client disconnects
+        stopped = threading.Event()
+
+        def produce():
+            try:
+                for segment in iter_faster_whisper_segments(
+                    request, file_path, language
+                ):
+                    if stopped.is_set():
+                        # Free the executor slot for other requests
+                        return
+                    results.put(segment.text)
+                results.put(None)
+            except Exception as e:
+                results.put(e)
 
-    try:
-        file_path = compress_audio(file_path)
-    except Exception as e:
-        log.exception(e)
+        future = TRANSCRIPTION_EXECUTOR.submit(produce)
+        try:
+            while (result := results.get()) is not None:
+                if isinstance(result, Exception):
+                    raise HTTPException(
+                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                        detail=f"Error transcribing audio: {result}",
+                    )
+                yield result
+        finally:
+            stopped.set()
+            future.cancel()
+        return
 
     # Always produce a list of chunk paths (could be one entry if small)
     try:
         chunk_paths = split_audio(file_path, MAX_FILE_SIZE)
-        print(f"Chunk paths: {chunk_paths}")
+        log.debug(f"Chunk paths: {chunk_paths}")
     except Exception as e:
         log.exception(e)
         raise HTTPException(
@@ -1049,99 +1312,51 @@ def transcribe(
             detail=ERROR_MESSAGES.DEFAULT(e),
         )
 
-    results = []
+    futures = [
+        TRANSCRIPTION_EXECUTOR.submit(
+            transcription_handler, request, chunk_path, metadata, user
+        )
+        for chunk_path in chunk_paths
+    ]
     try:
-        with ThreadPoolExecutor() as executor:
-            # Submit tasks for each chunk_path
-            futures = [
-                executor.submit(
-                    transcription_handler, request, chunk_path, metadata, user
+        # Yield results in order, later chunks keep transcribing meanwhile
+        for future in futures:
+            try:
+                result = future.result()
+            except Exception as transcribe_exc:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Error transcribing chunk: {transcribe_exc}",
                 )
-                for chunk_path in chunk_paths
-            ]
-            # Gather results as they complete
-            for future in futures:
-                try:
-                    results.append(future.result())
-                except Exception as transcribe_exc:
-                    raise HTTPException(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        detail=f"Error transcribing chunk: {transcribe_exc}",
-                    )
+            yield result["text"]
     finally:
+        for future in futures:
+            future.cancel()
+
         # Clean up only the temporary chunks, never the original file
-        for chunk_path in chunk_paths:
+        for future, chunk_path in zip(futures, chunk_paths):
             if chunk_path != file_path and os.path.isfile(chunk_path):
+                if not future.cancelled():
+                    # Wait for in-flight chunks before removing their files
+                    wait([future])
                 try:
                     os.remove(chunk_path)
                 except Exception:
                     pass
 
-    return {
-        "text": " ".join([result["text"] for result in results]),
-    }
-
-
-def compress_audio(file_path):
-    if os.path.getsize(file_path) > MAX_FILE_SIZE:
-        id = os.path.splitext(os.path.basename(file_path))[
-            0
-        ]  # Handles names with multiple dots
-        file_dir = os.path.dirname(file_path)
-
-        audio = AudioSegment.from_file(file_path)
-        audio = audio.set_frame_rate(16000).set_channels(1)  # Compress audio
-
-        compressed_path = os.path.join(file_dir, f"{id}_compressed.mp3")
-        audio.export(compressed_path, format="mp3", bitrate="32k")
-        # log.debug(f"Compressed audio to {compressed_path}")  # Uncomment if log is defined
-
-        return compressed_path
-    else:
-        return file_path
-
-
-def split_audio(file_path, max_bytes, format="mp3", bitrate="32k"):
-    """
-    Splits audio into chunks not exceeding max_bytes.
-    Returns a list of chunk file paths. If audio fits, returns list with original path.
-    """
-    file_size = os.path.getsize(file_path)
-    if file_size <= max_bytes:
-        return [file_path]  # Nothing to split
-
-    audio = AudioSegment.from_file(file_path)
-    duration_ms = len(audio)
-    orig_size = file_size
-
-    approx_chunk_ms = max(int(duration_ms * (max_bytes / orig_size)) - 1000, 1000)
-    chunks = []
-    start = 0
-    i = 0
-
-    base, _ = os.path.splitext(file_path)
-
-    while start < duration_ms:
-        end = min(start + approx_chunk_ms, duration_ms)
-        chunk = audio[start:end]
-        chunk_path = f"{base}_chunk_{i}.{format}"
-        chunk.export(chunk_path, format=format, bitrate=bitrate)
-
-        # Reduce chunk duration if still too large
-        while os.path.getsize(chunk_path) > max_bytes and (end - start) > 5000:
-            end = start + ((end - start) // 2)
-            chunk = audio[start:end]
-            chunk.export(chunk_path, format=format, bitrate=bitrate)
-
-        if os.path.getsize(chunk_path) > max_bytes:
-            os.remove(chunk_path)
-            raise Exception("Audio chunk cannot be reduced below max file size.")
 
-        chunks.append(chunk_path)
-        start = end
-        i += 1
+def transcribe(
+    request: Request, file_path: str, metadata: Optional[dict] = None, user=None
+):
+    texts = [
+        text.strip()
+        for text in iter_transcription(request, file_path, metadata, user)
+        if text.strip()
+    ]
 
-    return chunks
+    return {
+        "text": " ".join(texts),
+    }
 
 
 @router.post("/transcriptions")
@@ -1149,6 +1364,7 @@ def transcription(
     request: Request,
     file: UploadFile = File(...),
     language: Optional[str] = Form(None),
+    stream: bool = Form(False),
     user=Depends(get_verified_user),
 ):
     log.info(f"file.content_type: {file.content_type}")
@@ -1176,21 +1392,43 @@ def transcription(
         id = uuid.uuid4()
 
         filename = f"{id}.{ext}"
-        contents = file.file.read()
 
         file_dir = f"{CACHE_DIR}/audio/transcriptions"
         os.makedirs(file_dir, exist_ok=True)
         file_path = f"{file_dir}/{filename}"
 
         with open(file_path, "wb") as f:
-            f.write(contents)
+            shutil.copyfileobj(file.file, f)
 
-        try:
-            metadata = None
+        metadata = None
 
-            if language:
-                metadata = {"language": language}
+        if language:
+            metadata = {"language": language}
 
+        if stream:
+
+            def event_stream():
+                texts = []
+                try:
+                    for text in iter_transcription(request, file_path, metadata, user):
+                        if text.strip():
+                            texts.append(text.strip())
+                            yield f"data: {json.dumps({'text': text})}\n\n"
+
+                    result = {
+                        "text": " ".join(texts),
+                        "filename": os.path.basename(file_path),
+                        "done": True,
+                    }
+                    yield f"data: {json.dumps(result)}\n\n"
+                except Exception as e:
+                    log.exception(e)
+                    detail = e.detail if isinstance(e, HTTPException) else str(e)
+                    yield f"data: {json.dumps({'error': detail, 'done': True})}\n\n"
+
+            return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+        try:
             result = transcribe(request, file_path, metadata, user)
 
             return {
@@ -10,7 +10,7 @@ from pydantic import BaseModel
 from open_webui.socket.main import (
     sio,
     get_user_ids_from_room,
-    get_active_status_by_user_id,
+    aget_active_user_ids,
 )
 from open_webui.models.users import (
     UserListResponse,
@@ -174,11 +174,12 @@ async def get_channel_users_by_id(
     users = result["users"]
     total = result["total"]
 
+    # One read of the active users instead of a lookup per listed user
+    active_user_ids = set(await aget_active_user_ids())
+
     return {
         "users": [
-            UserModelResponse(
-                **user.model_dump(), is_active=get_active_status_by_user_id(user.id)
-            )
+            UserModelResponse(**user.model_dump(), is_active=user.id in active_user_ids)
             for user in users
         ],
         "total": total,
@@ -569,7 +570,7 @@ async def post_new_message(
 
     try:
         message, channel = await new_message_handler(request, id, form_data, user)
-        active_user_ids = get_user_ids_from_room(f"channel:{channel.id}")
+        active_user_ids = await get_user_ids_from_room(f"channel:{channel.id}")
 
         async def background_handler():
             await model_response_handler(request, channel, message, user)
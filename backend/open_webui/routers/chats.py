@@ -1,3 +1,4 @@
+import gzip
 import json
 import logging
 from typing import Optional
@@ -17,13 +18,16 @@ from open_webui.models.folders import Folders
 
 from open_webui.config import ENABLE_ADMIN_CHAT_ACCESS, ENABLE_ADMIN_EXPORT
 from open_webui.constants import ERROR_MESSAGES
-from open_webui.env import SRC_LOG_LEVELS
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from open_webui.env import CHAT_IMPORT_BATCH_SIZE, SRC_LOG_LEVELS
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_permission
+from open_webui.utils.chat_import import import_chats_from_ndjson
+from open_webui.utils.export import get_export_response
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -159,6 +163,37 @@ async def import_chats(form_data: ChatsImportForm, user=Depends(get_verified_use
         )
 
 
+@router.post("/import/stream")
+def import_chats_stream(
+    file: UploadFile = File(...),
+    batch_size: Optional[int] = None,
+    skip: int = 0,
+    user=Depends(get_verified_user),
+):
+    """
+    Imports an NDJSON file, as produced by /all?format=ndjson, optionally
+    gzipped. The response is a stream of NDJSON progress events, see
+    import_chats_from_ndjson for how to resume a failed import.
+    """
+    lines = file.file
+    if (file.filename or "").endswith(".gz") or file.content_type in (
+        "application/gzip",
+        "application/x-gzip",
+    ):
+        lines = gzip.GzipFile(fileobj=file.file)
+
+    def event_stream():
+        for event in import_chats_from_ndjson(
+            user.id,
+            lines,
+            batch_size=batch_size or CHAT_IMPORT_BATCH_SIZE,
+            skip=max(0, skip),
+        ):
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+
 ############################
 # GetChats
 ############################
@@ -254,11 +289,18 @@ async def get_user_pinned_chats(user=Depends(get_verified_user)):
 
 
 @router.get("/all", response_model=list[ChatResponse])
-async def get_user_chats(user=Depends(get_verified_user)):
-    return [
-        ChatResponse(**chat.model_dump())
-        for chat in Chats.get_chats_by_user_id(user.id)
-    ]
+async def get_user_chats(
+    format: str = "json", gzip: bool = False, user=Depends(get_verified_user)
+):
+    return get_export_response(
+        (
+            ChatResponse(**chat.model_dump())
+            for chat in Chats.iter_chats(user_id=user.id)
+        ),
+        format=format,
+        gzip=gzip,
+        filename="chats",
+    )
 
 
 ############################
@@ -267,11 +309,18 @@ async def get_user_chats(user=Depends(get_verified_user)):
 
 
 @router.get("/all/archived", response_model=list[ChatResponse])
-async def get_user_archived_chats(user=Depends(get_verified_user)):
-    return [
-        ChatResponse(**chat.model_dump())
-        for chat in Chats.get_archived_chats_by_user_id(user.id)
-    ]
+async def get_user_archived_chats(
+    format: str = "json", gzip: bool = False, user=Depends(get_verified_user)
+):
+    return get_export_response(
+        (
+            ChatResponse(**chat.model_dump())
+            for chat in Chats.iter_chats(user_id=user.id, archived=True)
+        ),
+        format=format,
+        gzip=gzip,
+        filename="archived-chats",
+    )
 
 
 ############################
@@ -297,13 +346,20 @@ async def get_all_user_tags(user=Depends(get_verified_user)):
 
 
 @router.get("/all/db", response_model=list[ChatResponse])
-async def get_all_user_chats_in_db(user=Depends(get_admin_user)):
+async def get_all_user_chats_in_db(
+    format: str = "json", gzip: bool = False, user=Depends(get_admin_user)
+):
     if not ENABLE_ADMIN_EXPORT:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
-    return [ChatResponse(**chat.model_dump()) for chat in Chats.get_chats()]
+    return get_export_response(
+        (ChatResponse(**chat.model_dump()) for chat in Chats.iter_chats()),
+        format=format,
+        gzip=gzip,
+        filename="all-chats",
+    )
 
 
 ############################
@@ -11,9 +11,16 @@ from open_webui.models.feedbacks import (
     FeedbackListResponse,
     Feedbacks,
 )
+from open_webui.models.leaderboard import (
+    ALL_TAGS,
+    LeaderboardResponse,
+    LeaderboardTagCount,
+    Leaderboards,
+)
 
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.export import get_export_response
 
 router = APIRouter()
 
@@ -71,9 +78,12 @@ async def delete_all_feedbacks(user=Depends(get_admin_user)):
 
 
 @router.get("/feedbacks/all/export", response_model=list[FeedbackModel])
-async def get_all_feedbacks(user=Depends(get_admin_user)):
-    feedbacks = Feedbacks.get_all_feedbacks()
-    return feedbacks
+async def get_all_feedbacks(
+    format: str = "json", gzip: bool = False, user=Depends(get_admin_user)
+):
+    return get_export_response(
+        Feedbacks.iter_feedbacks(), format=format, gzip=gzip, filename="feedbacks"
+    )
 
 
 @router.get("/feedbacks/user", response_model=list[FeedbackUserResponse])
@@ -113,6 +123,39 @@ async def get_feedbacks(
     return result
 
 
+@router.get("/leaderboard", response_model=LeaderboardResponse)
+async def get_leaderboard(
+    tag: Optional[str] = None,
+    order_by: Optional[str] = "rating",
+    direction: Optional[str] = "desc",
+    page: Optional[int] = 1,
+    limit: Optional[int] = PAGE_ITEM_COUNT,
+    user=Depends(get_admin_user),
+):
+    limit = max(1, min(limit, 100))
+
+    page = max(1, page)
+    skip = (page - 1) * limit
+
+    return Leaderboards.get_leaderboard(
+        tag=tag or ALL_TAGS,
+        order_by=order_by,
+        direction=direction,
+        skip=skip,
+        limit=limit,
+    )
+
+
+@router.get("/leaderboard/tags", response_model=list[str])
+async def get_leaderboard_tags(user=Depends(get_admin_user)):
+    return Leaderboards.get_tags()
+
+
+@router.get("/leaderboard/model/tags", response_model=list[LeaderboardTagCount])
+async def get_leaderboard_model_tags(id: str, user=Depends(get_admin_user)):
+    return Leaderboards.get_model_tags(id)
+
+
 @router.post("/feedback", response_model=FeedbackModel)
 async def create_feedback(
     request: Request,
@@ -22,9 +22,11 @@ from fastapi import (
 )
 
 from fastapi.responses import FileResponse, StreamingResponse
+from starlette.datastructures import Headers
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.env import SRC_LOG_LEVELS
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.cache import RETRIEVAL_RESULT_CACHE
 
 from open_webui.models.users import Users
 from open_webui.models.files import (
@@ -38,6 +40,7 @@ from open_webui.models.knowledge import Knowledges
 from open_webui.routers.knowledge import get_knowledge, get_knowledge_list
 from open_webui.routers.retrieval import ProcessFileForm, process_file
 from open_webui.routers.audio import transcribe
+from open_webui.retrieval.ingestion import PRIORITY_NORMAL, IngestionJob
 from open_webui.storage.provider import Storage
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from pydantic import BaseModel
@@ -85,16 +88,18 @@ def has_access_to_file(
 ############################
 
 
-def process_uploaded_file(request, file, file_path, file_item, file_metadata, user):
+def process_uploaded_file(
+    request, content_type, file_path, file_item, file_metadata, user
+):
     try:
-        if file.content_type:
+        if content_type:
             stt_supported_content_types = getattr(
                 request.app.state.config, "STT_SUPPORTED_CONTENT_TYPES", []
             )
 
             if any(
-                fnmatch(file.content_type, content_type)
-                for content_type in (
+                fnmatch(content_type, pattern)
+                for pattern in (
                     stt_supported_content_types
                     if stt_supported_content_types
                     and any(t.strip() for t in stt_supported_content_types)
@@ -111,17 +116,17 @@ def process_uploaded_file(request, file, file_path, file_item, file_metadata, us
                     ),
                     user=user,
                 )
-            elif (not file.content_type.startswith(("image/", "video/"))) or (
+            elif (not content_type.startswith(("image/", "video/"))) or (
                 request.app.state.config.CONTENT_EXTRACTION_ENGINE == "external"
             ):
                 process_file(request, ProcessFileForm(file_id=file_item.id), user=user)
             else:
                 raise Exception(
-                    f"File type {file.content_type} is not supported for processing"
+                    f"File type {content_type} is not supported for processing"
                 )
         else:
             log.info(
-                f"File type {file.content_type} is not provided, but trying to process anyway"
+                f"File type {content_type} is not provided, but trying to process anyway"
             )
             process_file(request, ProcessFileForm(file_id=file_item.id), user=user)
     except Exception as e:
@@ -135,6 +140,55 @@ def process_uploaded_file(request, file, file_path, file_item, file_metadata, us
         )
 
 
+def process_ingestion_job(app, job: IngestionJob):
+    """Runs a queued ingestion job, see open_webui.retrieval.ingestion."""
+    file_item = Files.get_file_by_id(job.file_id)
+    user = Users.get_user_by_id(job.user_id)
+
+    if not file_item or not user:
+        log.warning(f"Skipping ingestion job for missing file {job.file_id}")
+        return
+
+    Files.update_file_data_by_id(file_item.id, {"status": "processing"})
+
+    request = Request(
+        # Creating a mock request object for jobs run outside of a request
+        {
+            "type": "http",
+            "asgi.version": "3.0",
+            "asgi.spec_version": "2.0",
+            "method": "POST",
+            "path": "/internal",
+            "query_string": b"",
+            "headers": Headers({}).raw,
+            "client": ("127.0.0.1", 12345),
+            "server": ("127.0.0.1", 80),
+            "scheme": "http",
+            "app": app,
+        }
+    )
+
+    process_uploaded_file(
+        request,
+        file_item.meta.get("content_type"),
+        file_item.path,
+        file_item,
+        job.metadata,
+        user,
+    )
+
+
+def fail_ingestion_job(job: IngestionJob):
+    """Marks the file of an ingestion job that was given up as failed."""
+    Files.update_file_data_by_id(
+        job.file_id,
+        {
+            "status": "failed",
+            "error": "Processing was interrupted too many times",
+        },
+    )
+
+
 @router.post("/", response_model=FileModelResponse)
 def upload_file(
     request: Request,
@@ -143,6 +197,7 @@ def upload_file(
     metadata: Optional[dict | str] = Form(None),
     process: bool = Query(True),
     process_in_background: bool = Query(True),
+    priority: int = Query(PRIORITY_NORMAL),
     user=Depends(get_verified_user),
 ):
     return upload_file_handler(
@@ -153,6 +208,7 @@ def upload_file(
         process_in_background=process_in_background,
         user=user,
         background_tasks=background_tasks,
+        priority=priority,
     )
 
 
@@ -164,6 +220,7 @@ def upload_file_handler(
     process_in_background: bool = Query(True),
     user=Depends(get_verified_user),
     background_tasks: Optional[BackgroundTasks] = None,
+    priority: int = PRIORITY_NORMAL,
 ):
     log.info(f"file.content_type: {file.content_type}")
 
@@ -202,7 +259,7 @@ def upload_file_handler(
         id = str(uuid.uuid4())
         name = filename
         filename = f"{id}_{filename}"
-        contents, file_path = Storage.upload_file(
+        file_path, file_hash, file_size = Storage.upload_file(
             file.file,
             filename,
             {
@@ -226,7 +283,8 @@ def upload_file_handler(
                     "meta": {
                         "name": name,
                         "content_type": file.content_type,
-                        "size": len(contents),
+                        "size": file_size,
+                        "sha256": file_hash,
                         "data": file_metadata,
                     },
                 }
@@ -234,11 +292,27 @@ def upload_file_handler(
         )
 
         if process:
-            if background_tasks and process_in_background:
+            ingestion_queue = getattr(request.app.state, "INGESTION_QUEUE", None)
+
+            if process_in_background and ingestion_queue is not None:
+                # Only admins may jump ahead of the default priority
+                if user.role != "admin":
+                    priority = max(priority, PRIORITY_NORMAL)
+
+                ingestion_queue.submit(
+                    IngestionJob(
+                        file_id=file_item.id,
+                        user_id=user.id,
+                        priority=priority,
+                        metadata=file_metadata,
+                    )
+                )
+                return {"status": True, **file_item.model_dump()}
+            elif background_tasks and process_in_background:
                 background_tasks.add_task(
                     process_uploaded_file,
                     request,
-                    file,
+                    file.content_type,
                     file_path,
                     file_item,
                     file_metadata,
@@ -248,7 +322,7 @@ def upload_file_handler(
             else:
                 process_uploaded_file(
                     request,
-                    file,
+                    file.content_type,
                     file_path,
                     file_item,
                     file_metadata,
@@ -346,6 +420,7 @@ async def delete_all_files(user=Depends(get_admin_user)):
         try:
             Storage.delete_all_files()
             VECTOR_DB_CLIENT.reset()
+            RETRIEVAL_RESULT_CACHE.invalidate_all()
         except Exception as e:
             log.exception(e)
             log.error("Error deleting files")
@@ -526,7 +601,10 @@ async def update_file_data_content_by_id(
 
 @router.get("/{id}/content")
 async def get_file_content_by_id(
-    id: str, user=Depends(get_verified_user), attachment: bool = Query(False)
+    id: str,
+    request: Request,
+    user=Depends(get_verified_user),
+    attachment: bool = Query(False),
 ):
     file = Files.get_file_by_id(id)
 
@@ -542,15 +620,19 @@ async def get_file_content_by_id(
         or has_access_to_file(id, "read", user)
     ):
         try:
-            file_path = Storage.get_file(file.path)
-            file_path = Path(file_path)
+            range_header = request.headers.get("range")
+            range_response = None
+            if range_header and not Storage.has_local_copy(file.path):
+                # Serve partial content (e.g. media seeking) straight from storage
+                range_response = await asyncio.to_thread(
+                    Storage.get_file_range, file.path, range_header
+                )
 
-            # Check if the file already exists in the cache
-            if file_path.is_file():
-                # Handle Unicode filenames
-                filename = file.meta.get("name", file.filename)
-                encoded_filename = quote(filename)  # RFC5987 encoding
+            if range_response is None:
+                file_path = Path(await asyncio.to_thread(Storage.get_file, file.path))
 
+            # Check if the file already exists in the cache
+            if range_response is not None or file_path.is_file():
                 content_type = file.meta.get("content_type")
                 filename = file.meta.get("name", file.filename)
                 encoded_filename = quote(filename)
@@ -573,6 +655,21 @@ async def get_file_content_by_id(
                             f"attachment; filename*=UTF-8''{encoded_filename}"
                         )
 
+                if range_response is not None:
+                    chunks, content_range, content_length = range_response
+                    return StreamingResponse(
+                        chunks,
+                        status_code=status.HTTP_206_PARTIAL_CONTENT,
+                        media_type=content_type,
+                        headers={
+                            **headers,
+                            "Accept-Ranges": "bytes",
+                            "Content-Range": content_range,
+                            "Content-Length": str(content_length),
+                        },
+                    )
+
+                # FileResponse handles Range requests for local copies
                 return FileResponse(file_path, headers=headers, media_type=content_type)
 
             else:
@@ -726,6 +823,7 @@ async def delete_file_by_id(id: str, user=Depends(get_verified_user)):
             try:
                 Storage.delete_file(file.path)
                 VECTOR_DB_CLIENT.delete(collection_name=f"file-{id}")
+                RETRIEVAL_RESULT_CACHE.invalidate(f"file-{id}")
             except Exception as e:
                 log.exception(e)
                 log.error("Error deleting files")
@@ -12,6 +12,7 @@ from open_webui.models.knowledge import (
 )
 from open_webui.models.files import Files, FileModel, FileMetadataResponse
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.cache import RETRIEVAL_RESULT_CACHE
 from open_webui.routers.retrieval import (
     process_file,
     ProcessFileForm,
@@ -217,6 +218,7 @@ async def reindex_knowledge_files(request: Request, user=Depends(get_verified_us
                     VECTOR_DB_CLIENT.delete_collection(
                         collection_name=knowledge_base.id
                     )
+                    RETRIEVAL_RESULT_CACHE.invalidate(knowledge_base.id)
             except Exception as e:
                 log.error(f"Error deleting collection {knowledge_base.id}: {str(e)}")
                 continue  # Skip, don't raise
@@ -479,6 +481,7 @@ def update_file_from_knowledge_by_id(
     VECTOR_DB_CLIENT.delete(
         collection_name=knowledge.id, filter={"file_id": form_data.file_id}
     )
+    RETRIEVAL_RESULT_CACHE.invalidate(knowledge.id)
 
     # Add content to the vector database
     try:
@@ -551,6 +554,7 @@ def remove_file_from_knowledge_by_id(
         VECTOR_DB_CLIENT.delete(
             collection_name=knowledge.id, filter={"file_id": form_data.file_id}
         )
+        RETRIEVAL_RESULT_CACHE.invalidate(knowledge.id)
     except Exception as e:
         log.debug("This was most likely caused by bypassing embedding processing")
         log.debug(e)
@@ -562,6 +566,7 @@ def remove_file_from_knowledge_by_id(
             file_collection = f"file-{form_data.file_id}"
             if VECTOR_DB_CLIENT.has_collection(collection_name=file_collection):
                 VECTOR_DB_CLIENT.delete_collection(collection_name=file_collection)
+                RETRIEVAL_RESULT_CACHE.invalidate(file_collection)
         except Exception as e:
             log.debug("This was most likely caused by bypassing embedding processing")
             log.debug(e)
@@ -660,6 +665,7 @@ async def delete_knowledge_by_id(id: str, user=Depends(get_verified_user)):
     # Clean up vector DB
     try:
         VECTOR_DB_CLIENT.delete_collection(collection_name=id)
+        RETRIEVAL_RESULT_CACHE.invalidate(id)
     except Exception as e:
         log.debug(e)
         pass
@@ -693,6 +699,7 @@ async def reset_knowledge_by_id(id: str, user=Depends(get_verified_user)):
 
     try:
         VECTOR_DB_CLIENT.delete_collection(collection_name=id)
+        RETRIEVAL_RESULT_CACHE.invalidate(id)
     except Exception as e:
         log.debug(e)
         pass
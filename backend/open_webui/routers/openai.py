@@ -21,9 +21,6 @@ from pydantic import BaseModel
 from starlette.background import BackgroundTask
 
 from open_webui.models.models import Models
-from open_webui.config import (
-    CACHE_DIR,
-)
 from open_webui.env import (
     MODELS_CACHE_TTL,
     AIOHTTP_CLIENT_SESSION_SSL,
@@ -47,6 +44,7 @@ from open_webui.utils.misc import (
     stream_chunks_handler,
 )
 
+from open_webui.utils.audio import SPEECH_CACHE
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
 from open_webui.utils.headers import include_user_info_headers
@@ -278,13 +276,9 @@ async def speech(request: Request, user=Depends(get_verified_user)):
         body = await request.body()
         name = hashlib.sha256(body).hexdigest()
 
-        SPEECH_CACHE_DIR = CACHE_DIR / "audio" / "speech"
-        SPEECH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        file_path = SPEECH_CACHE_DIR.joinpath(f"{name}.mp3")
-        file_body_path = SPEECH_CACHE_DIR.joinpath(f"{name}.json")
-
         # Check if the file already exists in the cache
-        if file_path.is_file():
+        file_path = SPEECH_CACHE.get(name)
+        if file_path:
             return FileResponse(file_path)
 
         url = request.app.state.config.OPENAI_API_BASE_URLS[idx]
@@ -310,13 +304,10 @@ async def speech(request: Request, user=Depends(get_verified_user)):
 
             r.raise_for_status()
 
-            # Save the streaming content to a file
-            with open(file_path, "wb") as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
-            with open(file_body_path, "w") as f:
-                json.dump(json.loads(body.decode("utf-8")), f)
+            # Save the streaming content to the cache
+            file_path = await asyncio.to_thread(
+                SPEECH_CACHE.put_stream, name, r.iter_content(chunk_size=8192)
+            )
 
             # Return the saved file
             return FileResponse(file_path)
@@ -7,6 +7,7 @@ import asyncio
 
 import re
 import uuid
+from array import array
 from datetime import datetime
 from pathlib import Path
 from typing import Iterator, List, Optional, Sequence, Union
@@ -25,11 +26,8 @@ from fastapi import (
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-import tiktoken
 
 
-from langchain.text_splitter import RecursiveCharacterTextSplitter, TokenTextSplitter
-from langchain_text_splitters import MarkdownHeaderTextSplitter
 from langchain_core.documents import Document
 
 from open_webui.models.files import FileModel, FileUpdateForm, Files
@@ -38,40 +36,25 @@ from open_webui.storage.provider import Storage
 
 
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.cache import (
+    RETRIEVAL_RESULT_CACHE,
+    TTLCache,
+    WEB_EMBEDDING_CACHE,
+    WEB_SEARCH_RESULT_CACHE,
+    normalize_query,
+)
+from open_webui.retrieval.models.worker import EmbeddingWorker, RerankingWorker
 
 # Document loaders
 from open_webui.retrieval.loaders.main import Loader
-from open_webui.retrieval.loaders.youtube import YoutubeLoader
+from open_webui.retrieval.ingestion import load_documents
 
 # Web search engines
-from open_webui.retrieval.web.main import SearchResult
+from open_webui.retrieval.web.main import WEB_SEARCH_ENGINES, SearchResult
 from open_webui.retrieval.web.utils import get_web_loader
-from open_webui.retrieval.web.ollama import search_ollama_cloud
-from open_webui.retrieval.web.perplexity_search import search_perplexity_search
-from open_webui.retrieval.web.brave import search_brave
-from open_webui.retrieval.web.kagi import search_kagi
-from open_webui.retrieval.web.mojeek import search_mojeek
-from open_webui.retrieval.web.bocha import search_bocha
-from open_webui.retrieval.web.duckduckgo import search_duckduckgo
-from open_webui.retrieval.web.google_pse import search_google_pse
-from open_webui.retrieval.web.jina_search import search_jina
-from open_webui.retrieval.web.searchapi import search_searchapi
-from open_webui.retrieval.web.serpapi import search_serpapi
-from open_webui.retrieval.web.searxng import search_searxng
-from open_webui.retrieval.web.yacy import search_yacy
-from open_webui.retrieval.web.serper import search_serper
-from open_webui.retrieval.web.serply import search_serply
-from open_webui.retrieval.web.serpstack import search_serpstack
-from open_webui.retrieval.web.tavily import search_tavily
-from open_webui.retrieval.web.bing import search_bing
-from open_webui.retrieval.web.azure import search_azure
-from open_webui.retrieval.web.exa import search_exa
-from open_webui.retrieval.web.perplexity import search_perplexity
-from open_webui.retrieval.web.sougou import search_sougou
-from open_webui.retrieval.web.firecrawl import search_firecrawl
-from open_webui.retrieval.web.external import search_external
 
 from open_webui.retrieval.utils import (
+    get_all_items,
     get_content_from_url,
     get_embedding_function,
     get_reranking_function,
@@ -102,6 +85,7 @@ from open_webui.env import (
     SRC_LOG_LEVELS,
     DEVICE_TYPE,
     DOCKER,
+    RAG_RERANKING_MAX_BATCH_PAIRS,
     SENTENCE_TRANSFORMERS_BACKEND,
     SENTENCE_TRANSFORMERS_MODEL_KWARGS,
     SENTENCE_TRANSFORMERS_CROSS_ENCODER_BACKEND,
@@ -124,18 +108,22 @@ def get_ef(
     engine: str,
     embedding_model: str,
     auto_update: bool = False,
+    batch_size: Optional[int] = None,
 ):
     ef = None
     if embedding_model and engine == "":
         from sentence_transformers import SentenceTransformer
 
         try:
-            ef = SentenceTransformer(
-                get_model_path(embedding_model, auto_update),
-                device=DEVICE_TYPE,
-                trust_remote_code=RAG_EMBEDDING_MODEL_TRUST_REMOTE_CODE,
-                backend=SENTENCE_TRANSFORMERS_BACKEND,
-                model_kwargs=SENTENCE_TRANSFORMERS_MODEL_KWARGS,
+            ef = EmbeddingWorker(
+                SentenceTransformer(
+                    get_model_path(embedding_model, auto_update),
+                    device=DEVICE_TYPE,
+                    trust_remote_code=RAG_EMBEDDING_MODEL_TRUST_REMOTE_CODE,
+                    backend=SENTENCE_TRANSFORMERS_BACKEND,
+                    model_kwargs=SENTENCE_TRANSFORMERS_MODEL_KWARGS,
+                ),
+                batch_size=batch_size,
             )
         except Exception as e:
             log.debug(f"Error loading SentenceTransformer: {e}")
@@ -156,9 +144,13 @@ def get_rf(
             try:
                 from open_webui.retrieval.models.colbert import ColBERT
 
-                rf = ColBERT(
-                    get_model_path(reranking_model, auto_update),
-                    env="docker" if DOCKER else None,
+                # ColBERT scores are normalized per query, so requests are not merged
+                rf = RerankingWorker(
+                    ColBERT(
+                        get_model_path(reranking_model, auto_update),
+                        env="docker" if DOCKER else None,
+                    ),
+                    merge_requests=False,
                 )
 
             except Exception as e:
@@ -212,6 +204,10 @@ def get_rf(
                 except Exception as e2:
                     log.warning(f"Failed to adjust pad_token_id on CrossEncoder: {e2}")
 
+                rf = RerankingWorker(
+                    rf, predict_kwargs={"batch_size": RAG_RERANKING_MAX_BATCH_PAIRS}
+                )
+
     return rf
 
 
@@ -302,9 +298,18 @@ class EmbeddingModelUpdateForm(BaseModel):
     ENABLE_ASYNC_EMBEDDING: Optional[bool] = True
 
 
+@router.get("/embedding/metrics")
+async def get_embedding_metrics(request: Request, user=Depends(get_admin_user)):
+    if isinstance(request.app.state.ef, EmbeddingWorker):
+        return request.app.state.ef.get_metrics()
+    return {}
+
+
 def unload_embedding_model(request: Request):
     if request.app.state.config.RAG_EMBEDDING_ENGINE == "":
         # unloads current internal embedding model and clears VRAM cache
+        if isinstance(request.app.state.ef, EmbeddingWorker):
+            request.app.state.ef.close()
         request.app.state.ef = None
         request.app.state.EMBEDDING_FUNCTION = None
         import gc
@@ -370,6 +375,7 @@ async def update_embedding_config(
         request.app.state.ef = get_ef(
             request.app.state.config.RAG_EMBEDDING_ENGINE,
             request.app.state.config.RAG_EMBEDDING_MODEL,
+            batch_size=request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
         )
 
         request.app.state.EMBEDDING_FUNCTION = get_embedding_function(
@@ -879,6 +885,8 @@ async def update_rag_config(
     # Reranking settings
     if request.app.state.config.RAG_RERANKING_ENGINE == "":
         # Unloading the internal reranker and clear VRAM memory
+        if isinstance(request.app.state.rf, RerankingWorker):
+            request.app.state.rf.close()
         request.app.state.rf = None
         request.app.state.RERANKING_FUNCTION = None
         import gc
@@ -922,6 +930,8 @@ async def update_rag_config(
                 request.app.state.config.ENABLE_RAG_HYBRID_SEARCH
                 and not request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL
             ):
+                if isinstance(request.app.state.rf, RerankingWorker):
+                    request.app.state.rf.close()
                 request.app.state.rf = get_rf(
                     request.app.state.config.RAG_RERANKING_ENGINE,
                     request.app.state.config.RAG_RERANKING_MODEL,
@@ -1232,6 +1242,7 @@ def save_docs_to_vector_db(
     split: bool = True,
     add: bool = False,
     user=None,
+    embedding_cache: Optional[TTLCache] = None,
 ) -> bool:
     def _get_docs_info(docs: list[Document]) -> str:
         docs_info = set()
@@ -1255,9 +1266,11 @@ def save_docs_to_vector_db(
 
     # Check if entries with the same hash (metadata.hash) already exist
     if metadata and "hash" in metadata:
-        result = VECTOR_DB_CLIENT.query(
+        result = VECTOR_DB_CLIENT.get_items(
             collection_name=collection_name,
             filter={"hash": metadata["hash"]},
+            include=["ids"],
+            limit=1,
         )
 
         if result is not None:
@@ -1267,6 +1280,14 @@ def save_docs_to_vector_db(
                 raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
 
     if split:
+        # Splitters and tiktoken are only needed here, keep them off the import path
+        import tiktoken
+        from langchain.text_splitter import (
+            RecursiveCharacterTextSplitter,
+            TokenTextSplitter,
+        )
+        from langchain_text_splitters import MarkdownHeaderTextSplitter
+
         if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
             text_splitter = RecursiveCharacterTextSplitter(
                 chunk_size=request.app.state.config.CHUNK_SIZE,
@@ -1358,6 +1379,7 @@ def save_docs_to_vector_db(
 
             if overwrite:
                 VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+                RETRIEVAL_RESULT_CACHE.invalidate(collection_name)
                 log.info(f"deleting existing collection {collection_name}")
             elif add is False:
                 log.info(
@@ -1396,15 +1418,43 @@ def save_docs_to_vector_db(
             ),
         )
 
-        # Run async embedding in sync context
-        embeddings = asyncio.run(
-            embedding_function(
-                list(map(lambda x: x.replace("\n", " "), texts)),
-                prefix=RAG_EMBEDDING_CONTENT_PREFIX,
-                user=user,
+        texts_to_embed = list(map(lambda x: x.replace("\n", " "), texts))
+        embeddings = [None] * len(texts_to_embed)
+
+        # Chunks embedded before with the same model are taken from the cache
+        if embedding_cache is not None and embedding_cache.enabled:
+            cache_keys = [
+                calculate_sha256_string(
+                    f"{request.app.state.config.RAG_EMBEDDING_ENGINE}:"
+                    f"{request.app.state.config.RAG_EMBEDDING_MODEL}:"
+                    f"{RAG_EMBEDDING_CONTENT_PREFIX}:{text}"
+                )
+                for text in texts_to_embed
+            ]
+            for idx, key in enumerate(cache_keys):
+                cached = embedding_cache.get(key)
+                if cached is not None:
+                    embeddings[idx] = cached.tolist()
+
+        missing = [idx for idx, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            # Run async embedding in sync context
+            new_embeddings = asyncio.run(
+                embedding_function(
+                    [texts_to_embed[idx] for idx in missing],
+                    prefix=RAG_EMBEDDING_CONTENT_PREFIX,
+                    user=user,
+                )
             )
+            for idx, embedding in zip(missing, new_embeddings):
+                embeddings[idx] = embedding
+                if embedding_cache is not None and embedding_cache.enabled:
+                    # Stored as float32, a list of floats is eight times larger
+                    embedding_cache.set(cache_keys[idx], array("f", embedding))
+        log.info(
+            f"embeddings generated {len(missing)} for {len(texts)} items, "
+            f"{len(texts) - len(missing)} reused"
         )
-        log.info(f"embeddings generated {len(embeddings)} for {len(texts)} items")
 
         items = [
             {
@@ -1421,6 +1471,7 @@ def save_docs_to_vector_db(
             collection_name=collection_name,
             items=items,
         )
+        RETRIEVAL_RESULT_CACHE.invalidate(collection_name)
 
         log.info(f"added {len(items)} items to collection {collection_name}")
         return True
@@ -1466,6 +1517,7 @@ def process_file(
                     VECTOR_DB_CLIENT.delete_collection(
                         collection_name=f"file-{file.id}"
                     )
+                    RETRIEVAL_RESULT_CACHE.invalidate(f"file-{file.id}")
                 except:
                     # Audio file upload pipeline
                     pass
@@ -1488,9 +1540,7 @@ def process_file(
                 # Check if the file has already been processed and save the content
                 # Usage: /knowledge/{id}/file/add, /knowledge/{id}/file/update
 
-                result = VECTOR_DB_CLIENT.query(
-                    collection_name=f"file-{file.id}", filter={"file_id": file.id}
-                )
+                result = get_all_items(f"file-{file.id}", filter={"file_id": file.id})
 
                 if result is not None and len(result.ids[0]) > 0:
                     docs = [
@@ -1551,8 +1601,8 @@ def process_file(
                         MINERU_API_KEY=request.app.state.config.MINERU_API_KEY,
                         MINERU_PARAMS=request.app.state.config.MINERU_PARAMS,
                     )
-                    docs = loader.load(
-                        file.filename, file.meta.get("content_type"), file_path
+                    docs = load_documents(
+                        loader, file.filename, file.meta.get("content_type"), file_path
                     )
 
                     docs = [
@@ -1775,7 +1825,7 @@ def search_web(
 
     # TODO: add playwright to search the web
     if engine == "ollama_cloud":
-        return search_ollama_cloud(
+        return WEB_SEARCH_ENGINES["ollama_cloud"](
             "https://ollama.com",
             request.app.state.config.OLLAMA_CLOUD_WEB_SEARCH_API_KEY,
             query,
@@ -1784,7 +1834,7 @@ def search_web(
         )
     elif engine == "perplexity_search":
         if request.app.state.config.PERPLEXITY_API_KEY:
-            return search_perplexity_search(
+            return WEB_SEARCH_ENGINES["perplexity_search"](
                 request.app.state.config.PERPLEXITY_API_KEY,
                 query,
                 request.app.state.config.WEB_SEARCH_RESULT_COUNT,
@@ -1796,7 +1846,7 @@ def search_web(
             raise Exception("No PERPLEXITY_API_KEY found in environment variables")
     elif engine == "searxng":
         if request.app.state.config.SEARXNG_QUERY_URL:
-            return search_searxng(
+            return WEB_SEARCH_ENGINES["searxng"](
                 request.app.state.config.SEARXNG_QUERY_URL,
                 query,
                 request.app.state.config.WEB_SEARCH_RESULT_COUNT,
@@ -1806,7 +1856,7 @@ def search_web(
             raise Exception("No SEARXNG_QUERY_URL found in environment variables")
     elif engine == "yacy":
         if request.app.state.config.YACY_QUERY_URL:
-            return search_yacy(
+            return WEB_SEARCH_ENGINES["yacy"](
                 request.app.state.config.YACY_QUERY_URL,
                 request.app.state.config.YACY_USERNAME,
                 request.app.state.config.YACY_PASSWORD,
@@ -1821,7 +1871,7 @@ def search_web(
             request.app.state.config.GOOGLE_PSE_API_KEY
             and request.app.state.config.GOOGLE_PSE_ENGINE_ID
         ):
-            return search_google_pse(
+            return WEB_SEARCH_ENGINES["google_pse"](
                 request.app.state.config.GOOGLE_PSE_API_KEY,
                 request.app.state.config.GOOGLE_PSE_ENGINE_ID,
                 query,
@@ -1835,7 +1885,7 @@ def search_web(
             )
     elif engine == "brave":
         if request.app.state.config.BRAVE_SEARCH_API_KEY:
-            return search_brave(
+            return WEB_SEARCH_ENGINES["brave"](
                 request.app.state.config.BRAVE_SEARCH_API_KEY,
                 query,
                 request.app.state.config.WEB_SEARCH_RESULT_COUNT,
@@ -1845,7 +1895,7 @@ def search_web(
             raise Exception("No BRAVE_SEARCH_API_KEY found in environment variables")
     elif engine == "kagi":
         if request.app.state.config.KAGI_SEARCH_API_KEY:
-            return search_kagi(
+            return WEB_SEARCH_ENGINES["kagi"](
                 request.app.state.config.KAGI_SEARCH_API_KEY,
                 query,
                 request.app.state.config.WEB_SEARCH_RESULT_COUNT,
@@ -1855,7 +1905,7 @@ def search_web(
             raise Exception("No KAGI_SEARCH_API_KEY found in environment variables")
     elif engine == "mojeek":
         if request.app.state.config.MOJEEK_SEARCH_API_KEY:
-            return search_mojeek(
+            return WEB_SEARCH_ENGINES["mojeek"](
                 request.app.state.config.MOJEEK_SEARCH_API_KEY,
                 query,
                 request.app.state.config.WEB_SEARCH_RESULT_COUNT,
@@ -1865,7 +1915,7 @@ def search_web(
             raise Exception("No MOJEEK_SEARCH_API_KEY found in environment variables")
     elif engine == "bocha":
         if request.app.state.config.BOCHA_SEARCH_API_KEY:
-            return search_bocha(
+            return WEB_SEARCH_ENGINES["bocha"](
                 request.app.state.config.BOCHA_SEARCH_API_KEY,
                 query,
                 request.app.state.config.WEB_SEARCH_RESULT_COUNT,
@@ -1875,7 +1925,7 @@ def search_web(
             raise Exception("No BOCHA_SEARCH_API_KEY found in environment variables")
     elif engine == "serpstack":
         if request.app.state.config.SERPSTACK_API_KEY:
-            return search_serpstack(
+            return WEB_SEARCH_ENGINES["serpstack"](
                 request.app.state.config.SERPSTACK_API_KEY,
                 query,
                 request.app.state.config.WEB_SEARCH_RESULT_COUNT,
@@ -1886,7 +1936,7 @@ def search_web(
             raise Exception("No SERPSTACK_API_KEY found in environment variables")
     elif engine == "serper":
         if request.app.state.config.SERPER_API_KEY:
-            return search_serper(
+            return WEB_SEARCH_ENGINES["serper"](
                 request.app.state.config.SERPER_API_KEY,
                 query,
                 request.app.state.config.WEB_SEARCH_RESULT_COUNT,
@@ -1896,7 +1946,7 @@ def search_web(
             raise Exception("No SERPER_API_KEY found in environment variables")
     elif engine == "serply":
         if request.app.state.config.SERPLY_API_KEY:
-            return search_serply(
+            return WEB_SEARCH_ENGINES["serply"](
                 request.app.state.config.SERPLY_API_KEY,
                 query,
                 request.app.state.config.WEB_SEARCH_RESULT_COUNT,
@@ -1905,7 +1955,7 @@ def search_web(
         else:
             raise Exception("No SERPLY_API_KEY found in environment variables")
     elif engine == "duckduckgo":
-        return search_duckduckgo(
+        return WEB_SEARCH_ENGINES["duckduckgo"](
             query,
             request.app.state.config.WEB_SEARCH_RESULT_COUNT,
             request.app.state.config.WEB_SEARCH_DOMAIN_FILTER_LIST,
@@ -1913,7 +1963,7 @@ def search_web(
         )
     elif engine == "tavily":
         if request.app.state.config.TAVILY_API_KEY:
-            return search_tavily(
+            return WEB_SEARCH_ENGINES["tavily"](
                 request.app.state.config.TAVILY_API_KEY,
                 query,
                 request.app.state.config.WEB_SEARCH_RESULT_COUNT,
@@ -1923,7 +1973,7 @@ def search_web(
             raise Exception("No TAVILY_API_KEY found in environment variables")
     elif engine == "exa":
         if request.app.state.config.EXA_API_KEY:
-            return search_exa(
+            return WEB_SEARCH_ENGINES["exa"](
                 request.app.state.config.EXA_API_KEY,
                 query,
                 request.app.state.config.WEB_SEARCH_RESULT_COUNT,
@@ -1933,7 +1983,7 @@ def search_web(
             raise Exception("No EXA_API_KEY found in environment variables")
     elif engine == "searchapi":
         if request.app.state.config.SEARCHAPI_API_KEY:
-            return search_searchapi(
+            return WEB_SEARCH_ENGINES["searchapi"](
                 request.app.state.config.SEARCHAPI_API_KEY,
                 request.app.state.config.SEARCHAPI_ENGINE,
                 query,
@@ -1944,7 +1994,7 @@ def search_web(
             raise Exception("No SEARCHAPI_API_KEY found in environment variables")
     elif engine == "serpapi":
         if request.app.state.config.SERPAPI_API_KEY:
-            return search_serpapi(
+            return WEB_SEARCH_ENGINES["serpapi"](
                 request.app.state.config.SERPAPI_API_KEY,
                 request.app.state.config.SERPAPI_ENGINE,
                 query,
@@ -1954,13 +2004,13 @@ def search_web(
         else:
             raise Exception("No SERPAPI_API_KEY found in environment variables")
     elif engine == "jina":
-        return search_jina(
+        return WEB_SEARCH_ENGINES["jina"](
             request.app.state.config.JINA_API_KEY,
             query,
             request.app.state.config.WEB_SEARCH_RESULT_COUNT,
         )
     elif engine == "bing":
-        return search_bing(
+        return WEB_SEARCH_ENGINES["bing"](
             request.app.state.config.BING_SEARCH_V7_SUBSCRIPTION_KEY,
             request.app.state.config.BING_SEARCH_V7_ENDPOINT,
             str(DEFAULT_LOCALE),
@@ -1974,7 +2024,7 @@ def search_web(
             and request.app.state.config.AZURE_AI_SEARCH_ENDPOINT
             and request.app.state.config.AZURE_AI_SEARCH_INDEX_NAME
         ):
-            return search_azure(
+            return WEB_SEARCH_ENGINES["azure"](
                 request.app.state.config.AZURE_AI_SEARCH_API_KEY,
                 request.app.state.config.AZURE_AI_SEARCH_ENDPOINT,
                 request.app.state.config.AZURE_AI_SEARCH_INDEX_NAME,
@@ -1987,14 +2037,14 @@ def search_web(
                 "AZURE_AI_SEARCH_API_KEY, AZURE_AI_SEARCH_ENDPOINT, and AZURE_AI_SEARCH_INDEX_NAME are required for Azure AI Search"
             )
     elif engine == "exa":
-        return search_exa(
+        return WEB_SEARCH_ENGINES["exa"](
             request.app.state.config.EXA_API_KEY,
             query,
             request.app.state.config.WEB_SEARCH_RESULT_COUNT,
             request.app.state.config.WEB_SEARCH_DOMAIN_FILTER_LIST,
         )
     elif engine == "perplexity":
-        return search_perplexity(
+        return WEB_SEARCH_ENGINES["perplexity"](
             request.app.state.config.PERPLEXITY_API_KEY,
             query,
             request.app.state.config.WEB_SEARCH_RESULT_COUNT,
@@ -2007,7 +2057,7 @@ def search_web(
             request.app.state.config.SOUGOU_API_SID
             and request.app.state.config.SOUGOU_API_SK
         ):
-            return search_sougou(
+            return WEB_SEARCH_ENGINES["sougou"](
                 request.app.state.config.SOUGOU_API_SID,
                 request.app.state.config.SOUGOU_API_SK,
                 query,
@@ -2019,7 +2069,7 @@ def search_web(
                 "No SOUGOU_API_SID or SOUGOU_API_SK found in environment variables"
             )
     elif engine == "firecrawl":
-        return search_firecrawl(
+        return WEB_SEARCH_ENGINES["firecrawl"](
             request.app.state.config.FIRECRAWL_API_BASE_URL,
             request.app.state.config.FIRECRAWL_API_KEY,
             query,
@@ -2027,7 +2077,7 @@ def search_web(
             request.app.state.config.WEB_SEARCH_DOMAIN_FILTER_LIST,
         )
     elif engine == "external":
-        return search_external(
+        return WEB_SEARCH_ENGINES["external"](
             request,
             request.app.state.config.EXTERNAL_WEB_SEARCH_URL,
             request.app.state.config.EXTERNAL_WEB_SEARCH_API_KEY,
@@ -2040,6 +2090,40 @@ def search_web(
         raise Exception("No search engine API key found in environment variables")
 
 
+async def search_web_with_cache(
+    request: Request, engine: str, query: str, user=None
+) -> list[SearchResult]:
+    """
+    search_web with responses cached for WEB_SEARCH_CACHE_TTL, by engine, result
+    count, domain filter and normalized query.
+    """
+    if not WEB_SEARCH_RESULT_CACHE.enabled:
+        return await run_in_threadpool(search_web, request, engine, query, user)
+
+    key = calculate_sha256_string(
+        json.dumps(
+            [
+                engine,
+                request.app.state.config.WEB_SEARCH_RESULT_COUNT,
+                request.app.state.config.WEB_SEARCH_DOMAIN_FILTER_LIST,
+                normalize_query(query),
+            ],
+            default=str,
+        )
+    )
+    results = await WEB_SEARCH_RESULT_CACHE.aget(key)
+    if results is not None:
+        log.debug(f"Using cached web search results for {query}")
+        return [SearchResult(**result) for result in results]
+
+    results = await run_in_threadpool(search_web, request, engine, query, user)
+    if results:
+        await WEB_SEARCH_RESULT_CACHE.aset(
+            key, [result.model_dump() for result in results if result]
+        )
+    return results
+
+
 @router.post("/process/web/search")
 async def process_web_search(
     request: Request, form_data: SearchForm, user=Depends(get_verified_user)
@@ -2054,8 +2138,7 @@ async def process_web_search(
         )
 
         search_tasks = [
-            run_in_threadpool(
-                search_web,
+            search_web_with_cache(
                 request,
                 request.app.state.config.WEB_SEARCH_ENGINE,
                 query,
@@ -2156,6 +2239,7 @@ async def process_web_search(
                     collection_name,
                     overwrite=True,
                     user=user,
+                    embedding_cache=WEB_EMBEDDING_CACHE,
                 )
             except Exception as e:
                 log.debug(f"error saving docs: {e}")
@@ -2195,8 +2279,8 @@ async def query_doc_handler(
             form_data.hybrid is None or form_data.hybrid
         ):
             collection_results = {}
-            collection_results[form_data.collection_name] = VECTOR_DB_CLIENT.get(
-                collection_name=form_data.collection_name
+            collection_results[form_data.collection_name] = get_all_items(
+                form_data.collection_name, include=["documents", "metadatas"]
             )
             return await query_doc_with_hybrid_search(
                 collection_name=form_data.collection_name,
@@ -2343,6 +2427,7 @@ def delete_entries_from_collection(form_data: DeleteForm, user=Depends(get_admin
                 collection_name=form_data.collection_name,
                 metadata={"hash": hash},
             )
+            RETRIEVAL_RESULT_CACHE.invalidate(form_data.collection_name)
             return {"status": True}
         else:
             return {"status": False}
@@ -2354,6 +2439,7 @@ def delete_entries_from_collection(form_data: DeleteForm, user=Depends(get_admin
 @router.post("/reset/db")
 def reset_vector_db(user=Depends(get_admin_user)):
     VECTOR_DB_CLIENT.reset()
+    RETRIEVAL_RESULT_CACHE.invalidate_all()
     Knowledges.delete_all_knowledge()
 
 
@@ -0,0 +1,111 @@
+from typing import Optional
+import logging
+
+from open_webui.models.usage import (
+    PERIODS,
+    UsageEventModel,
+    UsageTotalsResponse,
+    Usages,
+)
+
+from open_webui.constants import ERROR_MESSAGES
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.env import SRC_LOG_LEVELS
+
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+router = APIRouter()
+
+
+def validate_period(period: str):
+    if period not in PERIODS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(
+                f"period must be one of {', '.join(PERIODS)}"
+            ),
+        )
+
+
+############################
+# GetUsageSummary
+############################
+
+
+@router.get("/summary", response_model=list[UsageTotalsResponse])
+async def get_usage_summary(
+    group_by: str = "model",
+    period: str = "day",
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    user=Depends(get_admin_user),
+):
+    validate_period(period)
+    if group_by not in ("model", "user", "group"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT("group_by must be one of model, user, group"),
+        )
+
+    return Usages.get_usage_summary(
+        group_by=group_by, period=period, start=start, end=end
+    )
+
+
+############################
+# GetUsageTimeseries
+############################
+
+
+@router.get("/timeseries", response_model=list[UsageTotalsResponse])
+async def get_usage_timeseries(
+    period: str = "day",
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    user_id: Optional[str] = None,
+    group_id: Optional[str] = None,
+    model_id: Optional[str] = None,
+    user=Depends(get_admin_user),
+):
+    validate_period(period)
+    return Usages.get_usage_timeseries(
+        period=period,
+        start=start,
+        end=end,
+        user_id=user_id,
+        group_id=group_id,
+        model_id=model_id,
+    )
+
+
+############################
+# GetUserUsage
+############################
+
+
+@router.get("/user", response_model=list[UsageTotalsResponse])
+async def get_user_usage(
+    period: str = "day",
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    user=Depends(get_verified_user),
+):
+    """The current user's usage per model, e.g. for quota checks."""
+    validate_period(period)
+    return Usages.get_usage_summary(
+        group_by="model", period=period, start=start, end=end, user_id=user.id
+    )
+
+
+@router.get("/user/events", response_model=list[UsageEventModel])
+async def get_user_usage_events(
+    page: int = 1,
+    user=Depends(get_verified_user),
+):
+    limit = 50
+    skip = (max(1, page) - 1) * limit
+    return Usages.get_usage_events_by_user_id(user.id, skip=skip, limit=limit)
@@ -19,6 +19,7 @@ from open_webui.models.users import (
     UserGroupIdsModel,
     UserGroupIdsListResponse,
     UserInfoListResponse,
+    UserInfoResponse,
     UserIdNameListResponse,
     UserRoleUpdateForm,
     Users,
@@ -28,9 +29,8 @@ from open_webui.models.users import (
 
 
 from open_webui.socket.main import (
-    get_active_status_by_user_id,
-    get_active_user_ids,
-    get_user_active_status,
+    aget_active_status_by_user_id,
+    aget_active_user_ids,
 )
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.env import SRC_LOG_LEVELS, STATIC_DIR
@@ -43,6 +43,7 @@ from open_webui.utils.auth import (
     validate_password,
 )
 from open_webui.utils.access_control import get_permissions, has_permission
+from open_webui.utils.export import get_export_response
 
 
 log = logging.getLogger(__name__)
@@ -64,7 +65,7 @@ async def get_active_users(
     Get a list of active users.
     """
     return {
-        "user_ids": get_active_user_ids(),
+        "user_ids": await aget_active_user_ids(),
     }
 
 
@@ -125,6 +126,18 @@ async def get_all_users(
     return Users.get_users()
 
 
+@router.get("/all/export", response_model=list[UserInfoResponse])
+async def export_all_users(
+    format: str = "json", gzip: bool = False, user=Depends(get_admin_user)
+):
+    return get_export_response(
+        (UserInfoResponse(**row.model_dump()) for row in Users.iter_users()),
+        format=format,
+        gzip=gzip,
+        filename="users",
+    )
+
+
 @router.get("/search", response_model=UserIdNameListResponse)
 async def search_users(
     query: Optional[str] = None,
@@ -387,7 +400,7 @@ async def get_user_by_id(user_id: str, user=Depends(get_verified_user)):
             **{
                 "name": user.name,
                 "profile_image_url": user.profile_image_url,
-                "active": get_active_status_by_user_id(user_id),
+                "active": await aget_active_status_by_user_id(user_id),
             }
         )
     else:
@@ -454,7 +467,7 @@ async def get_user_profile_image_by_id(user_id: str, user=Depends(get_verified_u
 @router.get("/{user_id}/active", response_model=dict)
 async def get_user_active_status_by_id(user_id: str, user=Depends(get_verified_user)):
     return {
-        "active": get_user_active_status(user_id),
+        "active": await aget_active_status_by_user_id(user_id),
     }
 
 
@@ -7,7 +7,6 @@ import sys
 import time
 from typing import Dict, Set
 from redis import asyncio as aioredis
-import pycrdt as Y
 
 from open_webui.models.users import Users, UserNameResponse
 from open_webui.models.channels import Channels
@@ -29,6 +28,7 @@ from open_webui.env import (
     WEBSOCKET_REDIS_URL,
     WEBSOCKET_REDIS_CLUSTER,
     WEBSOCKET_REDIS_LOCK_TIMEOUT,
+    WEBSOCKET_REDIS_POOL_CACHE_TTL,
     WEBSOCKET_SENTINEL_PORT,
     WEBSOCKET_SENTINEL_HOSTS,
     REDIS_KEY_PREFIX,
@@ -39,7 +39,15 @@ from open_webui.env import (
     WEBSOCKET_SERVER_ENGINEIO_LOGGING,
 )
 from open_webui.utils.auth import decode_token
-from open_webui.socket.utils import RedisDict, RedisLock, YdocManager
+from open_webui.socket.utils import (
+    LocalDict,
+    LocalHashPool,
+    RedisDict,
+    RedisHashPool,
+    RedisLock,
+    UsageExpiryIndex,
+    YdocManager,
+)
 from open_webui.tasks import create_task, stop_item_tasks
 from open_webui.utils.redis import get_redis_connection
 from open_webui.utils.access_control import has_access, get_users_with_access
@@ -118,19 +126,24 @@ if WEBSOCKET_MANAGER == "redis":
     redis_sentinels = get_sentinels_from_env(
         WEBSOCKET_SENTINEL_HOSTS, WEBSOCKET_SENTINEL_PORT
     )
+    # Session entries only change on connect/join, so short lived local
+    # copies are safe and save a round trip on every event
     SESSION_POOL = RedisDict(
         f"{REDIS_KEY_PREFIX}:session_pool",
         redis_url=WEBSOCKET_REDIS_URL,
         redis_sentinels=redis_sentinels,
         redis_cluster=WEBSOCKET_REDIS_CLUSTER,
+        cache_ttl=WEBSOCKET_REDIS_POOL_CACHE_TTL,
     )
-    USER_POOL = RedisDict(
+    # One hash per user and model with a field per session, so connects,
+    # disconnects and usage updates on different workers never race
+    USER_POOL = RedisHashPool(
         f"{REDIS_KEY_PREFIX}:user_pool",
         redis_url=WEBSOCKET_REDIS_URL,
         redis_sentinels=redis_sentinels,
         redis_cluster=WEBSOCKET_REDIS_CLUSTER,
     )
-    USAGE_POOL = RedisDict(
+    USAGE_POOL = RedisHashPool(
         f"{REDIS_KEY_PREFIX}:usage_pool",
         redis_url=WEBSOCKET_REDIS_URL,
         redis_sentinels=redis_sentinels,
@@ -148,19 +161,37 @@ if WEBSOCKET_MANAGER == "redis":
     renew_func = clean_up_lock.renew_lock
     release_func = clean_up_lock.release_lock
 else:
-    SESSION_POOL = {}
-    USER_POOL = {}
-    USAGE_POOL = {}
+    SESSION_POOL = LocalDict()
+    USER_POOL = LocalHashPool()
+    USAGE_POOL = LocalHashPool()
 
     aquire_func = release_func = renew_func = lambda: True
 
 
 YDOC_MANAGER = YdocManager(
-    redis=REDIS,
+    # Yjs updates are stored as raw bytes
+    redis=(
+        get_redis_connection(
+            redis_url=WEBSOCKET_REDIS_URL,
+            redis_sentinels=get_sentinels_from_env(
+                WEBSOCKET_SENTINEL_HOSTS, WEBSOCKET_SENTINEL_PORT
+            ),
+            redis_cluster=WEBSOCKET_REDIS_CLUSTER,
+            async_mode=True,
+            decode_responses=False,
+        )
+        if WEBSOCKET_MANAGER == "redis"
+        else None
+    ),
     redis_key_prefix=f"{REDIS_KEY_PREFIX}:ydoc:documents",
 )
 
 
+USAGE_EXPIRY_INDEX = UsageExpiryIndex(
+    redis=REDIS, redis_key=f"{REDIS_KEY_PREFIX}:usage_pool:expiry"
+)
+
+
 async def periodic_usage_pool_cleanup():
     max_retries = 2
     retry_delay = random.uniform(
@@ -183,31 +214,34 @@ async def periodic_usage_pool_cleanup():
 
     log.debug("Running periodic_cleanup")
     try:
+        # Index entries left in the pool by instances that ran before the index
+        for model_id in await USAGE_POOL.akeys():
+            for sid, updated_at in (await USAGE_POOL.aget(model_id)).items():
+                await USAGE_EXPIRY_INDEX.touch(model_id, sid, updated_at)
+
         while True:
             if not renew_func():
                 log.error(f"Unable to renew cleanup lock. Exiting usage pool cleanup.")
                 raise Exception("Unable to renew usage pool cleanup lock.")
 
             now = int(time.time())
-            send_usage = False
-            for model_id, connections in list(USAGE_POOL.items()):
-                # Creating a list of sids to remove if they have timed out
-                expired_sids = [
-                    sid
-                    for sid, details in connections.items()
-                    if now - details["updated_at"] > TIMEOUT_DURATION
-                ]
 
-                for sid in expired_sids:
-                    del connections[sid]
+            # Only models with expired sessions are read and rewritten
+            expired_sids_by_model = {}
+            for model_id, sid in await USAGE_EXPIRY_INDEX.pop_expired(
+                now - TIMEOUT_DURATION
+            ):
+                expired_sids_by_model.setdefault(model_id, []).append(sid)
+
+            for model_id, expired_sids in expired_sids_by_model.items():
+                connections = await USAGE_POOL.aget(model_id)
 
-                if not connections:
-                    log.debug(f"Cleaning up model {model_id} from usage pool")
-                    del USAGE_POOL[model_id]
-                else:
-                    USAGE_POOL[model_id] = connections
+                for sid in expired_sids:
+                    updated_at = connections.get(sid)
+                    if updated_at is not None and now - updated_at > TIMEOUT_DURATION:
+                        # Skipped if a usage event refreshed it in the meantime
+                        await USAGE_POOL.aremove(model_id, sid, updated_at)
 
-                send_usage = True
             await asyncio.sleep(TIMEOUT_DURATION)
     finally:
         release_func()
@@ -225,11 +259,21 @@ def get_models_in_use():
     return models_in_use
 
 
+async def aget_models_in_use():
+    """List models that are currently in use without blocking the event loop."""
+    return await USAGE_POOL.akeys()
+
+
 def get_active_user_ids():
     """Get the list of active user IDs."""
     return list(USER_POOL.keys())
 
 
+async def aget_active_user_ids():
+    """Get the list of active user IDs without blocking the event loop."""
+    return await USER_POOL.akeys()
+
+
 def get_user_active_status(user_id):
     """Check if a user is currently active."""
     return user_id in USER_POOL
@@ -251,12 +295,12 @@ def get_session_ids_from_room(room):
     return [session_id[0] for session_id in active_session_ids]
 
 
-def get_user_ids_from_room(room):
+async def get_user_ids_from_room(room):
     active_session_ids = get_session_ids_from_room(room)
 
-    active_user_ids = list(
-        set([SESSION_POOL.get(session_id)["id"] for session_id in active_session_ids])
-    )
+    # One HMGET for the whole room instead of a lookup per participant
+    sessions = await SESSION_POOL.aget_many(active_session_ids)
+    active_user_ids = list(set([session["id"] for session in sessions if session]))
     return active_user_ids
 
 
@@ -266,18 +310,20 @@ def get_active_status_by_user_id(user_id):
     return False
 
 
+async def aget_active_status_by_user_id(user_id):
+    return await USER_POOL.acontains(user_id)
+
+
 @sio.on("usage")
 async def usage(sid, data):
-    if sid in SESSION_POOL:
+    if await SESSION_POOL.acontains(sid):
         model_id = data["model"]
         # Record the timestamp for the last update
         current_time = int(time.time())
 
         # Store the new usage data and task
-        USAGE_POOL[model_id] = {
-            **(USAGE_POOL[model_id] if model_id in USAGE_POOL else {}),
-            sid: {"updated_at": current_time},
-        }
+        await USAGE_POOL.aadd(model_id, sid, current_time)
+        await USAGE_EXPIRY_INDEX.touch(model_id, sid, current_time)
 
 
 @sio.event
@@ -290,13 +336,10 @@ async def connect(sid, environ, auth):
             user = Users.get_user_by_id(data["id"])
 
         if user:
-            SESSION_POOL[sid] = user.model_dump(
-                exclude=["date_of_birth", "bio", "gender"]
+            await SESSION_POOL.aset(
+                sid, user.model_dump(exclude=["date_of_birth", "bio", "gender"])
             )
-            if user.id in USER_POOL:
-                USER_POOL[user.id] = USER_POOL[user.id] + [sid]
-            else:
-                USER_POOL[user.id] = [sid]
+            await USER_POOL.aadd(user.id, sid, int(time.time()))
 
             await sio.enter_room(sid, f"user:{user.id}")
 
@@ -316,11 +359,10 @@ async def user_join(sid, data):
     if not user:
         return
 
-    SESSION_POOL[sid] = user.model_dump(exclude=["date_of_birth", "bio", "gender"])
-    if user.id in USER_POOL:
-        USER_POOL[user.id] = USER_POOL[user.id] + [sid]
-    else:
-        USER_POOL[user.id] = [sid]
+    await SESSION_POOL.aset(
+        sid, user.model_dump(exclude=["date_of_birth", "bio", "gender"])
+    )
+    await USER_POOL.aadd(user.id, sid, int(time.time()))
 
     await sio.enter_room(sid, f"user:{user.id}")
     # Join all the channels
@@ -405,7 +447,7 @@ async def channel_events(sid, data):
                 "channel_id": data["channel_id"],
                 "message_id": data.get("message_id", None),
                 "data": event_data,
-                "user": UserNameResponse(**SESSION_POOL[sid]).model_dump(),
+                "user": UserNameResponse(**(await SESSION_POOL.aget(sid))).model_dump(),
             },
             room=room,
         )
@@ -414,7 +456,7 @@ async def channel_events(sid, data):
 @sio.on("ydoc:document:join")
 async def ydoc_document_join(sid, data):
     """Handle user joining a document"""
-    user = SESSION_POOL.get(sid)
+    user = await SESSION_POOL.aget(sid)
 
     try:
         document_id = data["document_id"]
@@ -450,14 +492,8 @@ async def ydoc_document_join(sid, data):
 
         active_session_ids = get_session_ids_from_room(f"doc_{document_id}")
 
-        # Get the Yjs document state
-        ydoc = Y.Doc()
-        updates = await YDOC_MANAGER.get_updates(document_id)
-        for update in updates:
-            ydoc.apply_update(bytes(update))
-
-        # Encode the entire document state as an update
-        state_update = ydoc.get_update()
+        # Get the Yjs document state as a single update
+        state_update = await YDOC_MANAGER.get_state(document_id)
         await sio.emit(
             "ydoc:document:state",
             {
@@ -526,14 +562,8 @@ async def yjs_document_state(sid, data):
             log.warning(f"Document {document_id} not found")
             return
 
-        # Get the Yjs document state
-        ydoc = Y.Doc()
-        updates = await YDOC_MANAGER.get_updates(document_id)
-        for update in updates:
-            ydoc.apply_update(bytes(update))
-
-        # Encode the entire document state as an update
-        state_update = ydoc.get_update()
+        # Get the Yjs document state as a single update
+        state_update = await YDOC_MANAGER.get_state(document_id)
 
         await sio.emit(
             "ydoc:document:state",
@@ -584,7 +614,7 @@ async def yjs_document_update(sid, data):
         async def debounced_save():
             await asyncio.sleep(0.5)
             await document_save_handler(
-                document_id, data.get("data", {}), SESSION_POOL.get(sid)
+                document_id, data.get("data", {}), await SESSION_POOL.aget(sid)
             )
 
         if data.get("data"):
@@ -649,15 +679,11 @@ async def yjs_awareness_update(sid, data):
 
 @sio.event
 async def disconnect(sid):
-    if sid in SESSION_POOL:
-        user = SESSION_POOL[sid]
-        del SESSION_POOL[sid]
-
-        user_id = user["id"]
-        USER_POOL[user_id] = [_sid for _sid in USER_POOL[user_id] if _sid != sid]
+    user = await SESSION_POOL.aget(sid)
+    if user:
+        await SESSION_POOL.adelete(sid)
 
-        if len(USER_POOL[user_id]) == 0:
-            del USER_POOL[user_id]
+        await USER_POOL.aremove(user["id"], sid)
 
         await YDOC_MANAGER.remove_user_from_all_documents(sid)
     else:
@@ -1,7 +1,8 @@
 import json
+import time
 import uuid
 from open_webui.utils.redis import get_redis_connection
-from open_webui.env import REDIS_KEY_PREFIX
+from open_webui.env import REDIS_KEY_PREFIX, WEBSOCKET_YDOC_COMPACTION_THRESHOLD
 from typing import Optional, List, Tuple
 import pycrdt as Y
 
@@ -46,8 +47,54 @@ class RedisLock:
             self.redis.delete(self.lock_name)
 
 
+class LocalDict(dict):
+    """
+    In-memory pool used when websockets are not managed through Redis. Offers
+    the same async accessors as RedisDict so handlers work with either.
+    """
+
+    async def aget(self, key, default=None):
+        return self.get(key, default)
+
+    async def aget_many(self, keys):
+        return [self.get(key) for key in keys]
+
+    async def aset(self, key, value):
+        self[key] = value
+
+    async def adelete(self, key):
+        self.pop(key, None)
+
+    async def acontains(self, key):
+        return key in self
+
+    async def akeys(self):
+        return list(self.keys())
+
+    async def aitems(self):
+        return list(self.items())
+
+
 class RedisDict:
-    def __init__(self, name, redis_url, redis_sentinels=[], redis_cluster=False):
+    """
+    Dict-like view over a Redis hash with JSON encoded values.
+
+    The plain dict protocol uses a blocking client and is kept for synchronous
+    callers. Code running on the event loop should use the async accessors
+    (aget, aget_many, aset, ...), which go through an asyncio client. Reads can
+    be served from a small local cache for cache_ttl seconds; writes and
+    deletes made through this instance update it immediately.
+    """
+
+    def __init__(
+        self,
+        name,
+        redis_url,
+        redis_sentinels=[],
+        redis_cluster=False,
+        cache_ttl: float = 0,
+        cache_size: int = 4096,
+    ):
         self.name = name
         self.redis = get_redis_connection(
             redis_url,
@@ -55,23 +102,69 @@ class RedisDict:
             redis_cluster=redis_cluster,
             decode_responses=True,
         )
+        self.async_redis = get_redis_connection(
+            redis_url,
+            redis_sentinels,
+            redis_cluster=redis_cluster,
+            async_mode=True,
+            decode_responses=True,
+        )
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self._cache = {}
+
+    def _get_cached(self, key):
+        if self.cache_ttl <= 0:
+            return None
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._cache.pop(key, None)
+            return None
+        return entry
+
+    def _set_cached(self, key, value):
+        if self.cache_ttl <= 0:
+            return
+        if key not in self._cache and len(self._cache) >= self.cache_size:
+            # Drop the oldest entry, dicts keep insertion order
+            self._cache.pop(next(iter(self._cache)), None)
+        self._cache[key] = (time.monotonic() + self.cache_ttl, value)
+
+    def _load(self, key, value):
+        if value is None:
+            self._cache.pop(key, None)
+            return None
+        value = json.loads(value)
+        self._set_cached(key, value)
+        return value
 
     def __setitem__(self, key, value):
         serialized_value = json.dumps(value)
         self.redis.hset(self.name, key, serialized_value)
+        self._set_cached(key, value)
 
     def __getitem__(self, key):
-        value = self.redis.hget(self.name, key)
+        entry = self._get_cached(key)
+        if entry is not None:
+            return entry[1]
+
+        value = self._load(key, self.redis.hget(self.name, key))
         if value is None:
             raise KeyError(key)
-        return json.loads(value)
+        return value
 
     def __delitem__(self, key):
+        self._cache.pop(key, None)
         result = self.redis.hdel(self.name, key)
         if result == 0:
             raise KeyError(key)
 
     def __contains__(self, key):
+        if self._get_cached(key) is not None:
+            return True
         return self.redis.hexists(self.name, key)
 
     def __len__(self):
@@ -93,6 +186,7 @@ class RedisDict:
             return default
 
     def clear(self):
+        self._cache.clear()
         self.redis.delete(self.name)
 
     def update(self, other=None, **kwargs):
@@ -107,92 +201,415 @@ class RedisDict:
             self[key] = default
         return self[key]
 
+    async def aget(self, key, default=None):
+        entry = self._get_cached(key)
+        if entry is not None:
+            return entry[1]
+
+        value = self._load(key, await self.async_redis.hget(self.name, key))
+        return default if value is None else value
+
+    async def aget_many(self, keys):
+        """Values for keys in order (None when missing), read with one HMGET."""
+        keys = list(keys)
+        values = [None] * len(keys)
+
+        missing = []
+        for i, key in enumerate(keys):
+            entry = self._get_cached(key)
+            if entry is not None:
+                values[i] = entry[1]
+            else:
+                missing.append(i)
+
+        if missing:
+            fetched = await self.async_redis.hmget(
+                self.name, [keys[i] for i in missing]
+            )
+            for i, value in zip(missing, fetched):
+                values[i] = self._load(keys[i], value)
+
+        return values
+
+    async def aset(self, key, value):
+        await self.async_redis.hset(self.name, key, json.dumps(value))
+        self._set_cached(key, value)
+
+    async def adelete(self, key):
+        self._cache.pop(key, None)
+        await self.async_redis.hdel(self.name, key)
+
+    async def acontains(self, key):
+        if self._get_cached(key) is not None:
+            return True
+        return bool(await self.async_redis.hexists(self.name, key))
+
+    async def akeys(self):
+        return await self.async_redis.hkeys(self.name)
+
+    async def aitems(self):
+        return [
+            (k, json.loads(v))
+            for k, v in (await self.async_redis.hgetall(self.name)).items()
+        ]
+
+
+# Sets a field and indexes its key in one step
+HASH_POOL_ADD_SCRIPT = """
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('SADD', KEYS[2], ARGV[3])
+return 1
+"""
+
+# Removes a field (only while it still holds ARGV[4], when given) and drops
+# the key from the index once its hash is empty
+HASH_POOL_REMOVE_SCRIPT = """
+local removed = 0
+if ARGV[3] == '0' or redis.call('HGET', KEYS[1], ARGV[1]) == ARGV[4] then
+    removed = redis.call('HDEL', KEYS[1], ARGV[1])
+end
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    redis.call('SREM', KEYS[2], ARGV[2])
+end
+return removed
+"""
+
+
+class LocalHashPool:
+    """
+    In-memory counterpart of RedisHashPool used when websockets are not
+    managed through Redis.
+    """
+
+    def __init__(self):
+        self._pool = {}
+
+    def keys(self):
+        return list(self._pool.keys())
+
+    def __contains__(self, key):
+        return key in self._pool
+
+    async def aadd(self, key, field, value):
+        self._pool.setdefault(key, {})[field] = value
+
+    async def aremove(self, key, field, value=None):
+        fields = self._pool.get(key, {})
+        removed = field in fields and (value is None or fields[field] == value)
+        if removed:
+            del fields[field]
+        if not fields:
+            self._pool.pop(key, None)
+        return removed
+
+    async def aget(self, key):
+        return dict(self._pool.get(key, {}))
+
+    async def acontains(self, key):
+        return key in self._pool
+
+    async def akeys(self):
+        return list(self._pool.keys())
+
+
+class RedisHashPool:
+    """
+    Pool of key -> {field: value} maps, e.g. user id -> {sid: connected_at},
+    stored as one Redis hash per key plus a set indexing the keys in use.
+
+    Every update touches a single field with one atomic script, so concurrent
+    connects, disconnects and cleanups on different workers can't overwrite
+    each other the way a read-modify-write of the whole entry could. All keys
+    share a hash tag so the scripts also run on Redis Cluster.
+    """
+
+    def __init__(
+        self,
+        name,
+        redis_url,
+        redis_sentinels=[],
+        redis_cluster=False,
+    ):
+        self.name = name
+        self.redis = get_redis_connection(
+            redis_url,
+            redis_sentinels,
+            redis_cluster=redis_cluster,
+            decode_responses=True,
+        )
+        self.async_redis = get_redis_connection(
+            redis_url,
+            redis_sentinels,
+            redis_cluster=redis_cluster,
+            async_mode=True,
+            decode_responses=True,
+        )
+        self._index_key = f"{{{name}}}:keys"
+
+    def _get_hash_key(self, key):
+        return f"{{{self.name}}}:key:{key}"
+
+    def keys(self):
+        return list(self.redis.smembers(self._index_key))
+
+    def __contains__(self, key):
+        return bool(self.redis.exists(self._get_hash_key(key)))
+
+    async def aadd(self, key, field, value):
+        await self.async_redis.eval(
+            HASH_POOL_ADD_SCRIPT,
+            2,
+            self._get_hash_key(key),
+            self._index_key,
+            field,
+            json.dumps(value),
+            key,
+        )
+
+    async def aremove(self, key, field, value=None):
+        """Removes field from key, only if it still holds value when one is given."""
+        return bool(
+            await self.async_redis.eval(
+                HASH_POOL_REMOVE_SCRIPT,
+                2,
+                self._get_hash_key(key),
+                self._index_key,
+                field,
+                key,
+                "0" if value is None else "1",
+                "" if value is None else json.dumps(value),
+            )
+        )
+
+    async def aget(self, key):
+        return {
+            field: json.loads(value)
+            for field, value in (
+                await self.async_redis.hgetall(self._get_hash_key(key))
+            ).items()
+        }
+
+    async def acontains(self, key):
+        return bool(await self.async_redis.exists(self._get_hash_key(key)))
+
+    async def akeys(self):
+        return list(await self.async_redis.smembers(self._index_key))
+
 
 class YdocManager:
+    """
+    Stores Yjs documents as a compacted snapshot update plus a short tail of
+    raw binary updates. Once the tail reaches compaction_threshold entries it
+    is folded into the snapshot, so storage and join cost stay bounded no
+    matter how long a document has been edited.
+
+    The Redis connection must be created with decode_responses=False.
+    """
+
     def __init__(
         self,
         redis=None,
         redis_key_prefix: str = f"{REDIS_KEY_PREFIX}:ydoc:documents",
+        compaction_threshold: int = WEBSOCKET_YDOC_COMPACTION_THRESHOLD,
     ):
+        self._snapshots = {}
         self._updates = {}
         self._users = {}
+        self._user_documents = {}
         self._redis = redis
         self._redis_key_prefix = redis_key_prefix
+        self._compaction_threshold = compaction_threshold
+
+    def _get_redis_key(self, document_id: str, name: str) -> str:
+        return f"{self._redis_key_prefix}:{document_id}:{name}"
+
+    @staticmethod
+    def _decode_update(update: bytes) -> bytes:
+        # Updates written by earlier versions were stored as JSON lists of ints
+        if update[:1] == b"[" and update[-1:] == b"]":
+            try:
+                return bytes(json.loads(update))
+            except ValueError:
+                pass
+        return update
+
+    @staticmethod
+    def _compact(updates: List[bytes]) -> bytes:
+        # Applying to a fresh doc (rather than merge_updates) also drops deleted content
+        ydoc = Y.Doc()
+        for update in updates:
+            ydoc.apply_update(update)
+        return ydoc.get_update()
 
     async def append_to_updates(self, document_id: str, update: bytes):
         document_id = document_id.replace(":", "_")
+        update = bytes(update)
+
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            await self._redis.rpush(redis_key, json.dumps(list(update)))
+            length = await self._redis.rpush(
+                self._get_redis_key(document_id, "updates"), update
+            )
         else:
-            if document_id not in self._updates:
-                self._updates[document_id] = []
-            self._updates[document_id].append(update)
+            self._updates.setdefault(document_id, []).append(update)
+            length = len(self._updates[document_id])
 
-    async def get_updates(self, document_id: str) -> List[bytes]:
+        if self._compaction_threshold and length >= self._compaction_threshold:
+            await self.compact_document(document_id)
+
+    async def _get_snapshot_and_updates(
+        self, document_id: str
+    ) -> Tuple[Optional[bytes], List[bytes]]:
+        if self._redis:
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.get(self._get_redis_key(document_id, "snapshot"))
+            pipe.lrange(self._get_redis_key(document_id, "updates"), 0, -1)
+            snapshot, updates = await pipe.execute()
+            return snapshot, [self._decode_update(update) for update in updates]
+        else:
+            return self._snapshots.get(document_id), list(
+                self._updates.get(document_id, [])
+            )
+
+    async def compact_document(self, document_id: str):
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            updates = await self._redis.lrange(redis_key, 0, -1)
-            return [bytes(json.loads(update)) for update in updates]
+            # Only one instance compacts a document at a time
+            lock_key = self._get_redis_key(document_id, "compaction_lock")
+            if not await self._redis.set(lock_key, b"1", nx=True, ex=30):
+                return
+
+            try:
+                snapshot, updates = await self._get_snapshot_and_updates(document_id)
+                if not updates:
+                    return
+
+                compacted = self._compact(([snapshot] if snapshot else []) + updates)
+
+                # Updates are idempotent, so a reader seeing both the new snapshot
+                # and the not yet trimmed updates still gets the right state.
+                await self._redis.set(
+                    self._get_redis_key(document_id, "snapshot"), compacted
+                )
+                await self._redis.ltrim(
+                    self._get_redis_key(document_id, "updates"), len(updates), -1
+                )
+            finally:
+                await self._redis.delete(lock_key)
         else:
-            return self._updates.get(document_id, [])
+            snapshot, updates = await self._get_snapshot_and_updates(document_id)
+            if not updates:
+                return
+
+            self._snapshots[document_id] = self._compact(
+                ([snapshot] if snapshot else []) + updates
+            )
+            del self._updates[document_id][: len(updates)]
+
+    async def get_state(self, document_id: str) -> bytes:
+        """Returns the whole document as a single Yjs update."""
+        document_id = document_id.replace(":", "_")
+
+        snapshot, updates = await self._get_snapshot_and_updates(document_id)
+        updates = ([snapshot] if snapshot else []) + updates
+
+        if not updates:
+            return Y.Doc().get_update()
+        if len(updates) == 1:
+            return updates[0]
+        return Y.merge_updates(*updates)
+
+    async def get_updates(self, document_id: str) -> List[bytes]:
+        document_id = document_id.replace(":", "_")
+
+        snapshot, updates = await self._get_snapshot_and_updates(document_id)
+        return ([snapshot] if snapshot else []) + updates
 
     async def document_exists(self, document_id: str) -> bool:
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            return await self._redis.exists(redis_key) > 0
+            return (
+                await self._redis.exists(
+                    self._get_redis_key(document_id, "updates"),
+                    self._get_redis_key(document_id, "snapshot"),
+                )
+                > 0
+            )
         else:
-            return document_id in self._updates
+            return document_id in self._updates or document_id in self._snapshots
 
     async def get_users(self, document_id: str) -> List[str]:
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:users"
+            redis_key = self._get_redis_key(document_id, "users")
             users = await self._redis.smembers(redis_key)
-            return list(users)
+            return [
+                user.decode() if isinstance(user, bytes) else user for user in users
+            ]
         else:
             return self._users.get(document_id, [])
 
+    def _get_user_documents_key(self, user_id: str) -> str:
+        return f"{self._redis_key_prefix}:by_user:{user_id}"
+
     async def add_user(self, document_id: str, user_id: str):
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:users"
-            await self._redis.sadd(redis_key, user_id)
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.sadd(self._get_redis_key(document_id, "users"), user_id)
+            pipe.sadd(self._get_user_documents_key(user_id), document_id)
+            await pipe.execute()
         else:
             if document_id not in self._users:
                 self._users[document_id] = set()
             self._users[document_id].add(user_id)
+            self._user_documents.setdefault(user_id, set()).add(document_id)
 
     async def remove_user(self, document_id: str, user_id: str):
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:users"
-            await self._redis.srem(redis_key, user_id)
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.srem(self._get_redis_key(document_id, "users"), user_id)
+            pipe.srem(self._get_user_documents_key(user_id), document_id)
+            await pipe.execute()
         else:
             if document_id in self._users and user_id in self._users[document_id]:
                 self._users[document_id].remove(user_id)
+            self._user_documents.get(user_id, set()).discard(document_id)
+            if not self._user_documents.get(user_id, True):
+                del self._user_documents[user_id]
 
     async def remove_user_from_all_documents(self, user_id: str):
+        # Only the documents this user joined are visited, via the by_user index
         if self._redis:
-            keys = await self._redis.keys(f"{self._redis_key_prefix}:*")
-            for key in keys:
-                if key.endswith(":users"):
-                    await self._redis.srem(key, user_id)
+            user_documents_key = self._get_user_documents_key(user_id)
+            document_ids = await self._redis.smembers(user_documents_key)
 
-                    document_id = key.split(":")[-2]
-                    if len(await self.get_users(document_id)) == 0:
-                        await self.clear_document(document_id)
+            for document_id in document_ids:
+                document_id = (
+                    document_id.decode()
+                    if isinstance(document_id, bytes)
+                    else document_id
+                )
+                users_key = self._get_redis_key(document_id, "users")
+
+                pipe = self._redis.pipeline(transaction=False)
+                pipe.srem(users_key, user_id)
+                pipe.scard(users_key)
+                _, remaining = await pipe.execute()
+
+                if remaining == 0:
+                    await self.clear_document(document_id)
+
+            await self._redis.delete(user_documents_key)
 
         else:
-            for document_id in list(self._users.keys()):
-                if user_id in self._users[document_id]:
+            for document_id in self._user_documents.pop(user_id, set()):
+                if user_id in self._users.get(document_id, set()):
                     self._users[document_id].remove(user_id)
                     if not self._users[document_id]:
                         del self._users[document_id]
@@ -203,12 +620,67 @@ class YdocManager:
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            await self._redis.delete(redis_key)
-            redis_users_key = f"{self._redis_key_prefix}:{document_id}:users"
-            await self._redis.delete(redis_users_key)
+            users_key = self._get_redis_key(document_id, "users")
+            user_ids = await self._redis.smembers(users_key)
+
+            pipe = self._redis.pipeline(transaction=False)
+            for user_id in user_ids:
+                user_id = user_id.decode() if isinstance(user_id, bytes) else user_id
+                pipe.srem(self._get_user_documents_key(user_id), document_id)
+            pipe.delete(
+                self._get_redis_key(document_id, "updates"),
+                self._get_redis_key(document_id, "snapshot"),
+                users_key,
+            )
+            await pipe.execute()
         else:
             if document_id in self._updates:
                 del self._updates[document_id]
+            if document_id in self._snapshots:
+                del self._snapshots[document_id]
             if document_id in self._users:
-                del self._users[document_id]
+                for user_id in self._users.pop(document_id):
+                    self._user_documents.get(user_id, set()).discard(document_id)
+
+
+class UsageExpiryIndex:
+    """
+    Sorted index of when each (model_id, sid) pair in USAGE_POOL was last
+    updated, so the periodic cleanup only visits entries that have expired
+    instead of reading and rewriting the whole pool on every sweep.
+    """
+
+    def __init__(
+        self,
+        redis=None,
+        redis_key: str = f"{REDIS_KEY_PREFIX}:usage_pool:expiry",
+    ):
+        self._entries = {}
+        self._redis = redis
+        self._redis_key = redis_key
+
+    async def touch(self, model_id: str, sid: str, timestamp: int):
+        member = f"{model_id}:{sid}"
+        if self._redis:
+            await self._redis.zadd(self._redis_key, {member: timestamp})
+        else:
+            self._entries[member] = timestamp
+
+    async def pop_expired(self, cutoff: int) -> List[Tuple[str, str]]:
+        """Removes and returns the (model_id, sid) pairs last updated before cutoff."""
+        if self._redis:
+            pipe = self._redis.pipeline(transaction=True)
+            pipe.zrangebyscore(self._redis_key, "-inf", f"({cutoff}")
+            pipe.zremrangebyscore(self._redis_key, "-inf", f"({cutoff}")
+            members, _ = await pipe.execute()
+        else:
+            members = [
+                member
+                for member, timestamp in self._entries.items()
+                if timestamp < cutoff
+            ]
+            for member in members:
+                del self._entries[member]
+
+        # Socket.IO session ids never contain ":", model ids might
+        return [tuple(member.rsplit(":", 1)) for member in members]
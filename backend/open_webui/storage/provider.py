@@ -1,12 +1,16 @@
 import os
 import shutil
 import json
+import hashlib
 import logging
 import re
+import threading
+import uuid
 from abc import ABC, abstractmethod
-from typing import BinaryIO, Tuple, Dict
+from typing import BinaryIO, Callable, Iterator, Optional, Tuple, Dict
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from botocore.exceptions import ClientError
 from open_webui.config import (
@@ -25,6 +29,7 @@ from open_webui.config import (
     AZURE_STORAGE_CONTAINER_NAME,
     AZURE_STORAGE_KEY,
     STORAGE_PROVIDER,
+    STORAGE_LOCAL_CACHE_MAX_SIZE,
     UPLOAD_DIR,
 )
 from google.cloud import storage
@@ -34,11 +39,173 @@ from azure.identity import DefaultAzureCredential
 from azure.storage.blob import BlobServiceClient
 from azure.core.exceptions import ResourceNotFoundError
 from open_webui.env import SRC_LOG_LEVELS
+from open_webui.utils.disk_cache import DiskCacheEvictor
 
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
 
+# Files are copied and uploaded in chunks of this size so memory use stays
+# constant regardless of the file size
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024  # 8MB
+RANGE_CHUNK_SIZE = 64 * 1024  # 64KB
+
+
+class LocalFileCache:
+    """
+    Read-through cache of remote storage objects in the local upload
+    directory.
+
+    The ETag of the object each local copy was downloaded from is recorded in
+    ETAG_DIR next to it, and a copy is only reused while the remote ETag still
+    matches. Files without a recorded ETag, e.g. left over from earlier
+    versions, are downloaded again. Local copies written by uploads are
+    recorded without an ETag and adopt the remote one on first use, since
+    object names are never reused. Copies are also looked up by ETag, so an
+    object with identical content is copied locally instead of being
+    downloaded again.
+
+    All state is on disk and shared by every worker. Once the files in the
+    directory exceed max_size bytes (0 disables the limit) the least recently
+    used ones are removed, see DiskCacheEvictor, except those used within the
+    last EVICTION_GRACE_SECONDS, which another worker may still be reading.
+    """
+
+    ETAG_DIR = ".etags"
+    # Recorded for local copies of uploads, which adopt the remote ETag
+    UPLOADED = ""
+    EVICTION_GRACE_SECONDS = 300
+
+    def __init__(self, directory: str, max_size: int):
+        self.directory = str(directory)
+        self.max_size = max_size
+
+        self._lock = threading.Lock()
+        # Local copies by ETag, only a hint, the recorded ETag is checked before use
+        self._etags: Dict[str, str] = {}
+
+        os.makedirs(os.path.join(self.directory, self.ETAG_DIR), exist_ok=True)
+        self._evictor = DiskCacheEvictor(
+            self.directory,
+            max_size,
+            is_temporary=lambda name: name.endswith(".part"),
+            grace_seconds=self.EVICTION_GRACE_SECONDS,
+            on_evict=self._on_evict,
+        )
+
+    def _etag_path(self, path: str) -> str:
+        return os.path.join(self.directory, self.ETAG_DIR, os.path.basename(path))
+
+    def _read_etag(self, path: str) -> Optional[str]:
+        try:
+            with open(self._etag_path(path), "r") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_etag(self, path: str, etag: Optional[str]):
+        etag_path = self._etag_path(path)
+        os.makedirs(os.path.dirname(etag_path), exist_ok=True)
+        part_path = f"{etag_path}.{uuid.uuid4().hex}.part"
+        with open(part_path, "w") as f:
+            f.write(etag or self.UPLOADED)
+        os.replace(part_path, etag_path)
+
+        if etag:
+            with self._lock:
+                self._etags[etag] = path
+
+    def _on_evict(self, path: str):
+        try:
+            os.remove(self._etag_path(path))
+        except OSError:
+            pass
+
+    def _record_size(self, path: str):
+        try:
+            self._evictor.add(os.path.getsize(path))
+        except OSError:
+            # Removed in the meantime
+            pass
+
+    def add(self, path: str, etag: Optional[str] = None):
+        """Registers a local copy written outside of the cache, e.g. by an upload."""
+        self._write_etag(path, etag)
+        self._record_size(path)
+
+    def contains(self, path: str) -> bool:
+        return os.path.isfile(path) and self._read_etag(path) is not None
+
+    def remove(self, path: str):
+        try:
+            os.remove(self._etag_path(path))
+        except OSError:
+            pass
+        with self._lock:
+            for etag, etag_path in list(self._etags.items()):
+                if etag_path == path:
+                    del self._etags[etag]
+
+    def clear(self):
+        shutil.rmtree(os.path.join(self.directory, self.ETAG_DIR), ignore_errors=True)
+        with self._lock:
+            self._etags.clear()
+
+    def get(
+        self,
+        path: str,
+        etag: Optional[str],
+        size: Optional[int],
+        download: Callable[[str], None],
+    ) -> str:
+        """
+        Returns path once it holds the object identified by etag, calling
+        download(target_path) only if no valid local copy exists.
+        """
+        recorded = self._read_etag(path)
+        if (
+            recorded is not None
+            and recorded in (self.UPLOADED, etag)
+            and os.path.isfile(path)
+            and (size is None or os.path.getsize(path) == size)
+        ):
+            if recorded != (etag or self.UPLOADED):
+                self._write_etag(path, etag)
+            try:
+                # Marks the copy as recently used for eviction in every worker
+                os.utime(path)
+            except OSError:
+                pass
+            return path
+
+        with self._lock:
+            source = self._etags.get(etag) if etag else None
+        if source == path or (source and self._read_etag(source) != etag):
+            source = None
+
+        # Download next to the destination and swap it in atomically, so
+        # concurrent readers never see a partial file
+        part_path = f"{path}.{uuid.uuid4().hex}.part"
+        try:
+            copied = False
+            if source:
+                try:
+                    shutil.copyfile(source, part_path)
+                    copied = True
+                except OSError:
+                    # Evicted in the meantime
+                    pass
+            if not copied:
+                download(part_path)
+            os.replace(part_path, path)
+        finally:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+
+        self._write_etag(path, etag)
+        self._record_size(path)
+        return path
+
 
 class StorageProvider(ABC):
     @abstractmethod
@@ -48,7 +215,11 @@ class StorageProvider(ABC):
     @abstractmethod
     def upload_file(
         self, file: BinaryIO, filename: str, tags: Dict[str, str]
-    ) -> Tuple[bytes, str]:
+    ) -> Tuple[str, str, int]:
+        """
+        Streams the file to storage and returns its storage path, the sha256
+        hex digest of its contents and its size in bytes.
+        """
         pass
 
     @abstractmethod
@@ -59,19 +230,41 @@ class StorageProvider(ABC):
     def delete_file(self, file_path: str) -> None:
         pass
 
+    def has_local_copy(self, file_path: str) -> bool:
+        """Whether get_file can return the file without downloading it."""
+        return True
+
+    def get_file_range(
+        self, file_path: str, range_header: str
+    ) -> Optional[Tuple[Iterator[bytes], str, int]]:
+        """
+        Streams a single HTTP byte range of the file straight from storage.
+        Returns the chunks, the Content-Range header value and the length of
+        the range, or None if the range can't be served remotely.
+        """
+        return None
+
 
 class LocalStorageProvider(StorageProvider):
     @staticmethod
     def upload_file(
         file: BinaryIO, filename: str, tags: Dict[str, str]
-    ) -> Tuple[bytes, str]:
-        contents = file.read()
-        if not contents:
-            raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+    ) -> Tuple[str, str, int]:
+        """Handles uploading of the file to local storage, hashing it while copying."""
         file_path = f"{UPLOAD_DIR}/{filename}"
+        sha256 = hashlib.sha256()
+        size = 0
+
         with open(file_path, "wb") as f:
-            f.write(contents)
-        return contents, file_path
+            while chunk := file.read(UPLOAD_CHUNK_SIZE):
+                sha256.update(chunk)
+                f.write(chunk)
+                size += len(chunk)
+
+        if not size:
+            os.remove(file_path)
+            raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+        return file_path, sha256.hexdigest(), size
 
     @staticmethod
     def get_file(file_path: str) -> str:
@@ -139,6 +332,13 @@ class S3StorageProvider(StorageProvider):
 
         self.bucket_name = S3_BUCKET_NAME
         self.key_prefix = S3_KEY_PREFIX if S3_KEY_PREFIX else ""
+        self.transfer_config = TransferConfig(
+            multipart_threshold=UPLOAD_CHUNK_SIZE,
+            multipart_chunksize=UPLOAD_CHUNK_SIZE,
+        )
+        self.cache = LocalFileCache(
+            UPLOAD_DIR, STORAGE_LOCAL_CACHE_MAX_SIZE * 1024 * 1024
+        )
 
     @staticmethod
     def sanitize_tag_value(s: str) -> str:
@@ -147,12 +347,17 @@ class S3StorageProvider(StorageProvider):
 
     def upload_file(
         self, file: BinaryIO, filename: str, tags: Dict[str, str]
-    ) -> Tuple[bytes, str]:
+    ) -> Tuple[str, str, int]:
         """Handles uploading of the file to S3 storage."""
-        _, file_path = LocalStorageProvider.upload_file(file, filename, tags)
+        file_path, file_hash, file_size = LocalStorageProvider.upload_file(
+            file, filename, tags
+        )
         s3_key = os.path.join(self.key_prefix, filename)
         try:
-            self.s3_client.upload_file(file_path, self.bucket_name, s3_key)
+            # Multipart upload streamed from the local copy
+            self.s3_client.upload_file(
+                file_path, self.bucket_name, s3_key, Config=self.transfer_config
+            )
             if S3_ENABLE_TAGGING and tags:
                 sanitized_tags = {
                     self.sanitize_tag_value(k): self.sanitize_tag_value(v)
@@ -168,10 +373,8 @@ class S3StorageProvider(StorageProvider):
                     Key=s3_key,
                     Tagging=tagging,
                 )
-            return (
-                open(file_path, "rb").read(),
-                f"s3://{self.bucket_name}/{s3_key}",
-            )
+            self.cache.add(file_path)
+            return f"s3://{self.bucket_name}/{s3_key}", file_hash, file_size
         except ClientError as e:
             raise RuntimeError(f"Error uploading file to S3: {e}")
 
@@ -180,11 +383,48 @@ class S3StorageProvider(StorageProvider):
         try:
             s3_key = self._extract_s3_key(file_path)
             local_file_path = self._get_local_file_path(s3_key)
-            self.s3_client.download_file(self.bucket_name, s3_key, local_file_path)
-            return local_file_path
+            head = self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
+            return self.cache.get(
+                local_file_path,
+                head.get("ETag"),
+                head.get("ContentLength"),
+                lambda path: self.s3_client.download_file(
+                    self.bucket_name, s3_key, path
+                ),
+            )
         except ClientError as e:
             raise RuntimeError(f"Error downloading file from S3: {e}")
 
+    def has_local_copy(self, file_path: str) -> bool:
+        s3_key = self._extract_s3_key(file_path)
+        return self.cache.contains(self._get_local_file_path(s3_key))
+
+    def get_file_range(
+        self, file_path: str, range_header: str
+    ) -> Optional[Tuple[Iterator[bytes], str, int]]:
+        """Handles streaming a byte range of the file from S3 storage."""
+        try:
+            response = self.s3_client.get_object(
+                Bucket=self.bucket_name,
+                Key=self._extract_s3_key(file_path),
+                Range=range_header,
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "InvalidRange":
+                return None
+            raise RuntimeError(f"Error downloading file range from S3: {e}")
+
+        if "ContentRange" not in response:
+            # The range was ignored (e.g. multiple ranges), serve it locally instead
+            response["Body"].close()
+            return None
+
+        return (
+            response["Body"].iter_chunks(RANGE_CHUNK_SIZE),
+            response["ContentRange"],
+            response["ContentLength"],
+        )
+
     def delete_file(self, file_path: str) -> None:
         """Handles deletion of the file from S3 storage."""
         try:
@@ -194,6 +434,7 @@ class S3StorageProvider(StorageProvider):
             raise RuntimeError(f"Error deleting file from S3: {e}")
 
         # Always delete from local storage
+        self.cache.remove(self._get_local_file_path(s3_key))
         LocalStorageProvider.delete_file(file_path)
 
     def delete_all_files(self) -> None:
@@ -213,6 +454,7 @@ class S3StorageProvider(StorageProvider):
             raise RuntimeError(f"Error deleting all files from S3: {e}")
 
         # Always delete from local storage
+        self.cache.clear()
         LocalStorageProvider.delete_all_files()
 
     # The s3 key is the name assigned to an object. It excludes the bucket name, but includes the internal path and the file name.
@@ -237,16 +479,23 @@ class GCSStorageProvider(StorageProvider):
             # if running on a Compute Engine instance, credentials would be from Google Metadata server
             self.gcs_client = storage.Client()
         self.bucket = self.gcs_client.bucket(GCS_BUCKET_NAME)
+        self.cache = LocalFileCache(
+            UPLOAD_DIR, STORAGE_LOCAL_CACHE_MAX_SIZE * 1024 * 1024
+        )
 
     def upload_file(
         self, file: BinaryIO, filename: str, tags: Dict[str, str]
-    ) -> Tuple[bytes, str]:
+    ) -> Tuple[str, str, int]:
         """Handles uploading of the file to GCS storage."""
-        contents, file_path = LocalStorageProvider.upload_file(file, filename, tags)
+        file_path, file_hash, file_size = LocalStorageProvider.upload_file(
+            file, filename, tags
+        )
         try:
-            blob = self.bucket.blob(filename)
+            # Setting a chunk size switches to a chunked resumable upload
+            blob = self.bucket.blob(filename, chunk_size=UPLOAD_CHUNK_SIZE)
             blob.upload_from_filename(file_path)
-            return contents, "gs://" + self.bucket_name + "/" + filename
+            self.cache.add(file_path)
+            return "gs://" + self.bucket_name + "/" + filename, file_hash, file_size
         except GoogleCloudError as e:
             raise RuntimeError(f"Error uploading file to GCS: {e}")
 
@@ -256,12 +505,19 @@ class GCSStorageProvider(StorageProvider):
             filename = file_path.removeprefix("gs://").split("/")[1]
             local_file_path = f"{UPLOAD_DIR}/{filename}"
             blob = self.bucket.get_blob(filename)
-            blob.download_to_filename(local_file_path)
+            if blob is None:
+                raise NotFound(f"File {filename} not found in GCS bucket")
 
-            return local_file_path
+            return self.cache.get(
+                local_file_path, blob.etag, blob.size, blob.download_to_filename
+            )
         except NotFound as e:
             raise RuntimeError(f"Error downloading file from GCS: {e}")
 
+    def has_local_copy(self, file_path: str) -> bool:
+        filename = file_path.removeprefix("gs://").split("/")[1]
+        return self.cache.contains(f"{UPLOAD_DIR}/{filename}")
+
     def delete_file(self, file_path: str) -> None:
         """Handles deletion of the file from GCS storage."""
         try:
@@ -272,6 +528,7 @@ class GCSStorageProvider(StorageProvider):
             raise RuntimeError(f"Error deleting file from GCS: {e}")
 
         # Always delete from local storage
+        self.cache.remove(f"{UPLOAD_DIR}/{filename}")
         LocalStorageProvider.delete_file(file_path)
 
     def delete_all_files(self) -> None:
@@ -286,6 +543,7 @@ class GCSStorageProvider(StorageProvider):
             raise RuntimeError(f"Error deleting all files from GCS: {e}")
 
         # Always delete from local storage
+        self.cache.clear()
         LocalStorageProvider.delete_all_files()
 
 
@@ -298,27 +556,50 @@ class AzureStorageProvider(StorageProvider):
         if storage_key:
             # Configure using the Azure Storage Account Endpoint and Key
             self.blob_service_client = BlobServiceClient(
-                account_url=self.endpoint, credential=storage_key
+                account_url=self.endpoint,
+                credential=storage_key,
+                max_single_put_size=UPLOAD_CHUNK_SIZE,
+                max_block_size=UPLOAD_CHUNK_SIZE,
             )
         else:
             # Configure using the Azure Storage Account Endpoint and DefaultAzureCredential
             # If the key is not configured, then the DefaultAzureCredential will be used to support Managed Identity authentication
             self.blob_service_client = BlobServiceClient(
-                account_url=self.endpoint, credential=DefaultAzureCredential()
+                account_url=self.endpoint,
+                credential=DefaultAzureCredential(),
+                max_single_put_size=UPLOAD_CHUNK_SIZE,
+                max_block_size=UPLOAD_CHUNK_SIZE,
             )
         self.container_client = self.blob_service_client.get_container_client(
             self.container_name
         )
+        self.cache = LocalFileCache(
+            UPLOAD_DIR, STORAGE_LOCAL_CACHE_MAX_SIZE * 1024 * 1024
+        )
 
     def upload_file(
         self, file: BinaryIO, filename: str, tags: Dict[str, str]
-    ) -> Tuple[bytes, str]:
+    ) -> Tuple[str, str, int]:
         """Handles uploading of the file to Azure Blob Storage."""
-        contents, file_path = LocalStorageProvider.upload_file(file, filename, tags)
+        file_path, file_hash, file_size = LocalStorageProvider.upload_file(
+            file, filename, tags
+        )
         try:
             blob_client = self.container_client.get_blob_client(filename)
-            blob_client.upload_blob(contents, overwrite=True)
-            return contents, f"{self.endpoint}/{self.container_name}/{filename}"
+            # Uploaded as staged blocks read from the local copy
+            with open(file_path, "rb") as f:
+                blob_client.upload_blob(
+                    f,
+                    overwrite=True,
+                    length=file_size,
+                    max_concurrency=4,
+                )
+            self.cache.add(file_path)
+            return (
+                f"{self.endpoint}/{self.container_name}/{filename}",
+                file_hash,
+                file_size,
+            )
         except Exception as e:
             raise RuntimeError(f"Error uploading file to Azure Blob Storage: {e}")
 
@@ -328,12 +609,22 @@ class AzureStorageProvider(StorageProvider):
             filename = file_path.split("/")[-1]
             local_file_path = f"{UPLOAD_DIR}/{filename}"
             blob_client = self.container_client.get_blob_client(filename)
-            with open(local_file_path, "wb") as download_file:
-                download_file.write(blob_client.download_blob().readall())
-            return local_file_path
+            properties = blob_client.get_blob_properties()
+
+            def download(path: str):
+                with open(path, "wb") as download_file:
+                    blob_client.download_blob(max_concurrency=4).readinto(download_file)
+
+            return self.cache.get(
+                local_file_path, properties.etag, properties.size, download
+            )
         except ResourceNotFoundError as e:
             raise RuntimeError(f"Error downloading file from Azure Blob Storage: {e}")
 
+    def has_local_copy(self, file_path: str) -> bool:
+        filename = file_path.split("/")[-1]
+        return self.cache.contains(f"{UPLOAD_DIR}/{filename}")
+
     def delete_file(self, file_path: str) -> None:
         """Handles deletion of the file from Azure Blob Storage."""
         try:
@@ -344,6 +635,7 @@ class AzureStorageProvider(StorageProvider):
             raise RuntimeError(f"Error deleting file from Azure Blob Storage: {e}")
 
         # Always delete from local storage
+        self.cache.remove(f"{UPLOAD_DIR}/{filename}")
         LocalStorageProvider.delete_file(file_path)
 
     def delete_all_files(self) -> None:
@@ -356,6 +648,7 @@ class AzureStorageProvider(StorageProvider):
             raise RuntimeError(f"Error deleting all files from Azure Blob Storage: {e}")
 
         # Always delete from local storage
+        self.cache.clear()
         LocalStorageProvider.delete_all_files()
 
 
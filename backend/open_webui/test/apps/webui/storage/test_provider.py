@@ -1,3 +1,4 @@
+import hashlib
 import io
 import os
 import boto3
@@ -66,13 +67,16 @@ class TestLocalStorageProvider:
 
     def test_upload_file(self, monkeypatch, tmp_path):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
-        contents, file_path = self.Storage.upload_file(self.file_bytesio, self.filename)
+        file_path, file_hash, file_size = self.Storage.upload_file(
+            self.file_bytesio, self.filename, {}
+        )
         assert (upload_dir / self.filename).exists()
         assert (upload_dir / self.filename).read_bytes() == self.file_content
-        assert contents == self.file_content
+        assert file_hash == hashlib.sha256(self.file_content).hexdigest()
+        assert file_size == len(self.file_content)
         assert file_path == str(upload_dir / self.filename)
         with pytest.raises(ValueError):
-            self.Storage.upload_file(self.file_bytesio_empty, self.filename)
+            self.Storage.upload_file(self.file_bytesio_empty, self.filename, {})
 
     def test_get_file(self, monkeypatch, tmp_path):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
@@ -114,26 +118,27 @@ class TestS3StorageProvider:
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
         # S3 checks
         with pytest.raises(Exception):
-            self.Storage.upload_file(io.BytesIO(self.file_content), self.filename)
+            self.Storage.upload_file(io.BytesIO(self.file_content), self.filename, {})
         self.s3_client.create_bucket(Bucket=self.Storage.bucket_name)
-        contents, s3_file_path = self.Storage.upload_file(
-            io.BytesIO(self.file_content), self.filename
+        s3_file_path, file_hash, file_size = self.Storage.upload_file(
+            io.BytesIO(self.file_content), self.filename, {}
         )
         object = self.s3_client.Object(self.Storage.bucket_name, self.filename)
         assert self.file_content == object.get()["Body"].read()
         # local checks
         assert (upload_dir / self.filename).exists()
         assert (upload_dir / self.filename).read_bytes() == self.file_content
-        assert contents == self.file_content
+        assert file_hash == hashlib.sha256(self.file_content).hexdigest()
+        assert file_size == len(self.file_content)
         assert s3_file_path == "s3://" + self.Storage.bucket_name + "/" + self.filename
         with pytest.raises(ValueError):
-            self.Storage.upload_file(self.file_bytesio_empty, self.filename)
+            self.Storage.upload_file(self.file_bytesio_empty, self.filename, {})
 
     def test_get_file(self, monkeypatch, tmp_path):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
         self.s3_client.create_bucket(Bucket=self.Storage.bucket_name)
-        contents, s3_file_path = self.Storage.upload_file(
-            io.BytesIO(self.file_content), self.filename
+        s3_file_path, file_hash, file_size = self.Storage.upload_file(
+            io.BytesIO(self.file_content), self.filename, {}
         )
         file_path = self.Storage.get_file(s3_file_path)
         assert file_path == str(upload_dir / self.filename)
@@ -142,8 +147,8 @@ class TestS3StorageProvider:
     def test_delete_file(self, monkeypatch, tmp_path):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
         self.s3_client.create_bucket(Bucket=self.Storage.bucket_name)
-        contents, s3_file_path = self.Storage.upload_file(
-            io.BytesIO(self.file_content), self.filename
+        s3_file_path, file_hash, file_size = self.Storage.upload_file(
+            io.BytesIO(self.file_content), self.filename, {}
         )
         assert (upload_dir / self.filename).exists()
         self.Storage.delete_file(s3_file_path)
@@ -158,12 +163,12 @@ class TestS3StorageProvider:
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
         # create 2 files
         self.s3_client.create_bucket(Bucket=self.Storage.bucket_name)
-        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename)
+        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename, {})
         object = self.s3_client.Object(self.Storage.bucket_name, self.filename)
         assert self.file_content == object.get()["Body"].read()
         assert (upload_dir / self.filename).exists()
         assert (upload_dir / self.filename).read_bytes() == self.file_content
-        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename_extra)
+        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename_extra, {})
         object = self.s3_client.Object(self.Storage.bucket_name, self.filename_extra)
         assert self.file_content == object.get()["Body"].read()
         assert (upload_dir / self.filename).exists()
@@ -228,25 +233,26 @@ class TestGCSStorageProvider:
         # catch error if bucket does not exist
         with pytest.raises(Exception):
             self.Storage.bucket = monkeypatch(self.Storage, "bucket", None)
-            self.Storage.upload_file(io.BytesIO(self.file_content), self.filename)
-        contents, gcs_file_path = self.Storage.upload_file(
-            io.BytesIO(self.file_content), self.filename
+            self.Storage.upload_file(io.BytesIO(self.file_content), self.filename, {})
+        gcs_file_path, file_hash, file_size = self.Storage.upload_file(
+            io.BytesIO(self.file_content), self.filename, {}
         )
         object = self.Storage.bucket.get_blob(self.filename)
         assert self.file_content == object.download_as_bytes()
         # local checks
         assert (upload_dir / self.filename).exists()
         assert (upload_dir / self.filename).read_bytes() == self.file_content
-        assert contents == self.file_content
+        assert file_hash == hashlib.sha256(self.file_content).hexdigest()
+        assert file_size == len(self.file_content)
         assert gcs_file_path == "gs://" + self.Storage.bucket_name + "/" + self.filename
         # test error if file is empty
         with pytest.raises(ValueError):
-            self.Storage.upload_file(self.file_bytesio_empty, self.filename)
+            self.Storage.upload_file(self.file_bytesio_empty, self.filename, {})
 
     def test_get_file(self, monkeypatch, tmp_path, setup):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
-        contents, gcs_file_path = self.Storage.upload_file(
-            io.BytesIO(self.file_content), self.filename
+        gcs_file_path, file_hash, file_size = self.Storage.upload_file(
+            io.BytesIO(self.file_content), self.filename, {}
         )
         file_path = self.Storage.get_file(gcs_file_path)
         assert file_path == str(upload_dir / self.filename)
@@ -254,8 +260,8 @@ class TestGCSStorageProvider:
 
     def test_delete_file(self, monkeypatch, tmp_path, setup):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
-        contents, gcs_file_path = self.Storage.upload_file(
-            io.BytesIO(self.file_content), self.filename
+        gcs_file_path, file_hash, file_size = self.Storage.upload_file(
+            io.BytesIO(self.file_content), self.filename, {}
         )
         # ensure that local directory has the uploaded file as well
         assert (upload_dir / self.filename).exists()
@@ -268,13 +274,13 @@ class TestGCSStorageProvider:
     def test_delete_all_files(self, monkeypatch, tmp_path, setup):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
         # create 2 files
-        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename)
+        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename, {})
         object = self.Storage.bucket.get_blob(self.filename)
         assert (upload_dir / self.filename).exists()
         assert (upload_dir / self.filename).read_bytes() == self.file_content
         assert self.Storage.bucket.get_blob(self.filename).name == self.filename
         assert self.file_content == object.download_as_bytes()
-        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename_extra)
+        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename_extra, {})
         object = self.Storage.bucket.get_blob(self.filename_extra)
         assert (upload_dir / self.filename_extra).exists()
         assert (upload_dir / self.filename_extra).read_bytes() == self.file_content
@@ -343,21 +349,20 @@ class TestAzureStorageProvider:
             "Container does not exist"
         )
         with pytest.raises(Exception):
-            self.Storage.upload_file(io.BytesIO(self.file_content), self.filename)
+            self.Storage.upload_file(io.BytesIO(self.file_content), self.filename, {})
 
         # Reset side effect and create container
         self.Storage.container_client.get_blob_client.side_effect = None
         self.Storage.create_container()
-        contents, azure_file_path = self.Storage.upload_file(
-            io.BytesIO(self.file_content), self.filename
+        azure_file_path, file_hash, file_size = self.Storage.upload_file(
+            io.BytesIO(self.file_content), self.filename, {}
         )
 
         # Assertions
         self.Storage.container_client.get_blob_client.assert_called_with(self.filename)
-        self.Storage.container_client.get_blob_client().upload_blob.assert_called_once_with(
-            self.file_content, overwrite=True
-        )
-        assert contents == self.file_content
+        self.Storage.container_client.get_blob_client().upload_blob.assert_called_once()
+        assert file_hash == hashlib.sha256(self.file_content).hexdigest()
+        assert file_size == len(self.file_content)
         assert (
             azure_file_path
             == f"https://myaccount.blob.core.windows.net/{self.Storage.container_name}/{self.filename}"
@@ -366,16 +371,16 @@ class TestAzureStorageProvider:
         assert (upload_dir / self.filename).read_bytes() == self.file_content
 
         with pytest.raises(ValueError):
-            self.Storage.upload_file(self.file_bytesio_empty, self.filename)
+            self.Storage.upload_file(self.file_bytesio_empty, self.filename, {})
 
     def test_get_file(self, monkeypatch, tmp_path):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
         self.Storage.create_container()
 
         # Mock upload behavior
-        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename)
+        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename, {})
         # Mock blob download behavior
-        self.Storage.container_client.get_blob_client().download_blob().readall.return_value = (
+        self.Storage.container_client.get_blob_client().download_blob().readinto.side_effect = lambda f: f.write(
             self.file_content
         )
 
@@ -391,7 +396,7 @@ class TestAzureStorageProvider:
         self.Storage.create_container()
 
         # Mock file upload
-        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename)
+        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename, {})
         # Mock deletion
         self.Storage.container_client.get_blob_client().delete_blob.return_value = None
 
@@ -406,8 +411,8 @@ class TestAzureStorageProvider:
         self.Storage.create_container()
 
         # Mock file uploads
-        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename)
-        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename_extra)
+        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename, {})
+        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename_extra, {})
 
         # Mock listing and deletion behavior
         self.Storage.container_client.list_blobs.return_value = [
@@ -433,3 +438,107 @@ class TestAzureStorageProvider:
         )
         with pytest.raises(Exception, match="Blob not found"):
             self.Storage.get_file(file_url)
+
+
+class TestLocalFileCache:
+    file_content = b"test content"
+
+    def test_get_downloads_once(self, tmp_path):
+        cache = provider.LocalFileCache(tmp_path, 0)
+        path = str(tmp_path / "test.txt")
+        download = MagicMock(
+            side_effect=lambda p: open(p, "wb").write(self.file_content)
+        )
+
+        assert cache.get(path, "etag-1", len(self.file_content), download) == path
+        assert cache.get(path, "etag-1", len(self.file_content), download) == path
+        assert download.call_count == 1
+        assert cache.contains(path)
+
+        # A changed object is downloaded again
+        cache.get(path, "etag-2", len(self.file_content), download)
+        assert download.call_count == 2
+
+    def test_get_reuses_identical_content(self, tmp_path):
+        cache = provider.LocalFileCache(tmp_path, 0)
+        download = MagicMock(
+            side_effect=lambda p: open(p, "wb").write(self.file_content)
+        )
+
+        cache.get(str(tmp_path / "a.txt"), "etag", None, download)
+        path = cache.get(str(tmp_path / "b.txt"), "etag", None, download)
+        assert download.call_count == 1
+        assert open(path, "rb").read() == self.file_content
+
+    def test_uploaded_copy_adopts_etag(self, tmp_path):
+        path = tmp_path / "test.txt"
+        path.write_bytes(self.file_content)
+        provider.LocalFileCache(tmp_path, 0).add(str(path))
+        # Recorded on disk, so it is also adopted after a restart
+        cache = provider.LocalFileCache(tmp_path, 0)
+        download = MagicMock(side_effect=lambda p: open(p, "wb").write(b"changed"))
+
+        assert cache.get(str(path), "etag", len(self.file_content), download) == str(
+            path
+        )
+        download.assert_not_called()
+
+        # From then on the copy is only valid for that ETag
+        cache.get(str(path), "etag-2", None, download)
+        download.assert_called_once()
+
+    def test_unrecorded_copy_is_downloaded(self, tmp_path):
+        path = tmp_path / "test.txt"
+        path.write_bytes(b"stale")
+        cache = provider.LocalFileCache(tmp_path, 0)
+        download = MagicMock(
+            side_effect=lambda p: open(p, "wb").write(self.file_content)
+        )
+
+        assert not cache.contains(str(path))
+        cache.get(str(path), "etag", None, download)
+        download.assert_called_once()
+        assert path.read_bytes() == self.file_content
+
+    def test_copies_shared_between_workers(self, tmp_path):
+        download = MagicMock(
+            side_effect=lambda p: open(p, "wb").write(self.file_content)
+        )
+        provider.LocalFileCache(tmp_path, 0).get(
+            str(tmp_path / "a.txt"), "etag", None, download
+        )
+
+        other = provider.LocalFileCache(tmp_path, 0)
+        assert other.contains(str(tmp_path / "a.txt"))
+        other.get(str(tmp_path / "a.txt"), "etag", None, download)
+        assert download.call_count == 1
+
+    def test_evicts_least_recently_used(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(provider.LocalFileCache, "EVICTION_GRACE_SECONDS", 0)
+        # Room for two and a half files, eviction frees it down to 90% of that
+        cache = provider.LocalFileCache(tmp_path, 5 * len(self.file_content) // 2)
+        download = MagicMock(
+            side_effect=lambda p: open(p, "wb").write(self.file_content)
+        )
+
+        cache.get(str(tmp_path / "a.txt"), "a", None, download)
+        cache.get(str(tmp_path / "b.txt"), "b", None, download)
+        cache.get(str(tmp_path / "a.txt"), "a", None, download)
+        cache.get(str(tmp_path / "c.txt"), "c", None, download)
+
+        assert (tmp_path / "a.txt").exists()
+        assert not (tmp_path / "b.txt").exists()
+        assert (tmp_path / "c.txt").exists()
+
+    def test_recently_used_files_are_not_evicted(self, tmp_path):
+        # Another worker may still be streaming them
+        cache = provider.LocalFileCache(tmp_path, len(self.file_content))
+        download = MagicMock(
+            side_effect=lambda p: open(p, "wb").write(self.file_content)
+        )
+
+        cache.get(str(tmp_path / "a.txt"), "a", None, download)
+        cache.get(str(tmp_path / "b.txt"), "b", None, download)
+
+        assert (tmp_path / "a.txt").exists()
+        assert (tmp_path / "b.txt").exists()
@@ -0,0 +1,113 @@
+"""
+Micro-benchmark of the SSE line splitting of upstream chat streams.
+
+Compares SSELineSplitter with the previous splitting, which concatenated the
+pending data with every chunk. Runs on synthetic provider streams, or on
+recorded response bodies (for example saved with `curl -N ... > stream.txt`):
+
+    python -m open_webui.test.benchmark.bench_sse_stream [stream.txt ...]
+"""
+
+import base64
+import json
+import os
+import sys
+import time
+
+from open_webui.utils.misc import SSELineSplitter
+
+MAX_LINE_SIZE = 10 * 1024 * 1024
+# aiohttp hands out at most a socket read at a time
+CHUNK_SIZE = 16 * 1024
+
+
+def split_concat(chunks, max_buffer_size):
+    """The splitting stream_chunks_handler used before SSELineSplitter."""
+    lines = []
+    buffer = b""
+    skip_mode = False
+    for data in chunks:
+        if skip_mode and len(buffer) > max_buffer_size:
+            buffer = b""
+        parts = (buffer + data).split(b"\n")
+        for line in parts[:-1]:
+            if skip_mode:
+                if len(line) <= max_buffer_size:
+                    skip_mode = False
+                    lines.append(line)
+                else:
+                    lines.append(b"data: {}")
+            elif len(line) > max_buffer_size:
+                skip_mode = True
+                lines.append(b"data: {}")
+            else:
+                lines.append(line)
+        buffer = parts[-1]
+        if not skip_mode and len(buffer) > max_buffer_size:
+            skip_mode = True
+            buffer = b""
+    if buffer and not skip_mode:
+        lines.append(buffer)
+    return lines
+
+
+def split_bytearray(chunks, max_buffer_size):
+    splitter = SSELineSplitter(max_buffer_size)
+    lines = []
+    for data in chunks:
+        lines.extend(splitter.feed(data))
+    return lines + splitter.flush()
+
+
+def event(delta: dict) -> bytes:
+    chunk = {"id": "chatcmpl-1", "object": "chat.completion.chunk", "choices": []}
+    chunk["choices"].append({"index": 0, "delta": delta, "finish_reason": None})
+    return b"data: " + json.dumps(chunk).encode() + b"\n\n"
+
+
+def synthetic_streams() -> dict[str, bytes]:
+    tokens = b"".join(event({"content": f"token {i} "}) for i in range(5000))
+    image = base64.b64encode(os.urandom(3 * 1024 * 1024)).decode()
+    arguments = json.dumps({"rows": [[i, "x" * 32] for i in range(20000)]})
+    return {
+        "text deltas": tokens + b"data: [DONE]\n\n",
+        "4MB base64 image": event({"images": [{"image_url": image}]}) + tokens,
+        "1MB tool call arguments": event(
+            {"tool_calls": [{"index": 0, "function": {"arguments": arguments}}]}
+        )
+        + tokens,
+    }
+
+
+def measure(split, chunks, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        split(chunks, MAX_LINE_SIZE)
+    return (time.perf_counter() - started) / rounds
+
+
+def main(paths: list[str]):
+    streams = synthetic_streams()
+    for path in paths:
+        with open(path, "rb") as f:
+            streams[os.path.basename(path)] = f.read()
+
+    print(f"{'stream':<28}{'size':>10}{'concat':>12}{'bytearray':>12}{'speedup':>10}")
+    for name, stream in streams.items():
+        chunks = [stream[i : i + CHUNK_SIZE] for i in range(0, len(stream), CHUNK_SIZE)]
+        assert split_concat(chunks, MAX_LINE_SIZE) == split_bytearray(
+            chunks, MAX_LINE_SIZE
+        )
+
+        rounds = 3
+        concat = measure(split_concat, chunks, rounds)
+        bytearray_ = measure(split_bytearray, chunks, rounds)
+        print(
+            f"{name:<28}{len(stream) / 1024 / 1024:>8.1f}MB"
+            f"{concat * 1000:>10.1f}ms{bytearray_ * 1000:>10.1f}ms"
+            f"{concat / bytearray_:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,151 @@
+"""
+Benchmark of the chat stream fast path, in tokens per second of CPU time.
+
+The full path repeats the per-line work that process_chat_response does for
+every text delta when the fast path is off: decoding the line, json.loads,
+process_filter_functions and looking up every field of the event. Reasoning
+tag and code interpreter detection run on top of that in the full path and
+are not included, so the speedup of those requests is larger. The full path
+serializes the content of every delta, the fast path only when it is emitted,
+every CHAT_RESPONSE_STREAM_DELTA_CHUNK_SIZE deltas.
+
+    python -m open_webui.test.benchmark.bench_stream_fast_path [tokens]
+"""
+
+import asyncio
+import json
+import sys
+import time
+
+from open_webui.utils.filter import process_filter_functions
+from open_webui.utils.misc import get_plain_content_delta
+
+
+def stream(tokens: int) -> list[bytes]:
+    lines = []
+    for i in range(tokens):
+        event = {
+            "id": "chatcmpl-1",
+            "object": "chat.completion.chunk",
+            "created": 1700000000,
+            "model": "gpt-4o",
+            "choices": [
+                {
+                    "index": 0,
+                    "delta": {"content": f" tok{i % 100}"},
+                    "logprobs": None,
+                    "finish_reason": None,
+                }
+            ],
+            "usage": None,
+        }
+        lines += [f"data: {json.dumps(event)}".encode(), b""]
+    return lines + [b"data: [DONE]", b""]
+
+
+def emit(data: dict):
+    # python-socketio encodes packets with the json module
+    json.dumps({"type": "chat:completion", "data": data})
+
+
+async def full_path(lines: list[bytes], delta_chunk_size: int):
+    content = ""
+    delta_count = 0
+    for line in lines:
+        line = line.decode("utf-8", "replace")
+        if not line.strip() or not line.startswith("data:"):
+            continue
+        try:
+            data = json.loads(line[len("data:") :].strip())
+        except ValueError:
+            continue
+
+        data, _ = await process_filter_functions(
+            request=None,
+            filter_functions=[],
+            filter_type="stream",
+            form_data=data,
+            extra_params={},
+        )
+        if "event" in data or "selected_model_id" in data:
+            continue
+        usage = data.get("usage", {}) or {}
+        usage.update(data.get("timings", {}))
+        choices = data.get("choices", [])
+        delta = choices[0].get("delta", {})
+        delta.get("tool_calls")
+        delta.get("images", [])
+        delta.get("reasoning_content") or delta.get("reasoning") or delta.get(
+            "thinking"
+        )
+        value = delta.get("content")
+        if value:
+            content = f"{content}{value}"
+            # The content is serialized for every delta, emitted or not
+            last_delta_data = {"content": content.strip()}
+            delta_count += 1
+            if delta_count >= delta_chunk_size:
+                emit(last_delta_data)
+                delta_count = 0
+
+
+async def fast_path(lines: list[bytes], delta_chunk_size: int):
+    content = ""
+    delta_count = 0
+    for line in lines:
+        plain_delta = get_plain_content_delta(line)
+        if plain_delta:
+            content = f"{content}{plain_delta[1]}"
+            delta_count += 1
+            if delta_count >= delta_chunk_size:
+                emit({"content": content.strip()})
+                delta_count = 0
+
+
+async def api_full_path(lines: list[bytes]):
+    for line in lines:
+        await process_filter_functions(
+            request=None,
+            filter_functions=[],
+            filter_type="stream",
+            form_data=line,
+            extra_params={},
+        )
+
+
+async def api_fast_path(lines: list[bytes]):
+    for line in lines:
+        pass
+
+
+def tokens_per_second(run, tokens: int, rounds: int = 5) -> float:
+    asyncio.run(run())
+    started = time.process_time()
+    for _ in range(rounds):
+        asyncio.run(run())
+    return tokens * rounds / (time.process_time() - started)
+
+
+def main(tokens: int):
+    lines = stream(tokens)
+    print(f"{'path':<30}{'full tok/s':>14}{'fast tok/s':>14}{'speedup':>10}")
+    for name, full, fast in [
+        (
+            "chat, delta chunk size 1",
+            lambda: full_path(lines, 1),
+            lambda: fast_path(lines, 1),
+        ),
+        (
+            "chat, delta chunk size 16",
+            lambda: full_path(lines, 16),
+            lambda: fast_path(lines, 16),
+        ),
+        ("API stream", lambda: api_full_path(lines), lambda: api_fast_path(lines)),
+    ]:
+        full = tokens_per_second(full, tokens)
+        fast = tokens_per_second(fast, tokens)
+        print(f"{name:<30}{full:>14,.0f}{fast:>14,.0f}{fast / full:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
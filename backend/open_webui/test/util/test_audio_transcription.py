@@ -0,0 +1,165 @@
+import asyncio
+import io
+import math
+import struct
+import threading
+import time
+import wave
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+
+from open_webui.routers import audio
+
+
+def make_request(**config):
+    return SimpleNamespace(
+        app=SimpleNamespace(state=SimpleNamespace(config=SimpleNamespace(**config)))
+    )
+
+
+def write_wav(path, segments, rate=16000):
+    """Writes (milliseconds, audible) segments of a 16-bit mono tone."""
+    frames = []
+    for ms, audible in segments:
+        for i in range(rate * ms // 1000):
+            value = int(8000 * math.sin(2 * math.pi * 440 * i / rate)) if audible else 0
+            frames.append(struct.pack("<h", value))
+
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(b"".join(frames))
+
+
+class TestSplitAudio:
+    def test_chunk_boundaries(self):
+        assert audio.get_chunk_boundaries(10, [], 20) == [(0, 10)]
+        # Cut at the latest silence under the limit, hard cut without one
+        assert audio.get_chunk_boundaries(25, [4, 8, 15], 10) == [
+            (0, 8),
+            (8, 15),
+            (15, 25),
+        ]
+        assert audio.get_chunk_boundaries(25, [], 10) == [(0, 10), (10, 20), (20, 25)]
+
+    def test_small_file_is_not_split(self, tmp_path):
+        path = tmp_path / "a.wav"
+        write_wav(path, [(500, True)])
+        assert audio.split_audio(str(path), 1024 * 1024) == [str(path)]
+
+    def test_split_in_silence(self, tmp_path):
+        path = tmp_path / "a.wav"
+        write_wav(path, [(3000, True), (1000, False), (3000, True)])
+
+        # 16 kHz 16-bit mono PCM is 256 kbps, chunks of at most 4.05 seconds
+        chunks = audio.split_audio(str(path), 32 * 4500, format="wav", bitrate="256k")
+
+        assert len(chunks) == 2
+        durations = []
+        for chunk in chunks:
+            with wave.open(chunk, "rb") as f:
+                durations.append(f.getnframes() * 1000 // f.getframerate())
+        assert 3000 < durations[0] < 4000
+        assert sum(durations) == 7000
+
+
+class TestIterTranscription:
+    def test_chunks_in_order_and_cleaned_up(self, tmp_path, monkeypatch):
+        original = tmp_path / "a.mp3"
+        original.write_bytes(b"")
+        chunks = [tmp_path / f"a_chunk_{i}.mp3" for i in range(3)]
+        for chunk in chunks:
+            chunk.write_bytes(b"")
+
+        monkeypatch.setattr(
+            audio, "split_audio", lambda *args: [str(chunk) for chunk in chunks]
+        )
+        monkeypatch.setattr(
+            audio,
+            "transcription_handler",
+            lambda request, path, metadata, user: {"text": path[-5]},
+        )
+
+        request = make_request(STT_ENGINE="openai")
+        assert list(audio.iter_transcription(request, str(original))) == [
+            "0",
+            "1",
+            "2",
+        ]
+        assert original.exists()
+        assert not any(chunk.exists() for chunk in chunks)
+
+    def test_local_engine_errors(self, monkeypatch):
+        def segments(*args):
+            yield SimpleNamespace(text="Hello")
+            raise RuntimeError("model failed")
+
+        monkeypatch.setattr(audio, "iter_faster_whisper_segments", segments)
+
+        texts = audio.iter_transcription(make_request(STT_ENGINE=""), "a.wav")
+        assert next(texts) == "Hello"
+        with pytest.raises(HTTPException):
+            next(texts)
+
+    def test_local_engine_stops_when_closed(self, monkeypatch):
+        produced = []
+        finished = threading.Event()
+
+        def segments(*args):
+            try:
+                for i in range(1000):
+                    produced.append(i)
+                    yield SimpleNamespace(text=str(i))
+                    time.sleep(0.001)
+            finally:
+                finished.set()
+
+        monkeypatch.setattr(audio, "iter_faster_whisper_segments", segments)
+
+        texts = audio.iter_transcription(make_request(STT_ENGINE=""), "a.wav")
+        assert next(texts) == "0"
+        texts.close()
+
+        # The worker gives up its executor slot instead of transcribing the rest
+        assert finished.wait(5)
+        assert len(produced) < 1000
+
+    def test_batching_honors_vad_setting(self, monkeypatch):
+        monkeypatch.setattr(audio, "WHISPER_BATCH_SIZE", 8)
+        request = make_request(WHISPER_VAD_FILTER=False)
+        request.app.state.faster_whisper_model = model = object()
+
+        assert audio.get_faster_whisper_transcriber(request) == (
+            model,
+            {"vad_filter": False},
+        )
+
+
+class TestTranscriptionStream:
+    def test_stream_events(self, monkeypatch):
+        monkeypatch.setattr(
+            audio, "iter_transcription", lambda *args: iter(["Hello ", " ", "world"])
+        )
+        file = UploadFile(
+            io.BytesIO(b"audio"),
+            filename="a.wav",
+            headers=Headers({"content-type": "audio/wav"}),
+        )
+
+        response = audio.transcription(
+            make_request(STT_SUPPORTED_CONTENT_TYPES=[]), file, None, True, None
+        )
+
+        async def read():
+            return [chunk async for chunk in response.body_iterator]
+
+        events = asyncio.run(read())
+        assert events[:2] == [
+            'data: {"text": "Hello "}\n\n',
+            'data: {"text": "world"}\n\n',
+        ]
+        assert '"text": "Hello world"' in events[2] and '"done": true' in events[2]
@@ -0,0 +1,60 @@
+import json
+
+from open_webui.models.chats import Chats
+from open_webui.utils.chat_import import import_chats_from_ndjson
+
+
+def make_lines(count):
+    return [
+        json.dumps({"chat": {"title": f"chat {i}"}, "meta": {"tags": ["a"]}}).encode()
+        + b"\n"
+        for i in range(count)
+    ]
+
+
+class TestChatImport:
+    def test_batches_and_progress(self, monkeypatch):
+        batches = []
+        monkeypatch.setattr(
+            Chats,
+            "insert_chats_batch",
+            lambda user_id, forms: batches.append(len(forms)) or len(forms),
+        )
+
+        lines = make_lines(5)
+        lines.insert(2, b"not json\n")
+        events = list(import_chats_from_ndjson("user-1", lines, batch_size=2))
+
+        assert batches == [2, 2, 1]
+        assert [event["line"] for event in events] == [2, 5, 6]
+        assert events[-1]["done"]
+        assert events[-1]["imported"] == 5
+        assert events[0]["errors"] == []
+        assert events[1]["failed"] == 1
+        assert events[1]["errors"][0]["start"] == 3
+
+    def test_failed_batch_and_resume(self, monkeypatch):
+        def insert(user_id, forms):
+            if forms[0].chat["title"] == "chat 2":
+                raise Exception("database is locked")
+            return len(forms)
+
+        monkeypatch.setattr(Chats, "insert_chats_batch", insert)
+
+        events = list(import_chats_from_ndjson("user-1", make_lines(6), batch_size=2))
+        assert events[-1]["imported"] == 4
+        assert events[-1]["failed"] == 2
+        assert events[1]["errors"] == [
+            {"start": 3, "end": 4, "error": "Failed to save chats"}
+        ]
+
+        events = list(
+            import_chats_from_ndjson("user-1", make_lines(6), batch_size=2, skip=4)
+        )
+        assert events[-1] == {
+            "line": 6,
+            "imported": 2,
+            "failed": 0,
+            "errors": [],
+            "done": True,
+        }
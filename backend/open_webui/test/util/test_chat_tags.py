@@ -0,0 +1,182 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from open_webui.models import chats as chats_module
+from open_webui.models import folders as folders_module
+from open_webui.models import tags as tags_module
+from open_webui.models.chats import Chat, ChatImportForm, ChatTag, Chats
+from open_webui.models.folders import Folder
+from open_webui.models.tags import Tag
+
+USER_ID = "user-1"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    for table in (Chat, ChatTag, Tag, Folder):
+        table.__table__.create(engine)
+    SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
+
+    @contextmanager
+    def get_db():
+        session = SessionLocal()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    for module in (chats_module, folders_module, tags_module):
+        monkeypatch.setattr(module, "get_db", get_db)
+    return get_db
+
+
+def import_chat(title, tags=(), folder_id=None, user_id=USER_ID):
+    (chat,) = Chats.import_chats(
+        user_id,
+        [
+            ChatImportForm(
+                chat={"title": title, "messages": []},
+                meta={"tags": list(tags)},
+                folder_id=folder_id,
+            )
+        ],
+    )
+    return chat.id
+
+
+def assert_in_sync(db):
+    with db() as session:
+        mirrored = {
+            (row.chat_id, row.user_id, row.tag_id)
+            for row in session.query(ChatTag).all()
+        }
+        expected = {
+            (chat.id, chat.user_id, tag_id)
+            for chat in session.query(Chat).all()
+            for tag_id in (chat.meta or {}).get("tags", [])
+        }
+    assert mirrored == expected
+
+
+def legacy_search(db, tag_ids):
+    """The JSON based tag filter used before chat_tag existed (sqlite)."""
+    with db() as session:
+        query = "SELECT id FROM chat WHERE user_id = :user_id AND archived = 0"
+        params = {"user_id": USER_ID}
+        if "none" in tag_ids:
+            query += " AND NOT EXISTS (SELECT 1 FROM json_each(chat.meta, '$.tags'))"
+        for i, tag_id in enumerate(tag_ids):
+            if "none" in tag_ids:
+                break
+            query += (
+                " AND EXISTS (SELECT 1 FROM json_each(chat.meta, '$.tags') AS tag"
+                f" WHERE tag.value = :tag_{i})"
+            )
+            params[f"tag_{i}"] = tag_id
+        return {row.id for row in session.execute(text(query), params)}
+
+
+def search(query):
+    return {
+        chat.id for chat in Chats.get_chats_by_user_id_and_search_text(USER_ID, query)
+    }
+
+
+class TestChatTagMirror:
+    def test_import(self, db):
+        import_chat("a", ["x", "y", "x"])
+        import_chat("b")
+        Chats.insert_chats_batch(
+            USER_ID,
+            [
+                ChatImportForm(chat={"title": "c"}, meta={"tags": ["y"]}),
+                ChatImportForm(chat={"title": "d"}, meta={}),
+            ],
+        )
+
+        assert_in_sync(db)
+        with db() as session:
+            assert session.query(ChatTag).count() == 3
+
+    def test_tag_and_untag(self, db):
+        chat_id = import_chat("a", ["x"])
+
+        Chats.add_chat_tag_by_id_and_user_id_and_tag_name(chat_id, USER_ID, "New Tag")
+        assert_in_sync(db)
+        assert Chats.count_chats_by_tag_name_and_user_id("new tag", USER_ID) == 1
+
+        Chats.delete_tag_by_id_and_user_id_and_tag_name(chat_id, USER_ID, "x")
+        assert_in_sync(db)
+        assert Chats.count_chats_by_tag_name_and_user_id("x", USER_ID) == 0
+
+        Chats.update_chat_tags_by_id(
+            chat_id, ["z", "none"], type("User", (), {"id": USER_ID})
+        )
+        assert_in_sync(db)
+        assert [
+            tag.id for tag in Chats.get_chat_tags_by_id_and_user_id(chat_id, USER_ID)
+        ] == ["z"]
+
+        Chats.delete_all_tags_by_id_and_user_id(chat_id, USER_ID)
+        assert_in_sync(db)
+        assert Chats.get_chat_list_by_user_id_and_tag_name(USER_ID, "z") == []
+
+    def test_delete(self, db):
+        first = import_chat("a", ["x"])
+        second = import_chat("b", ["x"])
+        import_chat("c", ["x"], user_id="user-2")
+
+        Chats.delete_chat_by_id(first)
+        Chats.delete_chat_by_id_and_user_id(second, USER_ID)
+        assert_in_sync(db)
+
+        Chats.delete_chats_by_user_id("user-2")
+        assert_in_sync(db)
+        with db() as session:
+            assert session.query(ChatTag).count() == 0
+
+    def test_delete_by_folder(self, db):
+        import_chat("a", ["x"], folder_id="folder-1")
+        kept = import_chat("b", ["x"], folder_id="folder-2")
+
+        Chats.delete_chats_by_user_id_and_folder_id(USER_ID, "folder-1")
+
+        assert_in_sync(db)
+        assert [
+            chat.id
+            for chat in Chats.get_chat_list_by_user_id_and_tag_name(USER_ID, "x")
+        ] == [kept]
+
+
+class TestTagSearch:
+    @pytest.fixture
+    def chats(self, db):
+        import_chat("alpha", ["x"])
+        import_chat("beta", ["x", "y"])
+        import_chat("gamma", ["y"])
+        import_chat("delta")
+        import_chat("other user", ["x"], user_id="user-2")
+        return db
+
+    @pytest.mark.parametrize(
+        "tag_ids",
+        [["x"], ["y"], ["x", "y"], ["missing"], ["none"], ["x", "none"]],
+    )
+    def test_matches_json_filter(self, chats, tag_ids):
+        expected = legacy_search(chats, tag_ids)
+
+        assert search(" ".join(f"tag:{tag_id}" for tag_id in tag_ids)) == expected
+
+    def test_combined_with_text(self, chats):
+        assert len(search("tag:x")) == 2
+        assert len(search("beta tag:x")) == 1
+        assert len(search("gamma tag:x")) == 0
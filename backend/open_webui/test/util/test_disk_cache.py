@@ -0,0 +1,95 @@
+import os
+
+from open_webui.utils import disk_cache
+from open_webui.utils.disk_cache import DiskCacheEvictor
+
+
+def write(path, size, mtime):
+    path.write_bytes(b"x" * size)
+    os.utime(path, (mtime, mtime))
+    return len(path.read_bytes())
+
+
+class TestDiskCacheEvictor:
+    def test_lists_directory_only_above_limit(self, tmp_path, monkeypatch):
+        listings = []
+        scandir = os.scandir
+
+        def record(path):
+            listings.append(path)
+            return scandir(path)
+
+        monkeypatch.setattr(disk_cache.os, "scandir", record)
+        evictor = DiskCacheEvictor(tmp_path, 100)
+        assert len(listings) == 1
+
+        for i in range(9):
+            evictor.add(write(tmp_path / str(i), 10, i))
+        assert len(listings) == 1
+        assert evictor.size == 90
+
+        # Crossing the limit evicts the oldest files down to LOW_WATER
+        evictor.add(write(tmp_path / "9", 20, 9))
+        assert len(listings) == 2
+        assert sorted(os.listdir(tmp_path)) == ["2", "3", "4", "5", "6", "7", "8", "9"]
+        assert evictor.size == 90
+
+        evictor.add(write(tmp_path / "10", 10, 10))
+        assert len(listings) == 2
+
+    def test_counts_files_of_other_workers(self, tmp_path):
+        write(tmp_path / "a", 60, 0)
+        evictor = DiskCacheEvictor(tmp_path, 100)
+        assert evictor.size == 60
+
+        # Written by another worker, only seen once the limit is crossed
+        write(tmp_path / "b", 30, 1)
+        evictor.add(write(tmp_path / "c", 20, 2))
+        assert len(os.listdir(tmp_path)) == 3
+
+        evictor.add(write(tmp_path / "d", 30, 3))
+        assert sorted(os.listdir(tmp_path)) == ["b", "c", "d"]
+        assert evictor.size == 80
+
+    def test_temporary_and_recent_files(self, tmp_path):
+        write(tmp_path / ".stale.tmp", 50, 0)
+        (tmp_path / ".fresh.tmp").write_bytes(b"x" * 50)
+        write(tmp_path / "old", 60, 0)
+        (tmp_path / "recent").write_bytes(b"x" * 60)
+
+        evicted = []
+        evictor = DiskCacheEvictor(
+            tmp_path,
+            100,
+            is_temporary=lambda name: name.startswith("."),
+            stale_temporary_seconds=3600,
+            grace_seconds=300,
+            on_evict=evicted.append,
+        )
+
+        assert sorted(os.listdir(tmp_path)) == [".fresh.tmp", "recent"]
+        assert evicted == [str(tmp_path / "old")]
+        assert evictor.size == 60
+
+    def test_files_in_grace_period_do_not_list_every_write(self, tmp_path, monkeypatch):
+        for name in ("a", "b"):
+            (tmp_path / name).write_bytes(b"x" * 60)
+        evictor = DiskCacheEvictor(tmp_path, 100, grace_seconds=300)
+        assert evictor.size == 120
+
+        listings = []
+        scandir = os.scandir
+        monkeypatch.setattr(
+            disk_cache.os,
+            "scandir",
+            lambda path: listings.append(path) or scandir(path),
+        )
+        evictor.add(5)
+        assert listings == []
+
+    def test_disabled(self, tmp_path):
+        write(tmp_path / "a", 60, 0)
+        evictor = DiskCacheEvictor(tmp_path, 0)
+        evictor.add(1000)
+
+        assert os.listdir(tmp_path) == ["a"]
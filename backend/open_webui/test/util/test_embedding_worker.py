@@ -0,0 +1,56 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from open_webui.retrieval.models.worker import EmbeddingWorker
+
+
+class PromptModel:
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, batch_size=32, prompt=None):
+        self.calls.append((len(texts), prompt))
+        return np.array(
+            [[float(len(text)), float(len(prompt or ""))] for text in texts]
+        )
+
+
+class TestEmbeddingWorker:
+    @pytest.mark.asyncio
+    async def test_batches_concurrent_requests(self):
+        model = PromptModel()
+        worker = EmbeddingWorker(model, batch_size=4, batch_wait_ms=50, max_workers=1)
+
+        results = await asyncio.gather(
+            worker.aencode("a"),
+            worker.aencode(["bb", "ccc"]),
+            worker.aencode("dddd", prefix="query: "),
+            worker.aencode(["e"] * 6),
+        )
+        metrics = worker.get_metrics()
+        worker.close()
+
+        assert results[0] == [1.0, 0.0]
+        assert results[1] == [[2.0, 0.0], [3.0, 0.0]]
+        assert results[2] == [4.0, 7.0]
+        assert len(results[3]) == 6
+        # Batches stop at 4 texts and prompts are never mixed within a call
+        assert model.calls[:2] == [(3, None), (1, "query: ")]
+        assert model.calls[2:] == [(4, None), (2, None)]
+        assert metrics["texts"] == 10
+        assert metrics["batches"] == 4
+
+    @pytest.mark.asyncio
+    async def test_errors_and_close(self):
+        model = PromptModel()
+        model.encode = lambda texts, **kwargs: 1 / 0
+        worker = EmbeddingWorker(model, batch_wait_ms=0)
+
+        with pytest.raises(ZeroDivisionError):
+            await worker.aencode("a")
+        worker.close()
+
+        with pytest.raises(RuntimeError):
+            worker.encode("a")
@@ -0,0 +1,42 @@
+import gzip
+import json
+
+from pydantic import BaseModel
+
+from open_webui.utils import export
+from open_webui.utils.export import gzip_chunks, iter_export_chunks
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+def make_items(count):
+    return (Item(id=i, name=f"item {i}") for i in range(count))
+
+
+class TestExport:
+    def test_json_array(self, monkeypatch):
+        monkeypatch.setattr(export, "EXPORT_CHUNK_SIZE", 64)
+        chunks = list(iter_export_chunks(make_items(50)))
+
+        assert len(chunks) > 1
+        items = json.loads(b"".join(chunks))
+        assert [item["id"] for item in items] == list(range(50))
+
+    def test_empty_json_array(self):
+        assert b"".join(iter_export_chunks(make_items(0))) == b"[]"
+
+    def test_ndjson(self):
+        body = b"".join(iter_export_chunks(make_items(3), "ndjson"))
+        lines = body.decode().splitlines()
+        assert [json.loads(line)["name"] for line in lines] == [
+            "item 0",
+            "item 1",
+            "item 2",
+        ]
+
+    def test_gzip(self):
+        body = b"".join(gzip_chunks(iter_export_chunks(make_items(100))))
+        assert len(json.loads(gzip.decompress(body))) == 100
@@ -0,0 +1,105 @@
+import threading
+import time
+
+import pytest
+
+from open_webui.retrieval.ingestion import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_NORMAL,
+    REDIS_INGESTION_PROCESSING_KEY,
+    REDIS_INGESTION_QUEUE_KEY,
+    IngestionJob,
+    IngestionQueue,
+)
+
+
+@pytest.fixture
+def redis():
+    fakeredis = pytest.importorskip("fakeredis")
+    # Needed by fakeredis to run the Lua scripts of the queue
+    pytest.importorskip("lupa")
+    return fakeredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
+
+
+def run_jobs(redis, count):
+    handled = []
+    done = threading.Event()
+
+    def handler(job):
+        handled.append(job.file_id)
+        if len(handled) == count:
+            done.set()
+
+    queue = IngestionQueue(handler, workers=1, redis=redis)
+    for file_id, priority in [
+        ("low", PRIORITY_LOW),
+        ("normal-1", PRIORITY_NORMAL),
+        ("high", PRIORITY_HIGH),
+        ("normal-2", PRIORITY_NORMAL),
+    ]:
+        queue.submit(IngestionJob(file_id=file_id, user_id="u", priority=priority))
+        time.sleep(0.002)
+
+    queue.start()
+    assert done.wait(5)
+    queue.stop()
+    return handled
+
+
+class TestIngestionQueue:
+    def test_priority_order_local(self):
+        assert run_jobs(None, 4) == ["high", "normal-1", "normal-2", "low"]
+
+    def test_priority_order_redis(self, redis):
+        assert run_jobs(redis, 4) == ["high", "normal-1", "normal-2", "low"]
+        assert redis.zcard(REDIS_INGESTION_QUEUE_KEY) == 0
+        assert redis.zcard(REDIS_INGESTION_PROCESSING_KEY) == 0
+
+    def test_job_kept_until_processed(self, redis):
+        started, release = threading.Event(), threading.Event()
+
+        def handler(job):
+            started.set()
+            release.wait(5)
+
+        queue = IngestionQueue(handler, workers=1, redis=redis)
+        queue.submit(IngestionJob(file_id="a", user_id="u"))
+        queue.start()
+        assert started.wait(5)
+
+        assert redis.zcard(REDIS_INGESTION_QUEUE_KEY) == 0
+        assert redis.zcard(REDIS_INGESTION_PROCESSING_KEY) == 1
+        # Running jobs of this instance are never requeued
+        redis.zadd(
+            REDIS_INGESTION_PROCESSING_KEY,
+            {m: 0 for m in redis.zrange(REDIS_INGESTION_PROCESSING_KEY, 0, -1)},
+        )
+        assert queue.requeue_abandoned_jobs() == 0
+
+        release.set()
+        queue.stop()
+        assert redis.zcard(REDIS_INGESTION_PROCESSING_KEY) == 0
+
+    def test_abandoned_jobs_are_requeued(self, redis):
+        abandoned = []
+        queue = IngestionQueue(
+            lambda job: None, redis=redis, max_attempts=2, on_abandoned=abandoned.append
+        )
+
+        # Taken by an instance that crashed
+        job = IngestionJob(file_id="a", user_id="u")
+        redis.zadd(REDIS_INGESTION_PROCESSING_KEY, {job.model_dump_json(): 0})
+
+        assert queue.requeue_abandoned_jobs() == 1
+        (member,) = redis.zrange(REDIS_INGESTION_QUEUE_KEY, 0, -1)
+        assert IngestionJob.model_validate_json(member).attempts == 1
+
+        # Taken and abandoned again, which reaches max_attempts
+        claimed, member = queue._next_job()
+        queue._running.clear()
+        redis.zadd(REDIS_INGESTION_PROCESSING_KEY, {member: 0})
+        assert queue.requeue_abandoned_jobs() == 0
+        assert [job.file_id for job in abandoned] == ["a"]
+        assert redis.zcard(REDIS_INGESTION_QUEUE_KEY) == 0
+        assert redis.zcard(REDIS_INGESTION_PROCESSING_KEY) == 0
@@ -0,0 +1,74 @@
+import importlib.util
+import sys
+
+import pytest
+
+from open_webui.retrieval.registry import LazyObject, LazyRegistry
+
+
+def assert_targets_exist(registry: LazyRegistry):
+    for name in registry:
+        module_name, _, attribute = registry._entries[name].partition(":")
+        assert attribute, name
+        assert importlib.util.find_spec(module_name) is not None, name
+
+
+class TestLazyRegistry:
+    def test_imports_on_first_access(self, tmp_path, monkeypatch):
+        (tmp_path / "lazy_registry_target.py").write_text("ENGINE = object()\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        monkeypatch.delitem(sys.modules, "lazy_registry_target", raising=False)
+
+        registry = LazyRegistry("engine", {"a": "lazy_registry_target:ENGINE"})
+        assert "a" in registry
+        assert list(registry) == ["a"]
+        assert "lazy_registry_target" not in sys.modules
+        assert not registry.is_loaded("a")
+
+        engine = registry["a"]
+        assert "lazy_registry_target" in sys.modules
+        assert registry.is_loaded("a")
+        assert registry.get("a") is engine
+
+    def test_unknown_name(self):
+        registry = LazyRegistry("web search engine", {})
+        assert "nope" not in registry
+        with pytest.raises(KeyError, match="Unknown web search engine: nope"):
+            registry["nope"]
+
+    def test_lazy_object(self):
+        created = []
+
+        def factory():
+            created.append(True)
+            return type("Client", (), {"name": "client"})()
+
+        client = LazyObject(factory)
+        assert created == []
+        assert client.name == "client"
+        client.name = "other"
+        assert client.name == "other"
+        assert created == [True]
+
+
+class TestRegistries:
+    def test_vector_db_clients(self):
+        from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENTS, Vector
+
+        assert_targets_exist(VECTOR_DB_CLIENTS)
+        # Unknown names fail as they did before the registry
+        with pytest.raises(ValueError, match="Unsupported vector type: nope"):
+            Vector.get_vector("nope")
+
+    def test_document_loaders(self):
+        loaders = pytest.importorskip("open_webui.retrieval.loaders.main")
+
+        assert_targets_exist(loaders.DOCUMENT_LOADERS)
+
+    def test_web_search_engines(self):
+        web = pytest.importorskip("open_webui.retrieval.web.main")
+        retrieval = pytest.importorskip("open_webui.routers.retrieval")
+
+        assert_targets_exist(web.WEB_SEARCH_ENGINES)
+        with pytest.raises(Exception, match="No search engine API key found"):
+            retrieval.search_web(None, "nope", "query")
@@ -0,0 +1,175 @@
+import pytest
+
+from open_webui.models.leaderboard import (
+    ALL_TAGS,
+    INITIAL_RATING,
+    LeaderboardPair,
+    Leaderboards,
+    add_contribution,
+    calculate_ratings,
+    get_contribution,
+)
+
+
+class TestLeaderboard:
+    def test_contribution(self):
+        assert get_contribution({"model_id": "a", "rating": 0}) is None
+        assert get_contribution({"model_id": "a", "rating": 1}) is None
+
+        contribution = get_contribution(
+            {
+                "model_id": "a",
+                "rating": "-1",
+                "sibling_model_ids": ["b", "b", "a"],
+                "tags": ["code", "", "code"],
+            }
+        )
+        assert contribution == {
+            "model_id": "a",
+            "opponent_ids": ["b"],
+            "outcome": 0,
+            "tags": ["code"],
+        }
+
+    def test_add_and_take_back(self):
+        contribution = get_contribution(
+            {"model_id": "a", "rating": 1, "sibling_model_ids": ["b"], "tags": ["x"]}
+        )
+
+        deltas = {}
+        add_contribution(deltas, contribution)
+        assert deltas[(ALL_TAGS, "a", "b")] == (1, 0)
+        assert deltas[("x", "b", "a")] == (0, 1)
+
+        add_contribution(deltas, contribution, sign=-1)
+        assert set(deltas.values()) == {(0, 0)}
+
+    def test_ratings(self):
+        ratings = calculate_ratings(
+            [("a", "b", 8), ("b", "a", 2), ("b", "c", 6), ("c", "b", 4)]
+        )
+
+        assert ratings["a"] > ratings["b"] > ratings["c"]
+        assert sum(ratings.values()) / len(ratings) == pytest.approx(INITIAL_RATING)
+
+        # Pair counts do not depend on the order feedback came in
+        assert calculate_ratings(
+            [("c", "b", 4), ("b", "c", 6), ("b", "a", 2), ("a", "b", 8)]
+        ) == pytest.approx(ratings)
+
+    def test_unbeaten_model_is_finite(self):
+        ratings = calculate_ratings([("a", "b", 5), ("b", "a", 0)])
+        assert INITIAL_RATING < ratings["a"] < INITIAL_RATING + 1000
+
+
+class TestWriteDeltas:
+    @pytest.fixture
+    def db(self):
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import Session
+
+        engine = create_engine("sqlite://")
+        LeaderboardPair.__table__.create(engine)
+        with Session(engine) as db:
+            yield db
+
+    def get_pairs(self, db):
+        return {
+            (pair.tag, pair.model_id, pair.opponent_id): (pair.won, pair.lost)
+            for pair in db.query(LeaderboardPair).all()
+        }
+
+    def test_upserts_and_drops_empty_pairs(self, db):
+        Leaderboards._write_deltas(
+            db, {(ALL_TAGS, "a", "b"): (1, 0), (ALL_TAGS, "b", "a"): (0, 1)}
+        )
+        Leaderboards._write_deltas(
+            db,
+            {
+                (ALL_TAGS, "a", "b"): (2, 1),
+                ("x", "a", "b"): (1, 0),
+                ("x", "b", "a"): (0, 0),
+            },
+        )
+        assert self.get_pairs(db) == {
+            (ALL_TAGS, "a", "b"): (3, 1),
+            (ALL_TAGS, "b", "a"): (0, 1),
+            ("x", "a", "b"): (1, 0),
+        }
+
+        Leaderboards._write_deltas(db, {(ALL_TAGS, "b", "a"): (0, -1)})
+        assert (ALL_TAGS, "b", "a") not in self.get_pairs(db)
+
+
+class TestModelTags:
+    def test_most_common_tags(self, monkeypatch):
+        from contextlib import contextmanager
+
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import Session
+
+        from open_webui.models import leaderboard
+
+        engine = create_engine("sqlite://")
+        leaderboard.LeaderboardFeedback.__table__.create(engine)
+
+        @contextmanager
+        def get_db():
+            with Session(engine) as db:
+                yield db
+
+        monkeypatch.setattr(leaderboard, "get_db", get_db)
+        with get_db() as db:
+            for i, (model_id, tags) in enumerate(
+                [("a", ["code", "math"]), ("a", ["code"]), ("a", None), ("b", ["x"])]
+            ):
+                db.add(
+                    leaderboard.LeaderboardFeedback(
+                        feedback_id=str(i), model_id=model_id, tags=tags
+                    )
+                )
+            db.commit()
+
+        assert [
+            (item.tag, item.count) for item in Leaderboards.get_model_tags("a")
+        ] == [("code", 2), ("math", 1)]
+        assert Leaderboards.get_model_tags("a", limit=1)[0].tag == "code"
+        assert Leaderboards.get_model_tags("c") == []
+
+
+class TestLeaderboardMigration:
+    def test_backfill_matches_app(self):
+        import importlib.util
+        from pathlib import Path
+
+        import open_webui
+
+        path = (
+            Path(open_webui.__file__).parent
+            / "migrations/versions/b2c4e6f8a0d1_add_leaderboard_tables.py"
+        )
+        spec = importlib.util.spec_from_file_location("leaderboard_migration", path)
+        migration = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(migration)
+
+        feedbacks = [
+            {"model_id": "a", "rating": 1, "sibling_model_ids": ["b", "c"]},
+            {
+                "model_id": "b",
+                "rating": "-1",
+                "sibling_model_ids": ["a", "b"],
+                "tags": ["code", "", "code"],
+            },
+            {"model_id": "c", "rating": 0, "sibling_model_ids": ["a"]},
+            None,
+        ]
+
+        app_deltas, migration_deltas = {}, {}
+        for data in feedbacks:
+            contribution = get_contribution(data)
+            assert migration.get_contribution(data) == contribution
+            if contribution:
+                add_contribution(app_deltas, contribution)
+                migration.add_contribution(migration_deltas, contribution)
+
+        assert migration_deltas == app_deltas
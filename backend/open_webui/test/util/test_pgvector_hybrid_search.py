@@ -0,0 +1,174 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+
+pgvector = pytest.importorskip("open_webui.retrieval.vector.dbs.pgvector")
+
+
+class FakeSession:
+    def __init__(self, rows=None, scalar=None):
+        self.rows = rows or []
+        self.scalar_value = scalar
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        self.statements.append((str(statement), params))
+        return self
+
+    def all(self):
+        return self.rows
+
+    def scalar(self):
+        return self.scalar_value
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def make_client(session):
+    client = pgvector.PgvectorClient.__new__(pgvector.PgvectorClient)
+    client.SessionLocal = lambda: session
+    client.hybrid_search_enabled = True
+    return client
+
+
+class TestHybridSearchSQL:
+    def test_binds_every_parameter(self):
+        session = FakeSession()
+        make_client(session).hybrid_search("kb", "what is rag", [0.1, 0.2], 5)
+
+        (_, params), *_ = session.statements
+        assert set(text(pgvector.HYBRID_SEARCH_SQL)._bindparams) == set(params)
+
+    def test_fuses_both_signals(self):
+        sql = pgvector.HYBRID_SEARCH_SQL
+
+        assert "FULL OUTER JOIN text_hits" in sql
+        assert "text_tsv @@ ts.query" in sql
+        # Query terms are OR-ed like BM25 instead of all being required
+        assert "'&',\n            '|'" in sql
+
+    @pytest.mark.parametrize(
+        "bm25_weight, vector_limit, text_limit",
+        [(0.0, 5, 0), (0.5, 5, 5), (1.0, 0, 5), (2.0, 0, 5)],
+    )
+    def test_weights_limit_signals(self, bm25_weight, vector_limit, text_limit):
+        session = FakeSession()
+        make_client(session).hybrid_search(
+            "kb", "query", [0.1], 5, bm25_weight=bm25_weight
+        )
+
+        (_, params), *_ = session.statements
+        assert params["vector_limit"] == vector_limit
+        assert params["text_limit"] == text_limit
+        assert params["bm25_weight"] == min(bm25_weight, 1.0)
+        assert params["vector_weight"] == 1.0 - min(bm25_weight, 1.0)
+        assert params["rrf_k"] == pgvector.HYBRID_SEARCH_RRF_K
+
+    def test_result_keeps_fused_order(self):
+        rows = [
+            SimpleNamespace(id="b", text="B", vmetadata={"n": 2}, score=0.03),
+            SimpleNamespace(id="a", text="A", vmetadata={"n": 1}, score=0.01),
+        ]
+        result = make_client(FakeSession(rows)).hybrid_search("kb", "q", [0.1], 2)
+
+        assert result.ids == [["b", "a"]]
+        assert result.documents == [["B", "A"]]
+        assert result.metadatas == [[{"n": 2}, {"n": 1}]]
+        assert result.distances == [[0.03, 0.01]]
+
+
+class TestTextSearchIndex:
+    def test_existing_column_is_not_altered(self):
+        session = FakeSession(scalar=1)
+        make_client(session)._ensure_text_search_index(session)
+
+        assert not any("ALTER TABLE" in sql for sql, _ in session.statements)
+        assert any(
+            "idx_document_chunk_text_tsv" in sql for sql, _ in session.statements
+        )
+
+    def test_missing_column_is_added(self):
+        session = FakeSession(scalar=None)
+        make_client(session)._ensure_text_search_index(session)
+
+        assert any(
+            "ADD COLUMN IF NOT EXISTS text_tsv" in sql for sql, _ in session.statements
+        )
+
+
+class TestNativeHybridSearchSelection:
+    @pytest.fixture
+    def retrieval(self, monkeypatch):
+        utils = pytest.importorskip("open_webui.retrieval.utils")
+        calls = {"native": [], "bm25": [], "iter_items": []}
+
+        class Client:
+            supported = True
+
+            def supports_hybrid_search(self):
+                return self.supported
+
+            def iter_items(self, collection_name, **kwargs):
+                calls["iter_items"].append(collection_name)
+                yield utils.GetResult(
+                    ids=[["1"]], documents=[["doc"]], metadatas=[[{}]]
+                )
+
+        async def native(collection_name, query, **kwargs):
+            calls["native"].append((collection_name, query))
+            return {"distances": [[0.5]], "documents": [["n"]], "metadatas": [[{}]]}
+
+        async def bm25(collection_name, collection_result, query, **kwargs):
+            calls["bm25"].append((collection_name, query))
+            return {"distances": [[0.5]], "documents": [["b"]], "metadatas": [[{}]]}
+
+        client = Client()
+        monkeypatch.setattr(utils, "VECTOR_DB_CLIENT", client)
+        monkeypatch.setattr(utils, "query_doc_with_native_hybrid_search", native)
+        monkeypatch.setattr(utils, "query_doc_with_hybrid_search", bm25)
+        return utils, client, calls
+
+    async def search(self, utils, **kwargs):
+        return await utils.query_collection_with_hybrid_search(
+            collection_names=["kb-1", "kb-2"],
+            queries=["q"],
+            embedding_function=None,
+            k=3,
+            reranking_function=None,
+            k_reranker=3,
+            r=0.0,
+            hybrid_bm25_weight=0.5,
+            **kwargs,
+        )
+
+    @pytest.mark.asyncio
+    async def test_native_search_skips_loading_collections(self, retrieval):
+        utils, _, calls = retrieval
+        await self.search(utils)
+
+        assert sorted(calls["native"]) == [("kb-1", "q"), ("kb-2", "q")]
+        assert calls["bm25"] == []
+        assert calls["iter_items"] == []
+
+    @pytest.mark.asyncio
+    async def test_unsupported_backend_uses_bm25(self, retrieval):
+        utils, client, calls = retrieval
+        client.supported = False
+        await self.search(utils)
+
+        assert calls["native"] == []
+        assert sorted(calls["bm25"]) == [("kb-1", "q"), ("kb-2", "q")]
+        assert calls["iter_items"] == ["kb-1", "kb-2"]
+
+    @pytest.mark.asyncio
+    async def test_enriched_texts_use_bm25(self, retrieval):
+        utils, _, calls = retrieval
+        await self.search(utils, enable_enriched_texts=True)
+
+        assert calls["native"] == []
+        assert len(calls["bm25"]) == 2
@@ -0,0 +1,98 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+pgvector = pytest.importorskip("open_webui.retrieval.vector.dbs.pgvector")
+
+
+class FakeSession:
+    def __init__(self, error=None):
+        self.error = error
+        self.executed = []
+        self.committed = False
+        self.rolled_back = False
+        self.closed = False
+
+    def execute(self, statement, params=None):
+        if self.error:
+            raise self.error
+        self.executed.append((statement, params))
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+    def close(self):
+        self.closed = True
+
+
+def make_client(sessions):
+    client = pgvector.PgvectorClient.__new__(pgvector.PgvectorClient)
+    client.SessionLocal = lambda: sessions.append(FakeSession()) or sessions[-1]
+    return client
+
+
+def make_items(*ids):
+    return [
+        {"id": id, "vector": [0.1], "text": f"text {id}", "metadata": {"n": i}}
+        for i, id in enumerate(ids)
+    ]
+
+
+def compile_sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestWrites:
+    def test_insert_is_one_batched_statement(self):
+        sessions = []
+        make_client(sessions).insert("kb", make_items("a", "b", "c"))
+
+        assert len(sessions) == 1
+        ((statement, rows),) = sessions[0].executed
+        assert [row["chunk_id"] for row in rows] == ["a", "b", "c"]
+        assert {row["chunk_collection_name"] for row in rows} == {"kb"}
+        assert sessions[0].committed and sessions[0].closed
+
+    def test_insert_does_not_ignore_conflicts(self):
+        sessions = []
+        make_client(sessions).insert("kb", make_items("a", "a"))
+
+        ((statement, rows),) = sessions[0].executed
+        assert "ON CONFLICT" not in compile_sql(statement)
+        # Duplicates reach the database, which rejects them
+        assert [row["chunk_id"] for row in rows] == ["a", "a"]
+
+    def test_upsert_updates_and_keeps_last_duplicate(self):
+        sessions = []
+        make_client(sessions).upsert("kb", make_items("a", "b", "a"))
+
+        ((statement, rows),) = sessions[0].executed
+        assert "ON CONFLICT (id) DO UPDATE" in compile_sql(statement)
+        assert [(row["chunk_id"], row["chunk_text"]) for row in rows] == [
+            ("a", "text a"),
+            ("b", "text b"),
+        ]
+        assert rows[0]["chunk_metadata"] == {"n": 2}
+
+    def test_each_operation_gets_its_own_session(self):
+        sessions = []
+        client = make_client(sessions)
+        client.insert("kb", make_items("a"))
+        client.upsert("kb", make_items("a"))
+        client.insert("kb", [])
+
+        assert len(sessions) == 2
+        assert all(session.closed for session in sessions)
+
+    def test_failed_write_rolls_back_and_raises(self):
+        session = FakeSession(error=RuntimeError("duplicate key"))
+        client = pgvector.PgvectorClient.__new__(pgvector.PgvectorClient)
+        client.SessionLocal = lambda: session
+
+        with pytest.raises(RuntimeError, match="duplicate key"):
+            client.insert("kb", make_items("a"))
+
+        assert session.rolled_back and session.closed
+        assert not session.committed
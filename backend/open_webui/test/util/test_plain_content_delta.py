@@ -0,0 +1,35 @@
+import json
+
+from open_webui.utils.misc import get_plain_content_delta
+
+
+def chunk(delta: dict, **fields) -> bytes:
+    event = {"choices": [{"index": 0, "delta": delta}], **fields}
+    return f"data: {json.dumps(event)}".encode()
+
+
+class TestGetPlainContentDelta:
+    def test_text_deltas(self):
+        data, value = get_plain_content_delta(chunk({"content": "Hi"}))
+        assert value == "Hi"
+        assert data["choices"][0]["delta"] == {"content": "Hi"}
+
+        line = chunk({"role": "assistant", "content": "Hi", "tool_calls": None})
+        assert get_plain_content_delta(line)[1] == "Hi"
+        assert get_plain_content_delta(chunk({"content": "Hi"}, usage=None))
+        assert get_plain_content_delta(chunk({"content": "Hi"}).decode())
+
+    def test_other_lines(self):
+        for line in [
+            b"",
+            b": keep-alive",
+            b"data: [DONE]",
+            b"data: {}",
+            chunk({"content": ""}),
+            chunk({"role": "assistant"}),
+            chunk({"content": "Hi", "reasoning_content": "Hmm"}),
+            chunk({"tool_calls": [{"index": 0}]}),
+            chunk({"content": "Hi"}, usage={"total_tokens": 1}),
+            chunk({"content": "Hi"}, selected_model_id="a"),
+        ]:
+            assert get_plain_content_delta(line) is None
@@ -0,0 +1,177 @@
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+from open_webui.utils import plugin
+
+
+@pytest.fixture
+def pip(monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr(
+        plugin.sysconfig, "get_paths", lambda: {"purelib": str(tmp_path)}
+    )
+    monkeypatch.setattr(plugin, "are_requirements_satisfied", lambda req_list: False)
+    monkeypatch.setattr(
+        plugin.subprocess, "check_call", lambda args: calls.append(args)
+    )
+    return calls
+
+
+def marker_for(requirements):
+    return plugin.get_requirements_marker_path(
+        plugin.get_requirements_hash(plugin.get_requirements_list(requirements))
+    )
+
+
+def function_content(requirements):
+    return (
+        f'"""\ntitle: Test\nrequirements: {requirements}\n"""\n'
+        f"import {requirements}\n\n"
+        "class Pipe:\n"
+        "    pass\n"
+    )
+
+
+class TestInstallFrontmatterRequirements:
+    def test_marker_lives_in_site_packages(self, pip, tmp_path):
+        marker = marker_for("requests")
+
+        assert marker.parent == tmp_path / ".open_webui_requirements"
+
+    def test_unchanged_requirements_skip_pip(self, pip):
+        plugin.install_frontmatter_requirements("requests, numpy")
+
+        assert len(pip) == 1
+        assert pip[0][-2:] == ["requests", "numpy"]
+        assert marker_for("requests, numpy").exists()
+
+        plugin.install_frontmatter_requirements("requests, numpy")
+        # Order and duplicates don't change the manifest
+        plugin.install_frontmatter_requirements("numpy, requests, numpy")
+
+        assert len(pip) == 1
+
+    def test_changed_requirements_reinstall(self, pip):
+        plugin.install_frontmatter_requirements("requests")
+        plugin.install_frontmatter_requirements("requests>=2.32")
+
+        assert len(pip) == 2
+        assert pip[1][-1] == "requests>=2.32"
+        assert marker_for("requests").exists()
+        assert marker_for("requests>=2.32").exists()
+
+    def test_changed_pip_options_reinstall(self, pip, monkeypatch):
+        plugin.install_frontmatter_requirements("requests")
+        monkeypatch.setattr(plugin, "PIP_OPTIONS", ["--upgrade"])
+        plugin.install_frontmatter_requirements("requests")
+
+        assert len(pip) == 2
+        assert "--upgrade" in pip[1]
+
+    def test_satisfied_requirements_skip_pip(self, pip, monkeypatch):
+        monkeypatch.setattr(plugin, "are_requirements_satisfied", lambda req_list: True)
+        plugin.install_frontmatter_requirements("requests")
+
+        assert pip == []
+        assert marker_for("requests").exists()
+
+    def test_failed_install_writes_no_marker(self, pip, monkeypatch):
+        def fail(args):
+            raise plugin.subprocess.CalledProcessError(1, args)
+
+        monkeypatch.setattr(plugin.subprocess, "check_call", fail)
+        with pytest.raises(plugin.subprocess.CalledProcessError):
+            plugin.install_frontmatter_requirements("requests")
+
+        assert not marker_for("requests").exists()
+
+
+class TestBackgroundInstall:
+    @pytest.fixture
+    def functions(self, monkeypatch):
+        updates = []
+        monkeypatch.setattr(
+            plugin.Functions,
+            "update_function_by_id",
+            lambda id, data: updates.append((id, data)),
+        )
+        monkeypatch.setattr(
+            plugin, "install_frontmatter_requirements", lambda requirements: None
+        )
+        return updates
+
+    def test_flag_is_cleared_while_installing(self, monkeypatch):
+        seen = []
+        monkeypatch.setattr(plugin.Functions, "get_functions", lambda active_only: [])
+        monkeypatch.setattr(plugin.Tools, "get_tools", lambda: [])
+        monkeypatch.setattr(
+            plugin,
+            "install_frontmatter_requirements",
+            lambda requirements: seen.append(
+                plugin.PLUGIN_DEPENDENCIES_INSTALLED.is_set()
+            ),
+        )
+
+        plugin.install_tool_and_function_dependencies()
+
+        assert seen == [False]
+        assert plugin.PLUGIN_DEPENDENCIES_INSTALLED.is_set()
+
+    @pytest.fixture
+    def install_later(self, monkeypatch):
+        """Clears the install flag, then installs the dependency shortly after."""
+        installed = threading.Event()
+        monkeypatch.setattr(plugin, "PLUGIN_DEPENDENCIES_INSTALLED", installed)
+
+        def install():
+            time.sleep(0.05)
+            monkeypatch.setitem(
+                sys.modules,
+                "open_webui_late_dependency",
+                types.ModuleType("open_webui_late_dependency"),
+            )
+            installed.set()
+
+        threading.Thread(target=install).start()
+
+    def test_missing_import_waits_for_install(self, functions, install_later):
+        _, function_type, _ = plugin.load_function_module_by_id(
+            "late", function_content("open_webui_late_dependency")
+        )
+
+        assert function_type == "pipe"
+        assert functions == []
+
+    def test_tools_wait_for_install(self, functions, install_later):
+        tools, _ = plugin.load_tool_module_by_id(
+            "late", "import open_webui_late_dependency\n\nclass Tools:\n    pass\n"
+        )
+
+        assert type(tools).__name__ == "Tools"
+
+    def test_missing_import_during_install_keeps_function_active(
+        self, functions, monkeypatch
+    ):
+        monkeypatch.setattr(plugin, "PLUGIN_DEPENDENCIES_INSTALLED", threading.Event())
+        monkeypatch.setattr(plugin, "PLUGIN_DEPENDENCIES_WAIT_TIMEOUT", 0.01)
+
+        with pytest.raises(Exception, match="still being installed"):
+            plugin.load_function_module_by_id(
+                "pending", function_content("open_webui_missing_dependency")
+            )
+
+        assert functions == []
+
+    def test_missing_import_after_install_deactivates_function(self, functions):
+        assert plugin.PLUGIN_DEPENDENCIES_INSTALLED.is_set()
+
+        with pytest.raises(ImportError):
+            plugin.load_function_module_by_id(
+                "broken", function_content("open_webui_missing_dependency")
+            )
+
+        assert functions == [("broken", {"is_active": False})]
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from open_webui.retrieval.models.worker import RerankingWorker
+
+
+class LengthModel:
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, sentences, **kwargs):
+        self.calls.append(len(sentences))
+        return [float(len(document)) for _, document in sentences]
+
+
+class TestRerankingWorker:
+    @pytest.mark.asyncio
+    async def test_merges_concurrent_requests(self):
+        model = LengthModel()
+        worker = RerankingWorker(model, max_batch_pairs=64, batch_wait_ms=50)
+
+        results = await asyncio.gather(
+            worker.apredict([("q1", "a"), ("q1", "bb")]),
+            worker.apredict([("q2", "ccc")]),
+        )
+        worker.close()
+
+        assert [list(scores) for scores in results] == [[1.0, 2.0], [3.0]]
+        assert model.calls == [3]
+
+    @pytest.mark.asyncio
+    async def test_caps_pairs_per_call(self):
+        model = LengthModel()
+        worker = RerankingWorker(model, max_batch_pairs=2, batch_wait_ms=0)
+
+        scores = await worker.apredict([("q", "a" * i) for i in range(1, 6)])
+        worker.close()
+
+        assert list(scores) == [1.0, 2.0, 3.0, 4.0, 5.0]
+        assert model.calls == [2, 2, 1]
+
+    @pytest.mark.asyncio
+    async def test_unmerged_requests_and_errors(self):
+        model = LengthModel()
+        worker = RerankingWorker(model, batch_wait_ms=50, merge_requests=False)
+
+        results = await asyncio.gather(
+            worker.apredict([("q1", "a")]), worker.apredict([("q2", "bb")])
+        )
+        assert results == [[1.0], [2.0]]
+        assert model.calls == [1, 1]
+
+        model.predict = lambda sentences, **kwargs: 1 / 0
+        with pytest.raises(ZeroDivisionError):
+            await worker.apredict([("q", "a")])
+        worker.close()
+
+        with pytest.raises(RuntimeError):
+            worker.predict([("q", "a")])
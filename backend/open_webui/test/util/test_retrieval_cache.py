@@ -0,0 +1,150 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from open_webui.retrieval import cache as cache_module
+from open_webui.retrieval.cache import RetrievalResultCache, TTLCache
+
+
+class TestRetrievalResultCache:
+    def test_normalized_query_hits(self):
+        cache = RetrievalResultCache(size=4, ttl=60)
+        result = {"documents": [["a"]], "metadatas": [[{"file_id": "1"}]]}
+
+        cache.set(cache.get_key(["kb"], ["What is  RAG?"], k=3), result)
+
+        assert cache.get(cache.get_key(["kb"], ["what is rag?"], k=3)) == result
+        assert cache.get(cache.get_key(["kb"], ["what is rag?"], k=4)) is None
+
+    def test_invalidate(self):
+        cache = RetrievalResultCache(size=4, ttl=60)
+        cache.set(cache.get_key(["kb", "other"], ["q"]), {"documents": []})
+        cache.set(cache.get_key(["unrelated"], ["q"]), {"documents": []})
+
+        cache.invalidate("kb")
+
+        assert cache.get(cache.get_key(["kb", "other"], ["q"])) is None
+        assert cache.get(cache.get_key(["unrelated"], ["q"])) is not None
+
+        cache.invalidate_all()
+        assert cache.get(cache.get_key(["unrelated"], ["q"])) is None
+
+    def test_lru_eviction(self):
+        cache = RetrievalResultCache(size=2, ttl=60)
+        for query in ("a", "b", "c"):
+            cache.set(cache.get_key(["kb"], [query]), {"query": query})
+
+        assert cache.get(cache.get_key(["kb"], ["a"])) is None
+        assert cache.get(cache.get_key(["kb"], ["c"])) == {"query": "c"}
+
+
+class TestTTLCache:
+    def test_expiry_and_copies(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+
+        cache = TTLCache(size=4, ttl=60)
+        value = [{"link": "https://a"}]
+        cache.set("q", value)
+        value[0]["link"] = "changed"
+
+        assert cache.get("q") == [{"link": "https://a"}]
+
+        now[0] += 61
+        assert cache.get("q") is None
+
+    def test_disabled(self):
+        assert not TTLCache(size=0, ttl=60).enabled
+        assert not TTLCache(size=4, ttl=0).enabled
+
+
+class TestAsyncAccess:
+    @pytest.fixture
+    def redis(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        return fakeredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
+
+    @pytest.fixture
+    def threads(self, monkeypatch):
+        calls = []
+        to_thread = asyncio.to_thread
+
+        async def record(func, *args):
+            calls.append(func.__name__)
+            return await to_thread(func, *args)
+
+        monkeypatch.setattr(cache_module.asyncio, "to_thread", record)
+        return calls
+
+    @pytest.mark.asyncio
+    async def test_redis_is_read_off_the_event_loop(self, threads, redis):
+        cache = RetrievalResultCache(size=4, ttl=60, redis=redis)
+
+        key = await cache.aget_key(["kb"], ["q"], k=3)
+        assert key == cache.get_key(["kb"], ["q"], k=3)
+        assert await cache.aget(key) is None
+
+        await cache.aset(key, {"documents": [["a"]]})
+        assert threads == ["_get_versions", "_get_remote", "_set_remote"]
+
+        # Another node sees the shared entry
+        other = RetrievalResultCache(size=4, ttl=60, redis=redis)
+        assert await other.aget(key) == {"documents": [["a"]]}
+
+        other.invalidate("kb")
+        assert await cache.aget_key(["kb"], ["q"], k=3) != key
+
+    @pytest.mark.asyncio
+    async def test_local_hits_stay_on_the_event_loop(self, threads):
+        cache = RetrievalResultCache(size=4, ttl=60)
+
+        key = await cache.aget_key(["kb"], ["q"])
+        await cache.aset(key, {"documents": []})
+
+        assert await cache.aget(key) == {"documents": []}
+        assert threads == []
+
+    @pytest.mark.asyncio
+    async def test_web_search_results(self, threads, redis, monkeypatch):
+        retrieval = pytest.importorskip("open_webui.routers.retrieval")
+        from open_webui.retrieval.web.main import SearchResult
+
+        searches = []
+
+        def search_web(request, engine, query, user=None):
+            searches.append(query)
+            return [SearchResult(link="https://a", title="A", snippet=None)]
+
+        monkeypatch.setattr(retrieval, "search_web", search_web)
+        monkeypatch.setattr(
+            retrieval,
+            "WEB_SEARCH_RESULT_CACHE",
+            TTLCache(size=4, ttl=60, redis=redis),
+        )
+        config = SimpleNamespace(
+            WEB_SEARCH_RESULT_COUNT=3, WEB_SEARCH_DOMAIN_FILTER_LIST=[]
+        )
+        request = SimpleNamespace(
+            app=SimpleNamespace(state=SimpleNamespace(config=config))
+        )
+
+        first = await retrieval.search_web_with_cache(request, "searxng", "Open  WebUI")
+        second = await retrieval.search_web_with_cache(request, "searxng", "open webui")
+
+        assert (
+            first == second == [SearchResult(link="https://a", title="A", snippet=None)]
+        )
+        assert searches == ["Open  WebUI"]
+        assert threads == ["_get_remote", "_set_remote"]
+
+
+class TestRetrievalResultCacheSetup:
+    def test_disabled_for_workers_without_redis(self, monkeypatch):
+        monkeypatch.setattr(cache_module, "REDIS_URL", "")
+        monkeypatch.setattr(cache_module, "RAG_RESULT_CACHE_SIZE", 512)
+        monkeypatch.setattr(cache_module, "UVICORN_WORKERS", 4)
+        assert not cache_module.get_retrieval_result_cache().enabled
+
+        monkeypatch.setattr(cache_module, "UVICORN_WORKERS", 1)
+        assert cache_module.get_retrieval_result_cache().enabled
@@ -0,0 +1,41 @@
+import os
+
+from open_webui.utils.audio import SpeechCache
+
+
+class TestSpeechCache:
+    def test_entries_of_other_workers(self, tmp_path):
+        cache = SpeechCache(tmp_path, 0)
+        other = SpeechCache(tmp_path, 0)
+
+        path = other.put_stream("a", iter([b"ID3", b"audio"]))
+        assert path.name == "a.mp3"
+        assert cache.get("a") == path
+        assert cache.read("a") == b"ID3audio"
+        assert cache.get("b") is None
+
+    def test_eviction_counts_directory(self, tmp_path):
+        other = SpeechCache(tmp_path, 0)
+        for i, key in enumerate(["a", "b"]):
+            path = other.put(key, b"x" * 10)
+            os.utime(path, (i, i))
+
+        cache = SpeechCache(tmp_path, 25)
+        cache.put("c", b"x" * 10)
+
+        assert cache.get("a") is None
+        assert cache.get("b") and cache.get("c")
+
+    def test_failed_write_leaves_no_entry(self, tmp_path):
+        cache = SpeechCache(tmp_path, 0)
+
+        def chunks():
+            yield b"ID3"
+            raise OSError("connection reset")
+
+        try:
+            cache.put_stream("a", chunks())
+        except OSError:
+            pass
+        assert cache.get("a") is None
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,28 @@
+from open_webui.utils.misc import SSELineSplitter
+
+
+def split(chunks, max_line_size=None):
+    splitter = SSELineSplitter(max_line_size)
+    lines = [line for chunk in chunks for line in splitter.feed(chunk)]
+    return lines + splitter.flush()
+
+
+class TestSSELineSplitter:
+    def test_lines_split_across_chunks(self):
+        stream = b'data: {"a": 1}\n\ndata: {"b": 2}\ndata: [DONE]'
+        expected = [b'data: {"a": 1}', b"", b'data: {"b": 2}', b"data: [DONE]"]
+
+        assert split([stream]) == expected
+        assert split([stream[i : i + 1] for i in range(len(stream))]) == expected
+        assert split([stream[:5], stream[5:17], stream[17:]]) == expected
+
+    def test_oversized_lines_are_skipped(self):
+        big = b"data: " + b"x" * 100
+        stream = b"data: 1\n" + big + b"\n" + big + b"\ndata: 2\n" + big
+
+        expected = [b"data: 1", b"data: {}", b"data: {}", b"data: 2", b"data: {}"]
+        assert split([stream], 20) == expected
+        # Detected while the line is still pending, the rest of it is dropped
+        assert split([stream[i : i + 7] for i in range(0, len(stream), 7)], 20) == (
+            expected
+        )
@@ -0,0 +1,132 @@
+import time
+
+from open_webui.models.usage import get_rollup_deltas, new_usage_event
+from open_webui.utils.usage import UsageLedgerWriter
+
+
+def make_event(user_id="user-1", created_at=90000, cost=0.5):
+    return new_usage_event(
+        user_id=user_id,
+        model_id="model-1",
+        usage={
+            "prompt_tokens": 10,
+            "completion_tokens": 5,
+            "completion_tokens_details": {"reasoning_tokens": 2},
+            "total_tokens": 17,
+            "cost": {"currency": "CNY", "billing_type": "per_token", "total": cost},
+        },
+        created_at=created_at,
+    )
+
+
+class TestUsageRollups:
+    def test_event_from_usage(self):
+        event = make_event()
+        assert event.reasoning_tokens == 2
+        assert event.billing_type == "per_token"
+        assert event.cost == 0.5
+
+    def test_rollup_deltas(self):
+        deltas = get_rollup_deltas(
+            [make_event(), make_event(created_at=90000 + 3600)],
+            {"user-1": ["group-1"]},
+        )
+
+        day = deltas[("day", 86400, "user", "user-1", "model-1")]
+        assert day["requests"] == 2
+        assert day["total_tokens"] == 34
+        assert day["cost"] == 1.0
+
+        assert deltas[("hour", 90000, "user", "user-1", "model-1")]["requests"] == 1
+        assert deltas[("hour", 93600, "group", "group-1", "model-1")]["requests"] == 1
+        # One day and two hours, for the user and for the group
+        assert len(deltas) == 6
+
+
+class TestUsageLedgerWriter:
+    def test_flushes_in_batches(self):
+        batches = []
+        writer = UsageLedgerWriter(
+            writer=lambda events: batches.append(len(events)),
+            flush_interval_ms=10_000,
+            batch_size=2,
+        )
+        writer.start()
+        for _ in range(5):
+            writer.record(make_event())
+
+        deadline = time.monotonic() + 5
+        while sum(batches) < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        writer.stop()
+
+        assert batches == [2, 2, 1]
+
+    def test_keeps_events_when_write_fails(self):
+        written = []
+
+        def write(events):
+            if not written:
+                written.append(None)
+                raise Exception("database is locked")
+            written.extend(events)
+
+        writer = UsageLedgerWriter(writer=write, batch_size=10)
+        writer.record(make_event())
+        writer.record(make_event())
+
+        assert writer.flush() == 0
+        assert writer.flush() == 2
+        assert len(written) == 3
+
+    def test_drops_events_beyond_max_pending(self):
+        writer = UsageLedgerWriter(writer=lambda events: None, max_pending=3)
+        for _ in range(5):
+            writer.record(make_event())
+
+        assert writer.dropped == 2
+        assert writer.flush() == 3
+
+    def test_dead_letters_rejected_events(self, tmp_path):
+        written = []
+
+        def write(events):
+            if any(event.user_id == "bad" for event in events):
+                raise Exception("value too long")
+            written.extend(events)
+
+        dead_letter_path = tmp_path / "dead_letter.jsonl"
+        writer = UsageLedgerWriter(
+            writer=write,
+            batch_size=10,
+            max_attempts=2,
+            dead_letter_path=str(dead_letter_path),
+        )
+        for user_id in ("a", "bad", "b", "c"):
+            writer.record(make_event(user_id=user_id))
+
+        assert writer.flush() == 0
+        assert not dead_letter_path.exists()
+        # The second failure splits the batch and sets the bad event aside
+        assert writer.flush() == 4
+        assert [event.user_id for event in written] == ["a", "b", "c"]
+
+        lines = dead_letter_path.read_text().splitlines()
+        assert len(lines) == 1 and '"user_id":"bad"' in lines[0]
+        assert writer.flush() == 0
+
+    def test_keeps_batch_while_database_is_down(self, tmp_path):
+        def write(events):
+            raise Exception("connection refused")
+
+        dead_letter_path = tmp_path / "dead_letter.jsonl"
+        writer = UsageLedgerWriter(
+            writer=write, max_attempts=1, dead_letter_path=str(dead_letter_path)
+        )
+        writer.record(make_event())
+        writer.record(make_event())
+
+        assert writer.flush() == 0
+        assert writer.flush() == 0
+        assert len(writer._retry) == 2
+        assert not dead_letter_path.exists()
@@ -0,0 +1,235 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from open_webui.retrieval.vector.main import GetResult, project_get_result
+
+IDS = [str(uuid.UUID(int=i)) for i in range(1, 6)]
+
+
+def make_items():
+    return [
+        {
+            "id": id,
+            "text": f"text {i}",
+            "vector": [float(i), 1.0],
+            "metadata": {"file_id": "even" if i % 2 == 0 else "odd"},
+        }
+        for i, id in enumerate(IDS)
+    ]
+
+
+def flatten(batches, field):
+    return [value for batch in batches for value in getattr(batch, field)[0]]
+
+
+class TestProjectGetResult:
+    def test_keeps_included_fields(self):
+        result = GetResult(
+            ids=[["a", "b"]],
+            documents=[["A", "B"]],
+            metadatas=[[{}, {}]],
+            vectors=[[[1.0], [2.0]]],
+        )
+
+        projected = project_get_result(result, ["ids", "documents"])
+        assert projected.ids == [["a", "b"]]
+        assert projected.documents == [["A", "B"]]
+        assert projected.metadatas is None
+        assert projected.vectors is None
+
+        # Vectors are only returned when asked for
+        assert project_get_result(result).vectors is None
+        assert project_get_result(result).metadatas == [[{}, {}]]
+
+    def test_slices(self):
+        result = GetResult(ids=[["a", "b", "c"]], documents=None, metadatas=None)
+
+        assert project_get_result(result, ["ids"], 1, 1).ids == [["b"]]
+        assert project_get_result(result, ["ids"], 2, 5).ids == [["c"]]
+        assert project_get_result(result, ["ids"], limit=2).ids == [["a", "b"]]
+        assert project_get_result(None) is None
+
+
+class TestPgvectorPagination:
+    @pytest.fixture
+    def client(self):
+        pgvector = pytest.importorskip("open_webui.retrieval.vector.dbs.pgvector")
+        from sqlalchemy.dialects import postgresql
+
+        rows = sorted(make_items(), key=lambda item: item["id"])
+        queries = []
+
+        class Session:
+            def execute(self, statement):
+                compiled = statement.compile(dialect=postgresql.dialect())
+                queries.append(compiled)
+                after_id = compiled.params.get("id_1")
+                limit = compiled.params.get("param_1")
+                matches = [
+                    SimpleNamespace(
+                        id=row["id"], text=row["text"], vmetadata=row["metadata"]
+                    )
+                    for row in rows
+                    if after_id is None or row["id"] > after_id
+                ]
+                return SimpleNamespace(all=lambda: matches[:limit])
+
+            def rollback(self):
+                pass
+
+            def close(self):
+                pass
+
+        client = pgvector.PgvectorClient.__new__(pgvector.PgvectorClient)
+        client.SessionLocal = Session
+        return client, queries
+
+    def test_iter_items_uses_keyset_pages(self, client):
+        client, queries = client
+        batches = list(client.iter_items("kb", batch_size=2))
+
+        assert [len(batch.ids[0]) for batch in batches] == [2, 2, 1]
+        assert flatten(batches, "ids") == IDS
+        # Every page after the first continues from the last id it saw
+        assert [query.params.get("id_1") for query in queries] == [
+            None,
+            IDS[1],
+            IDS[3],
+        ]
+        assert all("ORDER BY document_chunk.id" in str(query) for query in queries)
+        assert all("vector" not in str(query).split("FROM")[0] for query in queries)
+
+    def test_get_items_projects_and_limits(self, client):
+        client, queries = client
+        result = client.get_items("kb", include=["documents"], limit=2)
+
+        assert result.ids is None
+        assert result.documents == [["text 0", "text 1"]]
+        assert "vmetadata" not in str(queries[0]).split("FROM")[0]
+
+
+class TestChromaPagination:
+    @pytest.fixture
+    def client(self):
+        chromadb = pytest.importorskip("chromadb")
+        chroma = pytest.importorskip("open_webui.retrieval.vector.dbs.chroma")
+
+        client = chroma.ChromaClient.__new__(chroma.ChromaClient)
+        client.client = chromadb.EphemeralClient()
+        name = f"test-{uuid.uuid4().hex}"
+        client.insert(name, make_items())
+        yield client, name
+        client.client.delete_collection(name)
+
+    def test_iter_items_pages_through_collection(self, client):
+        client, name = client
+        batches = list(client.iter_items(name, batch_size=2))
+
+        assert [len(batch.ids[0]) for batch in batches] == [2, 2, 1]
+        assert sorted(flatten(batches, "ids")) == IDS
+        assert batches[0].vectors is None
+
+    def test_iter_items_filter_and_include(self, client):
+        client, name = client
+        batches = list(
+            client.iter_items(
+                name, filter={"file_id": "even"}, include=["documents"], batch_size=2
+            )
+        )
+
+        assert all(batch.ids is None for batch in batches)
+        assert sorted(flatten(batches, "documents")) == ["text 0", "text 2", "text 4"]
+
+    def test_get_items(self, client):
+        client, name = client
+        result = client.get_items(name, include=["ids", "vectors"], limit=3)
+
+        assert len(result.ids[0]) == 3
+        assert result.documents is None
+        assert all(len(vector) == 2 for vector in result.vectors[0])
+        assert client.get_items("missing") is None
+        assert list(client.iter_items("missing")) == []
+
+
+class TestQdrantPagination:
+    @pytest.fixture
+    def client(self):
+        qdrant_client = pytest.importorskip("qdrant_client")
+        qdrant = pytest.importorskip("open_webui.retrieval.vector.dbs.qdrant")
+
+        client = qdrant.QdrantClient.__new__(qdrant.QdrantClient)
+        client.client = qdrant_client.QdrantClient(":memory:")
+        client.collection_prefix = "open-webui"
+        client.QDRANT_ON_DISK = False
+        client.QDRANT_HNSW_M = 16
+        client.insert("kb", make_items())
+        return client
+
+    def test_iter_items_follows_scroll_offsets(self, client):
+        batches = list(client.iter_items("kb", batch_size=2))
+
+        assert [len(batch.ids[0]) for batch in batches] == [2, 2, 1]
+        assert sorted(flatten(batches, "ids")) == IDS
+        assert batches[0].vectors is None
+
+    def test_iter_items_filter_and_include(self, client):
+        batches = list(
+            client.iter_items(
+                "kb", filter={"file_id": "odd"}, include=["metadatas"], batch_size=1
+            )
+        )
+
+        assert all(batch.ids is None and batch.documents is None for batch in batches)
+        assert flatten(batches, "metadatas") == [{"file_id": "odd"}] * 2
+
+    def test_get_items(self, client):
+        result = client.get_items("kb", include=["ids", "vectors"], limit=3)
+
+        assert len(result.ids[0]) == 3
+        assert result.documents is None
+        assert len(result.vectors[0]) == 3
+        assert client.get_items("missing") is None
+        assert list(client.iter_items("missing")) == []
+
+
+class TestGetAllItems:
+    def test_merges_batches(self, monkeypatch):
+        utils = pytest.importorskip("open_webui.retrieval.utils")
+        calls = []
+
+        class Client:
+            def iter_items(self, collection_name, filter=None, include=None):
+                calls.append((collection_name, filter, include))
+                yield GetResult(ids=None, documents=[["A", "B"]], metadatas=[[1, 2]])
+                yield GetResult(ids=None, documents=[["C"]], metadatas=[[3]])
+
+            def get_items(self, *args, **kwargs):
+                raise AssertionError("whole collection read in one query")
+
+        monkeypatch.setattr(utils, "VECTOR_DB_CLIENT", Client())
+        result = utils.get_all_items(
+            "kb", filter={"file_id": "1"}, include=["documents", "metadatas"]
+        )
+
+        assert calls == [("kb", {"file_id": "1"}, ["documents", "metadatas"])]
+        assert result.ids is None
+        assert result.documents == [["A", "B", "C"]]
+        assert result.metadatas == [[1, 2, 3]]
+
+    def test_empty_collection(self, monkeypatch):
+        utils = pytest.importorskip("open_webui.retrieval.utils")
+
+        class Client:
+            def iter_items(self, collection_name, filter=None, include=None):
+                return iter(())
+
+        monkeypatch.setattr(utils, "VECTOR_DB_CLIENT", Client())
+
+        assert utils.get_all_items("kb") is None
+        assert utils.get_all_items_from_collections(["kb"]) == {
+            "documents": [[]],
+            "metadatas": [[]],
+            "ids": [[]],
+        }
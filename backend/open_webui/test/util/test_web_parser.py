@@ -0,0 +1,122 @@
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from open_webui.retrieval.web.parser import parse_page
+
+
+class TestParsePage:
+    def test_text_and_metadata(self):
+        page = (
+            "<html lang='de'><title>Grüße</title>"
+            "<meta name='description' content='Beschreibung'><p>Hallo</p></html>"
+        )
+        text, metadata, _ = parse_page(
+            page.encode("latin-1"), "https://a", encoding="latin-1"
+        )
+
+        assert text == "GrüßeHallo"
+        assert metadata == {
+            "source": "https://a",
+            "title": "Grüße",
+            "description": "Beschreibung",
+            "language": "de",
+        }
+
+    def test_encoding_fallbacks(self):
+        assert parse_page("<p>ü</p>".encode(), "https://a")[0] == "ü"
+        assert parse_page("<p>ü</p>".encode("cp1252"), "https://a")[0] == "ü"
+        assert parse_page(b"", "https://a")[:2] == ("", {"source": "https://a"})
+
+
+class BrokenPool:
+    def submit(self, *args):
+        raise BrokenProcessPool
+
+
+class TestParsePool:
+    @pytest.fixture
+    def web_utils(self, monkeypatch):
+        web_utils = pytest.importorskip("open_webui.retrieval.web.utils")
+        monkeypatch.setattr(web_utils, "_parse_pool", None)
+        return web_utils
+
+    @pytest.mark.asyncio
+    async def test_parses_in_thread_without_pool(self, web_utils, monkeypatch):
+        monkeypatch.setattr(web_utils, "WEB_PARSE_PROCESS_POOL_SIZE", 0)
+        loader = web_utils.SafeWebBaseLoader(web_paths=["https://a"])
+
+        text, metadata = await loader._aparse("https://a", b"<p>Hallo</p>")
+
+        assert web_utils.get_web_parse_pool() is None
+        assert (text, metadata) == ("Hallo", {"source": "https://a"})
+        assert "parse_ms" in loader.timings["https://a"]
+
+    @pytest.mark.asyncio
+    async def test_broken_pool_is_dropped(self, web_utils, monkeypatch):
+        pool = BrokenPool()
+        monkeypatch.setattr(web_utils, "_parse_pool", pool)
+        monkeypatch.setattr(web_utils, "WEB_PARSE_PROCESS_POOL_SIZE", 1)
+        loader = web_utils.SafeWebBaseLoader(web_paths=["https://a"])
+
+        text, _ = await loader._aparse("https://a", b"<p>Hallo</p>")
+
+        assert text == "Hallo"
+        assert web_utils._parse_pool is None
+
+
+class TestPageCache:
+    @pytest.fixture
+    def web_utils(self, monkeypatch):
+        web_utils = pytest.importorskip("open_webui.retrieval.web.utils")
+        monkeypatch.setattr(web_utils, "WEB_PARSE_PROCESS_POOL_SIZE", 0)
+        return web_utils
+
+    @pytest.fixture
+    def cache(self, web_utils, monkeypatch):
+        from open_webui.retrieval.cache import TTLCache
+
+        cache = TTLCache(8, 86400)
+        monkeypatch.setattr(web_utils, "WEB_PAGE_CACHE", cache)
+        return cache
+
+    @pytest.fixture
+    def loader(self, web_utils, cache):
+        return web_utils.SafeWebBaseLoader(web_paths=["https://a"])
+
+    def stale_page(self):
+        return {
+            "text": "Alt",
+            "metadata": {"source": "https://a"},
+            "etag": '"1"',
+            "last_modified": None,
+            "fetched_at": 0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_failed_revalidation_uses_cached_page(self, loader, cache):
+        page = self.stale_page()
+        await cache.aset("https://a", page)
+
+        # A failed fetch leaves no response and an empty body behind
+        result = await loader._aload_page("https://a", "", page)
+
+        assert result["text"] == "Alt"
+        assert (await cache.aget("https://a"))["fetched_at"] == 0
+
+        loader._responses["https://a"] = {"status": 500}
+        assert (await loader._aload_page("https://a", b"Error", page))["text"] == "Alt"
+
+    @pytest.mark.asyncio
+    async def test_revalidated_and_changed_pages_are_stored(self, loader, cache):
+        page = self.stale_page()
+        loader._responses["https://a"] = {"status": 304}
+
+        assert (await loader._aload_page("https://a", b"", page))["text"] == "Alt"
+        assert (await cache.aget("https://a"))["fetched_at"] > 0
+
+        loader._responses["https://a"] = {"status": 200, "etag": '"2"'}
+        result = await loader._aload_page("https://a", b"<p>Neu</p>", page)
+
+        assert result["text"] == "Neu"
+        assert (await cache.aget("https://a"))["etag"] == '"2"'
@@ -0,0 +1,163 @@
+import pycrdt as Y
+import pytest
+
+from open_webui.socket.utils import (
+    LocalDict,
+    LocalHashPool,
+    UsageExpiryIndex,
+    YdocManager,
+)
+
+
+def make_updates(count):
+    ydoc = Y.Doc()
+    text = ydoc.get("content", type=Y.Text)
+
+    updates = []
+    ydoc.observe(lambda event: updates.append(event.update))
+    for i in range(count):
+        text += f"{i} "
+
+    return updates, str(text)
+
+
+def read_text(update):
+    ydoc = Y.Doc()
+    ydoc.apply_update(update)
+    return str(ydoc.get("content", type=Y.Text))
+
+
+class TestYdocManager:
+    @pytest.mark.asyncio
+    async def test_state_without_compaction(self):
+        manager = YdocManager(compaction_threshold=0)
+        updates, expected = make_updates(10)
+
+        for update in updates:
+            await manager.append_to_updates("note:1", list(update))
+
+        assert await manager.document_exists("note:1")
+        assert len(await manager.get_updates("note:1")) == 10
+        assert read_text(await manager.get_state("note:1")) == expected
+
+    @pytest.mark.asyncio
+    async def test_compaction_keeps_state(self):
+        manager = YdocManager(compaction_threshold=8)
+        updates, expected = make_updates(20)
+
+        for update in updates:
+            await manager.append_to_updates("note:1", update)
+
+        # One snapshot plus the updates appended since the last compaction
+        assert len(await manager.get_updates("note:1")) == 1 + 20 % 8
+        assert read_text(await manager.get_state("note:1")) == expected
+
+    @pytest.mark.asyncio
+    async def test_clear_document(self):
+        manager = YdocManager(compaction_threshold=2)
+        updates, _ = make_updates(3)
+
+        for update in updates:
+            await manager.append_to_updates("note:1", update)
+        await manager.clear_document("note:1")
+
+        assert not await manager.document_exists("note:1")
+
+    @pytest.mark.asyncio
+    async def test_remove_user_from_all_documents(self):
+        manager = YdocManager()
+        updates, _ = make_updates(1)
+
+        for document_id in ("note:1", "note:2"):
+            await manager.append_to_updates(document_id, updates[0])
+            await manager.add_user(document_id, "sid-a")
+        await manager.add_user("note:2", "sid-b")
+
+        await manager.remove_user_from_all_documents("sid-a")
+
+        # note:1 had no other users left and is cleared, note:2 is kept
+        assert not await manager.document_exists("note:1")
+        assert await manager.get_users("note:2") == {"sid-b"}
+        assert "sid-a" not in manager._user_documents
+
+
+class TestUsageExpiryIndex:
+    @pytest.mark.asyncio
+    async def test_pop_expired(self):
+        index = UsageExpiryIndex()
+        await index.touch("org:model", "sid-a", 100)
+        await index.touch("org:model", "sid-b", 200)
+        await index.touch("other", "sid-a", 50)
+
+        assert sorted(await index.pop_expired(150)) == [
+            ("org:model", "sid-a"),
+            ("other", "sid-a"),
+        ]
+        assert await index.pop_expired(150) == []
+        assert await index.pop_expired(201) == [("org:model", "sid-b")]
+
+
+class TestLocalDict:
+    @pytest.mark.asyncio
+    async def test_async_accessors(self):
+        pool = LocalDict()
+        await pool.aset("sid-a", {"id": "user-1"})
+        await pool.aset("sid-b", {"id": "user-2"})
+
+        assert await pool.acontains("sid-a")
+        assert await pool.aget_many(["sid-b", "missing", "sid-a"]) == [
+            {"id": "user-2"},
+            None,
+            {"id": "user-1"},
+        ]
+
+        await pool.adelete("sid-a")
+        await pool.adelete("missing")
+        assert await pool.aget("sid-a", {}) == {}
+        assert await pool.akeys() == ["sid-b"]
+
+
+class TestLocalHashPool:
+    @pytest.mark.asyncio
+    async def test_sessions_are_tracked_per_field(self):
+        pool = LocalHashPool()
+        await pool.aadd("user-1", "sid-a", 100)
+        await pool.aadd("user-1", "sid-b", 200)
+        await pool.aadd("user-2", "sid-c", 300)
+
+        assert await pool.aget("user-1") == {"sid-a": 100, "sid-b": 200}
+        assert sorted(await pool.akeys()) == ["user-1", "user-2"]
+
+        assert await pool.aremove("user-1", "sid-a")
+        assert await pool.acontains("user-1")
+        assert await pool.aremove("user-1", "sid-b")
+        assert not await pool.acontains("user-1")
+        assert "user-1" not in pool
+        assert pool.keys() == ["user-2"]
+        assert not await pool.aremove("user-1", "sid-b")
+
+    @pytest.mark.asyncio
+    async def test_conditional_remove_keeps_refreshed_field(self):
+        pool = LocalHashPool()
+        await pool.aadd("model", "sid-a", 100)
+        # A usage event refreshes the session before the cleanup removes it
+        await pool.aadd("model", "sid-a", 200)
+
+        assert not await pool.aremove("model", "sid-a", 100)
+        assert await pool.aget("model") == {"sid-a": 200}
+        assert await pool.aremove("model", "sid-a", 200)
+        assert await pool.akeys() == []
+
+    @pytest.mark.asyncio
+    async def test_async_status_helpers(self, monkeypatch):
+        socket_main = pytest.importorskip("open_webui.socket.main")
+        monkeypatch.setattr(socket_main, "USER_POOL", LocalHashPool())
+        monkeypatch.setattr(socket_main, "USAGE_POOL", LocalHashPool())
+
+        await socket_main.USER_POOL.aadd("user-1", "sid-a", 100)
+        await socket_main.USAGE_POOL.aadd("model", "sid-a", 100)
+
+        assert await socket_main.aget_active_status_by_user_id("user-1")
+        assert not await socket_main.aget_active_status_by_user_id("user-2")
+        assert await socket_main.aget_active_user_ids() == ["user-1"]
+        assert await socket_main.aget_models_in_use() == ["model"]
@@ -0,0 +1,192 @@
+import hashlib
+import io
+import logging
+import os
+import re
+import struct
+import uuid
+import wave
+from pathlib import Path
+from typing import Iterable, Optional
+
+from open_webui.config import CACHE_DIR
+from open_webui.env import AUDIO_SPEECH_CACHE_MAX_SIZE, SRC_LOG_LEVELS
+from open_webui.utils.disk_cache import DiskCacheEvictor
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["AUDIO"])
+
+
+CODE_BLOCK_PATTERN = re.compile(r"```[\s\S]*?```")
+SENTENCE_BOUNDARY_PATTERN = re.compile(r"(?<=[.!?。！？])\s+|\n+")
+PARAGRAPH_BOUNDARY_PATTERN = re.compile(r"\n+")
+
+
+def split_text_into_sentences(text: str, split_on: str = "punctuation") -> list[str]:
+    """
+    Splits text into the units synthesized by the streaming speech endpoint.
+    Mirrors the frontend's extractSentences/extractParagraphsForAudio so that
+    the per-sentence cache is shared between both code paths.
+    """
+    text = CODE_BLOCK_PATTERN.sub("", text or "")
+
+    if split_on == "punctuation":
+        parts = SENTENCE_BOUNDARY_PATTERN.split(text)
+    elif split_on == "paragraphs":
+        parts = PARAGRAPH_BOUNDARY_PATTERN.split(text)
+    else:
+        parts = [text]
+
+    return [part.strip() for part in parts if part and part.strip()]
+
+
+def get_audio_media_type(data: bytes) -> str:
+    """Guess the media type of an encoded audio buffer from its magic bytes."""
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        return "audio/wav"
+    if data[:4] == b"OggS":
+        return "audio/ogg"
+    if data[:4] == b"fLaC":
+        return "audio/flac"
+    if data[:4] == b"\x1a\x45\xdf\xa3":
+        return "audio/webm"
+    if data[:2] in (b"\xff\xf1", b"\xff\xf9"):
+        return "audio/aac"
+    if data[:3] == b"ID3" or (len(data) > 1 and data[0] == 0xFF and data[1] >= 0xE0):
+        return "audio/mpeg"
+    return "application/octet-stream"
+
+
+def read_wav(data: bytes) -> tuple:
+    """Returns the format parameters and raw PCM frames of a WAV buffer."""
+    with wave.open(io.BytesIO(data), "rb") as wav:
+        return wav.getparams(), wav.readframes(wav.getnframes())
+
+
+def get_wav_stream_header(params) -> bytes:
+    """
+    Builds a PCM WAV header for a stream of unknown length. The RIFF and data
+    chunk sizes are set to their maximum value, which players treat as
+    "read until EOF".
+    """
+    byte_rate = params.framerate * params.nchannels * params.sampwidth
+    block_align = params.nchannels * params.sampwidth
+
+    return (
+        b"RIFF"
+        + struct.pack("<I", 0xFFFFFFFF)
+        + b"WAVE"
+        + b"fmt "
+        + struct.pack(
+            "<IHHIIHH",
+            16,
+            1,
+            params.nchannels,
+            params.framerate,
+            byte_rate,
+            block_align,
+            params.sampwidth * 8,
+        )
+        + b"data"
+        + struct.pack("<I", 0xFFFFFFFF)
+    )
+
+
+class SpeechCache:
+    """
+    Size-bounded on-disk cache for synthesized speech.
+
+    Entries are files named after their key inside cache_dir, so entries
+    written by other workers are hits as well and count towards the size. Hits
+    update the modification time of an entry and once the files in the
+    directory exceed max_size bytes the least recently used ones are removed,
+    see DiskCacheEvictor. A max_size of 0 disables eviction.
+    """
+
+    EXTENSIONS = ("mp3", "wav")
+    # Temporary files older than this are left over from interrupted writes
+    STALE_TMP_SECONDS = 3600
+
+    def __init__(self, cache_dir: Path, max_size: int):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+
+        for path in self.cache_dir.glob("*.json"):
+            # Request bodies written next to each entry by earlier versions
+            path.unlink(missing_ok=True)
+        self._evictor = DiskCacheEvictor(
+            self.cache_dir,
+            max_size,
+            is_temporary=lambda name: name.startswith("."),
+            stale_temporary_seconds=self.STALE_TMP_SECONDS,
+        )
+
+    @staticmethod
+    def get_key(*parts) -> str:
+        return hashlib.sha256(
+            b"\x00".join(
+                part if isinstance(part, bytes) else str(part).encode("utf-8")
+                for part in parts
+            )
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[Path]:
+        for ext in self.EXTENSIONS:
+            path = self.cache_dir / f"{key}.{ext}"
+            try:
+                os.utime(path)
+            except OSError:
+                continue
+            return path
+        return None
+
+    def read(self, key: str) -> Optional[bytes]:
+        path = self.get(key)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except OSError:
+            # Evicted in the meantime
+            return None
+
+    def put(self, key: str, data: bytes) -> Path:
+        return self.put_stream(key, [data])
+
+    def put_stream(self, key: str, chunks: Iterable[bytes]) -> Path:
+        """Writes the chunks to the entry as they arrive, without buffering them."""
+        # Write to a temporary file first so readers never see partial audio
+        tmp_path = self.cache_dir / f".{key}.{uuid.uuid4().hex}.tmp"
+        ext = None
+        size = 0
+        try:
+            with open(tmp_path, "wb") as f:
+                for chunk in chunks:
+                    if not chunk:
+                        continue
+                    if ext is None:
+                        ext = (
+                            "wav"
+                            if get_audio_media_type(chunk) == "audio/wav"
+                            else "mp3"
+                        )
+                    f.write(chunk)
+                    size += len(chunk)
+
+            path = self.cache_dir / f"{key}.{ext or 'mp3'}"
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        for other in self.EXTENSIONS:
+            if other != path.suffix[1:]:
+                (self.cache_dir / f"{key}.{other}").unlink(missing_ok=True)
+
+        self._evictor.add(size)
+        return path
+
+
+SPEECH_CACHE_DIR = CACHE_DIR / "audio" / "speech"
+SPEECH_CACHE = SpeechCache(SPEECH_CACHE_DIR, AUDIO_SPEECH_CACHE_MAX_SIZE * 1024 * 1024)
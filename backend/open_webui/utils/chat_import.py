@@ -0,0 +1,74 @@
+import json
+import logging
+from typing import Iterable, Iterator
+
+from pydantic import ValidationError
+
+from open_webui.env import CHAT_IMPORT_BATCH_SIZE, SRC_LOG_LEVELS
+from open_webui.models.chats import ChatImportForm, Chats
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+# Line errors included in the progress events, the counts are always exact
+MAX_REPORTED_ERRORS = 100
+
+
+def import_chats_from_ndjson(
+    user_id: str,
+    lines: Iterable[bytes],
+    batch_size: int = CHAT_IMPORT_BATCH_SIZE,
+    skip: int = 0,
+) -> Iterator[dict]:
+    """
+    Imports one chat per line, in the format of the NDJSON chat export, and
+    yields a progress event after every batch and a final one with done=True.
+
+    Lines are numbered from 1 and the first `skip` lines are ignored. Every
+    event is sent after its batch is committed, so if an import is interrupted,
+    sending the same file again with skip set to the `line` of the last event
+    continues where it stopped without creating duplicates. Invalid lines and
+    batches that fail to insert do not stop the import, they are counted in
+    `failed` and their line ranges are listed in `errors`.
+    """
+    batch_size = max(1, batch_size)
+    progress = {"line": skip, "imported": 0, "failed": 0, "errors": []}
+    batch = []
+    batch_start = skip + 1
+
+    def add_error(start: int, end: int, error: str, count: int = 1):
+        progress["failed"] += count
+        if len(progress["errors"]) < MAX_REPORTED_ERRORS:
+            progress["errors"].append({"start": start, "end": end, "error": error})
+
+    def flush(end: int):
+        if batch:
+            try:
+                progress["imported"] += Chats.insert_chats_batch(user_id, batch)
+            except Exception as e:
+                log.exception(f"Error importing chats {batch_start}-{end}: {e}")
+                add_error(batch_start, end, "Failed to save chats", len(batch))
+            batch.clear()
+        progress["line"] = end
+        event = dict(progress)
+        # Every event only reports the errors since the previous one
+        progress["errors"] = []
+        return event
+
+    line_number = 0
+    for line_number, line in enumerate(lines, start=1):
+        if line_number <= skip:
+            continue
+        if not line.strip():
+            continue
+
+        try:
+            batch.append(ChatImportForm.model_validate(json.loads(line)))
+        except (ValueError, ValidationError) as e:
+            add_error(line_number, line_number, str(e).splitlines()[0])
+
+        if len(batch) >= batch_size:
+            yield flush(line_number)
+            batch_start = line_number + 1
+
+    yield {**flush(max(line_number, skip)), "done": True}
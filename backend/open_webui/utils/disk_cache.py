@@ -0,0 +1,125 @@
+import logging
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+
+class DiskCacheEvictor:
+    """
+    Keeps the files of a cache directory under max_size bytes by removing the
+    least recently modified ones. A max_size of 0 disables the limit.
+
+    The directory is listed once on creation. After that the total size is
+    tracked in memory from the writes reported with add, and the directory is
+    only listed again once the total crosses max_size. Eviction then frees the
+    directory down to LOW_WATER of max_size, so the next listing is many writes
+    away. Files written by other workers sharing the directory are counted by
+    that listing, until then the directory can exceed max_size by their writes.
+
+    Files for which is_temporary(name) is true are neither counted nor evicted,
+    they are removed once older than stale_temporary_seconds (if given). Files
+    modified within the last grace_seconds are never evicted, and on_evict is
+    called with the path of every evicted file.
+    """
+
+    # Fraction of max_size an eviction frees the directory down to
+    LOW_WATER = 0.9
+
+    def __init__(
+        self,
+        directory: str,
+        max_size: int,
+        is_temporary: Callable[[str], bool] = lambda name: False,
+        stale_temporary_seconds: Optional[int] = None,
+        grace_seconds: int = 0,
+        on_evict: Optional[Callable[[str], None]] = None,
+    ):
+        self.directory = str(directory)
+        self.max_size = max_size
+        self.is_temporary = is_temporary
+        self.stale_temporary_seconds = stale_temporary_seconds
+        self.grace_seconds = grace_seconds
+        self.on_evict = on_evict
+
+        self._lock = threading.Lock()
+        self._size = 0
+        self._threshold = max_size
+
+        if self.max_size:
+            with self._lock:
+                self._evict()
+
+    @property
+    def size(self) -> int:
+        """Bytes in the directory as far as this worker knows."""
+        return self._size
+
+    def add(self, size: int):
+        """Records size bytes written to the directory, evicting if needed."""
+        if not self.max_size:
+            return
+
+        with self._lock:
+            self._size += size
+            if self._size > self._threshold:
+                self._evict()
+
+    def _list_files(self) -> list[tuple[float, str, int]]:
+        now = time.time()
+        files = []
+        for entry in os.scandir(self.directory):
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except FileNotFoundError:
+                # Removed by another worker
+                continue
+
+            if self.is_temporary(entry.name):
+                if (
+                    self.stale_temporary_seconds is not None
+                    and now - stat.st_mtime > self.stale_temporary_seconds
+                ):
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
+                continue
+
+            files.append((stat.st_mtime, entry.path, stat.st_size))
+        return files
+
+    def _evict(self):
+        files = self._list_files()
+        size = sum(file_size for _, _, file_size in files)
+
+        if size > self.max_size:
+            target = int(self.max_size * self.LOW_WATER)
+            grace_until = time.time() - self.grace_seconds
+            # Always keep the most recent entry, even if it alone exceeds the limit
+            for mtime, path, file_size in sorted(files)[:-1]:
+                if size <= target or (self.grace_seconds and mtime > grace_until):
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    log.warning(f"Failed to evict cached file {path}: {e}")
+                    continue
+                size -= file_size
+                if self.on_evict:
+                    self.on_evict(path)
+
+        self._size = size
+        # Entries that could not be evicted yet must not cause a listing per write
+        self._threshold = max(
+            self.max_size, size + self.max_size - int(self.max_size * self.LOW_WATER)
+        )
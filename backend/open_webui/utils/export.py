@@ -0,0 +1,93 @@
+import logging
+import zlib
+from typing import Iterable, Iterator, Optional
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+EXPORT_FORMATS = ("json", "ndjson")
+
+# Serialized rows are sent in chunks of about this size
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+def iter_export_chunks(
+    items: Iterable[BaseModel], format: str = "json"
+) -> Iterator[bytes]:
+    """
+    Serializes items one at a time, as a JSON array or as NDJSON (one object per
+    line), and yields the result in chunks of EXPORT_CHUNK_SIZE bytes.
+    """
+    ndjson = format == "ndjson"
+    buffer = bytearray() if ndjson else bytearray(b"[")
+    count = 0
+
+    try:
+        for item in items:
+            if not ndjson and count:
+                buffer += b","
+            buffer += item.model_dump_json().encode()
+            if ndjson:
+                buffer += b"\n"
+            count += 1
+
+            if len(buffer) >= EXPORT_CHUNK_SIZE:
+                yield bytes(buffer)
+                buffer.clear()
+    except Exception as e:
+        # Headers are already sent, all we can do is end with a truncated body
+        log.exception(f"Error exporting after {count} items: {e}")
+        raise
+
+    if not ndjson:
+        buffer += b"]"
+    if buffer:
+        yield bytes(buffer)
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def get_export_response(
+    items: Iterable[BaseModel],
+    format: str = "json",
+    gzip: bool = False,
+    filename: Optional[str] = None,
+) -> StreamingResponse:
+    """
+    Streams items from a generator, so memory use does not grow with the number
+    of rows. The JSON format stays compatible with the list responses it
+    replaces. With gzip the body is a .gz file to download, not a transfer
+    encoding.
+    """
+    if format not in EXPORT_FORMATS:
+        format = "json"
+
+    chunks = iter_export_chunks(items, format)
+    media_type = "application/x-ndjson" if format == "ndjson" else "application/json"
+    extension = format
+
+    if gzip:
+        chunks = gzip_chunks(chunks)
+        media_type = "application/gzip"
+        extension = f"{format}.gz"
+
+    headers = {}
+    if filename and (gzip or format == "ndjson"):
+        headers["Content-Disposition"] = (
+            f'attachment; filename="{filename}.{extension}"'
+        )
+
+    # A sync generator, Starlette iterates it in a worker thread
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
@@ -22,6 +22,21 @@ def get_function_module(request, function_id, load_from_db=True):
     return function_module
 
 
+def has_stream_filters(request, filter_functions) -> bool:
+    """
+    Whether any of the filter functions handles stream events.
+    """
+    return any(
+        getattr(
+            get_function_module(request, function.id, load_from_db=False),
+            "stream",
+            None,
+        )
+        for function in filter_functions
+        if function
+    )
+
+
 def get_sorted_filter_ids(request, model: dict, enabled_filter_ids: list = None):
     def get_priority(function_id):
         function = Functions.get_function_by_id(function_id)
@@ -10,6 +10,7 @@ from aiocache import cached
 from typing import Any, Optional
 import random
 import json
+import orjson
 import html
 import inspect
 import re
@@ -32,7 +33,7 @@ from open_webui.models.users import Users
 from open_webui.socket.main import (
     get_event_call,
     get_event_emitter,
-    get_active_status_by_user_id,
+    aget_active_status_by_user_id,
 )
 from open_webui.routers.tasks import (
     generate_queries,
@@ -91,14 +92,17 @@ from open_webui.utils.misc import (
     prepend_to_first_user_message_content,
     convert_logit_bias_input_to_json,
     get_content_from_message,
+    get_plain_content_delta,
 )
 from open_webui.utils.tools import get_tools, get_updated_tool_function
 from open_webui.utils.plugin import load_function_module_by_id
 from open_webui.utils.filter import (
     get_sorted_filter_ids,
+    has_stream_filters,
     process_filter_functions,
 )
 from open_webui.utils.code_interpreter import execute_code_jupyter
+from open_webui.utils.usage import record_usage
 from open_webui.utils.payload import apply_system_prompt_to_body
 from open_webui.utils.mcp.client import MCPClient
 
@@ -1924,6 +1928,13 @@ async def process_chat_response(
                         response_data["usage"] = enrich_usage_with_cost(
                             response_data.get("usage", {}), metadata.get("model", {})
                         )
+                        record_usage(
+                            user.id,
+                            (metadata.get("model") or {}).get("id"),
+                            response_data["usage"],
+                            chat_id=metadata.get("chat_id"),
+                            message_id=metadata.get("message_id"),
+                        )
 
                     if "error" in response_data:
                         error = response_data.get("error")
@@ -1993,7 +2004,7 @@ async def process_chat_response(
                             )
 
                             # Send a webhook notification if the user is not active
-                            if not get_active_status_by_user_id(user.id):
+                            if not await aget_active_status_by_user_id(user.id):
                                 webhook_url = Users.get_user_webhook_url_by_id(user.id)
                                 if webhook_url:
                                     await post_webhook(
@@ -2504,6 +2515,14 @@ async def process_chat_response(
                 else:
                     reasoning_tags = DEFAULT_REASONING_TAGS
 
+            # Text deltas skip the filters, tag detection and full parsing of
+            # the stream when none of them could change the response
+            STREAM_FAST_PATH = not (
+                DETECT_REASONING_TAGS
+                or DETECT_CODE_INTERPRETER
+                or has_stream_filters(request, filter_functions)
+            )
+
             try:
                 for event in events:
                     await event_emitter(
@@ -2537,12 +2556,23 @@ async def process_chat_response(
                         ),
                     )
                     last_delta_data = None
+                    # Set by fast path deltas, the content is only serialized when flushed
+                    content_changed = False
+                    # Providers may send usage more than once, only the last one is recorded
+                    last_usage = None
 
                     async def flush_pending_delta_data(threshold: int = 0):
                         nonlocal delta_count
                         nonlocal last_delta_data
+                        nonlocal content_changed
 
-                        if delta_count >= threshold and last_delta_data:
+                        if delta_count >= threshold and (
+                            last_delta_data or content_changed
+                        ):
+                            if content_changed:
+                                last_delta_data = {
+                                    "content": serialize_content_blocks(content_blocks)
+                                }
                             await event_emitter(
                                 {
                                     "type": "chat:completion",
@@ -2551,8 +2581,46 @@ async def process_chat_response(
                             )
                             delta_count = 0
                             last_delta_data = None
+                            content_changed = False
 
                     async for line in response.body_iterator:
+                        plain_delta = (
+                            get_plain_content_delta(line)
+                            if STREAM_FAST_PATH
+                            and content_blocks
+                            and content_blocks[-1]["type"] == "text"
+                            else None
+                        )
+                        if plain_delta:
+                            data, value = plain_delta
+                            if ENABLE_CHAT_RESPONSE_BASE64_IMAGE_URL_CONVERSION:
+                                value = convert_markdown_base64_images(
+                                    request, value, metadata, user
+                                )
+
+                            content = f"{content}{value}"
+                            content_blocks[-1]["content"] += value
+
+                            if ENABLE_REALTIME_CHAT_SAVE:
+                                # Save message in the database
+                                Chats.upsert_message_to_chat_by_id_and_message_id(
+                                    metadata["chat_id"],
+                                    metadata["message_id"],
+                                    {
+                                        "content": serialize_content_blocks(
+                                            content_blocks
+                                        ),
+                                    },
+                                )
+                                last_delta_data = data
+                            else:
+                                content_changed = True
+
+                            delta_count += 1
+                            if delta_count >= delta_chunk_size:
+                                await flush_pending_delta_data(delta_chunk_size)
+                            continue
+
                         line = (
                             line.decode("utf-8", "replace")
                             if isinstance(line, bytes)
@@ -2613,6 +2681,7 @@ async def process_chat_response(
                                         usage = enrich_usage_with_cost(
                                             usage, metadata.get("model", {})
                                         )
+                                        last_usage = usage
                                         await event_emitter(
                                             {
                                                 "type": "chat:completion",
@@ -2845,6 +2914,7 @@ async def process_chat_response(
                                 if delta:
                                     delta_count += 1
                                     last_delta_data = data
+                                    content_changed = False
                                     if delta_count >= delta_chunk_size:
                                         await flush_pending_delta_data(delta_chunk_size)
                                 else:
@@ -2863,6 +2933,15 @@ async def process_chat_response(
                                 continue
                     await flush_pending_delta_data()
 
+                    if last_usage:
+                        record_usage(
+                            user.id,
+                            (metadata.get("model") or {}).get("id"),
+                            last_usage,
+                            chat_id=metadata.get("chat_id"),
+                            message_id=metadata.get("message_id"),
+                        )
+
                     if content_blocks:
                         # Clean up the last text block
                         if content_blocks[-1]["type"] == "text":
@@ -3291,7 +3370,7 @@ async def process_chat_response(
                     )
 
                 # Send a webhook notification if the user is not active
-                if not get_active_status_by_user_id(user.id):
+                if not await aget_active_status_by_user_id(user.id):
                     webhook_url = Users.get_user_webhook_url_by_id(user.id)
                     if webhook_url:
                         await post_webhook(
@@ -3339,6 +3418,15 @@ async def process_chat_response(
             def wrap_item(item):
                 return f"data: {item}\n\n"
 
+            if not has_stream_filters(request, filter_functions):
+                # Nothing can change the stream, upstream chunks are forwarded as is
+                for event in events:
+                    yield b"data: " + orjson.dumps(event) + b"\n\n"
+
+                async for data in original_generator:
+                    yield data
+                return
+
             for event in events:
                 event, _ = await process_filter_functions(
                     request=request,
@@ -6,9 +6,10 @@ import uuid
 import logging
 from datetime import timedelta
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Optional, Union
 import json
 import aiohttp
+import orjson
 
 
 import collections.abc
@@ -583,11 +584,80 @@ def extract_urls(text: str) -> list[str]:
     return url_pattern.findall(text)
 
 
+class SSELineSplitter:
+    """
+    Splits a byte stream into lines, without their trailing newline.
+
+    The complete lines of a chunk are split in one pass and only the partial
+    line at its end is kept, in a bytearray that the following chunks are
+    appended to, so a line that arrives in many chunks is copied once instead
+    of once per chunk. Lines longer than max_line_size are replaced with
+    b"data: {}" and the rest of their data is dropped as it arrives instead of
+    being buffered.
+    """
+
+    OVERSIZED_LINE = b"data: {}"
+
+    def __init__(self, max_line_size: Optional[int] = None):
+        self.max_line_size = (
+            max_line_size if max_line_size and max_line_size > 0 else None
+        )
+        self._buffer = bytearray()
+        self._skipping = False
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """Adds a chunk and returns the lines it completes."""
+        if self._skipping:
+            # Still inside an oversized line, drop everything up to its end
+            end = data.find(b"\n")
+            if end < 0:
+                return []
+            data = data[end + 1 :]
+            self._skipping = False
+
+        buffer = self._buffer
+        pending = len(buffer)
+        last = data.rfind(b"\n")
+        if last < 0:
+            lines = []
+        elif pending:
+            first = data.find(b"\n")
+            buffer += data[:first]
+            lines = [bytes(buffer)]
+            buffer.clear()
+            if first < last:
+                lines.extend(data[first + 1 : last].split(b"\n"))
+        else:
+            lines = data[:last].split(b"\n")
+        buffer += data[last + 1 :]
+
+        if self.max_line_size is not None:
+            if pending + len(data) > self.max_line_size:
+                for i, line in enumerate(lines):
+                    if len(line) > self.max_line_size:
+                        log.info(f"Skipping oversized line, line size: {len(line)}")
+                        lines[i] = self.OVERSIZED_LINE
+
+            if len(buffer) > self.max_line_size:
+                log.info(f"Skipping oversized line, buffer size: {len(buffer)}")
+                lines.append(self.OVERSIZED_LINE)
+                buffer.clear()
+                self._skipping = True
+        return lines
+
+    def flush(self) -> list[bytes]:
+        """Returns the last line if the stream did not end with a newline."""
+        lines = [] if self._skipping or not self._buffer else [bytes(self._buffer)]
+        self._buffer.clear()
+        self._skipping = False
+        return lines
+
+
 def stream_chunks_handler(stream: aiohttp.StreamReader):
     """
     Handle stream response chunks, supporting large data chunks that exceed the original 16kb limit.
-    When a single line exceeds max_buffer_size, returns an empty JSON string {} and skips subsequent data
-    until encountering normally sized data.
+    Every line that exceeds max_buffer_size is replaced with an empty JSON event (data: {}) and
+    its data is skipped up to the next line.
 
     :param stream: The stream reader to handle.
     :return: An async generator that yields the stream data.
@@ -598,51 +668,60 @@ def stream_chunks_handler(stream: aiohttp.StreamReader):
         return stream
 
     async def yield_safe_stream_chunks():
-        buffer = b""
-        skip_mode = False
+        splitter = SSELineSplitter(max_buffer_size)
 
         async for data, _ in stream.iter_chunks():
             if not data:
                 continue
+            for line in splitter.feed(data):
+                yield line
 
-            # In skip_mode, if buffer already exceeds the limit, clear it (it's part of an oversized line)
-            if skip_mode and len(buffer) > max_buffer_size:
-                buffer = b""
+        for line in splitter.flush():
+            yield line
 
-            lines = (buffer + data).split(b"\n")
+    return yield_safe_stream_chunks()
 
-            # Process complete lines (except the last possibly incomplete fragment)
-            for i in range(len(lines) - 1):
-                line = lines[i]
 
-                if skip_mode:
-                    # Skip mode: check if current line is small enough to exit skip mode
-                    if len(line) <= max_buffer_size:
-                        skip_mode = False
-                        yield line
-                    else:
-                        yield b"data: {}"
-                else:
-                    # Normal mode: check if line exceeds limit
-                    if len(line) > max_buffer_size:
-                        skip_mode = True
-                        yield b"data: {}"
-                        log.info(f"Skip mode triggered, line size: {len(line)}")
-                    else:
-                        yield line
-
-            # Save the last incomplete fragment
-            buffer = lines[-1]
-
-            # Check if buffer exceeds limit
-            if not skip_mode and len(buffer) > max_buffer_size:
-                skip_mode = True
-                log.info(f"Skip mode triggered, buffer size: {len(buffer)}")
-                # Clear oversized buffer to prevent unlimited growth
-                buffer = b""
-
-        # Process remaining buffer data
-        if buffer and not skip_mode:
-            yield buffer
+# Delta fields that are forwarded without processing when they are the only ones set
+PLAIN_DELTA_FIELDS = ("content", "role")
 
-    return yield_safe_stream_chunks()
+
+def get_plain_content_delta(line: Union[bytes, str]) -> Optional[tuple[dict, str]]:
+    """
+    Parses a line of a chat completion stream and returns the event and its
+    text if it only carries text for the first choice. Returns None for every
+    other line (usage, tool calls, reasoning, images, errors, [DONE]), which
+    need the full processing of the stream.
+    """
+    prefix = b"data:" if isinstance(line, bytes) else "data:"
+    if not line.startswith(prefix):
+        return None
+
+    try:
+        data = orjson.loads(line[len(prefix) :])
+    except orjson.JSONDecodeError:
+        return None
+
+    if (
+        not isinstance(data, dict)
+        or "event" in data
+        or "selected_model_id" in data
+        or data.get("usage")
+        or data.get("timings")
+    ):
+        return None
+
+    choices = data.get("choices")
+    if not choices or not isinstance(choices, list) or not isinstance(choices[0], dict):
+        return None
+
+    delta = choices[0].get("delta")
+    if not isinstance(delta, dict):
+        return None
+
+    value = delta.get("content")
+    if not value or not isinstance(value, str):
+        return None
+    if any(field for key, field in delta.items() if key not in PLAIN_DELTA_FIELDS):
+        return None
+    return data, value
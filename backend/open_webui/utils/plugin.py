@@ -1,19 +1,35 @@
+import hashlib
+import importlib.metadata
+import json
 import os
 import re
 import subprocess
 import sys
+import sysconfig
+import threading
 from importlib import util
+from pathlib import Path
 import types
 import tempfile
 import logging
 
-from open_webui.env import SRC_LOG_LEVELS, PIP_OPTIONS, PIP_PACKAGE_INDEX_OPTIONS
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    PIP_OPTIONS,
+    PIP_PACKAGE_INDEX_OPTIONS,
+    PIP_WHEEL_CACHE_DIR,
+    PLUGIN_DEPENDENCIES_WAIT_TIMEOUT,
+)
 from open_webui.models.functions import Functions
 from open_webui.models.tools import Tools
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
 
+# Cleared while install_tool_and_function_dependencies runs in the background
+PLUGIN_DEPENDENCIES_INSTALLED = threading.Event()
+PLUGIN_DEPENDENCIES_INSTALLED.set()
+
 
 def extract_frontmatter(content):
     """
@@ -68,6 +84,27 @@ def replace_imports(content):
     return content
 
 
+def exec_plugin_module(module, content: str):
+    """
+    Executes the plugin content in module. If an import fails while the
+    dependencies of all plugins are still being installed, waits up to
+    PLUGIN_DEPENDENCIES_WAIT_TIMEOUT seconds for the install and tries again.
+    """
+    try:
+        exec(content, module.__dict__)
+    except ImportError:
+        if PLUGIN_DEPENDENCIES_INSTALLED.is_set():
+            raise
+
+        log.info(f"Waiting for plugin dependencies to load {module.__name__}")
+        if not PLUGIN_DEPENDENCIES_INSTALLED.wait(PLUGIN_DEPENDENCIES_WAIT_TIMEOUT):
+            raise
+
+        # Let the import system find the packages installed in the meantime
+        importlib.invalidate_caches()
+        exec(content, module.__dict__)
+
+
 def load_tool_module_by_id(tool_id, content=None):
 
     if content is None:
@@ -98,7 +135,7 @@ def load_tool_module_by_id(tool_id, content=None):
         module.__dict__["__file__"] = temp_file.name
 
         # Executing the modified content in the created module's namespace
-        exec(content, module.__dict__)
+        exec_plugin_module(module, content)
         frontmatter = extract_frontmatter(content)
         log.info(f"Loaded module: {module.__name__}")
 
@@ -142,7 +179,7 @@ def load_function_module_by_id(function_id: str, content: str | None = None):
         module.__dict__["__file__"] = temp_file.name
 
         # Execute the modified content in the created module's namespace
-        exec(content, module.__dict__)
+        exec_plugin_module(module, content)
         frontmatter = extract_frontmatter(content)
         log.info(f"Loaded module: {module.__name__}")
 
@@ -160,6 +197,12 @@ def load_function_module_by_id(function_id: str, content: str | None = None):
         # Cleanup by removing the module in case of error
         del sys.modules[module_name]
 
+        if isinstance(e, ImportError) and not PLUGIN_DEPENDENCIES_INSTALLED.is_set():
+            # Still being installed after the wait, keep it active
+            raise Exception(
+                f"Dependencies of function {function_id} are still being installed"
+            ) from e
+
         Functions.update_function_by_id(function_id, {"is_active": False})
         raise e
     finally:
@@ -264,14 +307,82 @@ def get_function_module_from_cache(request, function_id, load_from_db=True):
     return function_module, function_type, frontmatter
 
 
+def get_requirements_list(requirements: str) -> list[str]:
+    """Splits a comma separated requirements string, dropping blanks and duplicates."""
+    return list(
+        dict.fromkeys(req.strip() for req in requirements.split(",") if req.strip())
+    )
+
+
+def get_requirements_hash(req_list: list[str]) -> str:
+    """
+    Hashes a requirements manifest together with the interpreter and pip options,
+    so a change to any of them invalidates the "already satisfied" marker.
+    """
+    manifest = {
+        "requirements": sorted(req_list),
+        "executable": sys.executable,
+        "version": sys.version,
+        "pip_options": PIP_OPTIONS,
+        "pip_package_index_options": PIP_PACKAGE_INDEX_OPTIONS,
+        "pip_wheel_cache_dir": PIP_WHEEL_CACHE_DIR,
+    }
+    return hashlib.sha256(
+        json.dumps(manifest, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+def get_requirements_marker_path(requirements_hash: str) -> Path:
+    # Kept inside site-packages so the marker lives and dies with the packages it
+    # describes, e.g. a fresh container never inherits a marker from a volume.
+    return (
+        Path(sysconfig.get_paths()["purelib"])
+        / ".open_webui_requirements"
+        / requirements_hash
+    )
+
+
+def are_requirements_satisfied(req_list: list[str]) -> bool:
+    """
+    Checks installed distributions against the requirements without invoking
+    pip. Anything that can't be checked locally (URLs, markers, unparsable
+    specifiers) is reported as unsatisfied.
+    """
+    try:
+        from packaging.requirements import Requirement
+
+        for req in req_list:
+            requirement = Requirement(req)
+            if requirement.url or requirement.marker:
+                return False
+
+            version = importlib.metadata.version(requirement.name)
+            if not requirement.specifier.contains(version, prereleases=True):
+                return False
+        return True
+    except Exception:
+        return False
+
+
 def install_frontmatter_requirements(requirements: str):
-    if requirements:
+    req_list = get_requirements_list(requirements or "")
+
+    if not req_list:
+        log.info("No requirements found in frontmatter.")
+        return
+
+    marker_path = get_requirements_marker_path(get_requirements_hash(req_list))
+    if marker_path.exists():
+        log.info(f"Requirements already satisfied: {' '.join(req_list)}")
+        return
+
+    if not are_requirements_satisfied(req_list):
         try:
-            req_list = [req.strip() for req in requirements.split(",")]
             log.info(f"Installing requirements: {' '.join(req_list)}")
             subprocess.check_call(
                 [sys.executable, "-m", "pip", "install"]
                 + PIP_OPTIONS
+                + (["--find-links", PIP_WHEEL_CACHE_DIR] if PIP_WHEEL_CACHE_DIR else [])
                 + req_list
                 + PIP_PACKAGE_INDEX_OPTIONS
             )
@@ -279,8 +390,11 @@ def install_frontmatter_requirements(requirements: str):
             log.error(f"Error installing packages: {' '.join(req_list)}")
             raise e
 
-    else:
-        log.info("No requirements found in frontmatter.")
+    try:
+        marker_path.parent.mkdir(parents=True, exist_ok=True)
+        marker_path.write_text(json.dumps(req_list))
+    except OSError as e:
+        log.debug(f"Could not write requirements marker {marker_path}: {e}")
 
 
 def install_tool_and_function_dependencies():
@@ -289,13 +403,15 @@ def install_tool_and_function_dependencies():
 
     By first collecting all dependencies from the frontmatter of each tool and function,
     and then installing them using pip. Duplicates or similar version specifications are
-    handled by pip as much as possible.
+    handled by pip as much as possible. Pip is skipped entirely when the combined
+    manifest was already installed into this interpreter.
     """
-    function_list = Functions.get_functions(active_only=True)
-    tool_list = Tools.get_tools()
-
-    all_dependencies = ""
+    PLUGIN_DEPENDENCIES_INSTALLED.clear()
     try:
+        function_list = Functions.get_functions(active_only=True)
+        tool_list = Tools.get_tools()
+
+        all_dependencies = ""
         for function in function_list:
             frontmatter = extract_frontmatter(replace_imports(function.content))
             if dependencies := frontmatter.get("requirements"):
@@ -310,3 +426,5 @@ def install_tool_and_function_dependencies():
         install_frontmatter_requirements(all_dependencies.strip(", "))
     except Exception as e:
         log.error(f"Error installing requirements: {e}")
+    finally:
+        PLUGIN_DEPENDENCIES_INSTALLED.set()
@@ -0,0 +1,207 @@
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Callable, Optional
+
+from open_webui.env import (
+    DATA_DIR,
+    ENABLE_USAGE_LEDGER,
+    SRC_LOG_LEVELS,
+    USAGE_LEDGER_FLUSH_BATCH_SIZE,
+    USAGE_LEDGER_FLUSH_INTERVAL_MS,
+)
+from open_webui.models.usage import UsageEventModel, Usages, new_usage_event
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+
+class UsageLedgerWriter:
+    """
+    Buffers usage events in memory and writes them to the ledger from a
+    background thread, once flush_interval_ms has passed or batch_size events
+    are waiting. Recording an event never touches the database.
+
+    At most max_pending events are buffered, events recorded beyond that are
+    counted in dropped. A batch that keeps failing max_attempts times in a row
+    is split up to find the events the database rejects; those are appended to
+    dead_letter_path instead of blocking the ledger.
+    """
+
+    def __init__(
+        self,
+        writer: Callable[[list[UsageEventModel]], int] = Usages.insert_usage_events,
+        flush_interval_ms: int = USAGE_LEDGER_FLUSH_INTERVAL_MS,
+        batch_size: int = USAGE_LEDGER_FLUSH_BATCH_SIZE,
+        max_pending: Optional[int] = None,
+        max_attempts: int = 5,
+        dead_letter_path: str = os.path.join(DATA_DIR, "usage_dead_letter.jsonl"),
+    ):
+        self.writer = writer
+        self.flush_interval = max(1, flush_interval_ms) / 1000
+        self.batch_size = max(1, batch_size)
+        # Events kept around while the database is unavailable
+        self.max_pending = max_pending or self.batch_size * 20
+        self.max_attempts = max(1, max_attempts)
+        self.dead_letter_path = dead_letter_path
+        self.dropped = 0
+
+        self._queue = queue.Queue(maxsize=self.max_pending)
+        self._retry: list[UsageEventModel] = []
+        self._failures = 0
+        self._dropped_lock = threading.Lock()
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def record(self, event: UsageEventModel):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+                dropped = self.dropped
+            # Logged on the first drop and then once per max_pending drops
+            if dropped == 1 or dropped % self.max_pending == 0:
+                log.warning(
+                    f"Usage ledger is full, {dropped} usage events dropped so far"
+                )
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._worker, name="usage-ledger-writer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop_event.set()
+        if self._thread is not None:
+            # Wakes the worker up if it is waiting for more events, a full
+            # queue wakes it up anyway
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                pass
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        # Write whatever is left, stop() is called on shutdown
+        self.flush()
+
+    def _take(self, deadline: float) -> list[UsageEventModel]:
+        events = self._retry
+        self._retry = []
+        while len(events) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout <= 0:
+                    event = self._queue.get_nowait()
+                else:
+                    event = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if event is None:
+                break
+            events.append(event)
+        return events
+
+    def flush(self) -> int:
+        """Writes all pending events, returns how many were written."""
+        written = 0
+        while True:
+            events = self._take(0)
+            if not events:
+                return written
+            if not self._write(events):
+                return written
+            written += len(events)
+
+    def _write(self, events: list[UsageEventModel]) -> bool:
+        try:
+            self.writer(events)
+            self._failures = 0
+            return True
+        except Exception as e:
+            log.exception(f"Error writing {len(events)} usage events: {e}")
+            self._failures += 1
+
+        if self._failures >= self.max_attempts:
+            self._failures = 0
+            written, rejected = self._write_split(events)
+            if written:
+                # The database works, so what still fails is the events' fault
+                self._dead_letter(rejected)
+                return True
+            log.warning(
+                f"Usage ledger still failing after {self.max_attempts} attempts"
+            )
+
+        self._retry = events
+        return False
+
+    def _write_split(
+        self, events: list[UsageEventModel]
+    ) -> tuple[int, list[UsageEventModel]]:
+        """Writes events in halves, returns how many were written and the rest."""
+        if len(events) > 1:
+            middle = len(events) // 2
+            written, rejected = self._write_split(events[:middle])
+            more_written, more_rejected = self._write_split(events[middle:])
+            return written + more_written, rejected + more_rejected
+
+        try:
+            self.writer(events)
+            return len(events), []
+        except Exception:
+            return 0, events
+
+    def _dead_letter(self, events: list[UsageEventModel]):
+        if not events:
+            return
+
+        log.error(
+            f"Moving {len(events)} usage events the ledger rejects to "
+            f"{self.dead_letter_path}"
+        )
+        try:
+            with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+                for event in events:
+                    f.write(event.model_dump_json() + "\n")
+        except OSError as e:
+            log.error(f"Dropping {len(events)} usage events: {e}")
+
+    def _worker(self):
+        while not self._stop_event.is_set():
+            events = self._take(time.monotonic() + self.flush_interval)
+            if events and not self._write(events):
+                self._stop_event.wait(self.flush_interval)
+
+
+USAGE_LEDGER = UsageLedgerWriter()
+
+
+def record_usage(
+    user_id: str,
+    model_id: Optional[str],
+    usage: Optional[dict],
+    chat_id: Optional[str] = None,
+    message_id: Optional[str] = None,
+):
+    """Adds a usage dict enriched by enrich_usage_with_cost to the ledger."""
+    if not ENABLE_USAGE_LEDGER or not usage or not user_id or not model_id:
+        return
+
+    try:
+        USAGE_LEDGER.record(
+            new_usage_event(
+                user_id=user_id,
+                model_id=model_id,
+                usage=usage,
+                created_at=int(time.time()),
+                chat_id=chat_id,
+                message_id=message_id,
+            )
+        )
+    except Exception as e:
+        log.warning(f"Error recording usage: {e}")
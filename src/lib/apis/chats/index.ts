@@ -96,6 +96,51 @@ export const importChats = async (token: string, chats: object[]) => {
 	return res;
 };
 
+export const importChatsStream = async (
+	token: string,
+	file: File,
+	skip: number = 0,
+	onProgress: (event: object) => void = () => {}
+) => {
+	const formData = new FormData();
+	formData.append('file', file);
+
+	const res = await fetch(`${WEBUI_API_BASE_URL}/chats/import/stream?skip=${skip}`, {
+		method: 'POST',
+		headers: {
+			authorization: `Bearer ${token}`
+		},
+		body: formData
+	});
+
+	if (!res.ok || !res.body) {
+		throw await res.json();
+	}
+
+	// Progress events are sent as NDJSON, the last one has done set
+	const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+	let buffer = '';
+	let lastEvent = null;
+
+	while (true) {
+		const { value, done } = await reader.read();
+		if (done) break;
+
+		buffer += value;
+		const lines = buffer.split('\n');
+		buffer = lines.pop() ?? '';
+
+		for (const line of lines) {
+			if (line.trim()) {
+				lastEvent = JSON.parse(line);
+				onProgress(lastEvent);
+			}
+		}
+	}
+
+	return lastEvent;
+};
+
 export const getChatList = async (
 	token: string = '',
 	page: number | null = null,